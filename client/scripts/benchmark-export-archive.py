@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark the creation of export archives.
+
+Creates a mixed export of incompressible files (standing in for PDFs, images and
+archives) and a transcript, then times `Export._create_archive` with the archive
+mode it chooses, and with the gzip archives it used to always create, as well as
+streaming the archive the way it is sent to the export agent.
+
+Run from the root of the repository with: PYTHONPATH=. scripts/benchmark-export-archive.py
+"""
+
+import argparse
+import os
+import time
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import mock
+
+from securedrop_client.export import Export
+
+parser = argparse.ArgumentParser(
+    """Benchmark the creation of export archives from a mixed set of files."""
+)
+parser.add_argument(
+    "--size", type=int, default=1024, help="""total size of the export in MiB (defaults to 1024)"""
+)
+parser.add_argument(
+    "--files", type=int, default=32, help="""number of incompressible files (defaults to 32)"""
+)
+
+MIB = 1024 * 1024
+
+
+def create_export_files(directory: str, size: int, count: int) -> List[str]:
+    """
+    Create count incompressible files and one transcript, adding up to size MiB.
+    """
+    filepaths = []
+    transcript_size = max(size // 100, 1) * MIB
+    file_size = (size * MIB - transcript_size) // count
+    for i in range(count):
+        filepath = os.path.join(directory, str(i), "files", f"document-{i}.pdf")
+        os.makedirs(os.path.dirname(filepath))
+        with open(filepath, "wb") as f:
+            for _ in range(file_size // MIB):
+                f.write(os.urandom(MIB))
+            f.write(os.urandom(file_size % MIB))
+        filepaths.append(filepath)
+
+    transcript_path = os.path.join(directory, "transcript", "transcript.txt")
+    os.makedirs(os.path.dirname(transcript_path))
+    line = b"Source: Here is what I found in the archives last week.\n"
+    with open(transcript_path, "wb") as f:
+        f.write(line * (transcript_size // len(line)))
+    filepaths.append(transcript_path)
+
+    return filepaths
+
+
+def time_archive(export: Export, directory: str, filepaths: List[str]) -> None:
+    start = time.perf_counter()
+    archive_path = export._create_archive(directory, "archive.sd-export", {}, filepaths)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(archive_path)
+    os.remove(archive_path)
+    print(f"  {elapsed:8.2f}s {size / MIB:10.1f} MiB")
+
+
+class NullStream:
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def time_stream(export: Export, filepaths: List[str]) -> None:
+    stream = NullStream()
+    start = time.perf_counter()
+    export._write_archive(stream, {}, filepaths)  # type: ignore[arg-type]
+    elapsed = time.perf_counter() - start
+    print(f"  {elapsed:8.2f}s {stream.size / MIB:10.1f} MiB")
+
+
+def main() -> None:
+    args = parser.parse_args()
+    export = Export()
+
+    with TemporaryDirectory() as directory:
+        print(f"Creating {args.size} MiB of export files...")
+        filepaths = create_export_files(directory, args.size, args.files)
+
+        print("Chosen archive mode:")
+        time_archive(export, directory, filepaths)
+
+        print("Transcript only:")
+        time_archive(export, directory, filepaths[-1:])
+
+        print("Streamed:")
+        time_stream(export, filepaths)
+
+        # tarfile compresses at level 9 by default
+        print("Always gzip at level 9:")
+        with mock.patch.object(Export, "_should_compress", return_value=True), mock.patch.object(
+            Export, "COMPRESSION_LEVEL", 9
+        ):
+            time_archive(export, directory, filepaths)
+
+
+if __name__ == "__main__":
+    main()
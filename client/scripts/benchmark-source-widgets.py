@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark the construction of SourceWidgets.
+
+Creates SourceWidgets for sources in a temporary database and reports the time
+it took and how much the resident memory of the process grew, which includes the
+icons, SVG renderers and animations that the widgets load.
+
+Run from the root of the repository with:
+
+    PYTHONPATH=. QT_QPA_PLATFORM=offscreen scripts/benchmark-source-widgets.py
+"""
+
+import argparse
+import os
+import time
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication
+
+parser = argparse.ArgumentParser("""Benchmark the construction of SourceWidgets.""")
+parser.add_argument(
+    "--count", type=int, default=5000, help="""number of widgets to create (defaults to 5000)"""
+)
+
+MIB = 1024 * 1024
+
+
+def resident_memory() -> int:
+    """
+    Return the resident memory of this process in bytes.
+    """
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def main() -> None:
+    args = parser.parse_args()
+    app = QApplication([])  # noqa: F841
+
+    # Import after the application exists, like the client does
+    from securedrop_client import db
+    from securedrop_client.gui.widgets import SourceList, SourceWidget
+    from securedrop_client.logic import Controller
+    from tests import factory
+
+    with TemporaryDirectory() as homedir:
+        os.mkdir(os.path.join(homedir, "data"), 0o700)
+        os.mkdir(os.path.join(homedir, "gpg"), 0o700)
+        session_maker = db.make_session_maker(homedir)
+        session = session_maker()
+        db.Base.metadata.create_all(bind=session.get_bind())
+
+        print(f"Creating {args.count} sources...")
+        sources = [factory.Source() for _ in range(args.count + 1)]
+        session.add_all(sources)
+        session.add_all(factory.Message(source=source) for source in sources)
+        session.commit()
+
+        controller = Controller("http://localhost", mock.MagicMock(), session_maker, homedir, None)
+        source_list = SourceList()
+
+        def create_widget(source: db.Source) -> SourceWidget:
+            return SourceWidget(
+                controller, source, source_list.source_selected, source_list.adjust_preview
+            )
+
+        # Load the resources shared by all widgets before measuring
+        create_widget(sources.pop())
+
+        memory = resident_memory()
+        start = time.perf_counter()
+        widgets = [create_widget(source) for source in sources]
+        elapsed = time.perf_counter() - start
+        memory = resident_memory() - memory
+
+        print(f"Created {len(widgets)} SourceWidgets:")
+        print(f"  {elapsed:8.2f}s {elapsed / len(widgets) * 1000:8.3f}ms per widget")
+        print(f"  {memory / MIB:8.1f} MiB {memory / len(widgets) / 1024:8.1f} KiB per widget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark polishing and painting SourceWidgets with the client style sheet.
+
+Creates SourceWidgets for sources in a temporary database, in a container that
+has the style sheet of the main window, then times showing and painting them,
+updating their styles when nothing changed (as happens after every sync), and
+switching them between unread and read.
+
+Run from the root of the repository with:
+
+    PYTHONPATH=. QT_QPA_PLATFORM=offscreen scripts/benchmark-styles.py
+"""
+
+import argparse
+import os
+import time
+from tempfile import TemporaryDirectory
+from typing import Callable
+from unittest import mock
+
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+parser = argparse.ArgumentParser("""Benchmark polishing and painting SourceWidgets.""")
+parser.add_argument(
+    "--count", type=int, default=1000, help="""number of widgets to create (defaults to 1000)"""
+)
+
+
+def timed(description: str, count: int, f: Callable[[], object]) -> None:
+    app = QApplication.instance()
+    start = time.perf_counter()
+    f()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    print(f"{description}:")
+    print(f"  {elapsed:8.2f}s {elapsed / count * 1000:8.3f}ms per widget")
+
+
+def main() -> None:
+    args = parser.parse_args()
+    app = QApplication([])  # noqa: F841
+
+    # Import after the application exists, like the client does
+    from securedrop_client import db
+    from securedrop_client.gui.widgets import SourceList, SourceWidget
+    from securedrop_client.logic import Controller
+    from securedrop_client.resources import load_css
+    from tests import factory
+
+    with TemporaryDirectory() as homedir:
+        os.mkdir(os.path.join(homedir, "data"), 0o700)
+        os.mkdir(os.path.join(homedir, "gpg"), 0o700)
+        session_maker = db.make_session_maker(homedir)
+        session = session_maker()
+        db.Base.metadata.create_all(bind=session.get_bind())
+
+        print(f"Creating {args.count} sources...")
+        sources = [factory.Source() for _ in range(args.count)]
+        session.add_all(sources)
+        session.add_all(factory.Message(source=source) for source in sources)
+        session.commit()
+
+        controller = Controller("http://localhost", mock.MagicMock(), session_maker, homedir, None)
+        source_list = SourceList()
+
+        container = QWidget()
+        container.setStyleSheet(load_css("sdclient.css"))
+        layout = QVBoxLayout(container)
+        widgets = []
+        for source in sources:
+            widget = SourceWidget(
+                controller, source, source_list.source_selected, source_list.adjust_preview
+            )
+            layout.addWidget(widget)
+            widgets.append(widget)
+
+        timed("Show and paint", len(widgets), lambda: (container.show(), container.grab()))
+
+        def update_styles() -> None:
+            for widget in widgets:
+                widget.update_styles()
+
+        timed("Update styles without changes", len(widgets), update_styles)
+
+        def mark_seen() -> None:
+            for widget in widgets:
+                widget.seen = not widget.seen
+                widget.update_styles()
+
+        timed("Switch between unread and read", len(widgets), mark_seen)
+        timed("Paint", len(widgets), container.grab)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import os
 from tempfile import NamedTemporaryFile
 from typing import Any, Optional, Tuple, Type, Union
 
+from PyQt5.QtCore import pyqtSignal
 from sdclientapi import API, BaseError
 from sdclientapi import Reply as SdkReply
 from sdclientapi import Submission as SdkSubmission
@@ -52,10 +53,14 @@ class DownloadJob(SingleObjectApiJob):
 
     CHUNK_SIZE = 4096
 
-    def __init__(self, data_dir: str, uuid: str) -> None:
+    def __init__(self, data_dir: str, uuid: str, source_uuid: Optional[str] = None) -> None:
         super().__init__(uuid)
         self.data_dir = data_dir
 
+        # The source of the item to download, if known, so that the queue can process the
+        # downloads of the sources the journalist is looking at first
+        self.source_uuid = source_uuid
+
     def _get_realistic_timeout(self, size_in_bytes: int) -> int:
         """
         Return a realistic timeout in seconds based on the size of the download.
@@ -242,8 +247,10 @@ class ReplyDownloadJob(DownloadJob):
     Download and decrypt a reply from a source.
     """
 
-    def __init__(self, uuid: str, data_dir: str, gpg: GpgHelper) -> None:
-        super().__init__(data_dir, uuid)
+    def __init__(
+        self, uuid: str, data_dir: str, gpg: GpgHelper, source_uuid: Optional[str] = None
+    ) -> None:
+        super().__init__(data_dir, uuid, source_uuid)
         self.gpg = gpg
 
     def get_db_object(self, session: Session) -> Reply:
@@ -297,8 +304,10 @@ class MessageDownloadJob(DownloadJob):
     Download and decrypt a message from a source.
     """
 
-    def __init__(self, uuid: str, data_dir: str, gpg: GpgHelper) -> None:
-        super().__init__(data_dir, uuid)
+    def __init__(
+        self, uuid: str, data_dir: str, gpg: GpgHelper, source_uuid: Optional[str] = None
+    ) -> None:
+        super().__init__(data_dir, uuid, source_uuid)
         self.uuid = uuid
         self.gpg = gpg
 
@@ -354,6 +363,13 @@ class FileDownloadJob(DownloadJob):
     Download and decrypt a file from a source.
     """
 
+    """
+    Signals that are emitted with the UUID of the file (and its size, when starting) around every
+    attempt to download it from the server, however the attempt ends.
+    """
+    download_started = pyqtSignal(str, int)
+    download_finished = pyqtSignal(str)
+
     def __init__(self, uuid: str, data_dir: str, gpg: GpgHelper) -> None:
         super().__init__(data_dir, uuid)
         self.gpg = gpg
@@ -371,9 +387,13 @@ class FileDownloadJob(DownloadJob):
         sdk_object = SdkSubmission(uuid=db_object.uuid)
         sdk_object.source_uuid = db_object.source.uuid
         sdk_object.filename = db_object.filename
-        return api.download_submission(
-            sdk_object, timeout=self._get_realistic_timeout(db_object.size)
-        )
+        self.download_started.emit(db_object.uuid, db_object.size)
+        try:
+            return api.download_submission(
+                sdk_object, timeout=self._get_realistic_timeout(db_object.size)
+            )
+        finally:
+            self.download_finished.emit(db_object.uuid)
 
     def call_decrypt(self, filepath: str, session: Optional[Session] = None) -> str:
         """
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, List, Optional
 
 from sdclientapi import API
 from sqlalchemy.orm.session import Session
@@ -13,6 +13,18 @@ class SeenJob(ApiJob):
         self.messages = messages
         self.replies = replies
 
+        # When the job should run, as set by the queue, so that the items of the conversations
+        # selected in the meantime can be added to it (see RunnableQueue.SEEN_JOB_DELAY)
+        self.due_at: Optional[float] = None
+
+    def merge(self, other: "SeenJob") -> None:
+        """
+        Add the items of another job, so that this job marks the items of both as seen.
+        """
+        self.files = list(dict.fromkeys(self.files + other.files))
+        self.messages = list(dict.fromkeys(self.messages + other.messages))
+        self.replies = list(dict.fromkeys(self.replies + other.replies))
+
     def call_api(self, api_client: API, session: Session) -> None:
         """
         Override ApiJob.
@@ -24,3 +36,17 @@ class SeenJob(ApiJob):
             return
 
         api_client.seen(self.files, self.messages, self.replies)
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        Jobs that mark the same items as seen are equal, so that the queue skips a job if the same
+        one is already pending (as when a conversation is selected again before the first job
+        ran).
+        """
+        if type(self) is not type(other):
+            return False
+        return (set(self.files), set(self.messages), set(self.replies)) == (
+            set(other.files),
+            set(other.messages),
+            set(other.replies),
+        )
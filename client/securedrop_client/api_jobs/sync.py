@@ -34,6 +34,8 @@ class MetadataSyncJob(ApiJob):
         Download new metadata, update the local database, import new keys, and
         then the success signal will let the controller know to add any new download
         jobs.
+
+        Return the UUIDs of the sources that changed, see `storage.update_local_storage`.
         """
 
         # TODO: Once https://github.com/freedomofpress/securedrop-client/issues/648, we will want to
@@ -54,9 +56,12 @@ class MetadataSyncJob(ApiJob):
         users = api_client.get_users()
         MetadataSyncJob._update_users(session, users)
         sources, submissions, replies = get_remote_data(api_client)
-        update_local_storage(session, sources, submissions, replies, self.data_dir)
+        changed_source_uuids = update_local_storage(
+            session, sources, submissions, replies, self.data_dir
+        )
         if self._state is not None:
             _update_state(self._state, submissions)
+        return changed_source_uuids
 
     def _update_users(session: Session, remote_users: List[SDKUser]) -> None:
         """
@@ -139,8 +144,8 @@ class MetadataSyncJob(ApiJob):
 
 
 def _update_state(app_state: state.State, submissions: List) -> None:
-    for submission in submissions:
-        if submission.is_file():
-            app_state.add_file(
-                state.ConversationId(submission.source_uuid), state.FileId(submission.uuid)
-            )
+    app_state.add_files(
+        (state.ConversationId(submission.source_uuid), state.FileId(submission.uuid))
+        for submission in submissions
+        if submission.is_file()
+    )
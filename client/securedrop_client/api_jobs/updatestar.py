@@ -1,4 +1,5 @@
 import logging
+from typing import Any
 
 import sdclientapi
 from sdclientapi import API, RequestTimeoutError, ServerConnectionError
@@ -14,6 +15,13 @@ class UpdateStarJob(SingleObjectApiJob):
         super().__init__(uuid)
         self.is_starred = is_starred
 
+    def __eq__(self, other: Any) -> bool:
+        """
+        Jobs are equal if they update the star of the same source from the same state, so that a
+        job that undoes the star update in progress is not skipped as a duplicate.
+        """
+        return super().__eq__(other) and self.is_starred == other.is_starred
+
     def call_api(self, api_client: API, session: Session) -> str:
         """
         Override ApiJob.
@@ -271,7 +271,11 @@ def start_app(args, qt_args) -> NoReturn:  # type: ignore[no-untyped-def]
         timer.start(500)
         timer.timeout.connect(lambda: None)
 
-        sys.exit(app.exec_())
+        exit_code = app.exec_()
+
+        # Don't leave the export agent running in the Export VM once the client is gone
+        export_service.end_session()
+        sys.exit(exit_code)
 
 
 def run() -> NoReturn:
@@ -1 +1 @@
-from .transcript import Transcript  # noqa: F401
+from .transcript import Transcript, clear_saved_transcripts  # noqa: F401
@@ -1,5 +1,8 @@
 import gettext
-from typing import Optional
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from jinja2 import Environment, PackageLoader, select_autoescape
 
@@ -23,15 +26,86 @@ def transcribe(record: database.Base) -> Optional[Item]:
     return transcribe_item(record)
 
 
+# The version of each conversation that was last saved to each transcript file,
+# see Transcript.save()
+_saved_transcripts: Dict[Path, Tuple[Hashable, Tuple[int, int]]] = {}
+_saved_transcripts_lock = threading.Lock()
+
+
+def clear_saved_transcripts() -> None:
+    """
+    Forget which transcripts were saved, so that every transcript is written again the next time
+    it is saved. Call this when the session ends.
+    """
+    with _saved_transcripts_lock:
+        _saved_transcripts.clear()
+
+
 class Transcript:
     def __init__(self, conversation: database.Source) -> None:
-        self._items = list(
+        self._conversation = conversation
+        self._template = env.get_template("transcript.txt.jinja")
+
+    @cached_property
+    def _items(self) -> List[Item]:
+        return list(
             filter(
                 lambda record: record is not None and record.type is not None,
-                [transcribe(record) for record in conversation.collection],
+                [transcribe(record) for record in self._conversation.collection],
             )
         )
-        self._template = env.get_template("transcript.txt.jinja")
 
     def __str__(self) -> str:
         return self._template.render(items=self._items)
+
+    def load(self) -> None:
+        """
+        Read everything the transcript needs from the conversation, which must be done on the
+        thread that owns the database session. The transcript can then be saved from any thread.
+        """
+        self._items
+        self._version
+
+    def save(self, path: Path) -> None:
+        """
+        Write the transcript to the file at path, a piece at a time, so that the transcript of a
+        long conversation is never held in memory as a whole.
+
+        Nothing is written if the file is unchanged since the transcript was last saved to it and
+        no item in the conversation was added, removed or updated since then.
+        """
+        version = self._version
+        with _saved_transcripts_lock:
+            saved = _saved_transcripts.get(path)
+        if saved is not None and saved == (version, _file_signature(path)):
+            return
+
+        with open(path, "w", encoding="utf-8") as f:
+            for chunk in self._template.generate(items=self._items):
+                f.write(chunk)
+
+        with _saved_transcripts_lock:
+            _saved_transcripts[path] = (version, _file_signature(path))
+
+    @cached_property
+    def _version(self) -> Hashable:
+        """
+        Return a value that changes whenever an item of the conversation that is part of the
+        transcript is added, removed or updated, or the journalist who sent a reply is renamed.
+        """
+        records = [
+            *self._conversation.messages,
+            *self._conversation.files,
+            *self._conversation.replies,
+        ]
+        last_updated = max((r.last_updated for r in records if r.last_updated), default=None)
+        senders = tuple(reply.journalist.username for reply in self._conversation.replies)
+        return (self._conversation.journalist_designation, len(records), last_updated, senders)
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return (-1, -1)
+    return (stat.st_mtime_ns, stat.st_size)
@@ -1,11 +1,10 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # Copyright © 2022‒2023 The Freedom of the Press Foundation.
-from typing import List
+from typing import List, Tuple
 
 from sqlalchemy.orm.session import Session
 
-from securedrop_client.db import File
-from securedrop_client.storage import get_local_files
+from securedrop_client.storage import get_local_file_states
 
 
 class Database:
@@ -15,5 +14,8 @@ class Database:
         super().__init__()
         self.session = session
 
-    def get_files(self) -> List[File]:
-        return get_local_files(self.session)
+    def get_file_states(self) -> List[Tuple[str, str, bool]]:
+        """
+        Return the UUID of every file, the UUID of its source and whether it was downloaded.
+        """
+        return get_local_file_states(self.session)
@@ -44,6 +44,18 @@ def make_session_maker(home: str) -> scoped_session:
     return scoped_session(maker)
 
 
+def collection_sort_key(item: Any) -> tuple:
+    """
+    Return the key that orders conversation items as in `Source.collection`: pending replies
+    last, then by file_counter, then by timestamp (the latter used only for draft replies).
+    """
+    return (
+        getattr(item, "is_pending", False),
+        item.file_counter,
+        getattr(item, "timestamp", datetime.datetime(datetime.MINYEAR, 1, 1)),
+    )
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -118,15 +130,7 @@ class Source(Base):
         collection.extend(self.files)
         collection.extend(self.replies)
         collection.extend(self.draftreplies)
-        # Push pending replies to the end of the collection, then sort by
-        # file_counter, then by timestamp (the latter used only for draft replies).
-        collection.sort(
-            key=lambda x: (
-                getattr(x, "is_pending", False),
-                x.file_counter,
-                getattr(x, "timestamp", datetime.datetime(datetime.MINYEAR, 1, 1)),
-            )
-        )
+        collection.sort(key=collection_sort_key)
         return collection
 
     @property
@@ -1,6 +1,8 @@
+import gzip
 import json
 import logging
 import os
+import select
 import subprocess
 import tarfile
 import threading
@@ -8,7 +10,7 @@ from enum import Enum
 from io import BytesIO
 from shlex import quote
 from tempfile import TemporaryDirectory
-from typing import List, Optional
+from typing import BinaryIO, Callable, List, Optional
 
 from PyQt5.QtCore import QObject, pyqtBoundSignal, pyqtSignal, pyqtSlot
 
@@ -38,6 +40,44 @@ class ExportStatus(Enum):
     MISSING_PRINTER_URI = "ERROR_MISSING_PRINTER_URI"
 
 
+class _ExportAgentSessionError(Exception):
+    pass
+
+
+class _ExportAgentRequest:
+    """
+    A stream that sends what is written into it to the export agent as one request.
+
+    Requests are sent in chunks, each of which is preceded by its size in bytes, and ended by a
+    chunk of size 0, so they can be streamed without knowing their size in advance.
+    """
+
+    def __init__(self, stdin: BinaryIO) -> None:
+        self._stdin = stdin
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._send(f"{len(data)}\n".encode("ascii"), data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._send(b"0\n")
+        try:
+            self._stdin.flush()
+        except OSError as e:
+            raise _ExportAgentSessionError() from e
+
+    def _send(self, *data: bytes) -> None:
+        try:
+            for d in data:
+                self._stdin.write(d)
+        except OSError as e:
+            raise _ExportAgentSessionError() from e
+
+
 class Export(QObject):
     """
     This class sends files over to the Export VM so that they can be copied to a luks-encrypted USB
@@ -45,8 +85,26 @@ class Export(QObject):
 
     Files are archived in a specified format, which you can learn more about in the README for the
     securedrop-export repository.
+
+    Archives are sent over a single long-running session with the export agent in the Export VM
+    when it is available, so that the Export VM keeps the state of attached devices between the
+    preflight checks and the export itself. If the agent is not available, each archive is opened
+    in the Export VM on its own instead. An archive that was sent to the agent is never opened in
+    the Export VM as well, since it may have been exported or printed already.
     """
 
+    AGENT_SERVICE = "securedrop.Export"
+
+    # Written by the agent when its session starts, before any request is sent
+    AGENT_READY = b"READY\n"
+
+    # Starting the Export VM can take a while
+    AGENT_START_TIMEOUT = 60  # seconds
+
+    # Exporting or printing many large files can take a while, but an agent that has not
+    # responded by then is assumed to be stuck
+    AGENT_RESPONSE_TIMEOUT = 10 * 60  # seconds
+
     METADATA_FN = "metadata.json"
 
     USB_TEST_FN = "usb-test.sd-export"
@@ -66,6 +124,11 @@ class Export(QObject):
     DISK_ENCRYPTION_KEY_NAME = "encryption_key"
     DISK_EXPORT_DIR = "export_data"
 
+    # Exported files are mostly documents, images and archives that are compressed already, so
+    # archives are only compressed, and then only lightly, when most of their contents are text.
+    COMPRESSIBLE_EXTENSIONS = {".csv", ".html", ".json", ".log", ".md", ".rtf", ".txt", ".xml"}
+    COMPRESSION_LEVEL = 1
+
     # Set up signals for communication with the controller
     preflight_check_call_failure = pyqtSignal(object)
     preflight_check_call_success = pyqtSignal()
@@ -87,6 +150,10 @@ class Export(QObject):
     ) -> None:
         super().__init__()
 
+        self._agent: Optional[subprocess.Popen] = None
+        self._agent_available = True
+        self._agent_lock = threading.Lock()
+
         self.connect_signals(
             export_preflight_check_requested,
             export_requested,
@@ -112,42 +179,38 @@ class Export(QObject):
         if print_preflight_check_requested is not None:
             print_preflight_check_requested.connect(self.run_printer_preflight)
 
-    def _export_archive(cls, archive_path: str) -> Optional[ExportStatus]:
+    def _export(
+        self, archive_dir: str, archive_fn: str, metadata: dict, filepaths: List[str] = []
+    ) -> Optional[ExportStatus]:
         """
-        Make the subprocess call to send the archive to the Export VM, where the archive will be
-        processed.
+        Send an archive of the supplied metadata and files to the Export VM, where the archive will
+        be processed.
+
+        The archive is streamed straight to the export agent, so it is never written to disk here.
+        Only if the agent is not available is the archive created in archive_dir first.
 
         Args:
-            archive_path (str): The path to the archive to be processed.
+            archive_dir (str): The path to the directory in which to create the archive if needed.
+            archive_fn (str): The name of the archive file.
+            metadata (dict): The dictionary containing metadata to add to the archive.
+            filepaths (List[str]): The list of files to add to the archive.
 
         Returns:
             str: The export status returned from the Export VM processing script.
 
         Raises:
             ExportError: Raised if (1) CalledProcessError is encountered, which can occur when
-                trying to start the Export VM when the USB device is not attached, or (2) when
-                the return code from `check_output` is not 0.
+                trying to start the Export VM when the USB device is not attached, (2) when
+                the return code from `check_output` is not 0, or (3) when the export agent does
+                not respond in time.
         """
         try:
-            # There are already talks of switching to a QVM-RPC implementation for unlocking devices
-            # and exporting files, so it's important to remember to shell-escape what we pass to the
-            # shell, even if for the time being we're already protected against shell injection via
-            # Python's implementation of subprocess, see
-            # https://docs.python.org/3/library/subprocess.html#security-considerations
-            output = subprocess.check_output(
-                [
-                    quote("qrexec-client-vm"),
-                    quote("--"),
-                    quote("sd-devices"),
-                    quote("qubes.OpenInVM"),
-                    quote("/usr/lib/qubes/qopen-in-vm"),
-                    quote("--view-only"),
-                    quote("--"),
-                    quote(archive_path),
-                ],
-                stderr=subprocess.STDOUT,
+            result = self._send_to_export_agent(
+                lambda stream: self._write_archive(stream, metadata, filepaths)
             )
-            result = output.decode("utf-8").strip()
+            if result is None:
+                archive_path = self._create_archive(archive_dir, archive_fn, metadata, filepaths)
+                result = self._open_in_export_vm(archive_path)
 
             # No status is returned for successful `disk`, `printer-test`, and `print` calls.
             # This will change in a future release of sd-export.
@@ -163,6 +226,140 @@ class Export(QObject):
             logger.debug(f"Subprocess failed: {e}")
             raise ExportError(ExportStatus.CALLED_PROCESS_ERROR)
 
+    def _send_to_export_agent(self, write_archive: Callable[[BinaryIO], None]) -> Optional[str]:
+        """
+        Send an archive over the session with the export agent, starting the session first if
+        there is none yet.
+
+        Args:
+            write_archive (Callable): Writes the archive into the stream it is passed.
+
+        Returns:
+            Optional[str]: The status returned by the agent, or None if the agent is not available
+                in the Export VM, in which case nothing was sent and it will not be tried again.
+
+        Raises:
+            CalledProcessError: Raised if the session ends before the agent responds. The session
+                is discarded, so the next archive is sent over a new one.
+            ExportError: Raised if the agent does not respond within AGENT_RESPONSE_TIMEOUT, in
+                which case it is stopped, and the next archive is sent over a new session.
+        """
+        with self._agent_lock:
+            if not self._agent_available:
+                return None
+
+            if self._agent is None and not self._start_export_agent():
+                logger.info("Export agent is not available, opening archives in the Export VM")
+                self._agent_available = False
+                return None
+
+            agent = self._agent
+            assert agent is not None and agent.stdin is not None and agent.stdout is not None
+            try:
+                request = _ExportAgentRequest(agent.stdin)
+                write_archive(request)
+                request.close()
+                readable, _, _ = select.select([agent.stdout], [], [], self.AGENT_RESPONSE_TIMEOUT)
+                if not readable:
+                    logger.error("Export agent did not respond in time, stopping it")
+                    agent.kill()
+                    self._close_export_agent()
+                    raise ExportError(ExportStatus.CALLED_PROCESS_ERROR)
+                response = agent.stdout.readline()
+            except _ExportAgentSessionError as e:
+                logger.debug(f"Export agent session failed: {e.__cause__}")
+                response = b""
+            except Exception:
+                # The agent can't tell where the next request would start
+                self._close_export_agent()
+                raise
+
+            if response.endswith(b"\n"):
+                return response.decode("utf-8").strip()
+
+            returncode = self._close_export_agent()
+            raise subprocess.CalledProcessError(returncode, self.AGENT_SERVICE)
+
+    def _start_export_agent(self) -> bool:
+        """
+        Start a session with the export agent, and return whether the agent is ready for requests.
+        """
+        try:
+            self._agent = subprocess.Popen(
+                [
+                    quote("qrexec-client-vm"),
+                    quote("--"),
+                    quote("sd-devices"),
+                    quote(self.AGENT_SERVICE),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.debug(f"Export agent session could not be started: {e}")
+            return False
+
+        assert self._agent.stdout is not None
+        readable, _, _ = select.select([self._agent.stdout], [], [], self.AGENT_START_TIMEOUT)
+        if readable and self._agent.stdout.readline() == self.AGENT_READY:
+            return True
+
+        if not readable:
+            self._agent.kill()
+        self._close_export_agent()
+        return False
+
+    def end_session(self) -> None:
+        """
+        End the session with the export agent, if any, so that it does not outlive the client
+        session. The next archive is sent over a new one.
+        """
+        self._close_export_agent()
+
+    def _close_export_agent(self) -> int:
+        """
+        End the session with the export agent, if any, and return its exit code.
+        """
+        agent, self._agent = self._agent, None
+        if agent is None:
+            return 0
+
+        try:
+            if agent.stdin:
+                agent.stdin.close()
+            return agent.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            agent.kill()
+            return agent.wait()
+
+    def _open_in_export_vm(cls, archive_path: str) -> str:
+        """
+        Make the subprocess call to open the archive in the Export VM, and return its output.
+
+        Raises:
+            CalledProcessError: Raised if the subprocess exits with a non-zero return code.
+        """
+        # There are already talks of switching to a QVM-RPC implementation for unlocking devices
+        # and exporting files, so it's important to remember to shell-escape what we pass to the
+        # shell, even if for the time being we're already protected against shell injection via
+        # Python's implementation of subprocess, see
+        # https://docs.python.org/3/library/subprocess.html#security-considerations
+        output = subprocess.check_output(
+            [
+                quote("qrexec-client-vm"),
+                quote("--"),
+                quote("sd-devices"),
+                quote("qubes.OpenInVM"),
+                quote("/usr/lib/qubes/qopen-in-vm"),
+                quote("--view-only"),
+                quote("--"),
+                quote(archive_path),
+            ],
+            stderr=subprocess.STDOUT,
+        )
+        return output.decode("utf-8").strip()
+
     def _create_archive(
         cls, archive_dir: str, archive_fn: str, metadata: dict, filepaths: List[str] = []
     ) -> str:
@@ -180,7 +377,31 @@ class Export(QObject):
         """
         archive_path = os.path.join(archive_dir, archive_fn)
 
-        with tarfile.open(archive_path, "w:gz") as archive:
+        with open(archive_path, "wb") as f:
+            cls._write_archive(f, metadata, filepaths)
+
+        return archive_path
+
+    def _write_archive(cls, stream: BinaryIO, metadata: dict, filepaths: List[str] = []) -> None:
+        """
+        Write the archive to be sent to the Export VM into a stream, which only needs to support
+        writing.
+
+        Args:
+            stream (BinaryIO): The stream to write the archive into.
+            metadata (dict): The dictionary containing metadata to add to the archive.
+            filepaths (List[str]): The list of files to add to the archive.
+        """
+        if cls._should_compress(filepaths):
+            with gzip.GzipFile(
+                filename="", mode="wb", compresslevel=cls.COMPRESSION_LEVEL, fileobj=stream
+            ) as compressed_stream:
+                cls._write_tar(compressed_stream, metadata, filepaths)  # type: ignore[arg-type]
+        else:
+            cls._write_tar(stream, metadata, filepaths)
+
+    def _write_tar(cls, stream: BinaryIO, metadata: dict, filepaths: List[str]) -> None:
+        with tarfile.open(fileobj=stream, mode="w|") as archive:
             cls._add_virtual_file_to_archive(archive, cls.METADATA_FN, metadata)
 
             # When more than one file is added to the archive,
@@ -191,7 +412,25 @@ class Export(QObject):
                     archive, filepath, prevent_name_collisions=is_one_of_multiple_files
                 )
 
-        return archive_path
+    def _should_compress(cls, filepaths: List[str]) -> bool:
+        """
+        Whether an archive of the supplied files is worth compressing, which is the case when most
+        of its bytes are in files that are text, such as transcripts.
+
+        The Export VM reads both compressed and uncompressed archives.
+
+        Args:
+            filepaths (List[str]): The list of files that will be added to the archive.
+        """
+        total_size = 0
+        compressible_size = 0
+        for filepath in filepaths:
+            size = os.path.getsize(filepath)
+            total_size += size
+            if os.path.splitext(filepath)[1].lower() in cls.COMPRESSIBLE_EXTENSIONS:
+                compressible_size += size
+
+        return compressible_size * 2 > total_size
 
     def _add_virtual_file_to_archive(
         cls, archive: tarfile.TarFile, filename: str, filedata: dict
@@ -238,11 +477,9 @@ class Export(QObject):
         """
         Make sure printer is ready.
         """
-        archive_path = self._create_archive(
+        status = self._export(
             archive_dir, self.PRINTER_PREFLIGHT_FN, self.PRINTER_PREFLIGHT_METADATA
         )
-
-        status = self._export_archive(archive_path)
         if status:
             raise ExportError(status)
 
@@ -256,8 +493,7 @@ class Export(QObject):
         Raises:
             ExportError: Raised if the usb-test does not return a USB_CONNECTED status.
         """
-        archive_path = self._create_archive(archive_dir, self.USB_TEST_FN, self.USB_TEST_METADATA)
-        status = self._export_archive(archive_path)
+        status = self._export(archive_dir, self.USB_TEST_FN, self.USB_TEST_METADATA)
         if status and status != ExportStatus.USB_CONNECTED:
             raise ExportError(status)
 
@@ -271,9 +507,7 @@ class Export(QObject):
         Raises:
             ExportError: Raised if the usb-test does not return a DISK_ENCRYPTED status.
         """
-        archive_path = self._create_archive(archive_dir, self.DISK_TEST_FN, self.DISK_TEST_METADATA)
-
-        status = self._export_archive(archive_path)
+        status = self._export(archive_dir, self.DISK_TEST_FN, self.DISK_TEST_METADATA)
         if status and status != ExportStatus.DISK_ENCRYPTED:
             raise ExportError(status)
 
@@ -289,9 +523,7 @@ class Export(QObject):
         """
         metadata = self.DISK_METADATA.copy()
         metadata[self.DISK_ENCRYPTION_KEY_NAME] = passphrase
-        archive_path = self._create_archive(archive_dir, self.DISK_FN, metadata, filepaths)
-
-        status = self._export_archive(archive_path)
+        status = self._export(archive_dir, self.DISK_FN, metadata, filepaths)
         if status:
             raise ExportError(status)
 
@@ -304,8 +536,7 @@ class Export(QObject):
 
         """
         metadata = self.PRINT_METADATA.copy()
-        archive_path = self._create_archive(archive_dir, self.PRINT_FN, metadata, filepaths)
-        status = self._export_archive(archive_path)
+        status = self._export(archive_dir, self.PRINT_FN, metadata, filepaths)
         if status:
             raise ExportError(status)
 
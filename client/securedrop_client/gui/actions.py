@@ -4,7 +4,6 @@ The actions available to the journalist.
 Over time, this module could become the interface between
 the GUI and the controller.
 """
-from contextlib import ExitStack
 from gettext import gettext as _
 from pathlib import Path
 from typing import Callable, Optional
@@ -18,6 +17,7 @@ from securedrop_client.db import Source
 from securedrop_client.gui.base import ModalDialog
 from securedrop_client.gui.conversation import ExportDevice as ConversationExportDevice
 from securedrop_client.gui.conversation import ExportDialog as ExportConversationDialog
+from securedrop_client.gui.conversation import ExportPreparation as ConversationExportPreparation
 from securedrop_client.gui.conversation import (
     ExportTranscriptDialog as ExportConversationTranscriptDialog,
 )
@@ -178,17 +178,13 @@ class PrintConversationAction(QAction):  # pragma: nocover
 
         transcript = ConversationTranscript(self._source)
         safe_mkdir(file_path.parent)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(str(transcript))
-            # Let this context lapse to ensure the file contents
-            # are written to disk.
+        transcript.save(file_path)
 
         # Open the file to prevent it from being removed while
         # the archive is being created. Once the file object goes
         # out of scope, any pending file removal will be performed
         # by the operating system.
-        with open(file_path, "r") as f:
+        with open(file_path, "r"):
             dialog = PrintConversationTranscriptDialog(
                 self._export_device, TRANSCRIPT_FILENAME, str(file_path)
             )
@@ -230,17 +226,13 @@ class ExportConversationTranscriptAction(QAction):  # pragma: nocover
 
         transcript = ConversationTranscript(self._source)
         safe_mkdir(file_path.parent)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(str(transcript))
-            # Let this context lapse to ensure the file contents
-            # are written to disk.
+        transcript.save(file_path)
 
         # Open the file to prevent it from being removed while
         # the archive is being created. Once the file object goes
         # out of scope, any pending file removal will be performed
         # by the operating system.
-        with open(file_path, "r") as f:
+        with open(file_path, "r"):
             dialog = ExportConversationTranscriptDialog(
                 self._export_device, TRANSCRIPT_FILENAME, str(file_path)
             )
@@ -300,9 +292,11 @@ class ExportConversationAction(QAction):  # pragma: nocover
 
     def _prepare_to_export(self) -> None:
         """
-        (Re-)generates the conversation transcript and opens a confirmation dialog to export it
-        alongside all the (attached) files that are downloaded, in the manner
-        of the existing ExportFileDialog.
+        Opens a confirmation dialog to export the conversation transcript alongside all the
+        (attached) files that are downloaded, in the manner of the existing ExportFileDialog.
+
+        The transcript is (re-)generated and the files are checked in the background while
+        the dialog is open, so that conversations with many files don't freeze the GUI.
         """
         transcript_location = (
             Path(self.controller.data_dir)
@@ -311,42 +305,32 @@ class ExportConversationAction(QAction):  # pragma: nocover
         )
 
         transcript = ConversationTranscript(self._source)
-        safe_mkdir(transcript_location.parent)
-
-        with open(transcript_location, "w", encoding="utf-8") as f:
-            f.write(str(transcript))
-            # Let this context lapse to ensure the file contents
-            # are written to disk.
+        transcript.load()
 
-        downloaded_file_locations = [
-            file.location(self.controller.data_dir)
-            for file in self._source.files
-            if self.controller.downloaded_file_exists(file, silence_errors=True)
-        ]
+        files = {file.location(self.controller.data_dir): file for file in self._source.files}
 
-        file_locations = downloaded_file_locations + [transcript_location]
-
-        # Open the files to prevent them from being removed while
-        # the archive is being created. Once the file objects go
-        # out of scope, any pending file removal will be performed
-        # by the operating system.
-        with ExitStack() as stack:
-            files = [
-                stack.enter_context(open(file_location, "r")) for file_location in file_locations
-            ]
-
-            file_count = len(files)
-            if file_count == 1:
-                summary = TRANSCRIPT_FILENAME
-            else:
-                summary = _("all files and transcript")
+        if any(file.is_downloaded for file in files.values()):
+            summary = _("all files and transcript")
+        else:
+            summary = TRANSCRIPT_FILENAME
 
-            dialog = ExportConversationDialog(
-                self._export_device,
-                summary,
-                [str(file_location) for file_location in file_locations],
-            )
+        preparation = ConversationExportPreparation(
+            transcript, transcript_location, list(files.keys())
+        )
+        dialog = ExportConversationDialog(self._export_device, summary, [], preparation)
+        preparation.start()
+        try:
             dialog.exec()
+        finally:
+            # Closes the files that were kept open for the export
+            preparation.release()
+
+        # Let the rest of the GUI know about files that were downloaded but have gone missing
+        for file_location in preparation.missing_file_locations:
+            file = files[file_location]
+            if file.is_downloaded:
+                self.controller.downloaded_file_exists(file, silence_errors=True)
+                break
 
     def _on_confirmation_dialog_accepted(self) -> None:
         self._prepare_to_export()
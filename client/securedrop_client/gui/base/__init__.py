@@ -25,4 +25,7 @@ from securedrop_client.gui.base.misc import (  # noqa: F401
     SvgLabel,
     SvgPushButton,
     SvgToggleButton,
+    repolish,
+    set_style_class,
+    set_style_name,
 )
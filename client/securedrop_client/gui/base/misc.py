@@ -204,3 +204,38 @@ class SecureQLabel(QLabel):
 
     def is_elided(self) -> bool:
         return self.elided
+
+
+def set_style_name(widget: QWidget, name: str) -> None:
+    """
+    Give the widget a new object name, and apply the style sheet rules that select it.
+
+    The rules of the application style sheet are matched against object names and properties when
+    a widget is polished, so only the widget and its children are polished again, and only if the
+    name changes.
+    """
+    if widget.objectName() != name:
+        widget.setObjectName(name)
+        repolish(widget)
+
+
+def set_style_class(widget: QWidget, name: str) -> None:
+    """
+    Set the "class" property of the widget, used in style sheet rules such as `.deleting`, and
+    apply the rules that select it.
+    """
+    if widget.property("class") != name:
+        widget.setProperty("class", name)
+        repolish(widget)
+
+
+def repolish(widget: QWidget) -> None:
+    """
+    Apply the style sheet rules that match the current object names and properties of the widget
+    and its children, without parsing the style sheet again.
+    """
+    for w in [widget, *widget.findChildren(QWidget)]:
+        style = w.style()
+        style.unpolish(w)
+        style.polish(w)
+    widget.update()
@@ -6,6 +6,7 @@ from .delete import DeleteConversationDialog  # noqa: F401
 from .export import Device as ExportDevice  # noqa: F401
 from .export import Dialog as ExportDialog  # noqa: F401
 from .export import FileDialog as ExportFileDialog  # noqa: F401
+from .export import Preparation as ExportPreparation  # noqa: F401
 from .export import PrintDialog as PrintFileDialog  # noqa: F401
 from .export import PrintTranscriptDialog  # noqa: F401
 from .export import TranscriptDialog as ExportTranscriptDialog  # noqa: F401
@@ -1,6 +1,7 @@
 from .device import Device  # noqa: F401
 from .dialog import Dialog  # noqa: F401
 from .file_dialog import FileDialog  # noqa: F401
+from .preparation import Preparation  # noqa: F401
 from .print_dialog import PrintDialog  # noqa: F401
 from .print_transcript_dialog import PrintTranscriptDialog  # noqa: F401
 from .transcript_dialog import TranscriptDialog  # noqa: F401
@@ -1,10 +1,11 @@
 from gettext import gettext as _
-from typing import List
+from typing import List, Optional
 
 from PyQt5.QtCore import pyqtSlot
 
 from .device import Device
 from .file_dialog import FileDialog
+from .preparation import Preparation
 
 
 class Dialog(FileDialog):
@@ -13,20 +14,75 @@ class Dialog(FileDialog):
     - Adjust the init arguments to export multiple files.
     - Adds a method to allow all those files to be exported.
     - Overrides the two slots that handles the export action to call said method.
+    - Optionally waits for the files to be prepared in the background, in which case they are
+      exported as soon as they are ready if the passphrase was submitted before.
     """
 
-    def __init__(self, device: Device, summary: str, file_locations: List[str]) -> None:
+    def __init__(
+        self,
+        device: Device,
+        summary: str,
+        file_locations: List[str],
+        preparation: Optional[Preparation] = None,
+    ) -> None:
         super().__init__(device, "", summary)
 
         self.file_locations = file_locations
+        self.preparing_message = _("Preparing files: {} of {}")
+        self.preparation_error_message = _("The files could not be prepared for export.")
+
+        self._preparation = preparation
+        self._is_preparing = preparation is not None
+        self._export_pending = False
+        if preparation is not None:
+            preparation.progress.connect(self._on_preparation_progress)
+            preparation.succeeded.connect(self._on_preparation_succeeded)
+            preparation.failed.connect(self._on_preparation_failed)
+            self.rejected.connect(self._cancel_preparation)
 
     @pyqtSlot(bool)
     def _export_files(self, checked: bool = False) -> None:
         self.start_animate_activestate()
-        self.cancel_button.setEnabled(False)
         self.passphrase_field.setDisabled(True)
+        if self._is_preparing:
+            # The files are exported once they are ready, the export can be cancelled until then
+            self._export_pending = True
+            return
+        self.cancel_button.setEnabled(False)
         self._device.export_files(self.file_locations, self.passphrase_field.text())
 
+    @pyqtSlot(int, int)
+    def _on_preparation_progress(self, done: int, total: int) -> None:
+        if self._export_pending:
+            self.error_details.setText(self.preparing_message.format(done, total))
+            self.error_details.show()
+
+    @pyqtSlot(list)
+    def _on_preparation_succeeded(self, file_locations: List[str]) -> None:
+        self.file_locations = file_locations
+        self._is_preparing = False
+        if self._export_pending:
+            self._export_pending = False
+            self.error_details.hide()
+            self._export_files()
+
+    @pyqtSlot(object)
+    def _on_preparation_failed(self, error: Exception) -> None:
+        self._is_preparing = False
+        self._export_pending = False
+        self.stop_animate_header()
+        self.stop_animate_activestate()
+        self.cancel_button.setEnabled(True)
+        self.continue_button.setEnabled(True)
+        self._show_generic_error_message()
+        self.body.setText(self.preparation_error_message)
+
+    @pyqtSlot()
+    def _cancel_preparation(self) -> None:
+        # Called directly: the preparation's own thread is busy until it notices
+        if self._preparation is not None:
+            self._preparation.cancel()
+
     @pyqtSlot()
     def _show_passphrase_request_message(self) -> None:
         self.continue_button.clicked.disconnect()
@@ -0,0 +1,112 @@
+import logging
+import os
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List, Optional
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from securedrop_client.conversation import Transcript
+from securedrop_client.utils import safe_mkdir
+
+logger = logging.getLogger(__name__)
+
+
+class Preparation(QObject):
+    """Prepares the files of a conversation for export on a worker thread.
+
+    Saves the transcript, checks which of the (attached) files exist and keeps every one of them
+    open until the preparation is released, so that they are not removed while the archive is
+    being created. The operating system is asked to read the files ahead, so that they can be
+    sent quickly once the journalist has entered the passphrase.
+
+    Everything that needs the database must be read before the preparation is started,
+    which is why it receives a loaded transcript and plain file locations.
+    """
+
+    # Emitted with the number of files that were prepared so far, and the total
+    progress = pyqtSignal(int, int)
+
+    # Emitted with the locations of the files to export, transcript included
+    succeeded = pyqtSignal(list)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+    def __init__(
+        self, transcript: Transcript, transcript_location: Path, file_locations: List[str]
+    ) -> None:
+        super().__init__()
+
+        self._transcript = transcript
+        self._transcript_location = transcript_location
+        self._file_locations = file_locations
+
+        # Locations of the files that were expected but not found
+        self.missing_file_locations: List[str] = []
+
+        self._cancel_requested = threading.Event()
+        self._open_files = ExitStack()
+        self._thread: Optional[QThread] = None
+
+    def start(self) -> None:
+        """
+        Start preparing the files on a new worker thread.
+        """
+        self._thread = QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self.run)
+        self._thread.start()
+
+    @pyqtSlot()
+    def cancel(self) -> None:
+        """
+        Stop preparing the files as soon as possible. Can be called from any thread.
+        """
+        self._cancel_requested.set()
+
+    def release(self) -> None:
+        """
+        Cancel the preparation if needed, wait for the worker thread and close all the files.
+        """
+        self.cancel()
+        if self._thread is not None:
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+        self._open_files.close()
+
+    @pyqtSlot()
+    def run(self) -> None:
+        total = len(self._file_locations) + 1
+        try:
+            safe_mkdir(self._transcript_location.parent)
+            self._transcript.save(self._transcript_location)
+            self._open(str(self._transcript_location))
+            self.progress.emit(1, total)
+
+            file_locations = []
+            for done, file_location in enumerate(self._file_locations, start=2):
+                if self._cancel_requested.is_set():
+                    logger.debug("Export preparation cancelled")
+                    self.cancelled.emit()
+                    return
+
+                try:
+                    self._open(file_location)
+                except FileNotFoundError:
+                    self.missing_file_locations.append(file_location)
+                else:
+                    file_locations.append(file_location)
+                self.progress.emit(done, total)
+
+            self.succeeded.emit(file_locations + [str(self._transcript_location)])
+        except Exception as e:
+            logger.error("Export preparation failed")
+            logger.debug(e)
+            self.failed.emit(e)
+
+    def _open(self, file_location: str) -> None:
+        f = self._open_files.enter_context(open(file_location, "rb"))
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
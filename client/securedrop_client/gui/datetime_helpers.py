@@ -3,11 +3,80 @@ Helper functions for formatting information in the UI
 
 """
 import datetime
+import time
+from typing import Callable, Dict, Optional
 
 import arrow
 from dateutil import tz
 from PyQt5.QtCore import QTimeZone
 
+# How often, in seconds, to check whether the system timezone changed
+TIMEZONE_CHECK_INTERVAL = 60
+
+# Every UTC offset in use is a whole number of quarter hours, and offsets change on the quarter
+# hour, so all the times in a quarter hour counted from the epoch fall on the same local day.
+QUARTER_HOUR = datetime.timedelta(minutes=15)
+EPOCH = datetime.datetime(1970, 1, 1)
+EPOCH_UTC = EPOCH.replace(tzinfo=datetime.timezone.utc)
+
+
+class TimestampFormatter:
+    """
+    Formats timestamps in the system timezone, as shown for thousands of sources and messages.
+
+    The timezone is looked up once and then again at most every TIMEZONE_CHECK_INTERVAL seconds,
+    since Qt only reports timezone changes on some platforms. Formatted dates are remembered per
+    quarter hour until the timezone changes, so that most timestamps are formatted with a lookup.
+    """
+
+    # Forget the formatted dates beyond this many quarter hours (a little over ten years)
+    MAX_CACHED_DATES = 365 * 96 * 10
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._checked_at: Optional[float] = None
+        self._timezone_id: Optional[bytes] = None
+        self._timezone: Optional[datetime.tzinfo] = None
+        self._formatted: Dict[int, str] = {}
+
+    @property
+    def timezone(self) -> Optional[datetime.tzinfo]:
+        """
+        The system timezone, or None if it is unknown (in which case times are shown in UTC).
+        """
+        now = self._clock()
+        if self._checked_at is None or now - self._checked_at >= TIMEZONE_CHECK_INTERVAL:
+            self._checked_at = now
+            timezone_id = QTimeZone.systemTimeZoneId().data()
+            if timezone_id != self._timezone_id:
+                self._timezone_id = timezone_id
+                self._timezone = tz.gettz(timezone_id.decode("utf-8"))
+                self._formatted.clear()
+        return self._timezone
+
+    def localise(self, date: datetime.datetime) -> datetime.datetime:
+        return arrow.get(date).to(self.timezone).datetime
+
+    def format_local(self, date: datetime.datetime) -> str:
+        # Naive datetimes are in UTC, like the ones stored in the database
+        quarter_hours = (date - (EPOCH if date.tzinfo is None else EPOCH_UTC)) // QUARTER_HOUR
+
+        # Look at the timezone first, so that the cache is cleared if it changed
+        timezone = self.timezone
+        try:
+            return self._formatted[quarter_hours]
+        except KeyError:
+            pass
+
+        if len(self._formatted) >= self.MAX_CACHED_DATES:
+            self._formatted.clear()
+        start = arrow.get(EPOCH_UTC + quarter_hours * QUARTER_HOUR).to(timezone).datetime
+        formatted = self._formatted[quarter_hours] = format_datetime_month_day(start)
+        return formatted
+
+
+_formatter = TimestampFormatter()
+
 
 def format_datetime_month_day(date: datetime.datetime) -> str:
     """
@@ -20,12 +89,11 @@ def localise_datetime(date: datetime.datetime) -> datetime.datetime:
     """
     Localise the datetime object to system timezone
     """
-    local_timezone = QTimeZone.systemTimeZoneId().data().decode("utf-8")
-    return arrow.get(date).to(tz.gettz(local_timezone)).datetime
+    return _formatter.localise(date)
 
 
 def format_datetime_local(date: datetime.datetime) -> str:
     """
     Localise date and return as a string in the format e.g. Sep 16
     """
-    return format_datetime_month_day(localise_datetime(date))
+    return _formatter.format_local(date)
@@ -21,7 +21,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
 from gettext import gettext as _
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QClipboard, QGuiApplication, QIcon, QKeySequence
@@ -164,12 +164,14 @@ class Window(QMainWindow):
         """
         self.main_view.refresh_source_conversations()
 
-    def show_sources(self, sources: List[Source]) -> None:
+    def show_sources(
+        self, sources: List[Source], changed_source_uuids: Optional[Set[str]] = None
+    ) -> None:
         """
         Update the left hand sources list in the UI with the passed in list of
-        sources.
+        sources, of which only the changed ones need refreshing if known.
         """
-        self.main_view.show_sources(sources)
+        self.main_view.show_sources(sources, changed_source_uuids)
 
     def show_last_sync(self, updated_on):  # type: ignore[no-untyped-def]
         """
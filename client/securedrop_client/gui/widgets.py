@@ -20,12 +20,11 @@ from __future__ import annotations
 
 import html
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from gettext import gettext as _
-from typing import Dict, List, Optional, Union  # noqa: F401
+from typing import Dict, List, Optional, Set, Tuple, Union  # noqa: F401
 from uuid import uuid4
 
-import arrow
 import sqlalchemy.orm.exc
 from PyQt5.QtCore import QEvent, QObject, QSize, Qt, QTimer, pyqtBoundSignal, pyqtSignal, pyqtSlot
 from PyQt5.QtGui import (
@@ -38,10 +37,12 @@ from PyQt5.QtGui import (
     QKeySequence,
     QLinearGradient,
     QMouseEvent,
+    QMovie,
     QPalette,
     QResizeEvent,
 )
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
     QAction,
     QGridLayout,
     QHBoxLayout,
@@ -79,13 +80,34 @@ from securedrop_client.gui.actions import (
     ExportConversationTranscriptAction,
     PrintConversationAction,
 )
-from securedrop_client.gui.base import SecureQLabel, SvgLabel, SvgPushButton, SvgToggleButton
+from securedrop_client.gui.base import (
+    SecureQLabel,
+    SvgLabel,
+    SvgPushButton,
+    SvgToggleButton,
+    set_style_class,
+    set_style_name,
+)
 from securedrop_client.gui.conversation import DeleteConversationDialog
 from securedrop_client.gui.datetime_helpers import format_datetime_local
 from securedrop_client.gui.source import DeleteSourceDialog
 from securedrop_client.logic import Controller
-from securedrop_client.resources import load_css, load_icon, load_image, load_movie
-from securedrop_client.storage import source_exists
+from securedrop_client.resources import (
+    load_css,
+    load_icon,
+    load_image,
+    load_movie,
+    load_shared_movie,
+)
+from securedrop_client.storage import (
+    count_conversation_items,
+    get_conversation_page,
+    get_first_file_counter,
+    get_latest_server_items,
+    get_seen_by_lists,
+    refresh_replies,
+    source_exists,
+)
 from securedrop_client.utils import humanize_filesize
 
 logger = logging.getLogger(__name__)
@@ -93,6 +115,7 @@ logger = logging.getLogger(__name__)
 
 MINIMUM_ANIMATION_DURATION_IN_MILLISECONDS = 300
 NO_DELAY = 1
+EPOCH = datetime(1970, 1, 1)
 
 
 class TopPane(QWidget):
@@ -605,14 +628,20 @@ class MainView(QWidget):
     and main context view).
     """
 
+    # How many conversations to keep when they are not shown, so that they show up straight away
+    # when their source is selected again
+    MAX_CACHED_CONVERSATIONS = 20
+
     def __init__(
         self,
         parent: Optional[QWidget],
         app_state: Optional[state.State] = None,
+        max_cached_conversations: int = MAX_CACHED_CONVERSATIONS,
     ) -> None:
         super().__init__(parent)
 
         self._state = app_state
+        self.max_cached_conversations = max_cached_conversations
 
         # Set id and styles
         self.setObjectName("MainView")
@@ -648,9 +677,16 @@ class MainView(QWidget):
         self._layout.addWidget(self.source_list, stretch=1)
         self._layout.addWidget(self.view_holder, stretch=2)
 
-        # Note: We should not delete SourceConversationWrapper when its source is unselected. This
-        # is a temporary solution to keep copies of our objects since we do delete them.
+        # The SourceConversationWrappers of the most recently selected sources, from the least to
+        # the most recently selected one. The least recently selected ones are deleted when there
+        # are more than max_cached_conversations, and created again when they are selected.
         self.source_conversations = {}  # type: Dict[str, SourceConversationWrapper]
+        self.conversation_cache_hits = 0
+
+        # The UUIDs of the sources whose cached conversations are out of date, since the source
+        # changed while another one was selected. They are refreshed when selected again.
+        self.outdated_conversations = set()  # type: Set[str]
+        self.conversation_cache_misses = 0
 
     def setup(self, controller: Controller) -> None:
         """
@@ -659,9 +695,12 @@ class MainView(QWidget):
         self.controller = controller
         self.source_list.setup(controller)
 
-    def show_sources(self, sources: List[Source]) -> None:
+    def show_sources(
+        self, sources: List[Source], changed_source_uuids: Optional[Set[str]] = None
+    ) -> None:
         """
-        Update the sources list in the GUI with the supplied list of sources.
+        Update the sources list in the GUI with the supplied list of sources, of which only the
+        ones in changed_source_uuids need refreshing, unless it is None.
         """
         # If no sources are supplied, display the EmptyConversationView with the no-sources message.
         #
@@ -683,11 +722,19 @@ class MainView(QWidget):
         if not self.source_list.source_items:
             self.source_list.initial_update(sources)
         else:
-            deleted_sources = self.source_list.update_sources(sources)
+            deleted_sources = self.source_list.update_sources(sources, changed_source_uuids)
             for source_uuid in deleted_sources:
                 # Then call the function to remove the wrapper and its children.
                 self.delete_conversation(source_uuid)
 
+        # Every cached conversation may be out of date if the changed sources are not known
+        if changed_source_uuids is None:
+            self.outdated_conversations.update(self.source_conversations)
+        else:
+            self.outdated_conversations.update(
+                changed_source_uuids.intersection(self.source_conversations)
+            )
+
     def on_source_changed(self) -> None:
         """
         Show conversation for the selected source.
@@ -704,19 +751,23 @@ class MainView(QWidget):
             self.source_list.source_selected.emit(source.uuid)
             self.controller.mark_seen(source)
 
-            # Get or create the SourceConversationWrapper
+            # Get or create the SourceConversationWrapper, and keep it as the most recent one. A
+            # cached conversation is only refreshed if its source changed since it was shown.
             if source.uuid in self.source_conversations:
-                conversation_wrapper = self.source_conversations[source.uuid]
-                conversation_wrapper.conversation_view.update_conversation(  # type: ignore[has-type]  # noqa: E501
-                    source.collection
-                )
+                self.conversation_cache_hits += 1
+                conversation_wrapper = self.source_conversations.pop(source.uuid)
+                if source.uuid in self.outdated_conversations:
+                    conversation_wrapper.conversation_view.refresh_conversation()  # type: ignore[has-type]  # noqa: E501
             else:
+                self.conversation_cache_misses += 1
                 conversation_wrapper = SourceConversationWrapper(
                     source, self.controller, self._state
                 )
-                self.source_conversations[source.uuid] = conversation_wrapper
+            self.source_conversations[source.uuid] = conversation_wrapper
+            self.outdated_conversations.discard(source.uuid)
 
             self.set_conversation(conversation_wrapper)
+            self.evict_conversations()
             logger.debug(
                 "Set conversation to the selected source with uuid: {}".format(source.uuid)
             )
@@ -735,9 +786,8 @@ class MainView(QWidget):
             self.controller.session.refresh(source)
             self.controller.mark_seen(source)
             conversation_wrapper = self.source_conversations[source.uuid]
-            conversation_wrapper.conversation_view.update_conversation(  # type: ignore[has-type]
-                source.collection
-            )
+            conversation_wrapper.conversation_view.refresh_conversation()  # type: ignore[has-type]
+            self.outdated_conversations.discard(source.uuid)
         except sqlalchemy.exc.InvalidRequestError as e:
             logger.debug("Error refreshing source conversations: %s", e)
 
@@ -751,9 +801,44 @@ class MainView(QWidget):
             conversation_wrapper = self.source_conversations[source_uuid]
             conversation_wrapper.deleteLater()
             del self.source_conversations[source_uuid]
+            self.outdated_conversations.discard(source_uuid)
         except KeyError:
             logger.debug("No SourceConversationWrapper for {} to delete".format(source_uuid))
 
+    @property
+    def conversation_cache_hit_rate(self) -> float:
+        """
+        The share of source selections that showed a conversation that was already created.
+        """
+        selections = self.conversation_cache_hits + self.conversation_cache_misses
+        return self.conversation_cache_hits / selections if selections else 0.0
+
+    def evict_conversations(self) -> None:
+        """
+        Delete the least recently selected conversations beyond max_cached_conversations, except
+        for the one that is shown and those that have something that can't be created again.
+        """
+        excess = len(self.source_conversations) - self.max_cached_conversations
+        if excess <= 0:
+            return
+
+        shown_widget = self.view_layout.itemAt(0).widget() if self.view_layout.count() else None
+        evicted = []
+        for source_uuid, conversation_wrapper in self.source_conversations.items():
+            if len(evicted) == excess:
+                break
+            if conversation_wrapper is not shown_widget and conversation_wrapper.is_idle():
+                evicted.append(source_uuid)
+
+        for source_uuid in evicted:
+            self.source_conversations.pop(source_uuid).deleteLater()
+            self.outdated_conversations.discard(source_uuid)
+
+        logger.debug(
+            f"Deleted {len(evicted)} conversations, keeping {len(self.source_conversations)} "
+            f"(hit rate {self.conversation_cache_hit_rate:.0%})"
+        )
+
     def set_conversation(self, widget: QWidget) -> None:
         """
         Update the view holder to contain the referenced widget.
@@ -859,33 +944,71 @@ class EmptyConversationView(QWidget):
 
 
 class SourceListWidgetItem(QListWidgetItem):
+    """
+    An entry in the source list, which knows its source without needing a SourceWidget, so that
+    widgets only have to exist for the entries that can be seen.
+    """
+
+    # Data role of the sort key, the timestamp of last interaction in microseconds since the epoch
+    SORT_KEY_ROLE = Qt.UserRole
+
+    def __init__(self, source: Source) -> None:
+        super().__init__()
+        self.source = source
+        self.source_uuid: str = source.uuid
+        self.last_updated = source.last_updated
+
+    @property
+    def last_updated(self) -> Optional[datetime]:
+        return self._last_updated
+
+    @last_updated.setter
+    def last_updated(self, last_updated: Optional[datetime]) -> None:
+        """
+        Keep the sort key in step with the timestamp, so that comparing items is cheap.
+        """
+        self._last_updated = last_updated
+        if last_updated is None:
+            sort_key = 0
+        else:
+            # Timestamps are stored as naive UTC
+            if last_updated.tzinfo is not None:
+                last_updated = last_updated.astimezone(timezone.utc).replace(tzinfo=None)
+            sort_key = (last_updated - EPOCH) // timedelta(microseconds=1)
+        if self.data(self.SORT_KEY_ROLE) != sort_key:
+            self.setData(self.SORT_KEY_ROLE, sort_key)
+
     def __lt__(self, other: "SourceListWidgetItem") -> bool:
         """
         Used for ordering widgets by timestamp of last interaction.
         """
-        lw = self.listWidget()
-        me = lw.itemWidget(self)
-        them = lw.itemWidget(other)
-        if me and them:
-            assert isinstance(me, SourceWidget)
-            assert isinstance(them, SourceWidget)
-            my_ts = arrow.get(me.last_updated)
-            other_ts = arrow.get(them.last_updated)
-            return my_ts < other_ts
-        return True
+        return self.data(self.SORT_KEY_ROLE) < other.data(self.SORT_KEY_ROLE)
 
 
 class SourceList(QListWidget):
     """
     Displays the list of sources.
+
+    Every source has a lightweight SourceListWidgetItem, but a SourceWidget is only created for
+    the sources that are in or near the viewport. SourceWidgets that have scrolled far away are
+    deleted again, unless they are selected or busy (being deleted, or starring), so that the
+    number of widgets does not depend on the number of sources.
     """
 
     source_selection_changed = pyqtSignal(state.SourceId)
     source_selection_cleared = pyqtSignal()
 
-    NUM_SOURCES_TO_ADD_AT_A_TIME = 32
     INITIAL_UPDATE_SCROLLBAR_WIDTH = 20
 
+    # Height of a SourceWidget until one was created and can be measured
+    DEFAULT_ITEM_HEIGHT = 66
+
+    # Number of rows above and below the viewport that get a SourceWidget ahead of time
+    PRELOADED_ROWS = 10
+
+    # Number of rows above and below the viewport past which SourceWidgets are deleted
+    RETAINED_ROWS = 50
+
     source_selected = pyqtSignal(str)
     adjust_preview = pyqtSignal(int)
 
@@ -902,21 +1025,33 @@ class SourceList(QListWidget):
         # Disable horizontal scrollbar for SourceList widget
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
-        # Enable ordering.
+        # Enable ordering, most recently-updated sources first. Items are then inserted in order,
+        # and moved when their sort key changes, without sorting the whole list again.
         self.setSortingEnabled(True)
+        self.sortItems(Qt.DescendingOrder)
 
         # To hold references to SourceListWidgetItem instances indexed by source UUID.
         self.source_items: Dict[str, SourceListWidgetItem] = {}
 
+        # The SourceWidgets that currently exist, indexed by source UUID.
+        self.source_widgets: Dict[str, SourceWidget] = {}
+
+        self._item_size_hint = QSize(0, self.DEFAULT_ITEM_HEIGHT)
+
+        # The selected source and the sources in the viewport, as last passed to the controller
+        self._download_priorities: Optional[Tuple[Optional[str], List[str]]] = None
+
         self.itemSelectionChanged.connect(self._on_item_selection_changed)
+        self.verticalScrollBar().valueChanged.connect(self._update_source_widgets)
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         self.adjust_preview.emit(event.size().width())
         super().resizeEvent(event)
+        self._update_source_widgets()
 
     def setup(self, controller: Controller) -> None:
         self.controller = controller
-        self.controller.reply_succeeded.connect(self.set_snippet)
+        self.controller.reply_succeeded.connect(self._on_reply_succeeded)
         self.controller.message_ready.connect(self.set_snippet)
         self.controller.reply_ready.connect(self.set_snippet)
         self.controller.file_ready.connect(self.set_snippet)
@@ -924,23 +1059,28 @@ class SourceList(QListWidget):
         self.controller.message_download_failed.connect(self.set_snippet)
         self.controller.reply_download_failed.connect(self.set_snippet)
 
-    def update_sources(self, sources: List[Source]) -> List[str]:
+    def update_sources(
+        self, sources: List[Source], changed_source_uuids: Optional[Set[str]] = None
+    ) -> List[str]:
         """
         Update the list with the passed in list of sources.
+
+        If changed_source_uuids is supplied, only the sources it contains are refreshed from the
+        database, and the others are assumed to be unchanged. Otherwise every source is refreshed.
         """
-        sources_to_update = []
+        sources_to_update = {}
         sources_to_add = {}
         for source in sources:
             try:
                 if source.uuid in self.source_items:
-                    sources_to_update.append(source.uuid)
+                    sources_to_update[source.uuid] = source
                 else:
                     sources_to_add[source.uuid] = source
             except sqlalchemy.exc.InvalidRequestError as e:
                 logger.debug(e)
                 continue
 
-        # Delete widgets for sources not in the supplied sourcelist
+        # Delete items and widgets for sources not in the supplied sourcelist
         deleted_uuids = []
         sources_to_delete = [
             self.source_items[uuid] for uuid in self.source_items if uuid not in sources_to_update
@@ -949,39 +1089,43 @@ class SourceList(QListWidget):
             if source_item.isSelected():
                 self.setCurrentItem(None)
 
-            source_widget = self.itemWidget(source_item)
+            self._delete_source_widget(source_item)
             self.takeItem(self.row(source_item))
-            assert isinstance(source_widget, SourceWidget)
-            if source_widget.source_uuid in self.source_items:
-                del self.source_items[source_widget.source_uuid]
-
-            deleted_uuids.append(source_widget.source_uuid)
-            source_widget.deleteLater()
-
-        # Update the remaining widgets
-        for i in range(self.count()):
-            source_widget = self.itemWidget(self.item(i))
+            del self.source_items[source_item.source_uuid]
+            deleted_uuids.append(source_item.source_uuid)
+
+        # Update the remaining items, and the widgets that exist. Busy widgets are always
+        # reloaded, since they may be waiting for the next sync. An item whose timestamp changed
+        # is moved to its new row, keeping its widget.
+        for uuid, source in sources_to_update.items():
+            source_item = self.source_items[uuid]
+            source_widget = self.source_widgets.get(uuid)
+            is_changed = changed_source_uuids is None or uuid in changed_source_uuids
+            if source_widget and (is_changed or not source_widget.is_idle()):
+                source_widget.reload()
+                source_item.source = source_widget.source
+                source_item.last_updated = source_widget.last_updated
+            elif is_changed:
+                try:
+                    self.controller.session.refresh(source)
+                except sqlalchemy.exc.InvalidRequestError as e:
+                    logger.debug(f"Could not refresh source {uuid}: {e}")
+                    continue
+                source_item.source = source
+                source_item.last_updated = source.last_updated
 
-            if not source_widget:
+        # Add items for new sources, which are inserted in order
+        for uuid, source in sources_to_add.items():
+            try:
+                source_item = SourceListWidgetItem(source)
+            except sqlalchemy.exc.InvalidRequestError as e:
+                logger.debug(e)
                 continue
-
-            assert isinstance(source_widget, SourceWidget)
-            source_widget.reload()
-
-        # Add widgets for new sources
-        for uuid in sources_to_add:
-            source_widget = SourceWidget(
-                self.controller, sources_to_add[uuid], self.source_selected, self.adjust_preview
-            )
-            source_item = SourceListWidgetItem(self)
-            source_item.setSizeHint(source_widget.sizeHint())
+            source_item.setSizeHint(self._item_size_hint)
             self.insertItem(0, source_item)
-            self.setItemWidget(source_item, source_widget)
             self.source_items[uuid] = source_item
-            self.adjust_preview.emit(self.width() - self.INITIAL_UPDATE_SCROLLBAR_WIDTH)
 
-        # Re-sort SourceList to make sure the most recently-updated sources appear at the top
-        self.sortItems(Qt.DescendingOrder)
+        self._update_source_widgets()
 
         # Return uuids of source widgets that were deleted so we can later delete the corresponding
         # conversation widgets
@@ -990,87 +1134,37 @@ class SourceList(QListWidget):
     def initial_update(self, sources: List[Source]) -> None:
         """
         Initialise the list with the passed in list of sources.
-        """
-        self.add_source(sources)
 
-    def add_source(self, sources: List[Source], slice_size: int = 1) -> None:
+        Items are cheap to create, and only the widgets for the first screenful of sources are
+        created, so all sources are added at once.
         """
-        Add a slice of sources, and if necessary, reschedule the addition of
-        more sources.
-        """
-
-        def schedule_source_management(slice_size: int = slice_size) -> None:
-            if not sources:
-                self.adjust_preview.emit(self.width() - self.INITIAL_UPDATE_SCROLLBAR_WIDTH)
-                return
-
-            # Process the remaining "slice_size" number of sources.
-            sources_slice = sources[:slice_size]
-            for source in sources_slice:
-                try:
-                    source_uuid = source.uuid
-                    source_widget = SourceWidget(
-                        self.controller, source, self.source_selected, self.adjust_preview
-                    )
-                    source_item = SourceListWidgetItem(self)
-                    source_item.setSizeHint(source_widget.sizeHint())
-                    self.insertItem(0, source_item)
-                    self.setItemWidget(source_item, source_widget)
-                    self.source_items[source_uuid] = source_item
-                except sqlalchemy.exc.InvalidRequestError as e:
-                    logger.debug(e)
-
-            # Re-sort SourceList to make sure the most recently-updated sources appear at the top
-            self.sortItems(Qt.DescendingOrder)
-
-            # ATTENTION! 32 is an arbitrary number arrived at via
-            # experimentation. It adds plenty of sources, but doesn't block
-            # for a noticable amount of time.
-            new_slice_size = min(self.NUM_SOURCES_TO_ADD_AT_A_TIME, slice_size * 2)
-            # Call add_source again for the remaining sources.
-            self.add_source(sources[slice_size:], new_slice_size)
-
-        # Schedule the closure defined above in the next iteration of the
-        # Qt event loop (thus unblocking the UI).
-        QTimer.singleShot(1, schedule_source_management)
+        self.update_sources(sources)
+        self.adjust_preview.emit(self.width() - self.INITIAL_UPDATE_SCROLLBAR_WIDTH)
 
     def get_selected_source(self) -> Optional[Source]:
         if not self.selectedItems():
             return None
 
         source_item = self.selectedItems()[0]
-        source_widget = self.itemWidget(source_item)
-        assert isinstance(source_widget, SourceWidget)
-        if source_widget and source_exists(self.controller.session, source_widget.source_uuid):
-            return source_widget.source
+        assert isinstance(source_item, SourceListWidgetItem)
+        if source_exists(self.controller.session, source_item.source_uuid):
+            return source_item.source
         return None  # pragma: nocover
 
     def get_source_widget(self, source_uuid: str) -> Optional[SourceWidget]:
         """
-        First try to get the source widget from the cache, then look for it in the SourceList.
+        Return the widget of the source, if the source is in the list and its widget exists.
         """
-        try:
-            source_item = self.source_items[source_uuid]
-            source_widget = self.itemWidget(source_item)
-            assert isinstance(source_widget, SourceWidget)
-            return source_widget
-        except KeyError:
-            pass
-
-        for i in range(self.count()):
-            list_item = self.item(i)
-            source_widget = self.itemWidget(list_item)
-            assert isinstance(source_widget, SourceWidget)
-            if source_widget and source_widget.source_uuid == source_uuid:
-                return source_widget
-
-        return None
+        return self.source_widgets.get(source_uuid)
 
     @pyqtSlot(str, str, str)
     def set_snippet(self, source_uuid: str, collection_item_uuid: str, content: str) -> None:
         """
         Set the source widget's preview snippet with the supplied content.
 
+        Sources without a widget don't need updating, since a widget shows the latest snippet
+        when it is created.
+
         Note: The signal's `collection_item_uuid` is not needed for setting the preview snippet. It
         is used by other signal handlers.
         """
@@ -1078,6 +1172,16 @@ class SourceList(QListWidget):
         if source_widget:
             source_widget.set_snippet(source_uuid, collection_item_uuid, content)
 
+    @pyqtSlot(str, str, str)
+    def _on_reply_succeeded(self, source_uuid: str, reply_uuid: str, content: str) -> None:
+        """
+        A reply that was just sent is now the last item of its source's conversation.
+        """
+        source_widget = self.get_source_widget(source_uuid)
+        if source_widget:
+            source_widget.update_last_activity()
+            source_widget.set_snippet(source_uuid, reply_uuid, content)
+
     @pyqtSlot()
     def _on_item_selection_changed(self) -> None:
         source = self.get_selected_source()
@@ -1085,6 +1189,101 @@ class SourceList(QListWidget):
             self.source_selection_changed.emit(state.SourceId(source.uuid))
         else:
             self.source_selection_cleared.emit()
+        self._update_download_priorities()
+
+    @pyqtSlot()
+    def _update_source_widgets(self) -> None:
+        """
+        Create the widgets for the rows in and near the viewport, and delete the idle widgets of
+        the rows that are far from it.
+        """
+        if not self.count():
+            return
+
+        first_row, last_row = self._visible_rows()
+
+        for row in range(
+            max(first_row - self.PRELOADED_ROWS, 0),
+            min(last_row + self.PRELOADED_ROWS, self.count() - 1) + 1,
+        ):
+            source_item = self.item(row)
+            assert isinstance(source_item, SourceListWidgetItem)
+            if source_item.source_uuid not in self.source_widgets:
+                self._create_source_widget(source_item)
+
+        retained_rows = range(first_row - self.RETAINED_ROWS, last_row + self.RETAINED_ROWS + 1)
+        for source_uuid, source_widget in list(self.source_widgets.items()):
+            source_item = self.source_items[source_uuid]
+            if self.row(source_item) not in retained_rows and source_widget.is_idle():
+                self._delete_source_widget(source_item)
+
+        self._update_download_priorities()
+
+    def _update_download_priorities(self) -> None:
+        """
+        Have the messages and replies of the selected source and of the sources in the viewport
+        downloaded first, whenever those sources change.
+        """
+        selected_items = self.selectedItems()
+        selected_source_uuid = None
+        if selected_items:
+            selected_item = selected_items[0]
+            assert isinstance(selected_item, SourceListWidgetItem)
+            selected_source_uuid = selected_item.source_uuid
+
+        visible_source_uuids = []
+        if self.count():
+            first_row, last_row = self._visible_rows()
+            for row in range(first_row, last_row + 1):
+                source_item = self.item(row)
+                assert isinstance(source_item, SourceListWidgetItem)
+                visible_source_uuids.append(source_item.source_uuid)
+
+        download_priorities = (selected_source_uuid, visible_source_uuids)
+        if download_priorities != self._download_priorities:
+            self._download_priorities = download_priorities
+            self.controller.prioritize_downloads(selected_source_uuid, visible_source_uuids)
+
+    def _visible_rows(self) -> Tuple[int, int]:
+        """
+        Return the first and last rows that fit in the viewport, from the scroll position rather
+        than from the item layout, which is only done once the list is shown.
+        """
+        row_height = max(self._item_size_hint.height(), 1)
+        scroll_position = self.verticalScrollBar().value()
+        if self.verticalScrollMode() == QAbstractItemView.ScrollPerItem:
+            first_row = scroll_position
+        else:
+            first_row = scroll_position // row_height
+        last_row = first_row + self.viewport().height() // row_height
+        return first_row, min(last_row, self.count() - 1)
+
+    def _create_source_widget(self, source_item: SourceListWidgetItem) -> None:
+        try:
+            source_widget = SourceWidget(
+                self.controller, source_item.source, self.source_selected, self.adjust_preview
+            )
+        except sqlalchemy.exc.InvalidRequestError as e:
+            logger.debug(e)
+            return
+
+        if source_item.isSelected():
+            source_widget._on_source_selected(source_item.source_uuid)
+        source_widget._on_adjust_preview(self.width() - self.INITIAL_UPDATE_SCROLLBAR_WIDTH)
+        self.setItemWidget(source_item, source_widget)
+        self.source_widgets[source_item.source_uuid] = source_widget
+
+        size_hint = source_widget.sizeHint()
+        if size_hint.height() != self._item_size_hint.height():
+            self._item_size_hint = QSize(0, size_hint.height())
+            for row in range(self.count()):
+                self.item(row).setSizeHint(self._item_size_hint)
+
+    def _delete_source_widget(self, source_item: SourceListWidgetItem) -> None:
+        source_widget = self.source_widgets.pop(source_item.source_uuid, None)
+        if source_widget:
+            self.removeItemWidget(source_item)
+            source_widget.deleteLater()
 
 
 class SourcePreview(SecureQLabel):
@@ -1130,11 +1329,10 @@ class ConversationDeletionIndicator(QWidget):
         deletion_message = QLabel(_("Deleting files and messages…"))
         deletion_message.setWordWrap(False)
 
-        self.animation = load_movie("loading-cubes.gif")
-        self.animation.setScaledSize(QSize(50, 50))
+        self.animation = load_shared_movie("loading-cubes.gif", self, QSize(50, 50))
 
         spinner = QLabel()
-        spinner.setMovie(self.animation)
+        spinner.setMovie(self.animation.movie)
 
         layout = QGridLayout()
         layout.setContentsMargins(20, 20, 20, 20)
@@ -1176,11 +1374,10 @@ class SourceDeletionIndicator(QWidget):
         self.deletion_message = QLabel(_("Deleting source account…"))
         self.deletion_message.setWordWrap(False)
 
-        self.animation = load_movie("loading-cubes.gif")
-        self.animation.setScaledSize(QSize(50, 50))
+        self.animation = load_shared_movie("loading-cubes.gif", self, QSize(50, 50))
 
         spinner = QLabel()
-        spinner.setMovie(self.animation)
+        spinner.setMovie(self.animation.movie)
 
         layout = QGridLayout()
         layout.setContentsMargins(20, 20, 20, 20)
@@ -1214,10 +1411,9 @@ class SourceWidgetDeletionIndicator(QLabel):
 
         self.setObjectName("SourceWidgetDeletionIndicator")
 
-        self.animation = load_movie("loading-bar.gif")
-        self.animation.setScaledSize(QSize(200, 11))
+        self.animation = load_shared_movie("loading-bar.gif", self, QSize(200, 11))
 
-        self.setMovie(self.animation)
+        self.setMovie(self.animation.movie)
 
     def start(self) -> None:
         self.animation.start()
@@ -1241,10 +1437,6 @@ class SourceWidget(QWidget):
     STAR_WIDTH = 20
     TIMESTAMP_WIDTH = 60
 
-    SOURCE_NAME_CSS = load_css("source_name.css")
-    SOURCE_PREVIEW_CSS = load_css("source_preview.css")
-    SOURCE_TIMESTAMP_CSS = load_css("source_timestamp.css")
-
     CONVERSATION_DELETED_TEXT = _("\u2014 All files and messages deleted for this source \u2014")
 
     def __init__(
@@ -1273,6 +1465,7 @@ class SourceWidget(QWidget):
         self.seen = self.source.seen
         self.source_uuid: str = self.source.uuid
         self.last_updated: sqlalchemy.DateTime = self.source.last_updated
+        self.last_activity: Optional[Union[Message, File, Reply]] = None
         self.selected = False
         self.deletion_scheduled_timestamp = datetime.utcnow()
         self.sync_started_timestamp = datetime.utcnow()
@@ -1369,16 +1562,17 @@ class SourceWidget(QWidget):
             self.timestamp.setText(_(format_datetime_local(self.source.last_updated)))
             self.name.setText(self.source.journalist_designation)
 
+            self.update_last_activity()
             self.set_snippet(self.source_uuid)
 
             if self.source.document_count == 0:
                 self.paperclip.hide()
                 self.paperclip_disabled.hide()
 
-            if not self.source.server_collection and self.source.interaction_count > 0:
-                self.preview.setProperty("class", "conversation_deleted")
+            if not self.last_activity and self.source.interaction_count > 0:
+                set_style_class(self.preview, "conversation_deleted")
             else:
-                self.preview.setProperty("class", "")
+                set_style_class(self.preview, "")
 
             self.star.update(self.source.is_starred)
 
@@ -1396,6 +1590,28 @@ class SourceWidget(QWidget):
         except sqlalchemy.exc.InvalidRequestError as e:
             logger.debug(f"Could not update SourceWidget for source {self.source_uuid}: {e}")
 
+    def update_last_activity(self) -> None:
+        """
+        Look up the last message, file or reply of the source, which the preview snippet shows.
+        """
+        self.last_activity = get_latest_server_items(self.controller.session, [self.source.id]).get(
+            self.source.id
+        )
+
+    def is_idle(self) -> bool:
+        """
+        Whether the widget only shows what is in the database, and can therefore be deleted and
+        created again later without losing anything.
+        """
+        return not (
+            self.selected
+            or self.deleting
+            or self.deleting_conversation
+            or self.sync_started_timestamp < self.deletion_scheduled_timestamp
+            or self.star.pending_count > 0
+            or self.star.wait_until_next_sync
+        )
+
     @pyqtSlot(str, str, str)
     def set_snippet(
         self, source_uuid: str, collection_uuid: Optional[str] = None, content: Optional[str] = None
@@ -1412,53 +1628,37 @@ class SourceWidget(QWidget):
 
         # If the source collection is empty yet the interaction_count is greater than zero, then we
         # known that the conversation has been deleted.
-        if not self.source.server_collection:
+        last_activity = self.last_activity
+        if not last_activity:
             if self.source.interaction_count > 0:
                 self.set_snippet_to_conversation_deleted()
         else:
-            last_activity = self.source.server_collection[-1]
             if collection_uuid and collection_uuid != last_activity.uuid:
                 return
 
-            self.preview.setProperty("class", "")
+            set_style_class(self.preview, "")
             self.preview.setText(content) if content else self.preview.setText(str(last_activity))
             self.preview.adjust_preview(self.width())
             self.update_styles()
 
     def set_snippet_to_conversation_deleted(self) -> None:
-        self.preview.setProperty("class", "conversation_deleted")
+        set_style_class(self.preview, "conversation_deleted")
         self.preview.setText(self.CONVERSATION_DELETED_TEXT)
         self.preview.adjust_preview(self.width())
         self.update_styles()
 
     def update_styles(self) -> None:
         if self.seen:
-            self.name.setStyleSheet("")
             if self.selected:
-                self.name.setObjectName("SourceWidget_name_selected")
+                set_style_name(self.name, "SourceWidget_name_selected")
             else:
-                self.name.setObjectName("SourceWidget_name")
-            self.name.setStyleSheet(self.SOURCE_NAME_CSS)
-
-            self.timestamp.setStyleSheet("")
-            self.timestamp.setObjectName("SourceWidget_timestamp")
-            self.timestamp.setStyleSheet(self.SOURCE_TIMESTAMP_CSS)
-
-            self.preview.setStyleSheet("")
-            self.preview.setObjectName("SourceWidget_preview")
-            self.preview.setStyleSheet(self.SOURCE_PREVIEW_CSS)
+                set_style_name(self.name, "SourceWidget_name")
+            set_style_name(self.timestamp, "SourceWidget_timestamp")
+            set_style_name(self.preview, "SourceWidget_preview")
         else:
-            self.name.setStyleSheet("")
-            self.name.setObjectName("SourceWidget_name_unread")
-            self.name.setStyleSheet(self.SOURCE_NAME_CSS)
-
-            self.timestamp.setStyleSheet("")
-            self.timestamp.setObjectName("SourceWidget_timestamp_unread")
-            self.timestamp.setStyleSheet(self.SOURCE_TIMESTAMP_CSS)
-
-            self.preview.setStyleSheet("")
-            self.preview.setObjectName("SourceWidget_preview_unread")
-            self.preview.setStyleSheet(self.SOURCE_PREVIEW_CSS)
+            set_style_name(self.name, "SourceWidget_name_unread")
+            set_style_name(self.timestamp, "SourceWidget_timestamp_unread")
+            set_style_name(self.preview, "SourceWidget_preview_unread")
 
     @pyqtSlot(bool)
     def _on_authentication_changed(self, authenticated: bool) -> None:
@@ -1516,8 +1716,8 @@ class SourceWidget(QWidget):
     def end_account_deletion(self) -> None:
         self.end_deletion()
         self.star.show()
-        self.name.setProperty("class", "")
-        self.timestamp.setProperty("class", "")
+        set_style_class(self.name, "")
+        set_style_class(self.timestamp, "")
         self.update_styles()
         self.deleting = False
 
@@ -1537,8 +1737,8 @@ class SourceWidget(QWidget):
     def start_account_deletion(self) -> None:
         self.deleting = True
         self.start_deletion()
-        self.name.setProperty("class", "deleting")
-        self.timestamp.setProperty("class", "deleting")
+        set_style_class(self.name, "deleting")
+        set_style_class(self.timestamp, "deleting")
         self.star.hide()
         self.update_styles()
 
@@ -1705,14 +1905,11 @@ class SenderIcon(QWidget):
     Represents a reply to a source.
     """
 
-    SENDER_ICON_CSS = load_css("sender_icon.css")
-
     def __init__(self) -> None:
         super().__init__()
         self._is_current_user = False
         self._initials = ""
         self.setObjectName("SenderIcon")
-        self.setStyleSheet(self.SENDER_ICON_CSS)
         self.setFixedSize(QSize(48, 48))
         font = QFont()
         font.setLetterSpacing(QFont.AbsoluteSpacing, 0.58)
@@ -1749,30 +1946,22 @@ class SenderIcon(QWidget):
             self._initials = initials
 
     def set_normal_styles(self) -> None:
-        self.setStyleSheet("")
         if self.is_current_user:
-            self.setObjectName("SenderIcon_current_user")
+            set_style_name(self, "SenderIcon_current_user")
         else:
-            self.setObjectName("SenderIcon")
-        self.setStyleSheet(self.SENDER_ICON_CSS)
+            set_style_name(self, "SenderIcon")
 
     def set_failed_styles(self) -> None:
-        self.setStyleSheet("")
-        self.setObjectName("SenderIcon_failed")
-        self.setStyleSheet(self.SENDER_ICON_CSS)
+        set_style_name(self, "SenderIcon_failed")
 
     def set_pending_styles(self) -> None:
-        self.setStyleSheet("")
         if self.is_current_user:
-            self.setObjectName("SenderIcon_current_user_pending")
+            set_style_name(self, "SenderIcon_current_user_pending")
         else:
-            self.setObjectName("SenderIcon_pending")
-        self.setStyleSheet(self.SENDER_ICON_CSS)
+            set_style_name(self, "SenderIcon_pending")
 
     def set_failed_to_decrypt_styles(self) -> None:
-        self.setStyleSheet("")
-        self.setObjectName("SenderIcon_failed_to_decrypt")
-        self.setStyleSheet(self.SENDER_ICON_CSS)
+        set_style_name(self, "SenderIcon_failed_to_decrypt")
 
 
 class SpeechBubble(QWidget):
@@ -1781,10 +1970,6 @@ class SpeechBubble(QWidget):
     and journalist.
     """
 
-    MESSAGE_CSS = load_css("speech_bubble_message.css")
-    STATUS_BAR_CSS = load_css("speech_bubble_status_bar.css")
-    CHECK_MARK_CSS = load_css("checker_tooltip.css")
-
     WIDTH_TO_CONTAINER_WIDTH_RATIO = 5 / 9
     MIN_WIDTH = 400
     MIN_CONTAINER_WIDTH = 750
@@ -1827,12 +2012,10 @@ class SpeechBubble(QWidget):
         # Message box
         self.message = SecureQLabel(text)
         self.message.setObjectName("SpeechBubble_message")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
 
         # Color bar
         self.color_bar = QWidget()
         self.color_bar.setObjectName("SpeechBubble_status_bar")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
 
         # User icon
         self.sender_icon = SenderIcon()
@@ -1841,7 +2024,6 @@ class SpeechBubble(QWidget):
         # Check mark
         self.check_mark = CheckMark()
         self.setObjectName("Checker")
-        self.setStyleSheet(self.CHECK_MARK_CSS)
         self.check_mark.installEventFilter(self)
 
         # Speech bubble
@@ -1924,20 +2106,12 @@ class SpeechBubble(QWidget):
         self.update_seen_by_list(self.seen_by)
 
     def set_normal_styles(self) -> None:
-        self.message.setStyleSheet("")
-        self.message.setObjectName("SpeechBubble_message")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
-        self.color_bar.setStyleSheet("")
-        self.color_bar.setObjectName("SpeechBubble_status_bar")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
+        set_style_name(self.message, "SpeechBubble_message")
+        set_style_name(self.color_bar, "SpeechBubble_status_bar")
 
     def set_failed_to_decrypt_styles(self) -> None:
-        self.message.setStyleSheet("")
-        self.message.setObjectName("SpeechBubble_message_decryption_error")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
-        self.color_bar.setStyleSheet("")
-        self.color_bar.setObjectName("SpeechBubble_status_bar_decryption_error")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
+        set_style_name(self.message, "SpeechBubble_message_decryption_error")
+        set_style_name(self.color_bar, "SpeechBubble_status_bar_decryption_error")
         self.sender_icon.set_failed_to_decrypt_styles()
 
     def update_seen_by_list(self, usernames: Dict[str, User]) -> None:
@@ -1973,13 +2147,11 @@ class CheckMark(QPushButton):
     Represents the seen by checkmark for each bubble.
     """
 
-    CHECK_MARK_CSS = load_css("checker_tooltip.css")
     CLICKABLE_SPACE = 65
 
     def __init__(self) -> None:
         super().__init__()
         self.setObjectName("Checker")
-        self.setStyleSheet(self.CHECK_MARK_CSS)
         layout = QHBoxLayout()
         self.setIcon(load_icon("checkmark.svg"))
         self.setIconSize(QSize(16, 10))
@@ -2026,9 +2198,6 @@ class ReplyWidget(SpeechBubble):
     Represents a reply to a source.
     """
 
-    MESSAGE_CSS = load_css("speech_bubble_message.css")
-    STATUS_BAR_CSS = load_css("speech_bubble_status_bar.css")
-
     ERROR_BOTTOM_MARGIN = 20
 
     def __init__(  # type: ignore[no-untyped-def]
@@ -2183,41 +2352,29 @@ class ReplyWidget(SpeechBubble):
             self.check_mark.show()
 
     def set_normal_styles(self) -> None:
-        self.message.setStyleSheet("")
-        self.message.setObjectName("SpeechBubble_reply")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
+        set_style_name(self.message, "SpeechBubble_reply")
 
         self.sender_icon.set_normal_styles()
 
-        self.color_bar.setStyleSheet("")
         if self.sender_is_current_user:
-            self.color_bar.setObjectName("ReplyWidget_status_bar_current_user")
+            set_style_name(self.color_bar, "ReplyWidget_status_bar_current_user")
         else:
-            self.color_bar.setObjectName("ReplyWidget_status_bar")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
+            set_style_name(self.color_bar, "ReplyWidget_status_bar")
 
     def set_pending_styles(self) -> None:
-        self.message.setStyleSheet("")
-        self.message.setObjectName("ReplyWidget_message_pending")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
+        set_style_name(self.message, "ReplyWidget_message_pending")
 
         self.sender_icon.set_pending_styles()
 
-        self.color_bar.setStyleSheet("")
         if self.sender_is_current_user:
-            self.color_bar.setObjectName("ReplyWidget_status_bar_pending_current_user")
+            set_style_name(self.color_bar, "ReplyWidget_status_bar_pending_current_user")
         else:
-            self.color_bar.setObjectName("ReplyWidget_status_bar_pending")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
+            set_style_name(self.color_bar, "ReplyWidget_status_bar_pending")
 
     def set_failed_styles(self) -> None:
-        self.message.setStyleSheet("")
-        self.message.setObjectName("ReplyWidget_message_failed")
-        self.message.setStyleSheet(self.MESSAGE_CSS)
+        set_style_name(self.message, "ReplyWidget_message_failed")
         self.sender_icon.set_failed_styles()
-        self.color_bar.setStyleSheet("")
-        self.color_bar.setObjectName("ReplyWidget_status_bar_failed")
-        self.color_bar.setStyleSheet(self.STATUS_BAR_CSS)
+        set_style_name(self.color_bar, "ReplyWidget_status_bar_failed")
 
 
 class FileWidget(QWidget):
@@ -2225,8 +2382,6 @@ class FileWidget(QWidget):
     Represents a file.
     """
 
-    DOWNLOAD_BUTTON_CSS = load_css("file_download_button.css")
-
     TOP_MARGIN = 18
     BOTTOM_MARGIN = 0
     FILE_FONT_SPACING = 2
@@ -2290,12 +2445,11 @@ class FileWidget(QWidget):
         file_options_layout.setAlignment(Qt.AlignLeft)
         self.download_button = QPushButton(_(" DOWNLOAD"))
         self.download_button.setObjectName("FileWidget_download_button")
-        self.download_button.setStyleSheet(self.DOWNLOAD_BUTTON_CSS)
         self.download_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self.download_button.setIcon(load_icon("download_file.svg"))
         self.download_button.setFont(self.file_buttons_font)
         self.download_button.setCursor(QCursor(Qt.PointingHandCursor))
-        self.download_animation = load_movie("download_file.gif")
+        self.download_animation = load_shared_movie("download_file.gif", self)
         self.export_button = QPushButton(_("EXPORT"))
         self.export_button.setObjectName("FileWidget_export_print")
         self.export_button.setFont(self.file_buttons_font)
@@ -2410,10 +2564,7 @@ class FileWidget(QWidget):
             self.download_button.setFont(self.file_buttons_font)
             self.download_button.show()
 
-            # Reset stylesheet
-            self.download_button.setStyleSheet("")
-            self.download_button.setObjectName("FileWidget_download_button")
-            self.download_button.setStyleSheet(self.DOWNLOAD_BUTTON_CSS)
+            set_style_name(self.download_button, "FileWidget_download_button")
 
             self.no_file_name.hide()
             self.export_button.hide()
@@ -2496,27 +2647,32 @@ class FileWidget(QWidget):
         Update the download button to the animated "downloading" state.
         """
         self.downloading = True
-        self.download_animation.frameChanged.connect(self.set_button_animation_frame)
-        self.download_animation.start()
+        if not self.download_animation.is_started:
+            movie = self.download_animation.movie
+            movie.frameChanged.connect(self.set_button_animation_frame)
+
+            # Show the current frame straight away if other widgets are already animating
+            if movie.state() == QMovie.Running:
+                self.set_button_animation_frame(movie.currentFrameNumber())
+            self.download_animation.start()
         self.download_button.setText(_(" DOWNLOADING "))
 
-        # Reset widget stylesheet
-        self.download_button.setStyleSheet("")
-        self.download_button.setObjectName("FileWidget_download_button_animating")
-        self.download_button.setStyleSheet(self.DOWNLOAD_BUTTON_CSS)
+        set_style_name(self.download_button, "FileWidget_download_button_animating")
 
     def set_button_animation_frame(self, frame_number: int) -> None:
         """
         Sets the download button's icon to the current frame of the spinner
         animation.
         """
-        self.download_button.setIcon(QIcon(self.download_animation.currentPixmap()))
+        self.download_button.setIcon(QIcon(self.download_animation.movie.currentPixmap()))
 
     def stop_button_animation(self) -> None:
         """
         Stops the download animation and restores the button to its default state.
         """
-        self.download_animation.stop()
+        if self.download_animation.is_started:
+            self.download_animation.movie.frameChanged.disconnect(self.set_button_animation_frame)
+            self.download_animation.stop()
         self.file = self.controller.get_file(self.file.uuid)
         self._set_file_state()
 
@@ -2656,12 +2812,19 @@ class DeletedConversationMarker(QWidget):
 class ConversationView(QWidget):
     """
     Renders a conversation.
+
+    Only the newest items of a long conversation are shown at first, and older ones are added a
+    page at a time as the journalist scrolls up to them.
     """
 
     conversation_updated = pyqtSignal()
 
     SCROLL_BAR_WIDTH = 15
 
+    # Number of conversation items shown at first, and added each time the view is scrolled to
+    # the top
+    PAGE_SIZE = 50
+
     def __init__(
         self,
         source_db_object: Source,
@@ -2704,14 +2867,28 @@ class ConversationView(QWidget):
         # Flag to show if the current user has sent a reply. See issue #61.
         self.reply_flag = False
 
+        # Number of the oldest conversation items that are not shown (yet)
+        self.hidden_item_count = 0
+
+        # Distance from the bottom of the view to keep when older items are added at the top
+        self._scroll_offset_from_bottom: Optional[int] = None
+
         # Completely unintuitive way to ensure the view remains scrolled to the bottom.
         sb = self._scroll.verticalScrollBar()
         sb.rangeChanged.connect(self.update_conversation_position)
+        sb.valueChanged.connect(self._on_scroll)
 
         main_layout.addWidget(self._scroll)
 
         try:
-            self.update_conversation(self.source.collection)
+            items, self.hidden_item_count = get_conversation_page(
+                self.controller.session, self.source.id, self.PAGE_SIZE
+            )
+
+            # Start at the newest items when older ones are left out
+            self.reply_flag = self.hidden_item_count > 0
+
+            self.update_conversation(items)
         except sqlalchemy.exc.InvalidRequestError as e:
             logger.debug("Error initializing ConversationView: %s", e)
 
@@ -2729,13 +2906,10 @@ class ConversationView(QWidget):
         # Now that we know the deletion is scheduled, hide conversation items until they are
         # removed from the local database.
         try:
-            draft_reply_exists = False
-            for item in self.source.collection:
-                if isinstance(item, DraftReply):
-                    draft_reply_exists = True
-                    continue
-                item_widget = self.current_messages.get(item.uuid)
-                if item_widget:
+            draft_reply_uuids = {draft_reply.uuid for draft_reply in self.source.draftreplies}
+            draft_reply_exists = bool(draft_reply_uuids)
+            for uuid, item_widget in self.current_messages.items():
+                if uuid not in draft_reply_uuids:
                     item_widget.hide()
 
             # If a draft reply exists then show the tear pattern above the draft replies.
@@ -2751,10 +2925,18 @@ class ConversationView(QWidget):
         except sqlalchemy.exc.InvalidRequestError as e:
             logger.debug(f"Could not update ConversationView: {e}")
 
-    def update_deletion_markers(self) -> None:
-        if self.source.collection:
+    def update_deletion_markers(self, collection: list) -> None:
+        """
+        Show whether conversation items were deleted, given the conversation items that are shown.
+        """
+        if collection:
             self._scroll.show()
-            if self.source.collection[0].file_counter > 1:
+            # The first item of the conversation is only looked up when it isn't shown
+            if self.hidden_item_count:
+                first_file_counter = get_first_file_counter(self.controller.session, self.source.id)
+            else:
+                first_file_counter = collection[0].file_counter
+            if first_file_counter is not None and first_file_counter > 1:
                 self.deleted_conversation_marker.hide()
                 self.deleted_conversation_items_marker.show()
         elif self.source.interaction_count > 0:
@@ -2762,6 +2944,17 @@ class ConversationView(QWidget):
             self.deleted_conversation_items_marker.hide()
             self.deleted_conversation_marker.show()
 
+    def refresh_conversation(self) -> None:
+        """
+        Reload the conversation items that are shown, and any newer ones, from the database,
+        leaving out as many older items as before.
+        """
+        count = count_conversation_items(self.controller.session, self.source.id)
+        items, self.hidden_item_count = get_conversation_page(
+            self.controller.session, self.source.id, count - self.hidden_item_count
+        )
+        self.update_conversation(items)
+
     def update_conversation(self, collection: list) -> None:
         """
         Given a list of conversation items that reflect the new state of the
@@ -2780,14 +2973,25 @@ class ConversationView(QWidget):
         when the new conversation state (i.e. the collection argument) is
         passed into this method in case of a mismatch between where the widget
         has been and now is in terms of its index in the conversation.
+
+        The collection holds the items that are shown, which are the ones after the first
+        `hidden_item_count` items of the conversation, and indexes are counted from the first of
+        them.
         """
         self.controller.session.refresh(self.source)
 
+        # Look up who has seen the items, and reload the senders of the replies, for all the
+        # items that are shown at once.
+        min_file_counter = min((item.file_counter for item in collection), default=0)
+        seen_by_lists = get_seen_by_lists(self.controller.session, self.source.id, min_file_counter)
+        refresh_replies(self.controller.session, self.source.id, min_file_counter)
+
         # Keep a temporary copy of the current conversation so we can delete any
         # items corresponding to deleted items in the source collection.
         current_conversation = self.current_messages.copy()
 
         for index, conversation_item in enumerate(collection):
+            seen_by_list = seen_by_lists.get(conversation_item.uuid, {})
             item_widget = current_conversation.get(conversation_item.uuid)
             if item_widget:
                 # FIXME: Item types cannot be defines as (FileWidget, MessageWidget, ReplyWidget)
@@ -2811,22 +3015,22 @@ class ConversationView(QWidget):
                     ) and conversation_item.content:
                         item_widget.message.setText(conversation_item.content)
 
-                    # If the item widget is not a FileWidget, retrieve the latest list of
+                    # If the item widget is not a FileWidget, update the latest list of
                     # usernames of the users who have seen it.
-                    item_widget.update_seen_by_list(conversation_item.seen_by_list)
+                    item_widget.update_seen_by_list(seen_by_list)
 
                 # TODO: Once the SDK supports the new /users endpoint, this code can be replaced so
                 # that we can also update user accounts in the local db who have not sent replies.
                 if isinstance(item_widget, ReplyWidget):
-                    self.controller.session.refresh(conversation_item)
-                    self.controller.session.refresh(conversation_item.journalist)
                     item_widget.sender = conversation_item.journalist
             else:
                 # add a new item to be displayed.
                 if isinstance(conversation_item, Message):
-                    self.add_message(conversation_item, index)
+                    self.add_message(conversation_item, index, seen_by_list)
                 elif isinstance(conversation_item, (DraftReply, Reply)):
-                    self.add_reply(conversation_item, conversation_item.journalist, index)
+                    self.add_reply(
+                        conversation_item, conversation_item.journalist, index, seen_by_list
+                    )
                 else:
                     self.add_file(conversation_item, index)
 
@@ -2841,7 +3045,7 @@ class ConversationView(QWidget):
             item_widget.deleteLater()
             self._scroll.remove_widget_from_conversation(item_widget)
 
-        self.update_deletion_markers()
+        self.update_deletion_markers(collection)
         self.conversation_updated.emit()
 
     def add_file(self, file: File, index: int) -> None:
@@ -2866,14 +3070,56 @@ class ConversationView(QWidget):
         """
         Handler called when a new item is added to the conversation. Ensures
         it's scrolled to the bottom and thus visible.
+
+        When older items were added at the top, the items that were shown stay where they were.
         """
         if self.reply_flag and max_val > 0:
             self._scroll.verticalScrollBar().setValue(max_val)
             self.reply_flag = False
+        elif self._scroll_offset_from_bottom is not None:
+            self._scroll.verticalScrollBar().setValue(max_val - self._scroll_offset_from_bottom)
+            self._scroll_offset_from_bottom = None
+
+        # The view can't be scrolled up to the older items while the items shown fit in it
+        if max_val == 0 and self.hidden_item_count:
+            self.show_older_items()
+
+    @pyqtSlot(int)
+    def _on_scroll(self, value: int) -> None:
+        if value == self._scroll.verticalScrollBar().minimum() and self.hidden_item_count:
+            self.show_older_items()
+
+    def show_older_items(self) -> None:
+        """
+        Show the next page of older conversation items, above the ones that are shown.
+        """
+        if not self.hidden_item_count:
+            return
+
+        page_size = min(self.PAGE_SIZE, self.hidden_item_count)
+
+        # The items that are shown move down by a page, which the layout takes care of
+        for item_widget in self.current_messages.values():
+            item_widget.index += page_size
+
+        scroll_bar = self._scroll.verticalScrollBar()
+        self._scroll_offset_from_bottom = scroll_bar.maximum() - scroll_bar.value()
 
-    def add_message(self, message: Message, index: int) -> None:
+        try:
+            items, self.hidden_item_count = get_conversation_page(
+                self.controller.session, self.source.id, len(self.current_messages) + page_size
+            )
+            self.update_conversation(items)
+        except sqlalchemy.exc.InvalidRequestError as e:
+            logger.debug(f"Could not show older conversation items: {e}")
+
+    def add_message(
+        self, message: Message, index: int, seen_by_list: Optional[Dict[str, User]] = None
+    ) -> None:
         """
         Add a message from the source.
+
+        If seen_by_list is not supplied it is looked up for this message.
         """
         conversation_item = MessageWidget(
             message.uuid,
@@ -2891,14 +3137,24 @@ class ConversationView(QWidget):
             conversation_item.on_update_authenticated_user
         )
         # Retrieve the list of usernames of the users who have seen the message.
-        conversation_item.update_seen_by_list(message.seen_by_list)
+        if seen_by_list is None:
+            seen_by_list = message.seen_by_list
+        conversation_item.update_seen_by_list(seen_by_list)
         self._scroll.add_widget_to_conversation(index, conversation_item, Qt.AlignLeft)
         self.current_messages[message.uuid] = conversation_item
         self.conversation_updated.emit()
 
-    def add_reply(self, reply: Union[DraftReply, Reply], sender: User, index: int) -> None:
+    def add_reply(
+        self,
+        reply: Union[DraftReply, Reply],
+        sender: User,
+        index: int,
+        seen_by_list: Optional[Dict[str, User]] = None,
+    ) -> None:
         """
         Add a reply from a journalist to the source.
+
+        If seen_by_list is not supplied it is looked up for this reply.
         """
         try:
             send_status = reply.send_status.name
@@ -2934,7 +3190,9 @@ class ConversationView(QWidget):
             conversation_item.on_update_authenticated_user
         )
         # Retrieve the list of usernames of the users who have seen the reply.
-        conversation_item.update_seen_by_list(reply.seen_by_list)
+        if seen_by_list is None:
+            seen_by_list = reply.seen_by_list
+        conversation_item.update_seen_by_list(seen_by_list)
         self._scroll.add_widget_to_conversation(index, conversation_item, Qt.AlignRight)
         self.current_messages[reply.uuid] = conversation_item
 
@@ -2945,8 +3203,7 @@ class ConversationView(QWidget):
         self.reply_flag = True
         if source_uuid == self.source.uuid:
             try:
-                self.controller.session.refresh(self.source)
-                self.update_conversation(self.source.collection)
+                self.refresh_conversation()
             except sqlalchemy.exc.InvalidRequestError as e:
                 logger.debug(e)
 
@@ -3005,6 +3262,17 @@ class SourceConversationWrapper(QWidget):
         self.reply_box.reply_sent.connect(self.conversation_view.on_reply_sent)
         self.conversation_view.conversation_updated.connect(self.on_conversation_updated)
 
+    def is_idle(self) -> bool:
+        """
+        Whether the conversation only shows what is in the database, and can therefore be deleted
+        and created again later without losing anything, such as a draft reply.
+        """
+        return not (
+            self.deleting_conversation
+            or self.reply_box.property("class")
+            or self.reply_box.text_edit.toPlainText()
+        )
+
     @pyqtSlot(str)
     def on_conversation_deleted(self, source_uuid: str) -> None:
         if self.source_uuid == source_uuid:
@@ -3035,14 +3303,14 @@ class SourceConversationWrapper(QWidget):
             self.end_account_deletion()
 
     def start_conversation_deletion(self) -> None:
-        self.reply_box.setProperty("class", "deleting_conversation")
+        set_style_class(self.reply_box, "deleting_conversation")
         self.deleting_conversation = True
         self.start_deletion()
         self.conversation_deletion_indicator.start()
         self.deletion_indicator.stop()
 
     def start_account_deletion(self) -> None:
-        self.reply_box.setProperty("class", "deleting")
+        set_style_class(self.reply_box, "deleting")
         self.reply_box.text_edit.setText("")
         self.start_deletion()
 
@@ -3057,10 +3325,6 @@ class SourceConversationWrapper(QWidget):
         self.deletion_indicator.start()
 
     def start_deletion(self) -> None:
-        css = load_css("sdclient.css")
-        self.reply_box.setStyleSheet(css)
-        self.setStyleSheet(css)
-
         self.reply_box.text_edit.setDisabled(True)
         self.reply_box.text_edit.hide()
         self.reply_box.send_button.setDisabled(True)
@@ -3075,10 +3339,7 @@ class SourceConversationWrapper(QWidget):
         self.end_deletion()
 
     def end_deletion(self) -> None:
-        self.reply_box.setProperty("class", "")
-        css = load_css("sdclient.css")
-        self.reply_box.setStyleSheet(css)
-        self.setStyleSheet(css)
+        set_style_class(self.reply_box, "")
 
         self.reply_box.text_edit.setEnabled(True)
         self.reply_box.text_edit.show()
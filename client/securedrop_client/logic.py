@@ -24,7 +24,7 @@ import uuid
 from datetime import datetime
 from gettext import gettext as _
 from gettext import ngettext
-from typing import Dict, List, Optional, Type, Union  # noqa: F401
+from typing import Dict, List, Optional, Set, Type, Union  # noqa: F401
 
 import arrow
 import sdclientapi
@@ -33,7 +33,7 @@ from PyQt5.QtCore import QObject, QProcess, QThread, QTimer, pyqtSignal, pyqtSlo
 from sdclientapi import AuthError, RequestTimeoutError, ServerConnectionError
 from sqlalchemy.orm.session import sessionmaker
 
-from securedrop_client import db, state, storage
+from securedrop_client import conversation, db, export, state, storage
 from securedrop_client.api_jobs.base import ApiInaccessibleError
 from securedrop_client.api_jobs.downloads import (
     DownloadChecksumMismatchException,
@@ -637,9 +637,10 @@ class Controller(QObject):
     def on_sync_started(self) -> None:
         self.sync_started.emit(datetime.utcnow())
 
-    def on_sync_success(self) -> None:
+    def on_sync_success(self, changed_source_uuids: Optional[Set[str]] = None) -> None:
         """
-        Called when synchronization of data via the API queue succeeds.
+        Called when synchronization of data via the API queue succeeds, with the UUIDs of the
+        sources that changed, or None if that is not known.
 
             * Set last sync flag
             * Download new messages and replies
@@ -655,7 +656,7 @@ class Controller(QObject):
         missing_files = storage.update_missing_files(self.data_dir, self.session)
         for missed_file in missing_files:
             self.file_missing.emit(missed_file.source.uuid, missed_file.uuid, str(missed_file))
-        self.update_sources()
+        self.update_sources(changed_source_uuids)
         self.gui.refresh_current_source_conversation()
         self.download_new_messages()
         self.download_new_replies()
@@ -709,12 +710,14 @@ class Controller(QObject):
         """
         self.gui.show_last_sync(self.get_last_sync())
 
-    def update_sources(self) -> None:
+    def update_sources(self, changed_source_uuids: Optional[Set[str]] = None) -> None:
         """
         Display the updated list of sources with those found in local storage.
+
+        Only the sources in changed_source_uuids are refreshed in the list, unless it is None.
         """
         sources = list(storage.get_local_sources(self.session))
-        self.gui.show_sources(sources)
+        self.gui.show_sources(sources, changed_source_uuids)
 
     def mark_seen(self, source: db.Source) -> None:
         """
@@ -726,29 +729,12 @@ class Controller(QObject):
             if not self.authenticated_user:
                 return
 
-            # Prepare the lists of uuids to mark as seen by the current user. Continue to process
-            # the next item if the source conversation item has already been seen by the current
-            # user or if it no longer exists (individual conversation items can be deleted via the
-            # web journalist interface).
-            current_user_id = self.authenticated_user.id
-            files = []  # type: List[str]
-            messages = []  # type: List[str]
-            replies = []  # type: List[str]
-            source_items = source.collection
-            for item in source_items:
-                try:
-                    if item.seen_by(current_user_id):
-                        continue
-
-                    if isinstance(item, db.File):
-                        files.append(item.uuid)
-                    elif isinstance(item, db.Message):
-                        messages.append(item.uuid)
-                    elif isinstance(item, db.Reply):
-                        replies.append(item.uuid)
-                except sqlalchemy.exc.InvalidRequestError as e:
-                    logger.debug(e)
-                    continue
+            # Look up the uuids to mark as seen by the current user. Individual conversation items
+            # can be deleted via the web journalist interface, in which case they are no longer
+            # in the database and are left out.
+            files, messages, replies = storage.get_unseen_items(
+                self.session, source.id, self.authenticated_user.id
+            )
 
             # If there's nothing to be marked as seen, just return.
             if not files and not messages and not replies:
@@ -791,7 +777,8 @@ class Controller(QObject):
     def logout(self) -> None:
         """
         If the token is not already invalid, make an api call to logout and invalidate the token.
-        Then mark all pending draft replies as failed, stop the queues, and show the user as logged
+        Then mark all pending draft replies as failed, stop the queues, end the session with the
+        export agent, forget which conversation transcripts were saved, and show the user as logged
         out in the GUI.
         """
 
@@ -805,6 +792,8 @@ class Controller(QObject):
 
         self.api_sync.stop()
         self.api_job_queue.stop()
+        export.getService().end_session()
+        conversation.clear_saved_transcripts()
         self.gui.logout()
 
         self.is_authenticated = False
@@ -822,25 +811,40 @@ class Controller(QObject):
 
     @login_required
     def _submit_download_job(
-        self, object_type: Union[Type[db.Reply], Type[db.Message], Type[db.File]], uuid: str
+        self,
+        object_type: Union[Type[db.Reply], Type[db.Message], Type[db.File]],
+        uuid: str,
+        source_uuid: Optional[str] = None,
     ) -> None:
         if object_type == db.Reply:
             job = ReplyDownloadJob(
-                uuid, self.data_dir, self.gpg
+                uuid, self.data_dir, self.gpg, source_uuid
             )  # type: Union[ReplyDownloadJob, MessageDownloadJob, FileDownloadJob]
             job.success_signal.connect(self.on_reply_download_success)
             job.failure_signal.connect(self.on_reply_download_failure)
         elif object_type == db.Message:
-            job = MessageDownloadJob(uuid, self.data_dir, self.gpg)
+            job = MessageDownloadJob(uuid, self.data_dir, self.gpg, source_uuid)
             job.success_signal.connect(self.on_message_download_success)
             job.failure_signal.connect(self.on_message_download_failure)
         elif object_type == db.File:
             job = FileDownloadJob(uuid, self.data_dir, self.gpg)
             job.success_signal.connect(self.on_file_download_success)
             job.failure_signal.connect(self.on_file_download_failure)
+            job.download_started.connect(self.api_sync.download_started)
+            job.download_finished.connect(self.api_sync.download_finished)
 
         self.add_job.emit(job)
 
+    def prioritize_downloads(
+        self, selected_source_uuid: Optional[str], visible_source_uuids: List[str]
+    ) -> None:
+        """
+        Download the messages and replies of the selected source first, then those of the sources
+        shown in the source list, so that the conversations the journalist is looking at become
+        readable however many other items are waiting to be downloaded.
+        """
+        self.api_job_queue.prioritize_sources(selected_source_uuid, visible_source_uuids)
+
     def download_new_messages(self) -> None:
         new_messages = storage.find_new_messages(self.session)
 
@@ -850,7 +854,7 @@ class Controller(QObject):
                     f"Download of message {message.uuid} failed since client start; not retrying."
                 )
             else:
-                self._submit_download_job(type(message), message.uuid)
+                self._submit_download_job(type(message), message.uuid, message.source.uuid)
 
     def on_message_download_success(self, uuid: str) -> None:
         """
@@ -885,7 +889,7 @@ class Controller(QObject):
                     f"Download of reply {reply.uuid} failed since client start; not retrying."
                 )
             else:
-                self._submit_download_job(type(reply), reply.uuid)
+                self._submit_download_job(type(reply), reply.uuid, reply.source.uuid)
 
     def on_reply_download_success(self, uuid: str) -> None:
         """
@@ -1000,6 +1004,7 @@ class Controller(QObject):
         # Delete conversation locally to ensure that it does not remain on disk until next sync
         storage.delete_local_conversation_by_source_uuid(self.session, uuid, self.data_dir)
         self.conversation_deletion_successful.emit(uuid, datetime.utcnow())
+        self.api_sync.request_sync()
 
     def on_delete_conversation_failure(self, e: Exception) -> None:
         if isinstance(e, DeleteConversationJobException):
@@ -1016,6 +1021,7 @@ class Controller(QObject):
         logger.info("Source %s successfully scheduled for deletion at server", source_uuid)
         storage.delete_local_source_by_uuid(self.session, source_uuid, self.data_dir)
         self.update_sources()
+        self.api_sync.request_sync()
 
     def on_delete_source_failure(self, e: Exception) -> None:
         if isinstance(e, DeleteSourceJobException):
@@ -1120,6 +1126,7 @@ class Controller(QObject):
         self.session.commit()
         reply = storage.get_reply(self.session, reply_uuid)
         self.reply_succeeded.emit(reply.source.uuid, reply_uuid, reply.content)
+        self.api_sync.request_sync()
 
     def on_reply_failure(
         self, exception: Union[SendReplyJobError, SendReplyJobTimeoutError]
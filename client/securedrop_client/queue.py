@@ -1,8 +1,10 @@
+import heapq
 import itertools
 import logging
 import threading
+import time
 from queue import PriorityQueue
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Iterable, Optional, Set, Tuple
 
 from PyQt5.QtCore import QObject, QThread, pyqtBoundSignal, pyqtSignal, pyqtSlot
 from sdclientapi import API, RequestTimeoutError, ServerConnectionError
@@ -82,6 +84,11 @@ class RunnableQueue(QObject):
     job and continue on to processing the next job. The job itself is responsible for emitting the
     success and failure signals, so when an unexpected error occurs, it should emit the failure
     signal so that the Controller can respond accordingly.
+
+    Jobs that are made once per click are merged into the queued job of the same kind, so that the
+    number of requests does not grow with the number of clicks: a SeenJob waits SEEN_JOB_DELAY
+    seconds in the queue and takes up the items of the SeenJobs added meanwhile, and an
+    UpdateStarJob replaces the star update that is queued for the same source.
     """
 
     # These are the priorities for processing jobs. Lower numbers corresponds to a higher priority.
@@ -93,11 +100,19 @@ class RunnableQueue(QObject):
         DeleteConversationJob: 14,
         SendReplyJob: 15,
         UpdateStarJob: 16,
-        MessageDownloadJob: 17,
-        ReplyDownloadJob: 17,
-        SeenJob: 18,
+        MessageDownloadJob: 19,
+        ReplyDownloadJob: 19,
+        SeenJob: 20,
     }
 
+    # Priorities of the message and reply downloads of the selected source, and of the sources
+    # shown in the source list, which are processed before the other downloads
+    SELECTED_SOURCE_DOWNLOAD_PRIORITY = 17
+    VISIBLE_SOURCE_DOWNLOAD_PRIORITY = 18
+
+    # How long, in seconds, a SeenJob waits in the queue before it is processed
+    SEEN_JOB_DELAY = 1.0
+
     # Signal that is emitted when processing is stopped and queued jobs are cleared
     cleared = pyqtSignal()
 
@@ -112,9 +127,11 @@ class RunnableQueue(QObject):
         api_client: API,
         session_maker: scoped_session,
         queue_updated_signal: Optional[pyqtBoundSignal] = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
         super().__init__()
         self.api_client = api_client
+        self.clock = clock
         self.session_maker = session_maker
         self.queue = RunnablePriorityQueue(
             queue_updated_signal=queue_updated_signal
@@ -125,6 +142,10 @@ class RunnableQueue(QObject):
         self.order_number = itertools.count()
         self.current_job = None  # type: Optional[QueueJob]
 
+        # The sources whose downloads are processed first, see prioritize_sources
+        self.selected_source_uuid: Optional[str] = None
+        self.visible_source_uuids: Set[str] = set()
+
         # Hold when reading/writing self.current_job or mutating queue state
         self.condition_add_or_remove_job = threading.Condition()
 
@@ -143,6 +164,100 @@ class RunnableQueue(QObject):
             return True
         return False
 
+    def _get_priority(self, job: QueueJob) -> int:
+        """
+        Return the priority of the job, which depends on its source for message and reply
+        downloads.
+        """
+        if isinstance(job, (MessageDownloadJob, ReplyDownloadJob)) and job.source_uuid:
+            if job.source_uuid == self.selected_source_uuid:
+                return self.SELECTED_SOURCE_DOWNLOAD_PRIORITY
+            if job.source_uuid in self.visible_source_uuids:
+                return self.VISIBLE_SOURCE_DOWNLOAD_PRIORITY
+        return self.JOB_PRIORITIES[type(job)]
+
+    def prioritize_sources(
+        self, selected_source_uuid: Optional[str], visible_source_uuids: Iterable[str]
+    ) -> None:
+        """
+        Process the message and reply downloads of the selected source first, then those of the
+        sources shown in the source list, and then the others. Jobs that are already queued are
+        moved accordingly.
+
+        Can block while waiting to acquire condition_add_or_remove_job.
+        """
+        with self.condition_add_or_remove_job:
+            visible_source_uuids = set(visible_source_uuids)
+            changed_source_uuids = self.visible_source_uuids ^ visible_source_uuids
+            if selected_source_uuid != self.selected_source_uuid:
+                changed_source_uuids.update((self.selected_source_uuid, selected_source_uuid))
+            self.selected_source_uuid = selected_source_uuid
+            self.visible_source_uuids = visible_source_uuids
+
+            # Only the jobs of the sources that changed get a new priority, which is usually none
+            # of them when the list is scrolled by a few rows
+            with self.queue.mutex:
+                heap = self.queue.queue
+                moved = False
+                for i, (priority, job) in enumerate(heap):
+                    if getattr(job, "source_uuid", None) in changed_source_uuids:
+                        heap[i] = (self._get_priority(job), job)
+                        moved = True
+                if moved:
+                    heapq.heapify(heap)
+
+    def _merge_into_queued_job(self, job: QueueJob) -> bool:
+        """
+        Merge a SeenJob into the queued SeenJob, or an UpdateStarJob into the UpdateStarJob queued
+        for the same source. Return whether the job was merged, in which case it must not be added.
+
+        An UpdateStarJob that undoes the queued one cancels it, since the star is back to what it
+        is on the server, and both jobs succeed without calling the API. One that does the same
+        update succeeds or fails along with the queued one. Either way, every UpdateStarJob that
+        is added reports its outcome.
+
+        When called condition_add_or_remove_job should be held.
+        """
+        if not isinstance(job, (SeenJob, UpdateStarJob)):
+            return False
+
+        for i, (priority, queued_job) in enumerate(self.queue.queue):
+            if isinstance(job, SeenJob) and isinstance(queued_job, SeenJob):
+                queued_job.merge(job)
+            elif (
+                isinstance(job, UpdateStarJob)
+                and isinstance(queued_job, UpdateStarJob)
+                and job.uuid == queued_job.uuid
+            ):
+                if job.is_starred == queued_job.is_starred:
+                    queued_job.success_signal.connect(job.success_signal)
+                    queued_job.failure_signal.connect(job.failure_signal)
+                else:
+                    with self.queue.mutex:
+                        del self.queue.queue[i]
+                        heapq.heapify(self.queue.queue)
+                    logger.debug("Cancelled job {} with {}".format(queued_job, job))
+                    queued_job.success_signal.emit(queued_job.uuid)
+                    job.success_signal.emit(job.uuid)
+                    return True
+            else:
+                continue
+            logger.debug("Merged job {} into {}".format(job, queued_job))
+            return True
+        return False
+
+    def _get_delay(self) -> float:
+        """
+        Return how long to wait before processing the next job, which is only ever needed for a
+        SeenJob since it has the lowest priority.
+
+        When called condition_add_or_remove_job should be held.
+        """
+        priority, job = self.queue.queue[0]
+        if isinstance(job, SeenJob) and job.due_at is not None:
+            return max(job.due_at - self.clock(), 0)
+        return 0
+
     def _clear(self) -> None:
         """
         Reinstantiate the PriorityQueue, rather than trying to clear it via undocumented methods.[1]
@@ -160,13 +275,15 @@ class RunnableQueue(QObject):
         Can block while waiting to acquire condition_add_or_remove_job.
         """
         with self.condition_add_or_remove_job:
-            if self._check_for_duplicate_jobs(job):
+            if self._merge_into_queued_job(job) or self._check_for_duplicate_jobs(job):
                 return
 
             logger.debug("Added {} to queue".format(job))
             current_order_number = next(self.order_number)
             job.order_number = current_order_number
-            priority = self.JOB_PRIORITIES[type(job)]
+            if isinstance(job, SeenJob):
+                job.due_at = self.clock() + self.SEEN_JOB_DELAY
+            priority = self._get_priority(job)
             self.queue.put_nowait((priority, job))
             self.condition_add_or_remove_job.notify()
 
@@ -182,7 +299,7 @@ class RunnableQueue(QObject):
 
         logger.debug("Added {} to queue".format(job))
         job.remaining_attempts = DEFAULT_NUM_ATTEMPTS
-        priority = self.JOB_PRIORITIES[type(job)]
+        priority = self._get_priority(job)
         self.queue.put_nowait((priority, job))
         self.condition_add_or_remove_job.notify()
 
@@ -212,6 +329,13 @@ class RunnableQueue(QObject):
         while True:
             with self.condition_add_or_remove_job:
                 self.condition_add_or_remove_job.wait_for(lambda: not self.queue.empty())
+
+                # Wait until the next job is due, or until a more urgent job is added
+                delay = self._get_delay()
+                if delay:
+                    self.condition_add_or_remove_job.wait(delay)
+                    continue
+
                 priority, self.current_job = self.queue.get(block=False)
 
             if isinstance(self.current_job, ClearQueueJob):
@@ -374,6 +498,15 @@ class ApiJobQueue(QObject):
             logger.debug("Resuming download queue")
             self.download_file_queue.resume.emit()
 
+    def prioritize_sources(
+        self, selected_source_uuid: Optional[str], visible_source_uuids: Iterable[str]
+    ) -> None:
+        """
+        Process the message and reply downloads of the supplied sources first. File downloads are
+        always requested by the journalist, so their order is left as is.
+        """
+        self.main_queue.prioritize_sources(selected_source_uuid, visible_source_uuids)
+
     @pyqtSlot(object)
     def enqueue(self, job: ApiJob) -> None:
         """
@@ -2,6 +2,10 @@
 Functions needed to work with non-code resources such as images (icons and SVG
 files) and CSS (for configuring the look of the UI).
 
+Every resource is read from disk once per process: icons, images, SVG renderers,
+movies and stylesheets are cached by name and shared by all the widgets that use
+them.
+
 Copyright (C) 2018  The Freedom of the Press Foundation.
 
 This program is free software: you can redistribute it and/or modify
@@ -17,13 +21,20 @@ GNU Affero General Public License for more details.
 You should have received a copy of the GNU Affero General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import functools
 import os
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from pkg_resources import resource_filename, resource_string
-from PyQt5.QtCore import QDir
-from PyQt5.QtGui import QFontDatabase, QIcon, QMovie, QPixmap
-from PyQt5.QtSvg import QSvgWidget
+from PyQt5 import sip
+from PyQt5.QtCore import QDir, QObject, QSize
+from PyQt5.QtGui import QFontDatabase, QIcon, QMovie, QPainter, QPaintEvent, QPixmap
+from PyQt5.QtSvg import QSvgRenderer, QSvgWidget
+
+# Resources that are QObjects, which are created again if they were deleted along with the
+# application
+_svg_renderers: Dict[str, QSvgRenderer] = {}
+_movies: Dict[Tuple[str, int, int], QMovie] = {}
 
 # Add resource directories to the search path.
 QDir.addSearchPath("images", resource_filename(__name__, "images"))
@@ -86,7 +97,24 @@ def load_icon(
         The icon that displays the contents of the SVG files.
 
     """
+    return QIcon(
+        _load_icon(
+            normal, disabled, active, selected, normal_off, disabled_off, active_off, selected_off
+        )
+    )
+
 
+@functools.lru_cache(maxsize=None)
+def _load_icon(
+    normal: str,
+    disabled: Optional[str],
+    active: Optional[str],
+    selected: Optional[str],
+    normal_off: Optional[str],
+    disabled_off: Optional[str],
+    active_off: Optional[str],
+    selected_off: Optional[str],
+) -> QIcon:
     icon = QIcon()
 
     icon.addFile(path(normal), mode=QIcon.Normal, state=QIcon.On)
@@ -115,20 +143,59 @@ def load_icon(
     return icon
 
 
+class SharedSvgWidget(QSvgWidget):
+    """
+    A QSvgWidget that draws with the shared renderer of its SVG file instead of parsing a copy
+    of the file.
+    """
+
+    def __init__(self, renderer: QSvgRenderer) -> None:
+        super().__init__()
+        self._renderer = renderer
+
+    def renderer(self) -> QSvgRenderer:
+        return self._renderer
+
+    def sizeHint(self) -> QSize:
+        if self._renderer.isValid():
+            return self._renderer.defaultSize()
+        return super().sizeHint()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        self._renderer.render(painter)
+
+
 def load_svg(name: str) -> QSvgWidget:
     """
     Return a QSvgWidget representation of a file in the resources.
     """
-    return QSvgWidget(path(name))
+    return SharedSvgWidget(load_svg_renderer(name))
+
+
+def load_svg_renderer(name: str) -> QSvgRenderer:
+    """
+    Return the shared QSvgRenderer of a file in the resources.
+    """
+    renderer = _svg_renderers.get(name)
+    if renderer is None or sip.isdeleted(renderer):
+        renderer = _svg_renderers[name] = QSvgRenderer(path(name))
+    return renderer
 
 
 def load_image(name: str) -> QPixmap:
     """
     Return a QPixmap representation of a file in the resources.
     """
+    return QPixmap(_load_image(name))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_image(name: str) -> QPixmap:
     return QPixmap(path(name))
 
 
+@functools.lru_cache(maxsize=None)
 def load_css(name: str) -> str:
     """
     Return the contents of the referenced CSS file in the resources.
@@ -139,5 +206,62 @@ def load_css(name: str) -> str:
 def load_movie(name: str) -> QMovie:
     """
     Return a GIF animation to use in the UI.
+
+    The movie belongs to the caller. Widgets that can have many instances should use
+    load_shared_movie instead.
     """
     return QMovie(path(name))
+
+
+class SharedMovie:
+    """
+    One user's reference to a movie that is shared by every widget showing the same animation
+    at the same size. The movie runs while any of its references is started.
+    """
+
+    _started_counts: Dict[QMovie, int] = {}
+
+    def __init__(self, movie: QMovie) -> None:
+        self.movie = movie
+        self.is_started = False
+
+    def start(self) -> None:
+        if self.is_started:
+            return
+
+        self.is_started = True
+        count = self._started_counts.get(self.movie, 0) + 1
+        self._started_counts[self.movie] = count
+        if count == 1:
+            self.movie.start()
+
+    def stop(self) -> None:
+        if not self.is_started:
+            return
+
+        self.is_started = False
+        count = self._started_counts.pop(self.movie) - 1
+        if count:
+            self._started_counts[self.movie] = count
+        elif not sip.isdeleted(self.movie):
+            self.movie.stop()
+
+
+def load_shared_movie(name: str, owner: QObject, size: Optional[QSize] = None) -> SharedMovie:
+    """
+    Return a new reference to the shared GIF animation of a file in the resources, scaled to
+    size if supplied.
+
+    The reference is stopped when its owner is destroyed, so that a widget that is deleted while
+    it is animating does not keep the movie running.
+    """
+    key = (name, size.width(), size.height()) if size else (name, -1, -1)
+    movie = _movies.get(key)
+    if movie is None or sip.isdeleted(movie):
+        movie = _movies[key] = QMovie(path(name))
+        if size:
+            movie.setScaledSize(size)
+
+    reference = SharedMovie(movie)
+    owner.destroyed.connect(reference.stop)
+    return reference
@@ -5,7 +5,7 @@ Stores and provides read/write access to the internal state of the SecureDrop Cl
 
 Note: the Graphical User Interface MUST NOT write state, except in QActions.
 """
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 
@@ -25,48 +25,58 @@ class State(QObject):
     def __init__(self, database: Optional[Database] = None) -> None:
         super().__init__()
         self._files: Dict[FileId, File] = {}
-        self._conversation_files: Dict[ConversationId, List[File]] = {}
+        # The files of each conversation, in the order in which they were added
+        self._conversation_files: Dict[ConversationId, Dict[FileId, File]] = {}
         self._selected_conversation: Optional[ConversationId] = None
 
         if database is not None:
             self._initialize_from_database(database)
 
     def _initialize_from_database(self, database: Database) -> None:
-        persisted_files = database.get_files()
-        for persisted_file in persisted_files:
-            conversation_id = ConversationId(persisted_file.source.uuid)
-            file_id = FileId(persisted_file.uuid)
-            self.add_file(conversation_id, file_id)
-            if persisted_file.is_downloaded:
-                known_file = self.file(file_id)
-                if known_file is not None:
-                    known_file.is_downloaded = True
+        for file_uuid, source_uuid, is_downloaded in database.get_file_states():
+            file_id = FileId(file_uuid)
+            self._add_file(ConversationId(source_uuid), file_id)
+            if is_downloaded:
+                self._files[file_id].is_downloaded = True
 
     def add_file(self, cid: ConversationId, fid: FileId) -> None:
-        file = File(fid)  # store references to the same object
-        if fid not in self._files.keys():
+        self.add_files([(cid, fid)])
+
+    def add_files(self, files: Iterable[Tuple[ConversationId, FileId]]) -> None:
+        """
+        Add files to their conversations, and notify once if any was added to the selected one.
+        """
+        selected_conversation_files_changed = False
+        for cid, fid in files:
+            if self._add_file(cid, fid) and cid == self._selected_conversation:
+                selected_conversation_files_changed = True
+
+        if selected_conversation_files_changed:
+            self.selected_conversation_files_changed.emit()
+
+    def _add_file(self, cid: ConversationId, fid: FileId) -> bool:
+        """
+        Add a file to a conversation, and return whether the conversation didn't have it yet.
+        """
+        file = self._files.get(fid)
+        if file is None:
+            file = File(fid)  # store references to the same object
             self._files[fid] = file
 
-        if cid not in self._conversation_files.keys():
-            self._conversation_files[cid] = []
+        conversation_files = self._conversation_files.setdefault(cid, {})
+        if fid in conversation_files:
+            return False
 
-        file_is_known = False
-        for known_file in self._conversation_files[cid]:
-            if fid == known_file.id:
-                file_is_known = True
-        if not file_is_known:
-            self._conversation_files[cid].append(file)
-            if cid == self._selected_conversation:
-                self.selected_conversation_files_changed.emit()
+        conversation_files[fid] = file
+        return True
 
     def remove_conversation_files(self, id: ConversationId) -> None:
-        self._conversation_files[id] = []
+        self._conversation_files[id] = {}
         if id == self._selected_conversation:
             self.selected_conversation_files_changed.emit()
 
     def conversation_files(self, id: ConversationId) -> List[File]:
-        default: List[File] = []
-        return self._conversation_files.get(id, default)
+        return list(self._conversation_files.get(id, {}).values())
 
     def file(self, id: FileId) -> Optional[File]:
         return self._files.get(id, None)
@@ -95,8 +105,7 @@ class State(QObject):
         if selected_conversation_id is None:
             return False
 
-        default: List[File] = []
-        for f in self._conversation_files.get(selected_conversation_id, default):
+        for f in self._conversation_files.get(selected_conversation_id, {}).values():
             if not f.is_downloaded:
                 return True
         return False
@@ -23,17 +23,18 @@ import logging
 import os
 import re
 import shutil
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
 
 from dateutil.parser import parse
 from sdclientapi import API
 from sdclientapi import Reply as SDKReply
 from sdclientapi import Source as SDKSource
 from sdclientapi import Submission as SDKSubmission
-from sqlalchemy import and_, desc, or_
+from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.session import Session
 
@@ -52,6 +53,7 @@ from securedrop_client.db import (
     SeenReply,
     Source,
     User,
+    collection_sort_key,
 )
 from securedrop_client.utils import SourceCache, chronometer
 
@@ -101,6 +103,14 @@ def get_local_files(session: Session) -> List[File]:
     return session.query(File).all()
 
 
+def get_local_file_states(session: Session) -> List[Tuple[str, str, bool]]:
+    """
+    Return the UUID of every file in the local database, the UUID of its source and whether it
+    was downloaded, without loading the files and sources themselves.
+    """
+    return session.query(File.uuid, Source.uuid, File.is_downloaded).join(File.source).all()
+
+
 def get_local_replies(session: Session) -> List[Reply]:
     """
     Return all reply objects from the local database that are successful.
@@ -108,6 +118,170 @@ def get_local_replies(session: Session) -> List[Reply]:
     return session.query(Reply).all()
 
 
+def get_latest_server_items(
+    session: Session, source_ids: Optional[List[int]] = None
+) -> Dict[int, Union[Message, File, Reply]]:
+    """
+    Return the last item of the server collection of each source, by source id, for the supplied
+    source ids or for all sources. Sources without any message, file or reply are left out.
+
+    This finds the highest file_counter of every source in each table, which the unique
+    constraint on (source_id, file_counter) makes cheap, instead of loading every item.
+    """
+    latest_items: Dict[int, Union[Message, File, Reply]] = {}
+    for model in (Message, File, Reply):
+        latest_file_counters = session.query(
+            model.source_id, func.max(model.file_counter).label("file_counter")
+        ).group_by(model.source_id)
+        if source_ids is not None:
+            latest_file_counters = latest_file_counters.filter(model.source_id.in_(source_ids))
+        subquery = latest_file_counters.subquery()
+
+        items = session.query(model).join(
+            subquery,
+            and_(
+                model.source_id == subquery.c.source_id,
+                model.file_counter == subquery.c.file_counter,
+            ),
+        )
+        for item in items:
+            latest_item = latest_items.get(item.source_id)
+            if latest_item is None or item.file_counter > latest_item.file_counter:
+                latest_items[item.source_id] = item
+
+    return latest_items
+
+
+def get_seen_by_lists(
+    session: Session, source_id: int, min_file_counter: int = 0
+) -> Dict[str, Dict[str, User]]:
+    """
+    Return the users who have seen each message and reply of a source, by item UUID, in one
+    query per table instead of one per item. Only items with a file_counter of at least
+    min_file_counter are included.
+
+    Each value is a dictionary with the user's username as its key and the user object as its
+    value, as returned by the `seen_by_list` property of the items.
+    """
+    seen_by_lists: Dict[str, Dict[str, User]] = {}
+    for model, seen_model, item_id in (
+        (Message, SeenMessage, SeenMessage.message_id),
+        (Reply, SeenReply, SeenReply.reply_id),
+    ):
+        seen_by = (
+            session.query(model.uuid, User)
+            .join(seen_model, item_id == model.id)
+            .join(User, seen_model.journalist_id == User.id)
+            .filter(model.source_id == source_id, model.file_counter >= min_file_counter)
+        )
+        for uuid, user in seen_by:
+            seen_by_lists.setdefault(uuid, {})[user.username] = user
+
+    return seen_by_lists
+
+
+def get_conversation_page(
+    session: Session, source_id: int, count: int
+) -> Tuple[List[Union[DraftReply, File, Message, Reply]], int]:
+    """
+    Return the newest count conversation items of a source, in the same order as
+    `Source.collection`, and the number of older items that are left out.
+
+    Only the newest count messages, files and replies are loaded, by file_counter, with one
+    query for each kind of item. Draft replies are always loaded. Items that are already in the
+    session are reloaded, since other sessions may have changed them.
+    """
+    items: List[Union[DraftReply, File, Message, Reply]] = []
+    total = 0
+    for model in (Message, File, Reply):
+        query = session.query(model).filter(model.source_id == source_id)
+        total += query.count()
+        items.extend(query.order_by(desc(model.file_counter)).limit(count).populate_existing())
+
+    draft_replies = (
+        session.query(DraftReply)
+        .filter(DraftReply.source_id == source_id)
+        .populate_existing()
+        .all()
+    )
+    items.extend(draft_replies)
+    total += len(draft_replies)
+
+    items.sort(key=collection_sort_key)
+    page = items[-count:] if count > 0 else []
+    return page, total - len(page)
+
+
+def count_conversation_items(session: Session, source_id: int) -> int:
+    """
+    Return the number of conversation items of a source, draft replies included.
+    """
+    return sum(
+        session.query(model).filter(model.source_id == source_id).count()
+        for model in (Message, File, Reply, DraftReply)
+    )
+
+
+def get_first_file_counter(session: Session, source_id: int) -> Optional[int]:
+    """
+    Return the file_counter of the oldest conversation item of a source that is not a pending
+    draft reply, which is the first item of `Source.collection` if there is any, or None.
+    """
+    queries = [
+        session.query(func.min(model.file_counter)).filter(model.source_id == source_id)
+        for model in (Message, File, Reply)
+    ]
+    queries.append(
+        session.query(func.min(DraftReply.file_counter))
+        .join(ReplySendStatus)
+        .filter(
+            DraftReply.source_id == source_id,
+            ReplySendStatus.name != ReplySendStatusCodes.PENDING.value,
+        )
+    )
+    file_counters = [query.scalar() for query in queries]
+    return min((counter for counter in file_counters if counter is not None), default=None)
+
+
+def get_unseen_items(
+    session: Session, source_id: int, journalist_id: int
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Return the UUIDs of the files, messages and replies of a source that the journalist has not
+    seen, each in conversation order. Each kind of item is looked up with a single query that
+    leaves out the items with a seen record for the journalist.
+    """
+    unseen_items = []
+    for model, seen_model, item_id in (
+        (File, SeenFile, SeenFile.file_id),
+        (Message, SeenMessage, SeenMessage.message_id),
+        (Reply, SeenReply, SeenReply.reply_id),
+    ):
+        seen = session.query(seen_model).filter(
+            item_id == model.id, seen_model.journalist_id == journalist_id
+        )
+        unseen = (
+            session.query(model.uuid)
+            .filter(model.source_id == source_id, ~seen.exists())
+            .order_by(model.file_counter)
+        )
+        unseen_items.append([uuid for uuid, in unseen])
+
+    files, messages, replies = unseen_items
+    return files, messages, replies
+
+
+def refresh_replies(session: Session, source_id: int, min_file_counter: int = 0) -> None:
+    """
+    Reload the replies of a source and their senders from the database in a single query, so
+    that changes made by other sessions, e.g. during a sync, are picked up. Only replies with a
+    file_counter of at least min_file_counter are reloaded.
+    """
+    session.query(Reply).options(joinedload(Reply.journalist)).filter(
+        Reply.source_id == source_id, Reply.file_counter >= min_file_counter
+    ).populate_existing().all()
+
+
 def get_remote_data(api: API) -> Tuple[List[SDKSource], List[SDKSubmission], List[SDKReply]]:
     """
     Given an authenticated connection to the SecureDrop API, get sources,
@@ -163,11 +337,14 @@ def update_local_storage(
     remote_submissions: List[SDKSubmission],
     remote_replies: List[SDKReply],
     data_dir: str,
-) -> None:
+) -> Set[str]:
     """
     Given a database session and collections of remote sources, submissions and
     replies from the SecureDrop API, ensures the local database is updated
     with this data.
+
+    Return the UUIDs of the sources that were added or changed, or whose submissions or
+    replies were added, changed or deleted.
     """
     remote_sources = sanitize_sources(remote_sources)
     remote_submissions = sanitize_submissions_or_replies(remote_submissions)
@@ -186,8 +363,9 @@ def update_local_storage(
     # The following update_* functions may change the database state.
     # Because of that, each get_local_* function needs to be called just before
     # its respective update_* function.
+    changed_source_uuids: Set[str] = set()
     with chronometer(logger, "update_sources"):
-        update_sources(
+        changed_source_uuids |= update_sources(
             remote_sources,
             get_local_sources(session),
             skip_conversation_uuids,
@@ -197,7 +375,7 @@ def update_local_storage(
         )
 
     with chronometer(logger, "update_files"):
-        update_files(
+        changed_source_uuids |= update_files(
             remote_files,
             get_local_files(session),
             skip_conversation_uuids,
@@ -207,7 +385,7 @@ def update_local_storage(
         )
 
     with chronometer(logger, "update_messages"):
-        update_messages(
+        changed_source_uuids |= update_messages(
             remote_messages,
             get_local_messages(session),
             skip_conversation_uuids,
@@ -217,7 +395,7 @@ def update_local_storage(
         )
 
     with chronometer(logger, "update_replies"):
-        update_replies(
+        changed_source_uuids |= update_replies(
             remote_replies,
             get_local_replies(session),
             skip_conversation_uuids,
@@ -240,6 +418,8 @@ def update_local_storage(
     # there is only ever one sync happening at a given time.
     _cleanup_flagged_locally_deleted(session, skip_conversations, skip_sources)
 
+    return changed_source_uuids
+
 
 def _get_flagged_locally_deleted(
     session: Session,
@@ -283,15 +463,28 @@ def _cleanup_flagged_locally_deleted(
     session.commit()
 
 
-def lazy_setattr(o: Any, a: str, v: Any) -> None:
+def lazy_setattr(o: Any, a: str, v: Any) -> bool:
     """
-    Only assign v to o.a if they differ.
+    Only assign v to o.a if they differ, and return whether it was assigned.
 
     Intended to avoid unnecessarily dirtying SQLAlchemy objects during
     sync.
     """
     if getattr(o, a) != v:
         setattr(o, a, v)
+        return True
+    return False
+
+
+def parse_utc_datetime(value: str) -> datetime:
+    """
+    Parse a timestamp from the server into a naive datetime in UTC, which is how timestamps are
+    read back from the local database, so that they can be compared.
+    """
+    parsed = parse(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
 
 def update_sources(
@@ -301,7 +494,7 @@ def update_sources(
     skip_uuids_deleted_source: List[str],
     session: Session,
     data_dir: str,
-) -> None:
+) -> Set[str]:
     """
     Given collections of remote sources, the current local sources, a list of
     UUIDs to skip, and a
@@ -314,7 +507,10 @@ def update_sources(
       (prevent re-downloading data that has just been locally deleted)
     * Local items not returned in the remote sources are deleted from the
       local database.
+
+    Return the UUIDs of the sources that were added or changed.
     """
+    changed_source_uuids = set()
     local_sources_by_uuid = {s.uuid: s for s in local_sources}
     for source in remote_sources:
         if source.uuid in skip_uuids_deleted_source:
@@ -327,13 +523,15 @@ def update_sources(
             logger.debug("Update source {}".format(source.uuid))
             local_source = local_sources_by_uuid[source.uuid]
 
-            lazy_setattr(local_source, "journalist_designation", source.journalist_designation)
-            lazy_setattr(local_source, "is_flagged", source.is_flagged)
-            lazy_setattr(local_source, "interaction_count", source.interaction_count)
-            lazy_setattr(local_source, "is_starred", source.is_starred)
-            lazy_setattr(local_source, "last_updated", parse(source.last_updated))
-            lazy_setattr(local_source, "public_key", source.key["public"])
-            lazy_setattr(local_source, "fingerprint", source.key["fingerprint"])
+            changes = [
+                lazy_setattr(local_source, "journalist_designation", source.journalist_designation),
+                lazy_setattr(local_source, "is_flagged", source.is_flagged),
+                lazy_setattr(local_source, "interaction_count", source.interaction_count),
+                lazy_setattr(local_source, "is_starred", source.is_starred),
+                lazy_setattr(local_source, "last_updated", parse_utc_datetime(source.last_updated)),
+                lazy_setattr(local_source, "public_key", source.key["public"]),
+                lazy_setattr(local_source, "fingerprint", source.key["fingerprint"]),
+            ]
 
             # If source files and messages have been locally-deleted, set the document count
             # to 0. Otherwise, populate with document count.
@@ -343,10 +541,15 @@ def update_sources(
                         source.uuid
                     )
                 )
-                lazy_setattr(local_source, "document_count", 0)
+                changes.append(lazy_setattr(local_source, "document_count", 0))
 
             else:
-                lazy_setattr(local_source, "document_count", source.number_of_documents)
+                changes.append(
+                    lazy_setattr(local_source, "document_count", source.number_of_documents)
+                )
+
+            if any(changes):
+                changed_source_uuids.add(source.uuid)
 
             # Removing the UUID from local_sources_by_uuid ensures
             # this record won't be deleted at the end of this
@@ -361,12 +564,13 @@ def update_sources(
                 is_flagged=source.is_flagged,
                 interaction_count=source.interaction_count,
                 is_starred=source.is_starred,
-                last_updated=parse(source.last_updated),
+                last_updated=parse_utc_datetime(source.last_updated),
                 document_count=source.number_of_documents,
                 public_key=source.key["public"],
                 fingerprint=source.key["fingerprint"],
             )
             session.add(ns)
+            changed_source_uuids.add(source.uuid)
 
             logger.debug("Added new source {}".format(source.uuid))
 
@@ -379,6 +583,8 @@ def update_sources(
 
     session.commit()
 
+    return changed_source_uuids
+
 
 def update_files(
     remote_submissions: List[SDKSubmission],
@@ -387,8 +593,8 @@ def update_files(
     skip_uuids_deleted_source: List[str],
     session: Session,
     data_dir: str,
-) -> None:
-    __update_submissions(
+) -> Set[str]:
+    return __update_submissions(
         File,
         remote_submissions,
         local_submissions,
@@ -406,8 +612,8 @@ def update_messages(
     skip_uuids_deleted_source: List[str],
     session: Session,
     data_dir: str,
-) -> None:
-    __update_submissions(
+) -> Set[str]:
+    return __update_submissions(
         Message,
         remote_submissions,
         local_submissions,
@@ -426,7 +632,7 @@ def __update_submissions(
     skip_uuids_deleted_source: List[str],
     session: Session,
     data_dir: str,
-) -> None:
+) -> Set[str]:
     """
     The logic for updating files and messages is effectively the same, so this function is somewhat
     overloaded to allow us to do both in a DRY way.
@@ -437,7 +643,10 @@ def __update_submissions(
           re-downloading locally-deleted submissions during a network race condition).
     * Local submissions not returned in the remote submissions are deleted
       from the local database.
+
+    Return the UUIDs of the sources whose submissions were added, changed or deleted.
     """
+    changed_source_uuids = set()
     local_submissions_by_uuid = {s.uuid: s for s in local_submissions}
     source_cache = SourceCache(session)
 
@@ -451,14 +660,23 @@ def __update_submissions(
 
         local_submission = local_submissions_by_uuid.get(submission.uuid)
         if local_submission:
-            lazy_setattr(local_submission, "size", submission.size)
-            lazy_setattr(local_submission, "is_read", submission.is_read)
-            lazy_setattr(local_submission, "download_url", submission.download_url)
+            changes = [
+                lazy_setattr(local_submission, "size", submission.size),
+                lazy_setattr(local_submission, "is_read", submission.is_read),
+                lazy_setattr(local_submission, "download_url", submission.download_url),
+            ]
 
             if model == File:
-                add_seen_file_records(local_submission.id, submission.seen_by, session)
+                changes.append(
+                    add_seen_file_records(local_submission.id, submission.seen_by, session)
+                )
             elif model == Message:
-                add_seen_message_records(local_submission.id, submission.seen_by, session)
+                changes.append(
+                    add_seen_message_records(local_submission.id, submission.seen_by, session)
+                )
+
+            if any(changes):
+                changed_source_uuids.add(submission.source_uuid)
 
             # Removing the UUID from local_uuids ensures this record won't be
             # deleted at the end of this function.
@@ -488,6 +706,7 @@ def __update_submissions(
                     add_seen_file_records(ns.id, submission.seen_by, session)
                 elif model == Message:
                     add_seen_message_records(ns.id, submission.seen_by, session)
+                changed_source_uuids.add(submission.source_uuid)
                 logger.debug(f"Added {model.__name__} {submission.uuid}")
 
     # The uuids remaining in local_uuids do not exist on the remote server, so
@@ -497,6 +716,7 @@ def __update_submissions(
     deleted_submission_directory_names = set()
     for deleted_submission in local_submissions_by_uuid.values():
         deleted_submission_directory_names.add(deleted_submission.source.journalist_filename)
+        changed_source_uuids.add(deleted_submission.source.uuid)
 
         # The local method could have deleted these files and submissions already
         try:
@@ -519,18 +739,21 @@ def __update_submissions(
             except OSError:
                 logger.error("Could not check {}".format(directory_name))
 
+    return changed_source_uuids
+
 
-def add_seen_file_records(file_id: int, journalist_uuids: List[str], session: Session) -> None:
+def add_seen_file_records(file_id: int, journalist_uuids: List[str], session: Session) -> bool:
     """
-    Add a seen record for each journalist that saw the file.
+    Add a seen record for each journalist that saw the file, and return whether any was added.
     """
+    added = False
     for journalist_uuid in journalist_uuids:
         journalist = session.query(User).filter_by(uuid=journalist_uuid).one_or_none()
 
         # Do not add seen record if journalist is missing from the local db. If the
         # journalist account needs to be created or deleted, wait until the server says so.
         if not journalist:
-            return
+            return added
 
         seen_file = (
             session.query(SeenFile)
@@ -540,19 +763,23 @@ def add_seen_file_records(file_id: int, journalist_uuids: List[str], session: Se
         if not seen_file:
             seen_file = SeenFile(file_id=file_id, journalist_id=journalist.id)
             session.add(seen_file)
+            added = True
 
+    return added
 
-def add_seen_message_records(msg_id: int, journalist_uuids: List[str], session: Session) -> None:
+
+def add_seen_message_records(msg_id: int, journalist_uuids: List[str], session: Session) -> bool:
     """
-    Add a seen record for each journalist that saw the message.
+    Add a seen record for each journalist that saw the message, and return whether any was added.
     """
+    added = False
     for journalist_uuid in journalist_uuids:
         journalist = session.query(User).filter_by(uuid=journalist_uuid).one_or_none()
 
         # Do not add seen record if journalist is missing from the local db. If the
         # journalist account needs to be created or deleted, wait until the server says so.
         if not journalist:
-            return
+            return added
 
         seen_message = (
             session.query(SeenMessage)
@@ -562,19 +789,23 @@ def add_seen_message_records(msg_id: int, journalist_uuids: List[str], session:
         if not seen_message:
             seen_message = SeenMessage(message_id=msg_id, journalist_id=journalist.id)
             session.add(seen_message)
+            added = True
+
+    return added
 
 
-def add_seen_reply_records(reply_id: int, journalist_uuids: List[str], session: Session) -> None:
+def add_seen_reply_records(reply_id: int, journalist_uuids: List[str], session: Session) -> bool:
     """
-    Add a seen record for each journalist that saw the reply.
+    Add a seen record for each journalist that saw the reply, and return whether any was added.
     """
+    added = False
     for journalist_uuid in journalist_uuids:
         journalist = session.query(User).filter_by(uuid=journalist_uuid).one_or_none()
 
         # Do not add seen record if journalist is missing from the local db. If the
         # journalist account needs to be created or deleted, wait until the server says so.
         if not journalist:
-            return
+            return added
 
         seen_reply = (
             session.query(SeenReply)
@@ -584,6 +815,9 @@ def add_seen_reply_records(reply_id: int, journalist_uuids: List[str], session:
         if not seen_reply:
             seen_reply = SeenReply(reply_id=reply_id, journalist_id=journalist.id)
             session.add(seen_reply)
+            added = True
+
+    return added
 
 
 def update_replies(
@@ -593,7 +827,7 @@ def update_replies(
     skip_uuids_deleted_source: List[str],
     session: Session,
     data_dir: str,
-) -> None:
+) -> Set[str]:
     """
     * Existing replies are updated in the local database.
     * New replies have an entry created in the local database.
@@ -601,7 +835,10 @@ def update_replies(
           re-downloading locally-deleted content during a network race condition).
     * Local replies not returned in the remote replies are deleted from the
       local database unless they are pending or failed.
+
+    Return the UUIDs of the sources whose replies were added, changed or deleted.
     """
+    changed_source_uuids = set()
     local_replies_by_uuid = {r.uuid: r for r in local_replies}
     deleted_user = session.query(User).filter_by(username="deleted").one_or_none()
     user_cache: Dict[str, User] = {}
@@ -642,11 +879,14 @@ def update_replies(
         local_reply = local_replies_by_uuid.get(reply.uuid)
 
         if local_reply:
-            lazy_setattr(local_reply, "journalist_id", user.id)
-            lazy_setattr(local_reply, "size", reply.size)
-            lazy_setattr(local_reply, "filename", reply.filename)
-
-            add_seen_reply_records(local_reply.id, reply.seen_by, session)
+            changes = [
+                lazy_setattr(local_reply, "journalist_id", user.id),
+                lazy_setattr(local_reply, "size", reply.size),
+                lazy_setattr(local_reply, "filename", reply.filename),
+                add_seen_reply_records(local_reply.id, reply.seen_by, session),
+            ]
+            if any(changes):
+                changed_source_uuids.add(reply.source_uuid)
 
             del local_replies_by_uuid[reply.uuid]
             logger.debug("Updated reply {}".format(reply.uuid))
@@ -675,6 +915,7 @@ def update_replies(
             session.flush()
 
             add_seen_reply_records(nr.id, reply.seen_by, session)
+            changed_source_uuids.add(reply.source_uuid)
 
             # All replies fetched from the server have succeeded in being sent,
             # so we should delete the corresponding draft locally if it exists.
@@ -700,6 +941,7 @@ def update_replies(
     # delete the related records.
     for deleted_reply in local_replies_by_uuid.values():
         try:
+            changed_source_uuids.add(deleted_reply.source.uuid)
             delete_single_submission_or_reply_on_disk(deleted_reply, data_dir)
             session.delete(deleted_reply)
             logger.debug("Deleted reply {}".format(deleted_reply.uuid))
@@ -711,6 +953,8 @@ def update_replies(
             )
     session.commit()
 
+    return changed_source_uuids
+
 
 def create_or_update_user(
     uuid: str, username: str, firstname: str, lastname: str, session: Session
@@ -1,7 +1,9 @@
 import logging
-from typing import Optional
+import time
+from enum import Enum
+from typing import Callable, Optional, Set
 
-from PyQt5.QtCore import QObject, QThread, QTimer, pyqtBoundSignal, pyqtSignal
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtBoundSignal, pyqtSignal, pyqtSlot
 from sdclientapi import API
 from sqlalchemy.orm import scoped_session
 
@@ -13,17 +15,119 @@ from securedrop_client.crypto import GpgHelper
 logger = logging.getLogger(__name__)
 
 
+class SyncReason(Enum):
+    """
+    Why the next sync is due when it is.
+    """
+
+    DEFAULT = "default"
+    NO_CHANGES = "no changes"
+    LOCAL_ACTION = "local action"
+    LARGE_DOWNLOAD = "large download"
+
+
+class SyncScheduler:
+    """
+    Decides how long to wait after a sync before the next one.
+
+    The wait is TIME_BETWEEN_SYNCS, and doubles after each sync that found no changes, up to
+    MAX_TIME_BETWEEN_SYNCS. The next sync is due right away after a local action, such as sending
+    a reply, and is held back to MAX_TIME_BETWEEN_SYNCS while large files are downloading, so that
+    syncs do not compete with the downloads for the Tor circuit.
+
+    Times are in seconds, as measured by clock.
+    """
+
+    TIME_BETWEEN_SYNCS = 15
+    MAX_TIME_BETWEEN_SYNCS = 60 * 2
+
+    # Downloads of files from this size, in bytes, hold syncs back
+    LARGE_DOWNLOAD_SIZE = 1024 * 1024 * 10
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._last_sync_finished_at: Optional[float] = None
+        self._unchanged_syncs = 0
+        self._sync_requested = False
+        self._large_downloads: Set[str] = set()
+
+    @property
+    def interval(self) -> float:
+        """
+        How long to wait after a sync before the next one.
+        """
+        if self._sync_requested:
+            return 0
+        if self._large_downloads:
+            return self.MAX_TIME_BETWEEN_SYNCS
+        return min(
+            self.TIME_BETWEEN_SYNCS * 2 ** min(self._unchanged_syncs, 8),
+            self.MAX_TIME_BETWEEN_SYNCS,
+        )
+
+    @property
+    def reason(self) -> SyncReason:
+        """
+        Why the interval is what it is.
+        """
+        if self._sync_requested:
+            return SyncReason.LOCAL_ACTION
+        if self._large_downloads:
+            return SyncReason.LARGE_DOWNLOAD
+        if self._unchanged_syncs:
+            return SyncReason.NO_CHANGES
+        return SyncReason.DEFAULT
+
+    def time_until_next_sync(self) -> float:
+        if self._last_sync_finished_at is None:
+            return 0
+        return max(self._last_sync_finished_at + self.interval - self._clock(), 0)
+
+    def request_sync(self) -> None:
+        """
+        Have the next sync start right away, or as soon as the sync in progress has finished.
+        """
+        self._sync_requested = True
+
+    def download_started(self, file_uuid: str, size: int) -> None:
+        if size >= self.LARGE_DOWNLOAD_SIZE:
+            self._large_downloads.add(file_uuid)
+
+    def download_finished(self, file_uuid: str) -> None:
+        self._large_downloads.discard(file_uuid)
+
+    def on_sync_started(self) -> None:
+        self._sync_requested = False
+
+    def on_sync_success(self, changed_source_uuids: Optional[Set[str]] = None) -> None:
+        self._last_sync_finished_at = self._clock()
+        if changed_source_uuids is None or changed_source_uuids:
+            self._unchanged_syncs = 0
+        else:
+            self._unchanged_syncs += 1
+
+    def on_sync_failure(self) -> None:
+        # Try to reconnect at the usual pace
+        self._last_sync_finished_at = self._clock()
+        self._unchanged_syncs = 0
+
+    def reset(self) -> None:
+        """
+        Forget the downloads and the requested sync, which no longer matter once syncs stop.
+        """
+        self._sync_requested = False
+        self._large_downloads.clear()
+
+
 class ApiSync(QObject):
     """
-    ApiSync continuously syncs, waiting 15 seconds between task completion.
+    ApiSync continuously syncs, waiting between syncs as decided by its SyncScheduler.
     """
 
     sync_started = pyqtSignal()
-    sync_success = pyqtSignal()
+    sync_success = pyqtSignal(object)
     sync_failure = pyqtSignal(Exception)
 
-    TIME_BETWEEN_SYNCS_MS = 1000 * 15  # fifteen seconds between syncs
-
     def __init__(
         self,
         api_client: API,
@@ -32,9 +136,14 @@ class ApiSync(QObject):
         data_dir: str,
         sync_thread: QThread,
         app_state: Optional[state.State] = None,
+        clock: Callable[[], float] = time.monotonic,
     ):
         super().__init__()
         self.api_client = api_client
+        self.scheduler = SyncScheduler(clock)
+
+        # Whether a sync started and has not finished yet, after which the next one is scheduled
+        self._syncing = False
 
         if sync_thread is not None:
             self.sync_thread = sync_thread
@@ -54,37 +163,95 @@ class ApiSync(QObject):
         self.sync_thread.started.connect(self.api_sync_bg_task.sync)
 
         self.timer = QTimer()
-        self.timer.setInterval(self.TIME_BETWEEN_SYNCS_MS)
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.sync)
 
+        self.sync_started.connect(self._on_sync_started)
+        self.sync_success.connect(self._on_sync_success)
+        self.sync_failure.connect(self._on_sync_failure)
+
     def start(self, api_client: API) -> None:
         """
         Start metadata syncs.
         """
         self.api_client = api_client
 
-        self.timer.start()
-
         if not self.sync_thread.isRunning():
             logger.debug("Starting sync thread")
             self.api_sync_bg_task.api_client = self.api_client
             self.sync_thread.start()
+        else:
+            self._schedule()
 
     def stop(self) -> None:
         """
         Stop metadata syncs.
         """
         self.api_client = None
+        self.timer.stop()
+        self.scheduler.reset()
 
         if self.sync_thread.isRunning():
             logger.debug("Stopping sync thread")
             self.sync_thread.quit()
 
-    def on_sync_success(self) -> None:
+    def request_sync(self) -> None:
+        """
+        Sync as soon as possible after a local action, so that it shows up from the server.
+        """
+        self.scheduler.request_sync()
+        self._schedule()
+
+    @pyqtSlot(str, int)
+    def download_started(self, file_uuid: str, size: int) -> None:
+        self.scheduler.download_started(file_uuid, size)
+        self._schedule()
+
+    @pyqtSlot(str)
+    def download_finished(self, file_uuid: str) -> None:
+        self.scheduler.download_finished(file_uuid)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """
+        Start the timer for the next sync, unless syncs are stopped or a sync is in progress, in
+        which case the next sync is scheduled when it finishes.
+        """
+        if not self.api_client or self._syncing:
+            return
+
+        time_until_next_sync = self.scheduler.time_until_next_sync()
+        logger.debug(
+            "Next sync in {:.0f}s, every {:.0f}s ({})".format(
+                time_until_next_sync, self.scheduler.interval, self.scheduler.reason.value
+            )
+        )
+        self.timer.start(int(time_until_next_sync * 1000))
+
+    @pyqtSlot()
+    def _on_sync_started(self) -> None:
+        self._syncing = True
+        self.scheduler.on_sync_started()
+
+    @pyqtSlot(object)
+    def _on_sync_success(self, changed_source_uuids: Optional[Set[str]] = None) -> None:
+        self._syncing = False
+        self.scheduler.on_sync_success(changed_source_uuids)
+        self._schedule()
+
+    @pyqtSlot(Exception)
+    def _on_sync_failure(self, result: Exception) -> None:
+        self._syncing = False
+        self.scheduler.on_sync_failure()
+        self._schedule()
+
+    def on_sync_success(self, changed_source_uuids: Optional[Set[str]] = None) -> None:
         """
         Start another sync on success.
+
+        Pass on the UUIDs of the sources that changed, or None if that is not known.
         """
-        self.sync_success.emit()
+        self.sync_success.emit(changed_source_uuids)
 
     def on_sync_failure(self, result: Exception) -> None:
         """
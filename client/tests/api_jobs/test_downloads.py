@@ -3,7 +3,8 @@ import os
 from typing import Tuple
 
 import pytest
-from sdclientapi import BaseError
+from PyQt5.QtTest import QSignalSpy
+from sdclientapi import BaseError, RequestTimeoutError
 from sdclientapi import Submission as SdkSubmission
 
 from securedrop_client.api_jobs.downloads import (
@@ -558,6 +559,36 @@ def test_FileDownloadJob_raises_on_path_traversal_attack(
     decrypt_fn.assert_not_called()
 
 
+def test_FileDownloadJob_signals_download_around_failed_attempt(
+    mocker, homedir, session, session_maker
+):
+    """
+    Ensure that the start and end of the download are signalled even when the download from the
+    server times out, as the job will then be retried.
+    """
+    source = factory.Source()
+    file_ = factory.File(source=source, is_downloaded=False, is_decrypted=None, size=1234)
+    session.add(source)
+    session.add(file_)
+    session.commit()
+
+    gpg = GpgHelper(homedir, session_maker, is_qubes=False)
+    api_client = mocker.MagicMock()
+    api_client.download_submission.side_effect = RequestTimeoutError()
+
+    job = FileDownloadJob(file_.uuid, os.path.join(homedir, "data"), gpg)
+    download_started_emissions = QSignalSpy(job.download_started)
+    download_finished_emissions = QSignalSpy(job.download_finished)
+
+    with pytest.raises(RequestTimeoutError):
+        job.call_api(api_client, session)
+
+    assert len(download_started_emissions) == 1
+    assert download_started_emissions[0] == [file_.uuid, 1234]
+    assert len(download_finished_emissions) == 1
+    assert download_finished_emissions[0] == [file_.uuid]
+
+
 def test_timeout_length_of_file_downloads(mocker, homedir, session, session_maker):
     """
     Ensure that files downloads have timeouts scaled by the size of the file.
@@ -64,3 +64,22 @@ def test_seen_with_reply_only(homedir, mocker, session, source):
     job.call_api(api_client, session)
 
     api_client.seen.assert_called_once_with([], [], [reply.uuid])
+
+
+def test_seen_jobs_for_the_same_items_are_equal():
+    job = SeenJob(["file-1", "file-2"], ["message-1"], [])
+
+    assert job == SeenJob(["file-2", "file-1"], ["message-1"], [])
+    assert job != SeenJob(["file-1"], ["message-1"], [])
+    assert job != SeenJob(["file-1", "file-2"], [], ["message-1"])
+    assert job != "not a job"
+
+
+def test_seen_job_merge():
+    job = SeenJob(["file-1"], ["message-1"], [])
+
+    job.merge(SeenJob(["file-2", "file-1"], [], ["reply-1"]))
+
+    assert job.files == ["file-1", "file-2"]
+    assert job.messages == ["message-1"]
+    assert job.replies == ["reply-1"]
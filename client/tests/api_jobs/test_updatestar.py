@@ -101,3 +101,11 @@ def test_call_api_raises_UpdateStarJobTimeoutError(mocker, session, exception):
     error = f"Failed to update star on source {source.uuid} due to error"
     with pytest.raises(UpdateStarJobTimeoutError, match=error):
         job.call_api(api_client, session)
+
+
+def test_update_star_jobs_are_equal_if_they_update_the_same_source_from_the_same_state():
+    job = UpdateStarJob("source-1", True)
+
+    assert job == UpdateStarJob("source-1", True)
+    assert job != UpdateStarJob("source-1", False)
+    assert job != UpdateStarJob("source-2", True)
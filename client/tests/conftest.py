@@ -7,8 +7,8 @@ from datetime import datetime
 from uuid import uuid4
 
 import pytest
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QMainWindow
+from PyQt5.QtCore import QCoreApplication, QEvent, Qt
+from PyQt5.QtWidgets import QApplication, QMainWindow
 
 from securedrop_client import export, state
 from securedrop_client.app import configure_locale_and_language
@@ -285,6 +285,17 @@ def _alembic_config(homedir):
     return alembic_path
 
 
+@pytest.fixture(scope="function")
+def no_leftover_widgets():
+    """
+    Delete the top-level widgets left over by earlier tests, so that they no longer share
+    resources, such as running animations, with the widgets of this test.
+    """
+    for widget in QApplication.topLevelWidgets():
+        widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
 @pytest.fixture(scope="function")
 def session_maker(homedir):
     return make_session_maker(homedir)
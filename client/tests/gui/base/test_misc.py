@@ -2,8 +2,17 @@
 Tests for the gui helper functions in __init__.py
 """
 from PyQt5.QtCore import QSize, Qt
-
-from securedrop_client.gui.base import SecureQLabel, SvgLabel, SvgPushButton, SvgToggleButton
+from PyQt5.QtGui import QPalette
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from securedrop_client.gui.base import (
+    SecureQLabel,
+    SvgLabel,
+    SvgPushButton,
+    SvgToggleButton,
+    set_style_class,
+    set_style_name,
+)
 from tests.helper import app  # noqa: F401
 
 
@@ -193,3 +202,55 @@ def test_SecureQLabel_trims_leading_and_trailing_whitespace():
     string_with_whitespace = "\n \n this is a string with leading and trailing whitespace \n"
     sl = SecureQLabel(string_with_whitespace)
     assert sl.text() == "this is a string with leading and trailing whitespace"
+
+
+def _styled_label():
+    """
+    Helper. Return a label whose colour depends on its object name and class, in a container
+    with a style sheet like the one of the main window.
+    """
+    container = QWidget()
+    container.setStyleSheet(
+        "#Label { color: #ff0000; }"
+        "#Label_unread { color: #00ff00; }"
+        "#Label.deleting { color: #0000ff; }"
+    )
+    label = QLabel("label", container)
+    label.setObjectName("Label")
+    QVBoxLayout(container).addWidget(label)
+    container.show()
+    return container, label
+
+
+def test_set_style_name():
+    container, label = _styled_label()
+    assert label.palette().color(QPalette.Foreground).name() == "#ff0000"
+
+    set_style_name(label, "Label_unread")
+
+    assert label.objectName() == "Label_unread"
+    assert label.palette().color(QPalette.Foreground).name() == "#00ff00"
+
+
+def test_set_style_name_only_repolishes_changes(mocker):
+    container, label = _styled_label()
+    set_style_class(label, "deleting")
+    repolish = mocker.patch("securedrop_client.gui.base.misc.repolish")
+
+    set_style_name(label, "Label")
+    set_style_class(label, "deleting")
+
+    repolish.assert_not_called()
+
+
+def test_set_style_class():
+    container, label = _styled_label()
+
+    set_style_class(label, "deleting")
+
+    assert label.property("class") == "deleting"
+    assert label.palette().color(QPalette.Foreground).name() == "#0000ff"
+
+    set_style_class(label, "")
+
+    assert label.palette().color(QPalette.Foreground).name() == "#ff0000"
@@ -328,3 +328,65 @@ def test_ExportDialog__update_dialog_when_status_is_unknown(mocker, export_dialo
     export_dialog._update_dialog("Some Unknown Error Status")
     export_dialog._show_generic_error_message.assert_called_once_with()
     assert export_dialog.error_status == "Some Unknown Error Status"
+
+
+def test_ExportDialog__export_files_waits_for_preparation(mocker, export_dialog):
+    preparation = mocker.MagicMock()
+    dialog = ExportDialog(export_dialog._device, "all files and transcript", [], preparation)
+    dialog.passphrase_field.text = mocker.MagicMock(return_value="mock_passphrase")
+
+    dialog._export_files()
+    dialog._on_preparation_progress(1, 3)
+
+    export_dialog._device.export_files.assert_not_called()
+    assert dialog.error_details.text() == "Preparing files: 1 of 3"
+    assert dialog.cancel_button.isEnabled()
+
+    dialog._on_preparation_succeeded(["/some/path/memo.txt", "/some/path/transcript.txt"])
+
+    export_dialog._device.export_files.assert_called_once_with(
+        ["/some/path/memo.txt", "/some/path/transcript.txt"], "mock_passphrase"
+    )
+    assert not dialog.cancel_button.isEnabled()
+
+
+def test_ExportDialog__export_files_after_preparation(mocker, export_dialog):
+    preparation = mocker.MagicMock()
+    dialog = ExportDialog(export_dialog._device, "all files and transcript", [], preparation)
+    dialog.passphrase_field.text = mocker.MagicMock(return_value="mock_passphrase")
+
+    dialog._on_preparation_succeeded(["/some/path/transcript.txt"])
+
+    export_dialog._device.export_files.assert_not_called()
+
+    dialog._export_files()
+
+    export_dialog._device.export_files.assert_called_once_with(
+        ["/some/path/transcript.txt"], "mock_passphrase"
+    )
+
+
+def test_ExportDialog__on_preparation_failed(mocker, export_dialog):
+    preparation = mocker.MagicMock()
+    dialog = ExportDialog(export_dialog._device, "all files and transcript", [], preparation)
+    dialog._export_files()
+
+    dialog._on_preparation_failed(OSError("No space left on device"))
+
+    assert dialog.header.text() == "Export failed"
+    assert dialog.body.text() == "The files could not be prepared for export."
+    assert dialog.continue_button.isEnabled()
+    assert dialog.cancel_button.isEnabled()
+
+    dialog._on_preparation_succeeded(["/some/path/transcript.txt"])
+
+    export_dialog._device.export_files.assert_not_called()
+
+
+def test_ExportDialog_cancel_cancels_preparation(mocker, export_dialog):
+    preparation = mocker.MagicMock()
+    dialog = ExportDialog(export_dialog._device, "all files and transcript", [], preparation)
+
+    dialog.reject()
+
+    preparation.cancel.assert_called_once_with()
@@ -0,0 +1,122 @@
+from pathlib import Path
+
+from PyQt5.QtTest import QSignalSpy
+
+from securedrop_client.gui.conversation.export import Preparation
+from tests.helper import app  # noqa: F401
+
+
+def _write_files(tmp_path, *names):
+    file_locations = []
+    for name in names:
+        file_location = tmp_path.joinpath(name)
+        file_location.write_text(name)
+        file_locations.append(str(file_location))
+    return file_locations
+
+
+def _transcript(mocker):
+    transcript = mocker.MagicMock()
+    transcript.save.side_effect = lambda path: path.write_text("transcript", encoding="utf-8")
+    return transcript
+
+
+def test_Preparation_run(mocker, tmp_path):
+    file_locations = _write_files(tmp_path, "memo.txt", "file123.jpg")
+    transcript_location = tmp_path.joinpath("mysterious-writer", "transcript.txt")
+    preparation = Preparation(_transcript(mocker), transcript_location, file_locations)
+    progress_emissions = QSignalSpy(preparation.progress)
+    succeeded_emissions = QSignalSpy(preparation.succeeded)
+
+    preparation.run()
+
+    assert transcript_location.read_text(encoding="utf-8") == "transcript"
+    assert [list(e) for e in progress_emissions] == [[1, 3], [2, 3], [3, 3]]
+    assert len(succeeded_emissions) == 1
+    assert succeeded_emissions[0] == [file_locations + [str(transcript_location)]]
+    assert preparation.missing_file_locations == []
+    preparation.release()
+
+
+def test_Preparation_run_keeps_files_open_until_released(mocker, tmp_path):
+    file_locations = _write_files(tmp_path, "memo.txt")
+    transcript_location = tmp_path.joinpath("transcript.txt")
+    preparation = Preparation(_transcript(mocker), transcript_location, file_locations)
+    opened = []
+    real_open = open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    mocker.patch("builtins.open", side_effect=tracking_open)
+
+    preparation.run()
+
+    assert len(opened) == 2
+    assert not any(f.closed for f in opened)
+
+    preparation.release()
+
+    assert all(f.closed for f in opened)
+
+
+def test_Preparation_run_skips_missing_files(mocker, tmp_path):
+    file_locations = _write_files(tmp_path, "memo.txt")
+    missing_location = str(tmp_path.joinpath("gone.pdf"))
+    transcript_location = tmp_path.joinpath("transcript.txt")
+    preparation = Preparation(
+        _transcript(mocker), transcript_location, [missing_location] + file_locations
+    )
+    succeeded_emissions = QSignalSpy(preparation.succeeded)
+
+    preparation.run()
+
+    assert succeeded_emissions[0] == [file_locations + [str(transcript_location)]]
+    assert preparation.missing_file_locations == [missing_location]
+    preparation.release()
+
+
+def test_Preparation_run_cancelled(mocker, tmp_path):
+    file_locations = _write_files(tmp_path, "memo.txt", "file123.jpg")
+    preparation = Preparation(
+        _transcript(mocker), tmp_path.joinpath("transcript.txt"), file_locations
+    )
+    succeeded_emissions = QSignalSpy(preparation.succeeded)
+    cancelled_emissions = QSignalSpy(preparation.cancelled)
+
+    preparation.cancel()
+    preparation.run()
+
+    assert len(succeeded_emissions) == 0
+    assert len(cancelled_emissions) == 1
+    preparation.release()
+
+
+def test_Preparation_run_failed(mocker, tmp_path):
+    transcript = mocker.MagicMock()
+    error = OSError("No space left on device")
+    transcript.save.side_effect = error
+    preparation = Preparation(transcript, tmp_path.joinpath("transcript.txt"), [])
+    succeeded_emissions = QSignalSpy(preparation.succeeded)
+    failed_emissions = QSignalSpy(preparation.failed)
+
+    preparation.run()
+
+    assert len(succeeded_emissions) == 0
+    assert failed_emissions[0] == [error]
+    preparation.release()
+
+
+def test_Preparation_start_runs_on_worker_thread(mocker, qtbot, tmp_path):
+    file_locations = _write_files(tmp_path, "memo.txt")
+    transcript_location = Path(tmp_path).joinpath("transcript.txt")
+    preparation = Preparation(_transcript(mocker), transcript_location, file_locations)
+
+    # Wait from before the start, since the worker may finish before the wait would begin
+    with qtbot.waitSignal(preparation.succeeded, timeout=5000) as blocker:
+        preparation.start()
+
+    assert blocker.args == [file_locations + [str(transcript_location)]]
+    preparation.release()
@@ -271,8 +271,10 @@ class TestPrintConversationAction(unittest.TestCase):
                 source = MagicMock(Source, journalist_filename="mysterious-writer")
                 action = PrintConversationAction(menu, controller, source)
                 with patch("securedrop_client.gui.actions.ConversationTranscript") as transcript:
-                    transcript.return_value.__str__ = Mock(
-                        return_value="☠ A string with unicode characters."
+                    transcript.return_value.save = Mock(
+                        side_effect=lambda path: path.write_text(
+                            "☠ A string with unicode characters.", encoding="utf-8"
+                        )
                     )
 
                     action._export_device.run_printer_preflight_checks = (
@@ -299,8 +301,10 @@ class TestExportConversationTranscriptAction(unittest.TestCase):
                 source = MagicMock(Source, journalist_filename="mysterious-writer")
                 action = ExportConversationTranscriptAction(menu, controller, source)
                 with patch("securedrop_client.gui.actions.ConversationTranscript") as transcript:
-                    transcript.return_value.__str__ = Mock(
-                        return_value="☠ A string with unicode characters."
+                    transcript.return_value.save = Mock(
+                        side_effect=lambda path: path.write_text(
+                            "☠ A string with unicode characters.", encoding="utf-8"
+                        )
                     )
 
                     action._export_device.run_printer_preflight_checks = (
@@ -332,8 +336,10 @@ class TestExportConversationAction(unittest.TestCase):
                 )
                 action = ExportConversationAction(menu, controller, source, app_state)
                 with patch("securedrop_client.gui.actions.ConversationTranscript") as transcript:
-                    transcript.return_value.__str__ = Mock(
-                        return_value="☠ A string with unicode characters."
+                    transcript.return_value.save = Mock(
+                        side_effect=lambda path: path.write_text(
+                            "☠ A string with unicode characters.", encoding="utf-8"
+                        )
                     )
 
                     action._export_device.run_printer_preflight_checks = (
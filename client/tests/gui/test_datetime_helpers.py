@@ -1,15 +1,28 @@
 import datetime
 
+import pytest
 from dateutil import tz
 from PyQt5.QtCore import QByteArray
 
 from securedrop_client.gui.datetime_helpers import (
+    TIMEZONE_CHECK_INTERVAL,
+    TimestampFormatter,
     format_datetime_local,
     format_datetime_month_day,
     localise_datetime,
 )
 
 
+@pytest.fixture(autouse=True)
+def formatter(mocker):
+    """
+    Look up the mocked system timezone in each test instead of the one that is already cached.
+    """
+    formatter = TimestampFormatter()
+    mocker.patch("securedrop_client.gui.datetime_helpers._formatter", formatter)
+    return formatter
+
+
 def test_format_datetime_month_day():
     # Dates are shown in the source list as well as the conversation view. Changing the date format
     # may result in UI issues - this test is a reminder to check both views!
@@ -37,3 +50,76 @@ def test_format_datetime_local(mocker):
     )
     evening_january_1_london = datetime.datetime(2023, 1, 1, 18, 0, 0, tzinfo=datetime.timezone.utc)
     assert format_datetime_local(evening_january_1_london) == "Jan 2"
+
+
+def test_format_datetime_local_naive_datetimes_are_utc(mocker):
+    mocker.patch(
+        "securedrop_client.gui.datetime_helpers.QTimeZone.systemTimeZoneId",
+        return_value=QByteArray(b"Pacific/Auckland"),
+    )
+    assert format_datetime_local(datetime.datetime(2023, 1, 1, 10, 59)) == "Jan 1"
+    assert format_datetime_local(datetime.datetime(2023, 1, 1, 11, 0)) == "Jan 2"
+
+
+def test_format_datetime_local_at_quarter_hour_offsets(mocker):
+    """
+    Ensure timestamps are formatted on the right day when the offset is not a whole hour.
+    """
+    mocker.patch(
+        "securedrop_client.gui.datetime_helpers.QTimeZone.systemTimeZoneId",
+        return_value=QByteArray(b"Asia/Kathmandu"),
+    )
+    # Kathmandu is 5 hours and 45 minutes ahead of UTC
+    assert format_datetime_local(datetime.datetime(2023, 1, 1, 18, 14, 59)) == "Jan 1"
+    assert format_datetime_local(datetime.datetime(2023, 1, 1, 18, 15)) == "Jan 2"
+    assert format_datetime_local(datetime.datetime(2023, 1, 1, 18, 29)) == "Jan 2"
+
+
+def test_format_datetime_local_across_dst_change(mocker):
+    mocker.patch(
+        "securedrop_client.gui.datetime_helpers.QTimeZone.systemTimeZoneId",
+        return_value=QByteArray(b"America/New_York"),
+    )
+    # Midnight in New York is at 05:00 UTC in winter and at 04:00 UTC in summer
+    assert format_datetime_local(datetime.datetime(2023, 3, 12, 4, 59)) == "Mar 11"
+    assert format_datetime_local(datetime.datetime(2023, 3, 12, 5, 0)) == "Mar 12"
+    assert format_datetime_local(datetime.datetime(2023, 3, 13, 3, 59)) == "Mar 12"
+    assert format_datetime_local(datetime.datetime(2023, 3, 13, 4, 0)) == "Mar 13"
+
+
+def test_TimestampFormatter_looks_up_timezone_once_per_interval(mocker):
+    system_timezone_id = mocker.patch(
+        "securedrop_client.gui.datetime_helpers.QTimeZone.systemTimeZoneId",
+        return_value=QByteArray(b"Pacific/Auckland"),
+    )
+    now = 1000.0
+    formatter = TimestampFormatter(clock=lambda: now)
+    evening_january_1_london = datetime.datetime(2023, 1, 1, 18, 0, 0, tzinfo=datetime.timezone.utc)
+
+    assert formatter.format_local(evening_january_1_london) == "Jan 2"
+    assert formatter.format_local(evening_january_1_london) == "Jan 2"
+    system_timezone_id.assert_called_once_with()
+
+    # The system timezone changes, which is noticed once the interval has passed
+    system_timezone_id.return_value = QByteArray(b"Europe/London")
+    now += TIMEZONE_CHECK_INTERVAL - 1
+    assert formatter.format_local(evening_january_1_london) == "Jan 2"
+    now += 1
+    assert formatter.format_local(evening_january_1_london) == "Jan 1"
+    assert system_timezone_id.call_count == 2
+
+
+def test_TimestampFormatter_reuses_formatted_dates(mocker):
+    mocker.patch(
+        "securedrop_client.gui.datetime_helpers.QTimeZone.systemTimeZoneId",
+        return_value=QByteArray(b"Europe/London"),
+    )
+    format_datetime_month_day = mocker.patch(
+        "securedrop_client.gui.datetime_helpers.format_datetime_month_day", return_value="Jan 1"
+    )
+    formatter = TimestampFormatter()
+
+    formatter.format_local(datetime.datetime(2023, 1, 1, 12, 0))
+    formatter.format_local(datetime.datetime(2023, 1, 1, 12, 14))
+
+    format_datetime_month_day.assert_called_once()
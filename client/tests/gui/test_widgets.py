@@ -3,19 +3,20 @@ Make sure the UI widgets are configured correctly and work as expected.
 """
 import math
 import random
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from gettext import gettext as _
-from unittest.mock import Mock, PropertyMock
+from unittest.mock import Mock
 
 import sqlalchemy
 import sqlalchemy.orm.exc
 from PyQt5.QtCore import QEvent, QPointF, QSize, Qt
 from PyQt5.QtGui import QFocusEvent, QMouseEvent, QMovie, QResizeEvent
-from PyQt5.QtTest import QTest
-from PyQt5.QtWidgets import QVBoxLayout, QWidget
+from PyQt5.QtTest import QSignalSpy, QTest
+from PyQt5.QtWidgets import QAbstractItemView, QMainWindow, QVBoxLayout, QWidget
 from sqlalchemy.orm import attributes, scoped_session, sessionmaker
 
 from securedrop_client import db, logic, storage
+from securedrop_client.api_jobs.updatestar import UpdateStarJob
 from securedrop_client.app import threads
 from securedrop_client.gui.datetime_helpers import format_datetime_local
 from securedrop_client.gui.source import DeleteSourceDialog
@@ -51,6 +52,7 @@ from securedrop_client.gui.widgets import (
     UserMenu,
     UserProfile,
 )
+from securedrop_client.queue import RunnableQueue
 from tests import factory
 from tests.helper import app  # noqa: F401
 
@@ -536,7 +538,8 @@ def test_MainView_show_sources_with_none_selected(mocker):
     source_widget = SourceWidget(
         mocker.MagicMock(), factory.Source(uuid="stub_uuid"), mocker.MagicMock(), mocker.MagicMock()
     )
-    source_item = SourceListWidgetItem(mv.source_list)
+    source_item = SourceListWidgetItem(source_widget.source)
+    mv.source_list.addItem(source_item)
     mv.source_list.setItemWidget(source_item, source_widget)
     mv.source_list.source_items["stub_uuid"] = source_item
     mocker.patch.object(mv.source_list, "update_sources")
@@ -545,7 +548,7 @@ def test_MainView_show_sources_with_none_selected(mocker):
 
     mv.show_sources([1, 2, 3])
 
-    mv.source_list.update_sources.assert_called_once_with([1, 2, 3])
+    mv.source_list.update_sources.assert_called_once_with([1, 2, 3], None)
     mv.empty_conversation_view.show_no_source_selected_message.assert_called_once_with()
     mv.empty_conversation_view.show.assert_called_once_with()
 
@@ -574,7 +577,7 @@ def test_MainView_show_sources_with_no_sources_at_all(mocker):
 
     mv.show_sources([])
 
-    mv.source_list.update_sources.assert_called_once_with([])
+    mv.source_list.update_sources.assert_called_once_with([], None)
     mv.empty_conversation_view.show_no_sources_message.assert_called_once_with()
     mv.empty_conversation_view.show.assert_called_once_with()
 
@@ -598,12 +601,12 @@ def test_MainView_show_sources_when_sources_are_deleted(mocker):
     mv.delete_conversation.assert_called_once_with(4)
 
 
-def test_MainView_delete_conversation_when_conv_wrapper_exists(mocker):
+def test_MainView_delete_conversation_when_conv_wrapper_exists(mocker, session):
     """
     Ensure SourceConversationWrapper is deleted if it exists.
     """
     source = factory.Source(uuid="123")
-    conversation_wrapper = SourceConversationWrapper(source, mocker.MagicMock())
+    conversation_wrapper = SourceConversationWrapper(source, mocker.MagicMock(session=session))
     conversation_wrapper.deleteLater = mocker.MagicMock()
     mv = MainView(None)
     mv.source_conversations = {}
@@ -693,7 +696,7 @@ def test_MainView_on_source_changed_updates_conversation_view(mocker, session):
     """
     mv = MainView(None)
     # mv.source_list = mocker.MagicMock()
-    mv.controller = mocker.MagicMock(is_authenticated=True)
+    mv.controller = mocker.MagicMock(is_authenticated=True, session=session)
     source = factory.Source()
     session.add(source)
     file = factory.File(source=source, filename="0-mock-doc.gpg")
@@ -783,16 +786,125 @@ def test_MainView_on_source_changed_SourceConversationWrapper_is_preserved(mocke
     )
     conversation_wrapper = mv.source_conversations[source.uuid]
     conversation_wrapper.conversation_view = mocker.MagicMock()
-    conversation_wrapper.conversation_view.update_conversation = mocker.MagicMock()
+
+    # The source changed while source2 was selected
+    mocker.patch.object(mv.source_list, "initial_update")
+    mv.show_sources([source, source2], {source.uuid})
 
     mv.on_source_changed()
 
     assert mv.set_conversation.call_count == 1
 
     # Conversation should be redrawn even for existing source (bug #467).
-    assert conversation_wrapper.conversation_view.update_conversation.call_count == 1
+    conversation_wrapper.conversation_view.refresh_conversation.assert_called_once_with()
     assert source_conversation_init.call_count == 0
     source_selected.emit.assert_called_once_with(source.uuid)
+    assert mv.outdated_conversations == set()
+
+
+def test_MainView_on_source_changed_does_not_refresh_unchanged_conversation(mocker, session):
+    """
+    A cached conversation is shown as it is when its source didn't change since it was shown.
+    """
+    mv = MainView(None)
+    mv.set_conversation = mocker.MagicMock()
+    mv.controller = mocker.MagicMock(is_authenticated=True)
+    source = factory.Source()
+    source2 = factory.Source()
+    session.add(source)
+    session.add(source2)
+    session.commit()
+    mocker.patch(
+        "securedrop_client.gui.widgets.SourceConversationWrapper.__init__", return_value=None
+    )
+    get_selected_source = mocker.patch(
+        "securedrop_client.gui.widgets.SourceList.get_selected_source", return_value=source
+    )
+    mv.on_source_changed()
+    conversation_wrapper = mv.source_conversations[source.uuid]
+    conversation_wrapper.conversation_view = mocker.MagicMock()
+    get_selected_source.return_value = source2
+    mv.on_source_changed()
+
+    # Only source2 changed
+    mocker.patch.object(mv.source_list, "initial_update")
+    mv.show_sources([source, source2], {source2.uuid})
+    get_selected_source.return_value = source
+    mv.on_source_changed()
+
+    conversation_wrapper.conversation_view.refresh_conversation.assert_not_called()
+    assert mv.outdated_conversations == {source2.uuid}
+
+
+def test_MainView_show_sources_marks_all_conversations_outdated(mocker):
+    """
+    Every cached conversation is out of date when the changed sources are not known.
+    """
+    mv = MainView(None)
+    mv.source_conversations = {"uuid-1": mocker.MagicMock(), "uuid-2": mocker.MagicMock()}
+    mocker.patch.object(mv.source_list, "initial_update")
+
+    mv.show_sources([mocker.MagicMock()])
+
+    assert mv.outdated_conversations == {"uuid-1", "uuid-2"}
+
+
+def test_MainView_on_source_changed_deletes_least_recently_selected_conversations(mocker):
+    """
+    Ensure that only the most recently selected conversations are kept, along with the ones that
+    can't be created again, and that the cache hit rate is counted.
+    """
+    mv = MainView(None, max_cached_conversations=2)
+    mv.controller = mocker.MagicMock()
+    mv.set_conversation = mocker.MagicMock()
+    mv.source_list = mocker.MagicMock()
+    mocker.patch(
+        "securedrop_client.gui.widgets.SourceConversationWrapper",
+        side_effect=lambda *args: mocker.MagicMock(),
+    )
+    sources = [factory.Source() for _ in range(4)]
+
+    def select(source):
+        mv.source_list.get_selected_source.return_value = source
+        mv.on_source_changed()
+        return mv.source_conversations[source.uuid]
+
+    first, second, third = [select(source) for source in sources[:3]]
+    first.deleteLater.assert_called_once_with()
+    assert list(mv.source_conversations) == [sources[1].uuid, sources[2].uuid]
+
+    # Selecting a conversation again makes it the most recent one
+    assert select(sources[1]) is second
+    second.is_idle.return_value = False
+    select(sources[3])
+    third.deleteLater.assert_called_once_with()
+    second.deleteLater.assert_not_called()
+    assert list(mv.source_conversations) == [sources[1].uuid, sources[3].uuid]
+
+    # A conversation with a draft reply or an ongoing deletion is kept beyond the limit
+    select(sources[0])
+    assert list(mv.source_conversations) == [sources[1].uuid, sources[0].uuid]
+    assert mv.conversation_cache_hits == 1
+    assert mv.conversation_cache_misses == 5
+    assert mv.conversation_cache_hit_rate == 1 / 6
+
+
+def test_SourceConversationWrapper_is_idle(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(), mocker.MagicMock(session=session))
+    assert scw.is_idle()
+
+    scw.reply_box.text_edit.setText("draft")
+    assert not scw.is_idle()
+    scw.reply_box.text_edit.setText("")
+    assert scw.is_idle()
+
+    scw.start_account_deletion()
+    assert not scw.is_idle()
+    scw.end_account_deletion()
+    assert scw.is_idle()
+
+    scw.start_conversation_deletion()
+    assert not scw.is_idle()
 
 
 def test_MainView_refresh_source_conversations(homedir, mocker, qtbot, session_maker, session):
@@ -908,19 +1020,13 @@ def test_MainView_refresh_source_conversations_with_deleted(
     mv.source_list.update_sources(sources)
     mv.show()
 
-    def collection_error():
-        raise sqlalchemy.exc.InvalidRequestError()
-
     mocker.patch(
         "securedrop_client.gui.widgets.SourceList.get_selected_source", return_value=source1
     )
     mv.on_source_changed()
 
-    mock_collection = mocker.patch(
-        "securedrop_client.db.Source.collection", new_callable=PropertyMock
-    )
     ire = sqlalchemy.exc.InvalidRequestError()
-    mock_collection.side_effect = ire
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", side_effect=ire)
     mv.refresh_source_conversations()
     debug_logger.assert_any_call("Error refreshing source conversations: %s", ire)
 
@@ -978,53 +1084,117 @@ def test_SourceList_get_selected_source(mocker):
 
 def test_SourceList_update_adds_new_sources(mocker):
     """
-    Check a new SourceWidget for each passed-in source is created and no widgets are cleared or
-    removed.
+    Check a new item and SourceWidget for each passed-in source is created and no widgets are
+    cleared or removed.
     """
     sl = SourceList()
 
     sl.clear = mocker.MagicMock()
-    sl.insertItem = mocker.MagicMock()
     sl.takeItem = mocker.MagicMock()
-    sl.setItemWidget = mocker.MagicMock()
     sl.controller = mocker.MagicMock()
     sl.setCurrentItem = mocker.MagicMock()
 
-    mock_sw = mocker.MagicMock()
-    mock_lwi = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.SourceWidget", mock_sw)
-    mocker.patch("securedrop_client.gui.widgets.SourceListWidgetItem", mock_lwi)
-
-    sources = [mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()]
+    sources = [factory.Source(), factory.Source(), factory.Source()]
     sl.update_sources(sources)
 
-    assert mock_sw.call_count == len(sources)
-    assert mock_lwi.call_count == len(sources)
-    assert sl.insertItem.call_count == len(sources)
-    assert sl.setItemWidget.call_count == len(sources)
+    assert sl.count() == len(sources)
     assert len(sl.source_items) == len(sources)
+    assert len(sl.source_widgets) == len(sources)
+    for source in sources:
+        assert sl.itemWidget(sl.source_items[source.uuid]).source == source
     assert sl.setCurrentItem.call_count == 0
     sl.clear.assert_not_called()
     sl.takeItem.assert_not_called()
-    mock_sw.deleteLater.assert_not_called()
 
 
-def test_SourceList_initial_update_adds_new_sources(mocker):
+def test_SourceList_update_only_creates_widgets_near_viewport(mocker):
     """
-    Check a new SourceWidget for each passed-in source is created and no widgets are cleared or
-    removed.
+    Check that all sources get an item but only the ones in or near the viewport get a widget.
     """
     sl = SourceList()
-
-    sl.clear = mocker.MagicMock()
-    sl.add_source = mocker.MagicMock()
+    sl.controller = mocker.MagicMock()
+    sl.resize(300, SourceList.DEFAULT_ITEM_HEIGHT * 5)
     sl.setItemWidget = mocker.MagicMock()
-    sl.currentRow = mocker.MagicMock(return_value=0)
-    sl.item = mocker.MagicMock()
-    sl.item().isSelected.return_value = True
+    source_widget = mocker.patch("securedrop_client.gui.widgets.SourceWidget")
+    source_widget.return_value.sizeHint.return_value = QSize(300, SourceList.DEFAULT_ITEM_HEIGHT)
+
+    sources = [factory.Source() for i in range(200)]
+    sl.update_sources(sources)
+
+    assert sl.count() == 200
+    assert len(sl.source_items) == 200
+    first_row, last_row = sl._visible_rows()
+    assert first_row == 0
+    assert source_widget.call_count == last_row + 1 + SourceList.PRELOADED_ROWS
+    assert len(sl.source_widgets) == source_widget.call_count
+    for row in range(source_widget.call_count):
+        assert sl.item(row).source_uuid in sl.source_widgets
+
+
+def test_SourceList_scrolling_creates_and_deletes_widgets(mocker):
+    """
+    Check that scrolling creates the widgets of the rows that come into view, and deletes the
+    idle widgets of the rows that are far away.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    sl.resize(300, SourceList.DEFAULT_ITEM_HEIGHT * 5)
+    sources = [factory.Source() for i in range(200)]
+    sl.update_sources(sources)
+    first_item = sl.item(0)
+    busy_item = sl.item(1)
+    sl.source_widgets[busy_item.source_uuid].deleting = True
+
+    sl.scrollToItem(sl.item(150), QAbstractItemView.PositionAtTop)
+    sl._update_source_widgets()
+
+    assert sl.item(150).source_uuid in sl.source_widgets
+    assert sl.itemWidget(sl.item(150)) is not None
+    assert first_item.source_uuid not in sl.source_widgets
+    assert sl.itemWidget(first_item) is None
+    assert busy_item.source_uuid in sl.source_widgets
+    assert len(sl.source_widgets) < 2 * (SourceList.RETAINED_ROWS + SourceList.PRELOADED_ROWS)
+
+
+def test_SourceList_prioritizes_downloads_of_selected_and_visible_sources(mocker):
+    """
+    Check that the downloads of the selected source and of the sources in the viewport are
+    prioritized whenever those sources change, and only then.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    sl.resize(300, SourceList.DEFAULT_ITEM_HEIGHT * 5)
+    sources = [factory.Source() for i in range(200)]
+    sl.update_sources(sources)
+
+    first_row, last_row = sl._visible_rows()
+    visible_source_uuids = [sl.item(row).source_uuid for row in range(first_row, last_row + 1)]
+    sl.controller.prioritize_downloads.assert_called_once_with(None, visible_source_uuids)
+
+    sl._update_source_widgets()
+    sl.controller.prioritize_downloads.assert_called_once()
+
+    sl.setCurrentItem(sl.item(1))
+    sl.controller.prioritize_downloads.assert_called_with(
+        sl.item(1).source_uuid, visible_source_uuids
+    )
+
+    sl.scrollToItem(sl.item(150), QAbstractItemView.PositionAtTop)
+    sl._update_source_widgets()
+    selected_source_uuid, visible_source_uuids = sl.controller.prioritize_downloads.call_args[0]
+    assert selected_source_uuid == sl.item(1).source_uuid
+    assert visible_source_uuids[0] == sl.item(150).source_uuid
+
+
+def test_SourceList_initial_update_adds_new_sources(mocker):
+    """
+    Check the initial update adds all the sources at once.
+    """
+    sl = SourceList()
+    sl.update_sources = mocker.MagicMock()
     sources = [mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()]
     sl.initial_update(sources)
-    sl.add_source.assert_called_once_with(sources)
+    sl.update_sources.assert_called_once_with(sources)
 
 
 def test_SourceList_update_when_source_deleted(mocker, session, session_maker, homedir):
@@ -1072,24 +1242,15 @@ def test_SourceList_update_when_source_deleted(mocker, session, session_maker, h
     assert len(sl.source_items) == 0
 
 
-def test_SourceList_add_source_starts_timer(mocker, session_maker, homedir):
-    """
-    When the add_source method is called it schedules the addition of a source
-    to the source list via a single-shot QTimer.
-    """
-    sl = SourceList()
-    sources = [mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()]
-    mock_timer = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.QTimer", mock_timer)
-    sl.add_source(sources)
-    assert mock_timer.singleShot.call_count == 1
-
-
 class DeletedSource(Mock):
     @property
     def uuid(self):
         raise sqlalchemy.exc.InvalidRequestError()
 
+    @property
+    def draftreplies(self):
+        raise sqlalchemy.exc.InvalidRequestError()
+
     @property
     def collection(self):
         raise sqlalchemy.exc.InvalidRequestError()
@@ -1159,6 +1320,121 @@ def test_SourceList_update_maintains_selection(mocker):
     assert sl.itemWidget(sl.currentItem()).source.id == sources[1].id
 
 
+def test_SourceList_update_only_reloads_changed_sources(mocker):
+    """
+    Check that only the widgets of the sources that changed are reloaded, and that the list is
+    not sorted again.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    sources = [factory.Source(), factory.Source()]
+    sl.update_sources(sources)
+    for source_widget in sl.source_widgets.values():
+        source_widget.reload = mocker.MagicMock()
+    sl.sortItems = mocker.MagicMock()
+
+    sl.update_sources(sources, {sources[0].uuid})
+
+    sl.source_widgets[sources[0].uuid].reload.assert_called_once_with()
+    sl.source_widgets[sources[1].uuid].reload.assert_not_called()
+    sl.sortItems.assert_not_called()
+
+
+def test_SourceList_update_reloads_busy_sources(mocker):
+    """
+    Check that the widget of a source that is not idle is reloaded even if it did not change.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    source = factory.Source()
+    sl.update_sources([source])
+    source_widget = sl.source_widgets[source.uuid]
+    source_widget.reload = mocker.MagicMock()
+    source_widget.is_idle = mocker.MagicMock(return_value=False)
+
+    sl.update_sources([source], set())
+
+    source_widget.reload.assert_called_once_with()
+
+
+def test_SourceList_update_moves_changed_source(mocker):
+    """
+    Check that a source that was updated more recently is moved to its new position, keeping
+    its widget, and that new sources are inserted in order.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    sources = [factory.Source(last_updated=datetime(2022, 1, day)) for day in (4, 3, 2, 1)]
+    sl.update_sources(sources)
+    source_widget = sl.source_widgets[sources[2].uuid]
+
+    sources[2].last_updated = datetime(2022, 1, 5)
+    new_source = factory.Source(last_updated=datetime(2022, 1, 3, 12))
+    sl.update_sources(sources + [new_source], {sources[2].uuid, new_source.uuid})
+
+    assert [sl.item(row).source_uuid for row in range(sl.count())] == [
+        sources[2].uuid,
+        sources[0].uuid,
+        new_source.uuid,
+        sources[1].uuid,
+        sources[3].uuid,
+    ]
+    assert sl.source_widgets[sources[2].uuid] is source_widget
+    assert sl.itemWidget(sl.item(0)) is source_widget
+
+    sources[2].last_updated = datetime(2021, 12, 31)
+    sl.update_sources(sources + [new_source], {sources[2].uuid})
+
+    assert sl.item(sl.count() - 1).source_uuid == sources[2].uuid
+
+
+def test_SourceList_update_does_not_move_sources_in_place(mocker):
+    """
+    Check that sources that changed without leaving their position are not moved, and that
+    several sources can move during one update.
+    """
+    sl = SourceList()
+    sl.controller = mocker.MagicMock()
+    sources = [factory.Source(last_updated=datetime(2022, 1, day)) for day in (4, 3, 2, 1)]
+    sl.update_sources(sources)
+    rows_moved = QSignalSpy(sl.model().rowsMoved)
+    layout_changed = QSignalSpy(sl.model().layoutChanged)
+
+    sources[1].last_updated = datetime(2022, 1, 3, 12)
+    sl.update_sources(sources)
+
+    assert len(rows_moved) == 0
+    assert len(layout_changed) == 0
+
+    sources[3].last_updated = datetime(2022, 1, 5)
+    sources[0].last_updated = datetime(2021, 12, 31)
+    sl.update_sources(sources, {sources[0].uuid, sources[3].uuid})
+
+    assert [sl.item(row).source_uuid for row in range(sl.count())] == [
+        sources[3].uuid,
+        sources[1].uuid,
+        sources[2].uuid,
+        sources[0].uuid,
+    ]
+
+
+def test_SourceListWidgetItem_sort_key(mocker):
+    """
+    The sort key is the timestamp of last interaction in microseconds since the epoch, whether
+    the timestamp is naive UTC or timezone-aware, and sources without one sort last.
+    """
+    item = SourceListWidgetItem(factory.Source(last_updated=datetime(1970, 1, 1, 0, 0, 1, 5)))
+    assert item.data(SourceListWidgetItem.SORT_KEY_ROLE) == 1_000_005
+
+    item.last_updated = datetime(1970, 1, 1, 2, 0, 1, tzinfo=timezone(timedelta(hours=2)))
+    assert item.data(SourceListWidgetItem.SORT_KEY_ROLE) == 1_000_000
+
+    other_item = SourceListWidgetItem(factory.Source(last_updated=None))
+    assert other_item.data(SourceListWidgetItem.SORT_KEY_ROLE) == 0
+    assert other_item < item
+    assert not item < other_item
+
+
 def test_SourceList_update_with_pre_selected_source_maintains_selection(mocker):
     """
     Check that an existing source widget that is selected remains selected.
@@ -1240,76 +1516,6 @@ def test_SourceList_update_removes_item_from_beginning_of_list(mocker):
     assert len(sl.source_items) == 2
 
 
-def test_SourceList_add_source_closure_adds_sources(mocker):
-    """
-    The closure (function created within the add_source function) behaves in
-    the expected way given the context of the call to add_source.
-    """
-    sl = SourceList()
-    sl.controller = mocker.MagicMock()
-    sl.insertItem = mocker.MagicMock()
-    sl.setItemWidget = mocker.MagicMock()
-    sl.setCurrentItem = mocker.MagicMock()
-
-    mock_sw = mocker.MagicMock()
-    mock_lwi = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.SourceWidget", mock_sw)
-    mocker.patch("securedrop_client.gui.widgets.SourceListWidgetItem", mock_lwi)
-    sources = [mocker.MagicMock(), mocker.MagicMock(), mocker.MagicMock()]
-    mock_timer = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.QTimer", mock_timer)
-    sl.add_source(sources, 1)
-    # Now grab the function created within add_source:
-    inner_fn = mock_timer.singleShot.call_args_list[0][0][1]
-    # Ensure add_source is mocked to avoid recursion in the test and so we
-    # can spy on how it's called.
-    sl.add_source = mocker.MagicMock()
-    # Call the inner function (as if the timer had completed).
-    inner_fn()
-    assert mock_sw.call_count == 1
-    assert mock_lwi.call_count == 1
-    assert sl.insertItem.call_count == 1
-    assert sl.setItemWidget.call_count == 1
-    assert len(sl.source_items) == 1
-    assert sl.setCurrentItem.call_count == 0
-    sl.add_source.assert_called_once_with(sources[1:], 2)
-
-
-def test_SourceList_add_source_closure_exits_on_no_more_sources(mocker):
-    """
-    The closure (function created within the add_source function) behaves in
-    the expected way given the context of the call to add_source.
-    """
-    sl = SourceList()
-    sl.controller = mocker.MagicMock()
-    sl.addItem = mocker.MagicMock()
-    sl.setItemWidget = mocker.MagicMock()
-    sl.setCurrentItem = mocker.MagicMock()
-
-    mock_sw = mocker.MagicMock()
-    mock_lwi = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.SourceWidget", mock_sw)
-    mocker.patch("securedrop_client.gui.widgets.SourceListWidgetItem", mock_lwi)
-    sources = []
-    mock_timer = mocker.MagicMock()
-    mocker.patch("securedrop_client.gui.widgets.QTimer", mock_timer)
-    sl.add_source(sources, 1)
-    # Now grab the function created within add_source:
-    inner_fn = mock_timer.singleShot.call_args_list[0][0][1]
-    # Ensure add_source is mocked to avoid recursion in the test and so we
-    # can spy on how it's called.
-    sl.add_source = mocker.MagicMock()
-    # Call the inner function (as if the timer had completed).
-    assert inner_fn() is None
-    assert mock_sw.call_count == 0
-    assert mock_lwi.call_count == 0
-    assert sl.addItem.call_count == 0
-    assert sl.setItemWidget.call_count == 0
-    assert len(sl.source_items) == 0
-    assert sl.setCurrentItem.call_count == 0
-    assert sl.add_source.call_count == 0
-
-
 def test_SourceList_set_snippet(mocker):
     """
     Handle the emitted event in the expected manner.
@@ -1320,15 +1526,34 @@ def test_SourceList_set_snippet(mocker):
         mocker.MagicMock(), factory.Source(uuid="mock_uuid"), mark_seen_signal, mocker.MagicMock()
     )
     source_widget.set_snippet = mocker.MagicMock()
-    source_item = SourceListWidgetItem(sl)
-    sl.setItemWidget(source_item, source_widget)
-    sl.source_items = {"mock_uuid": source_item}
+    sl.source_widgets = {"mock_uuid": source_widget}
 
     sl.set_snippet("mock_uuid", "msg_uuid", "msg_content")
 
     source_widget.set_snippet.assert_called_once_with("mock_uuid", "msg_uuid", "msg_content")
 
 
+def test_SourceList__on_reply_succeeded(mocker):
+    """
+    The reply that was sent becomes the last activity of its source, shown in the snippet.
+    """
+    sl = SourceList()
+    source_widget = SourceWidget(
+        mocker.MagicMock(), factory.Source(uuid="mock_uuid"), mocker.MagicMock(), mocker.MagicMock()
+    )
+    reply = factory.Reply(uuid="reply_uuid", content="reply_content")
+    mocker.patch(
+        "securedrop_client.gui.widgets.get_latest_server_items",
+        return_value={source_widget.source.id: reply},
+    )
+    sl.source_widgets = {"mock_uuid": source_widget}
+
+    sl._on_reply_succeeded("mock_uuid", "reply_uuid", "reply_content")
+
+    assert source_widget.last_activity == reply
+    assert source_widget.preview.text() == "reply_content"
+
+
 def test_SourceList_get_source_widget(mocker):
     sl = SourceList()
     sl.controller = mocker.MagicMock()
@@ -1359,9 +1584,11 @@ def test_SourceList_get_source_widget_if_one_exists_in_cache(mocker):
     source_widget = SourceWidget(
         mocker.MagicMock(), factory.Source(uuid="mock_uuid"), mark_seen_signal, mocker.MagicMock()
     )
-    source_item = SourceListWidgetItem(sl)
+    source_item = SourceListWidgetItem(source_widget.source)
+    sl.addItem(source_item)
     sl.setItemWidget(source_item, source_widget)
     sl.source_items["mock_uuid"] = source_item
+    sl.source_widgets["mock_uuid"] = source_widget
 
     assert sl.get_source_widget("mock_uuid") == source_widget
 
@@ -1631,6 +1858,7 @@ def test_SourceWidget_html_init(mocker):
     controller = mocker.MagicMock()
     mock_source = mocker.MagicMock()
     mock_source.journalist_designation = "foo <b>bar</b> baz"
+    mock_source.interaction_count = 0
     mark_seen_signal = mocker.MagicMock()
 
     sw = SourceWidget(controller, mock_source, mark_seen_signal, mocker.MagicMock())
@@ -1650,7 +1878,8 @@ def test_SourceWidget__on_adjust_preview(mocker):
     sl = SourceList()
     sw = SourceWidget(mocker.MagicMock(), factory.Source(), mocker.MagicMock(), mocker.MagicMock())
     sw.preview = mocker.MagicMock()
-    source_item = SourceListWidgetItem(sl)
+    source_item = SourceListWidgetItem(sw.source)
+    sl.addItem(source_item)
     sl.setItemWidget(source_item, sw)
 
     sw._on_adjust_preview(100)
@@ -1819,6 +2048,25 @@ def test_SourceWidget__on_conversation_deletion_successful(mocker):
     assert sw.deletion_indicator.isHidden()
 
 
+def test_SourceWidget_is_idle(mocker):
+    sw = SourceWidget(mocker.MagicMock(), factory.Source(), mocker.MagicMock(), mocker.MagicMock())
+    assert sw.is_idle()
+
+    sw._on_source_selected(sw.source_uuid)
+    assert not sw.is_idle()
+    sw._on_source_selected("some_other_uuid")
+    assert sw.is_idle()
+
+    sw.star.pending_count = 1
+    assert not sw.is_idle()
+    sw.star.pending_count = 0
+
+    sw._on_conversation_deletion_successful(sw.source_uuid, datetime.utcnow())
+    assert not sw.is_idle()
+    sw._on_sync_started(datetime.utcnow())
+    assert sw.is_idle()
+
+
 def test_SourceWidget_update_attachment_icon(mocker):
     """
     Attachment icon identicates document count
@@ -1908,6 +2156,31 @@ def test_SourceWidget_set_snippet_draft_only(mocker, session_maker, session, hom
     assert sw.preview.text() == "File: " + f.filename
 
 
+def test_SourceWidget_set_snippet_ignores_older_items(mocker, session_maker, session, homedir):
+    """
+    Only the last item of the conversation changes the snippet, and finding it does not load the
+    source's collection.
+    """
+    mock_gui = mocker.MagicMock()
+    controller = logic.Controller("http://localhost", mock_gui, session_maker, homedir, None)
+    source = factory.Source()
+    message = factory.Message(source=source, filename="1-msg.gpg", content="first")
+    reply = factory.Reply(source=source, filename="2-reply.gpg", content="last")
+    session.add_all([source, message, reply])
+    session.commit()
+    sw = SourceWidget(controller, source, mocker.MagicMock(), mocker.MagicMock())
+    assert sw.preview.text() == "last"
+
+    mocker.patch.object(
+        db.Source, "server_collection", new_callable=mocker.PropertyMock, side_effect=AssertionError
+    )
+    sw.set_snippet(source.uuid, message.uuid, "first, again")
+    assert sw.preview.text() == "last"
+
+    sw.set_snippet(source.uuid, reply.uuid, "last, again")
+    assert sw.preview.text() == "last, again"
+
+
 def test_SourceWidget_set_snippet(mocker, session_maker, session, homedir):
     """
     Snippets are set as expected.
@@ -1945,8 +2218,10 @@ def test_SourceWidget_update_truncate_latest_msg(mocker):
     controller = mocker.MagicMock()
     source = mocker.MagicMock()
     source.journalist_designation = "Testy McTestface"
-    source.collection = [factory.Message(content="a" * 151)]
-    source.server_collection = source.collection
+    mocker.patch(
+        "securedrop_client.gui.widgets.get_latest_server_items",
+        return_value={source.id: factory.Message(content="a" * 151)},
+    )
     mark_seen_signal = mocker.MagicMock()
     sw = SourceWidget(controller, source, mark_seen_signal, mocker.MagicMock())
 
@@ -2135,7 +2410,10 @@ def test_SourceWidget_uses_SecureQLabel(mocker):
     controller = mocker.MagicMock()
     source = mocker.MagicMock()
     source.journalist_designation = "Testy McTestface"
-    source.collection = [factory.Message(content="a" * 121)]
+    mocker.patch(
+        "securedrop_client.gui.widgets.get_latest_server_items",
+        return_value={source.id: factory.Message(content="a" * 121)},
+    )
     mark_seen_signal = mocker.MagicMock()
     sw = SourceWidget(controller, source, mark_seen_signal, mocker.MagicMock())
 
@@ -2510,6 +2788,31 @@ def test_StarToggleButton_on_star_update_failed_for_non_matching_source_uuid(moc
     assert stb.pending_count == 1
 
 
+def test_StarToggleButton_pending_count_after_star_toggled_back(mocker):
+    """
+    Ensure no star update is pending after the star is toggled back before the first update was
+    sent, in which case the star updates cancel out in the queue.
+    """
+    controller = mocker.MagicMock()
+    controller.is_authenticated = True
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    stb = StarToggleButton(controller, "mock_uuid", False)
+
+    def update_star(source_uuid, is_starred):
+        job = UpdateStarJob(source_uuid, is_starred)
+        job.success_signal.connect(lambda uuid: stb.on_star_update_successful(uuid))
+        queue.add_job(job)
+
+    controller.update_star.side_effect = update_star
+
+    stb.click()
+    stb.click()
+
+    assert stb.pending_count == 0
+    assert stb.is_starred is False
+    assert queue.queue.empty()
+
+
 def test_StarToggleButton_on_star_update_successful(mocker):
     """
     Ensure that the pending count is decremented if the source uuid matches.
@@ -3277,7 +3580,7 @@ def test_FileWidget_on_left_click_downloading_in_progress(mocker, session, sourc
     controller.on_submission_download.call_count == 0
 
 
-def test_FileWidget_start_button_animation(mocker, session, source):
+def test_FileWidget_start_button_animation(mocker, session, source, no_leftover_widgets):
     """
     Ensure widget state is updated when this method is called.
     """
@@ -3545,7 +3848,7 @@ def test_FileWidget_on_file_missing_show_download_button_when_uuid_matches(
     assert fw.print_button.isHidden()
     assert not fw.no_file_name.isHidden()
     assert fw.file_name.isHidden()
-    assert fw.download_animation.state() == QMovie.NotRunning
+    assert not fw.download_animation.is_started
 
 
 def test_FileWidget_on_file_missing_does_not_show_download_button_when_uuid_does_not_match(
@@ -3737,12 +4040,12 @@ def test_FileWidget_update_file_size_with_deleted_file(
         assert fw.file_size.text() == ""
 
 
-def test_SourceConversationWrapper_on_conversation_updated(mocker, qtbot):
+def test_SourceConversationWrapper_on_conversation_updated(mocker, qtbot, session):
     source = factory.Source()
     file = factory.File(source=source, is_downloaded=True)
 
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file)
+    controller = mocker.MagicMock(get_file=get_file, session=session)
 
     scw = SourceConversationWrapper(source, controller, None)
     scw.conversation_title_bar.updated.setText("CANARY")
@@ -3758,6 +4061,7 @@ def test_SourceConversationWrapper_on_conversation_updated(mocker, qtbot):
 
 
 def test_SourceConversationWrapper_on_source_deleted(mocker):
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([], 0))
     source = factory.Source(uuid="123")
     mv = MainView(None)
     mv.source_list = mocker.MagicMock()
@@ -3780,8 +4084,8 @@ def test_SourceConversationWrapper_on_source_deleted(mocker):
     assert not scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_source_deleted_wrong_uuid(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_source_deleted_wrong_uuid(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_source_deleted("321")
     assert not scw.conversation_title_bar.isHidden()
     assert not scw.conversation_view.isHidden()
@@ -3789,8 +4093,8 @@ def test_SourceConversationWrapper_on_source_deleted_wrong_uuid(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_source_deletion_failed(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_source_deletion_failed(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_source_deleted("123")
 
     scw.on_source_deletion_failed("123")
@@ -3801,8 +4105,8 @@ def test_SourceConversationWrapper_on_source_deletion_failed(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_source_deletion_failed_wrong_uuid(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_source_deletion_failed_wrong_uuid(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_source_deleted("123")
 
     scw.on_source_deletion_failed("321")
@@ -3814,6 +4118,7 @@ def test_SourceConversationWrapper_on_source_deletion_failed_wrong_uuid(mocker):
 
 
 def test_SourceConversationWrapper_on_conversation_deleted(mocker):
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([], 0))
     source = factory.Source(uuid="123")
     mv = MainView(None)
     mv.source_list = mocker.MagicMock()
@@ -3838,8 +4143,8 @@ def test_SourceConversationWrapper_on_conversation_deleted(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_conversation_deleted_wrong_uuid(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_conversation_deleted_wrong_uuid(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_conversation_deleted("321")
     assert not scw.conversation_title_bar.isHidden()
     assert not scw.conversation_view.isHidden()
@@ -3848,8 +4153,8 @@ def test_SourceConversationWrapper_on_conversation_deleted_wrong_uuid(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper__on_conversation_deletion_successful(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper__on_conversation_deletion_successful(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_conversation_deleted("123")
 
     scw._on_conversation_deletion_successful("123", datetime.now())
@@ -3861,8 +4166,8 @@ def test_SourceConversationWrapper__on_conversation_deletion_successful(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_conversation_deletion_failed(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_conversation_deletion_failed(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_conversation_deleted("123")
 
     scw.on_conversation_deletion_failed("123")
@@ -3874,8 +4179,8 @@ def test_SourceConversationWrapper_on_conversation_deletion_failed(mocker):
     assert scw.deletion_indicator.isHidden()
 
 
-def test_SourceConversationWrapper_on_conversation_deletion_failed_wrong_uuid(mocker):
-    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock())
+def test_SourceConversationWrapper_on_conversation_deletion_failed_wrong_uuid(mocker, session):
+    scw = SourceConversationWrapper(factory.Source(uuid="123"), mocker.MagicMock(session=session))
     scw.on_conversation_deleted("123")
 
     scw.on_conversation_deletion_failed("321")
@@ -3893,6 +4198,7 @@ def test_ConversationView_init(mocker, homedir):
     """
     mocked_source = mocker.MagicMock()
     message = factory.Message(source=factory.Source(), content=">^..^<")
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([message], 0))
     mocked_source.collection = mocked_source.server_collection = [message]
     user = factory.User()
     mocked_controller = mocker.MagicMock(authenticated_user=user)
@@ -3904,26 +4210,20 @@ def test_ConversationView_init_with_deleted_source(mocker, homedir, session):
     """
     Ensure the conversation view has a layout to add widgets to.
     """
-    mocked_controller = mocker.MagicMock()
+    mocked_controller = mocker.MagicMock(session=session)
     debug_logger = mocker.patch("securedrop_client.gui.widgets.logger.debug")
 
-    def collection_error():
-        raise sqlalchemy.exc.InvalidRequestError()
-
     source = factory.Source(uuid="ire-123")
     session.add(source)
     session.commit()
 
-    mock_collection = mocker.patch(
-        "securedrop_client.db.Source.collection", new_callable=PropertyMock
-    )
     ire = sqlalchemy.exc.InvalidRequestError()
-    mock_collection.side_effect = ire
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", side_effect=ire)
     ConversationView(source, mocked_controller)
     debug_logger.assert_any_call("Error initializing ConversationView: %s", ire)
 
 
-def test_ConversationView_ConversationScrollArea_resize(mocker):
+def test_ConversationView_ConversationScrollArea_resize(mocker, session):
     """
     Test that the resize event handler calls adjust_width on each conversation item, passing in the
     width of the scroll widget.
@@ -3932,7 +4232,7 @@ def test_ConversationView_ConversationScrollArea_resize(mocker):
     user = factory.User()
 
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(factory.Source(), controller)
     message = factory.Message(source=factory.Source(), content=">^..^<")
@@ -3953,7 +4253,7 @@ def test_ConversationView_ConversationScrollArea_resize(mocker):
 
 
 def test_ConversationView__on_sync_started(mocker, session):
-    cv = ConversationView(factory.Source(), mocker.MagicMock())
+    cv = ConversationView(factory.Source(), mocker.MagicMock(session=session))
     timestamp = datetime.now()
     cv._on_sync_started(timestamp)
     assert cv.sync_started_timestamp == timestamp
@@ -3966,7 +4266,7 @@ def test_ConversationView__on_conversation_deletion_successful(mocker, session):
     session.add(source)
     session.commit()
     user = factory.User()
-    cv = ConversationView(source, mocker.MagicMock(authenticated_user=user))
+    cv = ConversationView(source, mocker.MagicMock(authenticated_user=user, session=session))
     timestamp = datetime.now()
 
     cv._on_conversation_deletion_successful(cv.source.uuid, timestamp)
@@ -3978,13 +4278,15 @@ def test_ConversationView__on_conversation_deletion_successful(mocker, session):
     assert cv.current_messages[message.uuid].isHidden()
 
 
-def test_ConversationView__on_conversation_deletion_successful_with_mismatched_source_uuid(mocker):
+def test_ConversationView__on_conversation_deletion_successful_with_mismatched_source_uuid(
+    mocker, session
+):
     """
     If the success signal was emitted for a different source, ensure the deletion markers are not
     altered.
     """
     source = factory.Source(uuid="abc123")
-    cv = ConversationView(source, mocker.MagicMock())
+    cv = ConversationView(source, mocker.MagicMock(session=session))
 
     assert not cv._scroll.isHidden()
     assert cv.deleted_conversation_items_marker.isHidden()
@@ -3998,7 +4300,7 @@ def test_ConversationView__on_conversation_deletion_successful_with_mismatched_s
 
 
 def test_ConversationView__on_conversation_deletion_successful_handles_exception(mocker, session):
-    cv = ConversationView(factory.Source(uuid="abc123"), mocker.MagicMock())
+    cv = ConversationView(factory.Source(uuid="abc123"), mocker.MagicMock(session=session))
     cv.source = DeletedSource()
     cv._on_conversation_deletion_successful("abc123", datetime.now())  # does not raise exception
 
@@ -4012,7 +4314,7 @@ def test_ConversationView__on_conversation_deletion_successful_does_not_hide_dra
     session.add(message)
     session.add(source)
     session.commit()
-    cv = ConversationView(source, mocker.MagicMock(authenticated_user=user))
+    cv = ConversationView(source, mocker.MagicMock(authenticated_user=user, session=session))
 
     cv._on_conversation_deletion_successful(cv.source.uuid, datetime.now())
 
@@ -4032,6 +4334,7 @@ def test_ConversationView_update_conversation_position_follow(mocker, homedir):
     """
     mocked_source = mocker.MagicMock()
     message = factory.Message(source=factory.Source(), content=">^..^<")
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([message], 0))
     mocked_source.collection = mocked_source.server_collection = [message]
 
     user = factory.User()
@@ -4058,6 +4361,7 @@ def test_ConversationView_update_conversation_position_stay_fixed(mocker, homedi
     """
     mocked_source = mocker.MagicMock()
     message = factory.Message(source=factory.Source(), content=">^..^<")
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([message], 0))
     mocked_source.collection = mocked_source.server_collection = [message]
 
     user = factory.User()
@@ -4132,26 +4436,29 @@ def test_ConversationView_on_reply_sent(mocker):
     """
     The handler for new replies should call add_reply
     """
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", return_value=([], 0))
     source = factory.Source()
     controller = mocker.MagicMock()
     controller.authenticated_user = factory.User()
     cv = ConversationView(source, controller)
-    cv.update_conversation = mocker.MagicMock()
+    cv.refresh_conversation = mocker.MagicMock()
 
     assert cv.reply_flag is False
     cv.on_reply_sent(source_uuid=source.uuid)
 
-    cv.update_conversation.assert_called_with(source.collection)
+    cv.refresh_conversation.assert_called_once_with()
     assert cv.reply_flag is True
 
 
-def test_ConversationView_on_reply_sent_does_not_add_message_intended_for_different_source(mocker):
+def test_ConversationView_on_reply_sent_does_not_add_message_intended_for_different_source(
+    mocker, session
+):
     """
     The handler for new replies should not call add_reply for a message that was intended for a
     different source. #sanity-check
     """
     source = factory.Source()
-    controller = mocker.MagicMock()
+    controller = mocker.MagicMock(session=session)
     cv = ConversationView(source, controller)
     cv.add_reply = mocker.MagicMock()
 
@@ -4160,26 +4467,22 @@ def test_ConversationView_on_reply_sent_does_not_add_message_intended_for_differ
     assert not cv.add_reply.called
 
 
-def test_ConversationView_on_reply_sent_with_deleted_source(mocker):
+def test_ConversationView_on_reply_sent_with_deleted_source(mocker, session):
     """
     Check that replying to a deleted source handles exception.
     """
     source = factory.Source()
-    controller = mocker.MagicMock()
+    controller = mocker.MagicMock(session=session)
     cv = ConversationView(source, controller)
     cv.update_conversation = mocker.MagicMock()
 
-    def collection_error():
-        raise sqlalchemy.exc.InvalidRequestError()
-
-    mock_collection = mocker.patch(
-        "securedrop_client.db.Source.collection", new_callable=PropertyMock
-    )
     ire = sqlalchemy.exc.InvalidRequestError()
-    mock_collection.side_effect = ire
+    mocker.patch("securedrop_client.gui.widgets.get_conversation_page", side_effect=ire)
 
     cv.on_reply_sent(source.uuid)
 
+    cv.update_conversation.assert_not_called()
+
 
 def test_ConversationView_add_reply(mocker, homedir, session, session_maker):
     """
@@ -4296,7 +4599,7 @@ def test_ConversationView_add_downloaded_file(mocker, homedir, source, session):
     session.commit()
 
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file)
+    controller = mocker.MagicMock(get_file=get_file, session=session)
 
     cv = ConversationView(source, controller)
     cv.conversation_updated = mocker.MagicMock()
@@ -4324,7 +4627,7 @@ def test_ConversationView_add_not_downloaded_file(mocker, homedir, source, sessi
     session.commit()
 
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file)
+    controller = mocker.MagicMock(get_file=get_file, session=session)
 
     cv = ConversationView(source, controller)
     cv.conversation_updated = mocker.MagicMock()
@@ -4342,6 +4645,8 @@ def test_ConversationView_add_not_downloaded_file(mocker, homedir, source, sessi
 
 
 def test_DeleteSource_from_source_menu_when_user_is_loggedout(mocker):
+    # The dialogs must not be parented to a window that an earlier test left to be deleted
+    mocker.patch("PyQt5.QtWidgets.QApplication.activeWindow", return_value=QMainWindow())
     mock_controller = mocker.MagicMock()
     mock_controller.api = None
     mock_source = mocker.MagicMock()
@@ -4392,7 +4697,7 @@ def test_ReplyBoxWidget_placeholder_show_currently_selected_source(mocker):
     assert -1 != source_name.text()
 
 
-def test_ReplyBoxWidget_send_reply(mocker):
+def test_ReplyBoxWidget_send_reply(mocker, session):
     """
     Ensure sending a reply from the reply box emits signal, clears text box, and sends the reply
     details to the controller.
@@ -4400,7 +4705,7 @@ def test_ReplyBoxWidget_send_reply(mocker):
     source = factory.Source(uuid="abc123")
     reply_uuid = "456xyz"
     mocker.patch("securedrop_client.gui.widgets.uuid4", return_value=reply_uuid)
-    controller = mocker.MagicMock()
+    controller = mocker.MagicMock(session=session)
     mocker.patch("securedrop_client.gui.widgets.SourceProfileShortWidget")
     mocker.patch("securedrop_client.gui.widgets.QVBoxLayout.addWidget")
     scw = SourceConversationWrapper(source, controller, None)
@@ -4851,7 +5156,7 @@ def test_update_conversation_maintains_old_items(mocker, session):
 
     user = factory.User()
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3
@@ -4882,7 +5187,7 @@ def test_update_conversation_does_not_remove_pending_draft_items(mocker, session
 
     user = factory.User()
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3  # precondition with draft
@@ -4918,7 +5223,7 @@ def test_update_conversation_does_remove_successful_draft_items(mocker, session)
 
     user = factory.User()
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3  # precondition with draft
@@ -4958,7 +5263,7 @@ def test_update_conversation_keeps_failed_draft_items(mocker, session):
     session.commit()
 
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3  # precondition with draft
@@ -4991,7 +5296,7 @@ def test_update_conversation_adds_new_items(mocker, session):
 
     user = factory.User()
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3  # precondition
@@ -5023,7 +5328,7 @@ def test_update_conversation_position_updates(mocker, session):
 
     user = factory.User()
     get_file = mocker.MagicMock(return_value=file)
-    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user)
+    controller = mocker.MagicMock(get_file=get_file, authenticated_user=user, session=session)
 
     cv = ConversationView(source, controller)
     assert cv._scroll.conversation_layout.count() == 3  # precondition
@@ -5094,8 +5399,8 @@ def test_update_conversation_content_updates(mocker, session):
     second_session.add(message)
     second_session.commit()
 
-    # Second call of update_conversation
-    cv.update_conversation(cv.source.collection)
+    # The conversation is reloaded
+    cv.refresh_conversation()
 
     # Check that the widget was updated with the expected content.
     assert mock_msg_widget_res.message.setText.call_args[0][0] == expected_content
@@ -5296,6 +5601,106 @@ def test_SenderIcon_set_normal_styles_purple_for_authenticated_user(mocker):
     si.setObjectName.assert_called_once_with("SenderIcon_current_user")
 
 
+def test_ConversationView_shows_newest_page_then_older_pages(mocker, session):
+    """
+    Only the newest page of a long conversation is shown at first, and older pages are added
+    above it when the view is scrolled to the top.
+    """
+    mocker.patch.object(ConversationView, "PAGE_SIZE", 2)
+    source = factory.Source()
+    session.add(source)
+    messages = [factory.Message(source=source, filename=f"{i}-msg.gpg") for i in range(1, 6)]
+    session.add_all(messages)
+    session.commit()
+    controller = mocker.MagicMock(authenticated_user=factory.User(), session=session)
+
+    cv = ConversationView(source, controller)
+
+    assert cv.hidden_item_count == 3
+    assert list(cv.current_messages) == [messages[3].uuid, messages[4].uuid]
+    assert cv._scroll.conversation_layout.indexOf(cv.current_messages[messages[3].uuid]) == 0
+
+    cv._on_scroll(cv._scroll.verticalScrollBar().minimum())
+
+    assert cv.hidden_item_count == 1
+    for index, message in enumerate(messages[1:]):
+        message_widget = cv.current_messages[message.uuid]
+        assert message_widget.index == index
+        assert cv._scroll.conversation_layout.indexOf(message_widget) == index
+
+    cv.show_older_items()
+    cv.show_older_items()
+
+    assert cv.hidden_item_count == 0
+    assert len(cv.current_messages) == 5
+    assert cv.current_messages[messages[0].uuid].index == 0
+
+
+def test_ConversationView_update_conversation_position_shows_older_items_without_scroll_bar(
+    mocker, session
+):
+    """
+    Older items are shown while the items that are shown fit in the view, since it can't be
+    scrolled up to them.
+    """
+    mocker.patch.object(ConversationView, "PAGE_SIZE", 2)
+    source = factory.Source()
+    session.add(source)
+    messages = [factory.Message(source=source, filename=f"{i}-msg.gpg") for i in range(1, 4)]
+    session.add_all(messages)
+    session.commit()
+    controller = mocker.MagicMock(authenticated_user=factory.User(), session=session)
+    cv = ConversationView(source, controller)
+    assert cv.hidden_item_count == 1
+
+    cv.update_conversation_position(0, 0)
+
+    assert cv.hidden_item_count == 0
+    assert len(cv.current_messages) == 3
+
+
+def test_ConversationView_refresh_conversation_keeps_hidden_items_hidden(mocker, session):
+    """
+    New items are added below the ones that are shown, without showing older items.
+    """
+    mocker.patch.object(ConversationView, "PAGE_SIZE", 2)
+    source = factory.Source()
+    session.add(source)
+    messages = [factory.Message(source=source, filename=f"{i}-msg.gpg") for i in range(1, 4)]
+    session.add_all(messages)
+    session.commit()
+    controller = mocker.MagicMock(authenticated_user=factory.User(), session=session)
+    cv = ConversationView(source, controller)
+
+    message = factory.Message(source=source, filename="4-msg.gpg")
+    session.add(message)
+    session.commit()
+    cv.refresh_conversation()
+
+    assert cv.hidden_item_count == 1
+    assert list(cv.current_messages) == [messages[1].uuid, messages[2].uuid, message.uuid]
+    assert cv.current_messages[message.uuid].index == 2
+
+
+def test_ConversationView_update_deletion_markers_with_hidden_items(mocker, session):
+    """
+    Items deleted at the start of the conversation are shown as deleted while the first items are
+    not shown.
+    """
+    mocker.patch.object(ConversationView, "PAGE_SIZE", 2)
+    source = factory.Source()
+    session.add(source)
+    messages = [factory.Message(source=source, filename=f"{i}-msg.gpg") for i in range(2, 5)]
+    session.add_all(messages)
+    session.commit()
+    controller = mocker.MagicMock(authenticated_user=factory.User(), session=session)
+
+    cv = ConversationView(source, controller)
+
+    assert cv.hidden_item_count == 1
+    assert not cv.deleted_conversation_items_marker.isHidden()
+
+
 def test_ConversationView_updates_message_seenby_tooltip(mocker, session):
     """
     Ensure the tooltip displays the usernames of the users who have seen the messages
@@ -5315,7 +5720,7 @@ def test_ConversationView_updates_message_seenby_tooltip(mocker, session):
     session.commit()
 
     # Create the MessageWidget for the message above
-    controller = mocker.MagicMock(authenticated_user=journalist)
+    controller = mocker.MagicMock(authenticated_user=journalist, session=session)
     cv = ConversationView(source, controller)
     cv.update_conversation(source.collection)
     message_widget = cv.current_messages[message.uuid]
@@ -5360,7 +5765,7 @@ def test_ConversationView_updates_reply_seenby_tooltip(mocker, session):
     session.commit()
 
     # Create the MessageWidget for the message above
-    controller = mocker.MagicMock(authenticated_user=journalist)
+    controller = mocker.MagicMock(authenticated_user=journalist, session=session)
     cv = ConversationView(source, controller)
     cv.update_conversation(source.collection)
     reply_widget = cv.current_messages[reply.uuid]
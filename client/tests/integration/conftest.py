@@ -11,7 +11,7 @@ from tests import factory
 
 
 @pytest.fixture(scope="function")
-def main_window(mocker, homedir, mock_export_service):
+def main_window(mocker, homedir, session_maker, session, mock_export_service):
     mocker.patch(
         "securedrop_client.gui.conversation.export.device.export.getService",
         return_value=mock_export_service,
@@ -25,7 +25,7 @@ def main_window(mocker, homedir, mock_export_service):
         controller = Controller(
             "http://localhost",
             gui,
-            mocker.MagicMock(),
+            session_maker,
             homedir,
             None,
             sync_thread=sync_thread,
@@ -48,13 +48,15 @@ def main_window(mocker, homedir, mock_export_service):
             "securedrop_client.gui.base.SecureQLabel.get_elided_text",
             return_value="1-yellow-doc.gz.gpg",
         )
-        source.collection.append(
+        session.add(source)
+        session.add_all(
             [
                 factory.File(source=source, filename="1-yellow-doc.gz.gpg"),
                 factory.Message(source=source, filename="2-yellow-msg.gpg"),
                 factory.Reply(source=source, filename="3-yellow-reply.gpg"),
             ]
         )
+        session.commit()
         source_list.setCurrentItem(source_list.item(0))
         gui.main_view.on_source_changed()
 
@@ -67,7 +69,7 @@ def main_window(mocker, homedir, mock_export_service):
 
 
 @pytest.fixture(scope="function")
-def main_window_no_key(mocker, homedir, mock_export_service):
+def main_window_no_key(mocker, homedir, session_maker, session, mock_export_service):
     mocker.patch(
         "securedrop_client.gui.conversation.export.device.export.getService",
         return_value=mock_export_service,
@@ -81,7 +83,7 @@ def main_window_no_key(mocker, homedir, mock_export_service):
         controller = Controller(
             "http://localhost",
             gui,
-            mocker.MagicMock(),
+            session_maker,
             homedir,
             None,
             sync_thread=sync_thread,
@@ -104,13 +106,15 @@ def main_window_no_key(mocker, homedir, mock_export_service):
             "securedrop_client.gui.base.SecureQLabel.get_elided_text",
             return_value="1-yellow-doc.gz.gpg",
         )
-        source.collection.append(
+        session.add(source)
+        session.add_all(
             [
                 factory.File(source=source, filename="1-yellow-doc.gz.gpg"),
                 factory.Message(source=source, filename="2-yellow-msg.gpg"),
                 factory.Reply(source=source, filename="3-yellow-reply.gpg"),
             ]
         )
+        session.commit()
         source_list.setCurrentItem(source_list.item(0))
         gui.main_view.on_source_changed()
 
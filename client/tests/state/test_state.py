@@ -1,5 +1,4 @@
 import unittest
-from collections import namedtuple
 from unittest import mock
 
 from PyQt5.QtTest import QSignalSpy
@@ -7,9 +6,6 @@ from PyQt5.QtTest import QSignalSpy
 from securedrop_client import state
 from tests.helper import app  # noqa: F401
 
-Source = namedtuple("Source", ["uuid"])
-File = namedtuple("File", ["uuid", "source", "is_downloaded"])
-
 
 class TestState(unittest.TestCase):
     def setUp(self):
@@ -41,6 +37,34 @@ class TestState(unittest.TestCase):
         self.state.add_file(5, 7)
         assert len(self.state.conversation_files(5)) == 2
 
+    def test_add_file_keeps_the_order_of_the_files(self):
+        for file_id in ["c", "a", "b"]:
+            self.state.add_file("4", file_id)
+        self.state.add_file("4", "a")
+
+        assert [f.id for f in self.state.conversation_files("4")] == ["c", "a", "b"]
+
+    def test_add_file_shares_known_files(self):
+        self.state.add_file("4", "X")
+        self.state.record_file_download("X")
+        self.state.add_file("5", "X")
+
+        assert self.state.conversation_files("5")[0] is self.state.file("X")
+        assert self.state.conversation_files("5")[0].is_downloaded
+
+    def test_add_files_notifies_once_per_batch(self):
+        self.state.selected_conversation = 1
+        signal_emissions = QSignalSpy(self.state.selected_conversation_files_changed)
+
+        self.state.add_files([(1, "a"), (2, "b"), (1, "c")])
+        assert len(signal_emissions) == 1
+        assert len(self.state.conversation_files(1)) == 2
+        assert len(self.state.conversation_files(2)) == 1
+
+        # NOT when none of the files is new to the selected conversation
+        self.state.add_files([(1, "a"), (2, "d")])
+        assert len(signal_emissions) == 1
+
     def test_remove_conversation_files_removes_all_conversation_files(self):
         self.state.add_file(7, 3)
         self.state.add_file(7, 1)
@@ -130,12 +154,10 @@ class TestState(unittest.TestCase):
         assert self.state.selected_conversation_has_downloadable_files
 
     def test_gets_initialized_when_created_with_a_database(self):
-        source = Source(uuid="id")
-        file_1 = File(uuid="one", source=source, is_downloaded=True)
-        file_2 = File(uuid="two", source=source, is_downloaded=False)
-
         database = mock.MagicMock()
-        database.get_files = mock.MagicMock(return_value=[file_1, file_2])
+        database.get_file_states = mock.MagicMock(
+            return_value=[("one", "id", True), ("two", "id", False)]
+        )
 
         initialized_state = state.State(database)
         assert initialized_state.file(state.FileId("one")).is_downloaded
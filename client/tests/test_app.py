@@ -148,11 +148,13 @@ def test_start_app(homedir, mocker):
     mocker.patch("securedrop_client.app.prevent_second_instance")
     mocker.patch("securedrop_client.app.sys")
     mocker.patch("securedrop_client.app.make_session_maker", return_value=mock_session_maker)
+    export_service = mocker.patch("securedrop_client.app.export.getService").return_value
 
     start_app(mock_args, mock_qt_args)
 
     mock_app.assert_called_once_with(mock_qt_args)
     mock_win.assert_called_once_with(app_state)
+    export_service.end_session.assert_called_once_with()
     mock_controller.assert_called_once_with(
         "http://localhost:8081/",
         mock_win(),
@@ -1,6 +1,9 @@
 import unittest
 from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from textwrap import dedent
+from unittest import mock
 
 from securedrop_client import conversation
 from securedrop_client import db as database
@@ -124,3 +127,71 @@ class TestConversationTranscript(unittest.TestCase):
             File: 9-memo.zip.gpg
             """
         )
+
+    def test_save_writes_transcript(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            assert path.read_text(encoding="utf-8") == str(conversation.Transcript(self._source))
+
+    def test_save_skips_unchanged_conversation(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            transcript = conversation.Transcript(self._source)
+            with mock.patch.object(transcript._template, "generate") as generate:
+                transcript.save(path)
+
+            generate.assert_not_called()
+
+    def test_save_rewrites_changed_conversation(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            self._source.messages[0].content = "Hello! This was newsworthy."
+            self._source.messages[0].last_updated = datetime.now()
+            conversation.Transcript(self._source).save(path)
+            assert "Hello! This was newsworthy." in path.read_text(encoding="utf-8")
+
+            self._source.messages.append(
+                database.Message(filename="10-message.gpg", is_downloaded=True, content="Bye!")
+            )
+            conversation.Transcript(self._source).save(path)
+            assert path.read_text(encoding="utf-8").endswith("Bye!\n")
+
+    def test_save_rewrites_conversation_with_renamed_journalist(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            self._source.replies[2].journalist.username = "renamed-journalist"
+            conversation.Transcript(self._source).save(path)
+
+            assert "renamed-journalist wrote:" in path.read_text(encoding="utf-8")
+
+    def test_save_rewrites_transcript_after_saved_transcripts_are_cleared(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            conversation.clear_saved_transcripts()
+            transcript = conversation.Transcript(self._source)
+            with mock.patch.object(
+                transcript._template, "generate", wraps=transcript._template.generate
+            ) as generate:
+                transcript.save(path)
+
+            generate.assert_called_once()
+
+    def test_save_rewrites_changed_file(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir).joinpath("transcript.txt")
+            conversation.Transcript(self._source).save(path)
+
+            path.write_text("Not a transcript")
+            conversation.Transcript(self._source).save(path)
+
+            assert path.read_text(encoding="utf-8") == str(conversation.Transcript(self._source))
@@ -1,6 +1,9 @@
+import json
 import os
 import subprocess
+import tarfile
 import unittest
+from io import BytesIO
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 import pytest
@@ -76,18 +79,15 @@ def test_run_printer_preflight_error(mocker):
 
 def test__run_printer_preflight(mocker):
     """
-    Ensure _export_archive and _create_archive are called with the expected parameters,
-    _export_archive is called with the return value of _create_archive, and
-    _run_disk_test returns without error if 'USB_CONNECTED' is the return value of _export_archive.
+    Ensure _export is called with the expected parameters, and
+    _run_disk_test returns without error if 'USB_CONNECTED' is the return value of _export.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="")
+    export._export = mocker.MagicMock(return_value="")
 
     export._run_printer_preflight("mock_archive_dir")
 
-    export._export_archive.assert_called_once_with("mock_archive_path")
-    export._create_archive.assert_called_once_with(
+    export._export.assert_called_once_with(
         "mock_archive_dir", "printer-preflight.sd-export", {"device": "printer-preflight"}
     )
 
@@ -97,8 +97,7 @@ def test__run_printer_preflight_raises_ExportError_if_not_empty_string(mocker):
     Ensure ExportError is raised if _run_disk_test returns anything other than 'USB_CONNECTED'.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
+    export._export = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
 
     with pytest.raises(ExportError):
         export._run_printer_preflight("mock_archive_dir")
@@ -153,17 +152,14 @@ def test_print_error(mocker):
 
 def test__run_print(mocker):
     """
-    Ensure _export_archive and _create_archive are called with the expected parameters and
-    _export_archive is called with the return value of _create_archive.
+    Ensure _export is called with the expected parameters.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="")
+    export._export = mocker.MagicMock(return_value="")
 
     export._run_print("mock_archive_dir", ["mock_filepath"])
 
-    export._export_archive.assert_called_once_with("mock_archive_path")
-    export._create_archive.assert_called_once_with(
+    export._export.assert_called_once_with(
         "mock_archive_dir", "print_archive.sd-export", {"device": "printer"}, ["mock_filepath"]
     )
 
@@ -173,8 +169,7 @@ def test__run_print_raises_ExportError_if_not_empty_string(mocker):
     Ensure ExportError is raised if _run_print returns anything other than ''.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
+    export._export = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
 
     with pytest.raises(ExportError):
         export._run_print("mock_archive_dir", ["mock_filepath"])
@@ -272,18 +267,15 @@ def test_run_preflight_checks_error(mocker):
 
 def test__run_disk_export(mocker):
     """
-    Ensure _export_archive and _create_archive are called with the expected parameters,
-    _export_archive is called with the return value of _create_archive, and
-    _run_disk_test returns without error if '' is the output status of _export_archive.
+    Ensure _export is called with the expected parameters, and
+    _run_disk_test returns without error if '' is the output status of _export.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="")
+    export._export = mocker.MagicMock(return_value="")
 
     export._run_disk_export("mock_archive_dir", ["mock_filepath"], "mock_passphrase")
 
-    export._export_archive.assert_called_once_with("mock_archive_path")
-    export._create_archive.assert_called_once_with(
+    export._export.assert_called_once_with(
         "mock_archive_dir",
         "archive.sd-export",
         {"encryption_key": "mock_passphrase", "device": "disk", "encryption_method": "luks"},
@@ -296,8 +288,7 @@ def test__run_disk_export_raises_ExportError_if_not_empty_string(mocker):
     Ensure ExportError is raised if _run_disk_test returns anything other than ''.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
+    export._export = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_EMPTY_STRING")
 
     with pytest.raises(ExportError):
         export._run_disk_export("mock_archive_dir", ["mock_filepath"], "mock_passphrase")
@@ -305,18 +296,15 @@ def test__run_disk_export_raises_ExportError_if_not_empty_string(mocker):
 
 def test__run_disk_test(mocker):
     """
-    Ensure _export_archive and _create_archive are called with the expected parameters,
-    _export_archive is called with the return value of _create_archive, and
-    _run_disk_test returns without error if 'USB_ENCRYPTED' is the output status of _export_archive.
+    Ensure _export is called with the expected parameters, and
+    _run_disk_test returns without error if 'USB_ENCRYPTED' is the output status of _export.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value=ExportStatus("USB_ENCRYPTED"))
+    export._export = mocker.MagicMock(return_value=ExportStatus("USB_ENCRYPTED"))
 
     export._run_disk_test("mock_archive_dir")
 
-    export._export_archive.assert_called_once_with("mock_archive_path")
-    export._create_archive.assert_called_once_with(
+    export._export.assert_called_once_with(
         "mock_archive_dir", "disk-test.sd-export", {"device": "disk-test"}
     )
 
@@ -326,8 +314,7 @@ def test__run_disk_test_raises_ExportError_if_not_USB_ENCRYPTED(mocker):
     Ensure ExportError is raised if _run_disk_test returns anything other than 'USB_ENCRYPTED'.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_USB_ENCRYPTED")
+    export._export = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_USB_ENCRYPTED")
 
     with pytest.raises(ExportError):
         export._run_disk_test("mock_archive_dir")
@@ -335,18 +322,15 @@ def test__run_disk_test_raises_ExportError_if_not_USB_ENCRYPTED(mocker):
 
 def test__run_usb_test(mocker):
     """
-    Ensure _export_archive and _create_archive are called with the expected parameters,
-    _export_archive is called with the return value of _create_archive, and
-    _run_disk_test returns without error if 'USB_CONNECTED' is the return value of _export_archive.
+    Ensure _export is called with the expected parameters, and
+    _run_disk_test returns without error if 'USB_CONNECTED' is the return value of _export.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value=ExportStatus("USB_CONNECTED"))
+    export._export = mocker.MagicMock(return_value=ExportStatus("USB_CONNECTED"))
 
     export._run_usb_test("mock_archive_dir")
 
-    export._export_archive.assert_called_once_with("mock_archive_path")
-    export._create_archive.assert_called_once_with(
+    export._export.assert_called_once_with(
         "mock_archive_dir", "usb-test.sd-export", {"device": "usb-test"}
     )
 
@@ -356,8 +340,7 @@ def test__run_usb_test_raises_ExportError_if_not_USB_CONNECTED(mocker):
     Ensure ExportError is raised if _run_disk_test returns anything other than 'USB_CONNECTED'.
     """
     export = Export()
-    export._create_archive = mocker.MagicMock(return_value="mock_archive_path")
-    export._export_archive = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_USB_CONNECTED")
+    export._export = mocker.MagicMock(return_value="SOMETHING_OTHER_THAN_USB_CONNECTED")
 
     with pytest.raises(ExportError):
         export._run_usb_test("mock_archive_dir")
@@ -409,21 +392,32 @@ def test__create_archive_with_multiple_export_files(mocker):
     assert not os.path.exists(archive_path)
 
 
-def test__export_archive(mocker):
+@pytest.fixture
+def no_export_agent(mocker):
+    """
+    Make the export agent unavailable, so that archives are opened in the Export VM.
+    """
+    return mocker.patch("subprocess.Popen", side_effect=FileNotFoundError("qrexec-client-vm"))
+
+
+def test__export(mocker, no_export_agent):
     """
     Ensure the subprocess call returns the expected output.
     """
     export = Export()
     mocker.patch("subprocess.check_output", return_value=b"USB_CONNECTED")
-    status = export._export_archive("mock.sd-export")
+    with TemporaryDirectory() as temp_dir:
+        status = export._export(temp_dir, "mock.sd-export", {})
     assert status == ExportStatus.USB_CONNECTED
 
     mocker.patch("subprocess.check_output", return_value=b"mock")
-    with pytest.raises(ExportError, match="UNEXPECTED_RETURN_STATUS"):
-        export._export_archive("mock.sd-export")
+    with pytest.raises(
+        ExportError, match="UNEXPECTED_RETURN_STATUS"
+    ), TemporaryDirectory() as temp_dir:
+        export._export(temp_dir, "mock.sd-export", {})
 
 
-def test__export_archive_does_not_raise_ExportError_when_CalledProcessError(mocker):
+def test__export_does_not_raise_ExportError_when_CalledProcessError(mocker, no_export_agent):
     """
     Ensure ExportError is raised if a CalledProcessError is encountered.
     """
@@ -432,19 +426,21 @@ def test__export_archive_does_not_raise_ExportError_when_CalledProcessError(mock
 
     export = Export()
 
-    with pytest.raises(ExportError, match="CALLED_PROCESS_ERROR"):
-        export._export_archive("mock.sd-export")
+    with pytest.raises(ExportError, match="CALLED_PROCESS_ERROR"), TemporaryDirectory() as temp_dir:
+        export._export(temp_dir, "mock.sd-export", {})
 
 
-def test__export_archive_with_evil_command(mocker):
+def test__export_with_evil_command(mocker, no_export_agent):
     """
     Ensure shell command is shell-escaped.
     """
     export = Export()
     check_output = mocker.patch("subprocess.check_output", return_value=b"ERROR_FILE_NOT_FOUND")
 
-    with pytest.raises(ExportError, match="UNEXPECTED_RETURN_STATUS"):
-        export._export_archive("somefile; rm -rf ~")
+    with pytest.raises(
+        ExportError, match="UNEXPECTED_RETURN_STATUS"
+    ), TemporaryDirectory() as temp_dir:
+        export._export(temp_dir, "somefile; rm -rf ~", {})
 
     check_output.assert_called_once_with(
         [
@@ -455,13 +451,13 @@ def test__export_archive_with_evil_command(mocker):
             "/usr/lib/qubes/qopen-in-vm",
             "--view-only",
             "--",
-            "'somefile; rm -rf ~'",
+            "'{}'".format(os.path.join(temp_dir, "somefile; rm -rf ~")),
         ],
         stderr=-2,
     )
 
 
-def test__export_archive_success_on_empty_return_value(mocker):
+def test__export_success_on_empty_return_value(mocker, no_export_agent):
     """
     Ensure an error is not raised when qrexec call returns empty string,
     (success state for `disk`, `print`, `printer-test`).
@@ -472,7 +468,8 @@ def test__export_archive_success_on_empty_return_value(mocker):
     export = Export()
     check_output = mocker.patch("subprocess.check_output", return_value=b"")
 
-    result = export._export_archive("somefile.sd-export")
+    with TemporaryDirectory() as temp_dir:
+        result = export._export(temp_dir, "somefile.sd-export", {})
 
     check_output.assert_called_once_with(
         [
@@ -483,9 +480,279 @@ def test__export_archive_success_on_empty_return_value(mocker):
             "/usr/lib/qubes/qopen-in-vm",
             "--view-only",
             "--",
-            "somefile.sd-export",
+            os.path.join(temp_dir, "somefile.sd-export"),
         ],
         stderr=-2,
     )
 
     assert result is None
+
+
+def _mock_agent(mocker, responses, ready=True):
+    """
+    Helper. Return a mock export agent session that answers each request with the next of the
+    supplied responses, after saying it is ready unless ready is False.
+    """
+    agent = mocker.MagicMock()
+    agent.stdout.readline.side_effect = ([Export.AGENT_READY] if ready else []) + responses
+    agent.wait.return_value = 1
+    mocker.patch("securedrop_client.export.select.select", side_effect=lambda r, w, x, t: (r, w, x))
+    return agent
+
+
+def _read_requests(agent) -> list:
+    """
+    Helper. Return the archives sent to a mock export agent session.
+    """
+    stream = BytesIO(b"".join(call.args[0] for call in agent.stdin.write.call_args_list))
+    requests = []
+    archive = b""
+    while header := stream.readline():
+        size = int(header)
+        if size:
+            archive += stream.read(size)
+        else:
+            requests.append(archive)
+            archive = b""
+
+    assert archive == b""
+    return requests
+
+
+def test__export_uses_export_agent(mocker):
+    """
+    Ensure archives are streamed over a single export agent session when the agent is available,
+    without being written to disk.
+    """
+    agent = _mock_agent(mocker, [b"USB_CONNECTED\n", b"USB_ENCRYPTED\n", b"\n"])
+    popen = mocker.patch("subprocess.Popen", return_value=agent)
+    check_output = mocker.patch("subprocess.check_output")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        export_file = os.path.join(temp_dir, "document.pdf")
+        with open(export_file, "wb") as f:
+            f.write(b"document")
+
+        assert export._export(temp_dir, "a.sd-export", {"n": 1}) == ExportStatus.USB_CONNECTED
+        assert export._export(temp_dir, "b.sd-export", {"n": 2}) == ExportStatus.DISK_ENCRYPTED
+        assert export._export(temp_dir, "c.sd-export", {"n": 3}, [export_file]) is None
+
+        assert os.listdir(temp_dir) == ["document.pdf"]
+
+    popen.assert_called_once_with(
+        ["qrexec-client-vm", "--", "sd-devices", "securedrop.Export"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    requests = _read_requests(agent)
+    assert len(requests) == 3
+    for i, request in enumerate(requests):
+        with tarfile.open(fileobj=BytesIO(request), mode="r:") as archive:
+            metadata = archive.extractfile("metadata.json")
+            assert json.load(metadata) == {"n": i + 1}
+    with tarfile.open(fileobj=BytesIO(requests[2]), mode="r:") as archive:
+        assert archive.extractfile("export_data/document.pdf").read() == b"document"
+    check_output.assert_not_called()
+
+
+def test__export_falls_back_if_export_agent_unavailable(mocker):
+    """
+    Ensure archives are opened in the Export VM if the export agent session can't be started,
+    and that the agent is not tried again.
+    """
+    agent = _mock_agent(mocker, [b""], ready=False)
+    popen = mocker.patch("subprocess.Popen", return_value=agent)
+    check_output = mocker.patch("subprocess.check_output", return_value=b"USB_CONNECTED")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        assert export._export(temp_dir, "a.sd-export", {}) == ExportStatus.USB_CONNECTED
+        assert export._export(temp_dir, "b.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+        assert sorted(os.listdir(temp_dir)) == ["a.sd-export", "b.sd-export"]
+
+    popen.assert_called_once()
+    agent.stdin.write.assert_not_called()
+    agent.stdin.close.assert_called_once_with()
+    assert check_output.call_count == 2
+
+
+def test__export_falls_back_if_export_agent_does_not_start(mocker):
+    """
+    Ensure an export agent that is not ready in time is stopped before any archive is sent to it,
+    and that archives are opened in the Export VM instead.
+    """
+    agent = _mock_agent(mocker, [], ready=False)
+    select = mocker.patch("securedrop_client.export.select.select", return_value=([], [], []))
+    popen = mocker.patch("subprocess.Popen", return_value=agent)
+    check_output = mocker.patch("subprocess.check_output", return_value=b"USB_CONNECTED")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        assert export._export(temp_dir, "a.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+    select.assert_called_once_with([agent.stdout], [], [], Export.AGENT_START_TIMEOUT)
+    agent.stdin.write.assert_not_called()
+    agent.kill.assert_called_once_with()
+    popen.assert_called_once()
+    check_output.assert_called_once()
+
+
+def test__export_does_not_fall_back_once_archive_is_sent(mocker):
+    """
+    Ensure an archive is not opened in the Export VM if the export agent session ends after the
+    archive was sent to it, since the agent may have exported or printed it already.
+    """
+    agent = _mock_agent(mocker, [b""])
+    mocker.patch("subprocess.Popen", return_value=agent)
+    check_output = mocker.patch("subprocess.check_output")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        with pytest.raises(ExportError, match="CALLED_PROCESS_ERROR"):
+            export._export(temp_dir, "mock.sd-export", {})
+
+        assert os.listdir(temp_dir) == []
+
+    assert len(_read_requests(agent)) == 1
+    check_output.assert_not_called()
+
+
+def test__export_raises_ExportError_if_export_agent_session_ends(mocker):
+    """
+    Ensure ExportError is raised if an established export agent session ends during a request,
+    and that the next request starts a new session.
+    """
+    first_agent = _mock_agent(mocker, [b"USB_CONNECTED\n", b""])
+    second_agent = _mock_agent(mocker, [b"USB_CONNECTED\n"])
+    popen = mocker.patch("subprocess.Popen", side_effect=[first_agent, second_agent])
+    check_output = mocker.patch("subprocess.check_output")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        export._export(temp_dir, "mock.sd-export", {})
+        with pytest.raises(ExportError, match="CALLED_PROCESS_ERROR"):
+            export._export(temp_dir, "mock.sd-export", {})
+        assert export._export(temp_dir, "mock.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+    assert popen.call_count == 2
+    first_agent.stdin.close.assert_called_once_with()
+    check_output.assert_not_called()
+
+
+def test__export_raises_ExportError_if_export_agent_does_not_respond(mocker):
+    """
+    Ensure an export agent that does not respond in time is stopped and ExportError is raised,
+    without opening the archive in the Export VM, and that the next archive is sent over a new
+    session.
+    """
+    first_agent = _mock_agent(mocker, [])
+    second_agent = _mock_agent(mocker, [b"USB_CONNECTED\n"])
+    select = mocker.patch(
+        "securedrop_client.export.select.select",
+        side_effect=[
+            ([first_agent.stdout], [], []),
+            ([], [], []),
+            ([second_agent.stdout], [], []),
+            ([second_agent.stdout], [], []),
+        ],
+    )
+    popen = mocker.patch("subprocess.Popen", side_effect=[first_agent, second_agent])
+    check_output = mocker.patch("subprocess.check_output")
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        with pytest.raises(ExportError, match="CALLED_PROCESS_ERROR"):
+            export._export(temp_dir, "a.sd-export", {})
+        assert export._export(temp_dir, "b.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+    assert select.call_args_list[1] == mocker.call(
+        [first_agent.stdout], [], [], Export.AGENT_RESPONSE_TIMEOUT
+    )
+    first_agent.kill.assert_called_once_with()
+    first_agent.stdin.close.assert_called_once_with()
+    assert popen.call_count == 2
+    check_output.assert_not_called()
+
+
+def test_end_session(mocker):
+    """
+    Ensure ending the session closes the export agent session, and that the next archive is sent
+    over a new one.
+    """
+    first_agent = _mock_agent(mocker, [b"USB_CONNECTED\n"])
+    second_agent = _mock_agent(mocker, [b"USB_CONNECTED\n"])
+    popen = mocker.patch("subprocess.Popen", side_effect=[first_agent, second_agent])
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        assert export._export(temp_dir, "mock.sd-export", {}) == ExportStatus.USB_CONNECTED
+        export.end_session()
+        first_agent.stdin.close.assert_called_once_with()
+        assert export._export(temp_dir, "mock.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+    assert popen.call_count == 2
+    export.end_session()
+    second_agent.stdin.close.assert_called_once_with()
+
+
+def test__export_closes_export_agent_session_if_archive_fails(mocker):
+    """
+    Ensure the export agent session is closed if the archive can't be written, since the agent
+    would not know where the next request starts.
+    """
+    first_agent = _mock_agent(mocker, [])
+    second_agent = _mock_agent(mocker, [b"USB_CONNECTED\n"])
+    popen = mocker.patch("subprocess.Popen", side_effect=[first_agent, second_agent])
+    export = Export()
+
+    with TemporaryDirectory() as temp_dir:
+        with pytest.raises(FileNotFoundError):
+            export._export(temp_dir, "mock.sd-export", {}, ["/nonexistent/document.pdf"])
+        assert export._export(temp_dir, "mock.sd-export", {}) == ExportStatus.USB_CONNECTED
+
+    assert popen.call_count == 2
+    first_agent.stdin.close.assert_called_once_with()
+
+
+def test__create_archive_is_uncompressed_without_text_files(mocker):
+    """
+    Ensure archives of files that are mostly not text are not compressed.
+    """
+    export = Export()
+    with TemporaryDirectory() as temp_dir:
+        document_path = os.path.join(temp_dir, "document.pdf")
+        transcript_path = os.path.join(temp_dir, "transcript.txt")
+        with open(document_path, "wb") as f:
+            f.write(os.urandom(4096))
+        with open(transcript_path, "w") as f:
+            f.write("hello\n" * 100)
+
+        archive_path = export._create_archive(
+            temp_dir, "mock.sd-export", {}, [document_path, transcript_path]
+        )
+
+        with tarfile.open(archive_path, "r:") as archive:
+            names = archive.getnames()
+        assert names[0] == "metadata.json"
+        assert names[1].endswith("document.pdf")
+        assert names[2].endswith("transcript.txt")
+
+
+def test__create_archive_is_compressed_with_mostly_text_files(mocker):
+    """
+    Ensure archives of files that are mostly text are compressed.
+    """
+    export = Export()
+    with TemporaryDirectory() as temp_dir:
+        transcript_path = os.path.join(temp_dir, "transcript.txt")
+        with open(transcript_path, "w") as f:
+            f.write("hello\n" * 10000)
+
+        archive_path = export._create_archive(temp_dir, "mock.sd-export", {}, [transcript_path])
+
+        with tarfile.open(archive_path, "r:gz") as archive:
+            assert archive.getnames() == ["metadata.json", "export_data/transcript.txt"]
+        assert os.path.getsize(archive_path) < 60000
@@ -6,7 +6,6 @@ import datetime
 import logging
 import os
 from gettext import gettext as _
-from typing import Type
 from unittest.mock import Mock, call
 
 import arrow
@@ -31,6 +30,7 @@ from securedrop_client.api_jobs.updatestar import UpdateStarJobError, UpdateStar
 from securedrop_client.api_jobs.uploads import SendReplyJobError, SendReplyJobTimeoutError
 from securedrop_client.app import threads
 from securedrop_client.logic import APICallRunner, Controller
+from securedrop_client.sync import SyncReason, SyncScheduler
 from tests import factory
 
 MAX_SIGNAL_WAITING_TIME = 50
@@ -533,10 +533,10 @@ def test_Controller_on_sync_success(homedir, config, mocker):
     missing = factory.File(is_downloaded=None, is_decrypted=None, source=source)
     mock_storage.update_missing_files.return_value = [missing]
 
-    co.on_sync_success()
+    co.on_sync_success({source.uuid})
 
     mock_storage.update_missing_files.assert_called_once_with(co.data_dir, co.session)
-    co.update_sources.assert_called_once_with()
+    co.update_sources.assert_called_once_with({source.uuid})
     co.download_new_messages.assert_called_once_with()
     co.download_new_replies.assert_called_once_with()
     co.resume_queues.assert_called_once_with()
@@ -681,7 +681,7 @@ def test_Controller_update_sources(homedir, config, mocker):
     co.update_sources()
 
     mock_storage.get_local_sources.assert_called_once_with(mock_session)
-    mock_gui.show_sources.assert_called_once_with(source_list)
+    mock_gui.show_sources.assert_called_once_with(source_list, None)
 
 
 def test_Controller_mark_seen(homedir, config, mocker, session, session_maker):
@@ -695,6 +695,7 @@ def test_Controller_mark_seen(homedir, config, mocker, session, session_maker):
     session.add(file)
     session.add(message)
     session.add(reply)
+    session.commit()
 
     job = mocker.MagicMock()
     job.success_signal = mocker.MagicMock()
@@ -785,6 +786,7 @@ def test_Controller_mark_seen_with_unseen_file_only(
     source = factory.Source()
     file = factory.File(source=source, uuid="file-uuid-1")
     session.add(file)
+    session.commit()
 
     job = mocker.patch("securedrop_client.logic.SeenJob")
 
@@ -801,6 +803,7 @@ def test_Controller_mark_seen_with_unseen_message_only(
     source = factory.Source()
     message = factory.Message(source=source, uuid="msg-uuid-1")
     session.add(message)
+    session.commit()
 
     job = mocker.patch("securedrop_client.logic.SeenJob")
 
@@ -817,6 +820,7 @@ def test_Controller_mark_seen_with_unseen_reply_only(
     source = factory.Source()
     reply = factory.Reply(source=source, uuid="reply-uuid-1")
     session.add(reply)
+    session.commit()
 
     job = mocker.patch("securedrop_client.logic.SeenJob")
 
@@ -870,45 +874,14 @@ def test_Controller_mark_seen_skips_op_if_user_offline(
     job.failure_signal.connect.assert_not_called()
 
 
-class DeletedFile(Mock):
-    def __class__(self):
-        return Type(db.File)
-
-    def seen_by(self, journalist_id):
-        raise sqlalchemy.exc.InvalidRequestError()
-
-
-class SourceWithDeletedFile(Mock):
+class DeletedSource(Mock):
     @property
-    def collection(self):
-        deleted_file = DeletedFile()
-        return [deleted_file]
-
-
-def test_Controller_mark_seen_does_not_raise_InvalidRequestError_if_item_deleted(
-    homedir, config, mocker, session, session_maker
-):
-    """
-    If a source item no longer exists in the local data store, ensure we do not raise an exception.
-    """
-    mocker.patch("securedrop_client.logic.isinstance", return_value=True)
-    debug_logger = mocker.patch("securedrop_client.logic.logger.debug")
-    co = Controller("http://localhost", mocker.MagicMock(), session_maker, homedir, None)
-    co.authenticated_user = factory.User()
-
-    co.mark_seen(SourceWithDeletedFile())
-
-    assert debug_logger.call_count == 1
-
-
-class DeletedSourceWhenAccessingCollection(Mock):
-    @property
-    def collection(self):
+    def id(self):
         raise sqlalchemy.exc.InvalidRequestError()
 
     @property
     def uuid(self):
-        return "DeletedSourceWhenAccessingCollection_uuid"
+        return "DeletedSource_uuid"
 
     @property
     def seen(self):
@@ -933,7 +906,7 @@ def test_Controller_mark_seen_does_not_raise_InvalidRequestError_if_source_delet
     co = Controller("http://localhost", mocker.MagicMock(), session_maker, homedir, None)
     co.authenticated_user = factory.User()
 
-    co.mark_seen(DeletedSourceWhenAccessingCollection())
+    co.mark_seen(DeletedSource())
 
     assert debug_logger.call_count == 1
 
@@ -1039,12 +1012,18 @@ def test_Controller_logout_with_no_api(homedir, config, mocker, session_maker):
     co.api_job_queue = mocker.MagicMock()
     co.api_job_queue.stop = mocker.MagicMock()
     co.call_api = mocker.MagicMock()
+    export_service = mocker.patch("securedrop_client.logic.export.getService").return_value
+    clear_saved_transcripts = mocker.patch(
+        "securedrop_client.logic.conversation.clear_saved_transcripts"
+    )
 
     co.logout()
 
     assert not co.authenticated_user
     co.call_api.assert_not_called()
     co.api_job_queue.stop.assert_called_once_with()
+    export_service.end_session.assert_called_once_with()
+    clear_saved_transcripts.assert_called_once_with()
     co.gui.logout.assert_called_once_with()
 
 
@@ -1255,8 +1234,13 @@ def test_Controller_on_file_download_Submission(homedir, config, session, mocker
 
     mock_success_signal = mocker.MagicMock()
     mock_failure_signal = mocker.MagicMock()
+    mock_download_started = mocker.MagicMock()
+    mock_download_finished = mocker.MagicMock()
     mock_job = mocker.MagicMock(
-        success_signal=mock_success_signal, failure_signal=mock_failure_signal
+        success_signal=mock_success_signal,
+        failure_signal=mock_failure_signal,
+        download_started=mock_download_started,
+        download_finished=mock_download_finished,
     )
     mock_job_cls = mocker.patch("securedrop_client.logic.FileDownloadJob", return_value=mock_job)
     add_job_emissions = QSignalSpy(co.add_job)
@@ -1274,6 +1258,36 @@ def test_Controller_on_file_download_Submission(homedir, config, session, mocker
     assert add_job_emissions[0] == [mock_job]
     mock_success_signal.connect.assert_called_once_with(co.on_file_download_success)
     mock_failure_signal.connect.assert_called_once_with(co.on_file_download_failure)
+    mock_download_started.connect.assert_called_once_with(co.api_sync.download_started)
+    mock_download_finished.connect.assert_called_once_with(co.api_sync.download_finished)
+
+
+def test_Controller_on_file_download_holds_syncs_back_while_downloading(
+    homedir, config, mocker, session, session_maker
+):
+    """
+    Check that a large file download only holds syncs back while the job is downloading it, and
+    not while it is waiting in the queue.
+    """
+    co = Controller("http://localhost", mocker.MagicMock(), session_maker, homedir, None)
+    co.api = "this has a value"
+    add_job_emissions = QSignalSpy(co.add_job)
+
+    source = factory.Source()
+    file_ = factory.File(source=source, size=SyncScheduler.LARGE_DOWNLOAD_SIZE)
+    session.add(source)
+    session.add(file_)
+    session.commit()
+
+    co.on_submission_download(db.File, file_.uuid)
+    assert co.api_sync.scheduler.reason != SyncReason.LARGE_DOWNLOAD
+
+    job = add_job_emissions[0][0]
+    job.download_started.emit(file_.uuid, file_.size)
+    assert co.api_sync.scheduler.reason == SyncReason.LARGE_DOWNLOAD
+
+    job.download_finished.emit(file_.uuid)
+    assert co.api_sync.scheduler.reason != SyncReason.LARGE_DOWNLOAD
 
 
 def test_Controller_on_file_download_Submission_no_auth(
@@ -1586,13 +1600,14 @@ def test_Controller_download_new_replies_with_new_reply(mocker, session, session
     success_signal = mocker.MagicMock()
     failure_signal = mocker.MagicMock()
     job = mocker.MagicMock(success_signal=success_signal, failure_signal=failure_signal)
-    mocker.patch("securedrop_client.logic.ReplyDownloadJob", return_value=job)
+    reply_download_job = mocker.patch("securedrop_client.logic.ReplyDownloadJob", return_value=job)
     add_job_emissions = QSignalSpy(co.add_job)
 
     co.download_new_replies()
 
     assert len(add_job_emissions) == 1
     assert add_job_emissions[0] == [job]
+    reply_download_job.assert_called_once_with(reply.uuid, co.data_dir, co.gpg, reply.source.uuid)
     success_signal.connect.assert_called_once_with(co.on_reply_download_success)
     failure_signal.connect.assert_called_once_with(co.on_reply_download_failure)
 
@@ -1694,6 +1709,17 @@ def test_Controller_on_reply_downloaded_decryption_failure(mocker, homedir, sess
     assert reply_download_failed_emissions[0] == [reply.source.uuid, reply.uuid, str(reply)]
 
 
+def test_Controller_prioritize_downloads(mocker, homedir, session_maker):
+    co = Controller("http://localhost", mocker.MagicMock(), session_maker, homedir, None)
+    co.api_job_queue = mocker.MagicMock()
+
+    co.prioritize_downloads("source-1", ["source-1", "source-2"])
+
+    co.api_job_queue.prioritize_sources.assert_called_once_with(
+        "source-1", ["source-1", "source-2"]
+    )
+
+
 def test_Controller_download_new_messages_with_new_message(mocker, session, session_maker, homedir):
     """
     Test that `download_new_messages` enqueues a job, connects to the right slots, and sets a
@@ -1708,13 +1734,18 @@ def test_Controller_download_new_messages_with_new_message(mocker, session, sess
     failure_signal = mocker.MagicMock()
     add_job_emissions = QSignalSpy(co.add_job)
     job = mocker.MagicMock(success_signal=success_signal, failure_signal=failure_signal)
-    mocker.patch("securedrop_client.logic.MessageDownloadJob", return_value=job)
+    message_download_job = mocker.patch(
+        "securedrop_client.logic.MessageDownloadJob", return_value=job
+    )
     set_status = mocker.patch.object(co, "set_status")
 
     co.download_new_messages()
 
     assert len(add_job_emissions) == 1
     assert add_job_emissions[0] == [job]
+    message_download_job.assert_called_once_with(
+        message.uuid, co.data_dir, co.gpg, message.source.uuid
+    )
     success_signal.connect.assert_called_once_with(co.on_message_download_success)
     failure_signal.connect.assert_called_once_with(co.on_message_download_failure)
 
@@ -1900,10 +1931,12 @@ def test_Controller_on_delete_source_success(mocker, homedir, session_maker):
     co = Controller("http://localhost", mocker.MagicMock(), mocker.MagicMock(), homedir, None)
     co.source_deleted = mocker.MagicMock()
     storage = mocker.patch("securedrop_client.logic.storage")
+    request_sync = mocker.patch.object(co.api_sync, "request_sync")
 
     co.on_delete_source_success("uuid")
 
     storage.delete_local_source_by_uuid.assert_called_once_with(co.session, "uuid", co.data_dir)
+    request_sync.assert_called_once_with()
 
 
 def test_Controller_on_delete_source_failure(homedir, config, mocker, session_maker):
@@ -1972,6 +2005,7 @@ def test_Controller_on_delete_conversation_success(mocker, homedir):
     co = Controller("http://localhost", mocker.MagicMock(), mocker.MagicMock(), homedir, None)
     mock_storage = mocker.MagicMock()
     mocker.patch("securedrop_client.logic.storage", mock_storage)
+    request_sync = mocker.patch.object(co.api_sync, "request_sync")
 
     co.on_delete_conversation_success("uuid-blah")
 
@@ -1981,6 +2015,7 @@ def test_Controller_on_delete_conversation_success(mocker, homedir):
     mock_storage.delete_local_conversation_by_source_uuid.assert_called_once_with(
         co.session, "uuid-blah", co.data_dir
     )
+    request_sync.assert_called_once_with()
 
 
 def test_Controller_on_delete_conversation_failure(homedir, config, mocker, session_maker, session):
@@ -2169,12 +2204,14 @@ def test_Controller_on_reply_success(homedir, mocker, session_maker, session):
     mock_storage.get_reply.return_value = mock_reply
 
     mocker.patch("securedrop_client.logic.storage", mock_storage)
+    request_sync = mocker.patch.object(co.api_sync, "request_sync")
     co.on_reply_success(reply.uuid)
 
     assert info_logger.call_args_list[0][0][0] == "{} sent successfully".format(reply.uuid)
     assert len(reply_succeeded_emissions) == 1
     assert reply_succeeded_emissions[0] == ["source_uuid", reply.uuid, "reply_message_mock"]
     assert len(reply_failed_emissions) == 0
+    request_sync.assert_called_once_with()
 
 
 def test_Controller_on_reply_failure(homedir, mocker, session_maker):
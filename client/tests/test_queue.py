@@ -14,6 +14,7 @@ from securedrop_client.api_jobs.downloads import (
     ReplyDownloadJob,
 )
 from securedrop_client.api_jobs.seen import SeenJob
+from securedrop_client.api_jobs.updatestar import UpdateStarJob
 from securedrop_client.api_jobs.uploads import SendReplyJob
 from securedrop_client.app import threads
 from securedrop_client.queue import ApiJobQueue, RunnableQueue
@@ -216,6 +217,139 @@ def test_RunnableQueue_duplicate_jobs(mocker):
     assert len(queue.queue.queue) == 2
 
 
+def test_RunnableQueue_merges_seen_jobs(mocker):
+    """
+    Verify that a SeenJob takes up the items of the SeenJobs added while it is queued.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    job = SeenJob(["file-1"], ["message-1"], [])
+
+    queue.add_job(job)
+    queue.add_job(SeenJob(["file-1"], ["message-1"], []))
+    queue.add_job(SeenJob(["file-2"], ["message-1", "message-2"], ["reply-1"]))
+
+    assert queue.queue.queue == [(RunnableQueue.JOB_PRIORITIES[SeenJob], job)]
+    assert job.files == ["file-1", "file-2"]
+    assert job.messages == ["message-1", "message-2"]
+    assert job.replies == ["reply-1"]
+
+
+def test_RunnableQueue_does_not_merge_seen_job_into_current_job(mocker):
+    """
+    Verify that a SeenJob for other items is queued while a SeenJob is being processed, and that
+    one for the same items is skipped.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    queue.current_job = SeenJob(["file-1"], [], [])
+
+    queue.add_job(SeenJob(["file-1"], [], []))
+    assert queue.queue.empty()
+
+    queue.add_job(SeenJob(["file-2"], [], []))
+    assert len(queue.queue.queue) == 1
+
+
+def test_RunnableQueue_processes_seen_job_after_delay(mocker):
+    """
+    Verify that a SeenJob is processed once it has waited SEEN_JOB_DELAY seconds in the queue.
+    """
+    api_client = mocker.MagicMock()
+    times = iter([100, 100.99, 101])
+    queue = RunnableQueue(api_client, mocker.MagicMock(), clock=lambda: next(times))
+    # Pause the queue once the job is processed so that the test exits the processing loop
+    api_client.seen.side_effect = lambda *args: queue.add_job(PauseQueueJob())
+
+    queue.add_job(SeenJob(["file-1"], [], []))
+    assert queue._get_delay() == pytest.approx(0.01)
+
+    queue.process()
+
+    api_client.seen.assert_called_once_with(["file-1"], [], [])
+    assert queue.queue.empty()
+
+
+def test_RunnableQueue_update_star_job_cancels_queued_job_it_undoes(mocker):
+    """
+    Verify that an UpdateStarJob that undoes the one queued for the same source cancels it, and
+    that both jobs succeed.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    job = UpdateStarJob("source-1", False)
+    undo_job = UpdateStarJob("source-1", True)
+    other_source_job = UpdateStarJob("source-2", False)
+    job_success_emissions = QSignalSpy(job.success_signal)
+    undo_job_success_emissions = QSignalSpy(undo_job.success_signal)
+
+    queue.add_job(job)
+    queue.add_job(other_source_job)
+    queue.add_job(undo_job)
+
+    assert [queued_job for priority, queued_job in queue.queue.queue] == [other_source_job]
+    assert job_success_emissions[0] == ["source-1"]
+    assert undo_job_success_emissions[0] == ["source-1"]
+
+
+def test_RunnableQueue_update_star_job_merged_into_same_update(mocker):
+    """
+    Verify that an UpdateStarJob that does the same update as the one queued for the same source
+    succeeds or fails along with it.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    job = UpdateStarJob("source-1", False)
+    same_job = UpdateStarJob("source-1", False)
+    success_emissions = QSignalSpy(same_job.success_signal)
+    failure_emissions = QSignalSpy(same_job.failure_signal)
+
+    queue.add_job(job)
+    queue.add_job(same_job)
+    assert [queued_job for priority, queued_job in queue.queue.queue] == [job]
+
+    job.success_signal.emit("source-1")
+    error = Exception("bang")
+    job.failure_signal.emit(error)
+
+    assert success_emissions[0] == ["source-1"]
+    assert failure_emissions[0] == [error]
+
+
+def test_RunnableQueue_queues_update_star_job_that_undoes_current_job(mocker):
+    """
+    Verify that an UpdateStarJob that undoes the star update in progress is not skipped as a
+    duplicate.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    queue.current_job = UpdateStarJob("source-1", False)
+
+    queue.add_job(UpdateStarJob("source-1", False))
+    assert queue.queue.empty()
+
+    queue.add_job(UpdateStarJob("source-1", True))
+    assert len(queue.queue.queue) == 1
+
+
+def test_RunnableQueue_prioritize_sources(mocker):
+    """
+    Verify that the message and reply downloads of the selected source are processed first, then
+    those of the visible sources, including the jobs that are already queued.
+    """
+    queue = RunnableQueue(mocker.MagicMock(), mocker.MagicMock())
+    other_job = MessageDownloadJob("message-1", "mock", "mock", "other-source")
+    visible_job = ReplyDownloadJob("reply-1", "mock", "mock", "visible-source")
+    selected_job = MessageDownloadJob("message-2", "mock", "mock", "selected-source")
+    unknown_source_job = MessageDownloadJob("message-3", "mock", "mock")
+    queue.add_job(other_job)
+    queue.add_job(visible_job)
+    queue.add_job(selected_job)
+    queue.add_job(unknown_source_job)
+
+    queue.prioritize_sources("selected-source", ["selected-source", "visible-source"])
+    later_selected_job = ReplyDownloadJob("reply-2", "mock", "mock", "selected-source")
+    queue.add_job(later_selected_job)
+
+    jobs = [queue.queue.get()[1] for i in range(5)]
+    assert jobs == [selected_job, later_selected_job, visible_job, other_job, unknown_source_job]
+
+
 def test_RunnableQueue_job_generic_exception(mocker):
     """
     Add two jobs to the queue, the first of which will cause a generic exception, which is handled
@@ -274,6 +408,18 @@ def test_RunnableQueue_clear(mocker):
     assert queue.queue.empty()
 
 
+def test_ApiJobQueue_prioritize_sources(mocker):
+    with threads(2) as [main_thread, file_download_thread]:
+        job_queue = ApiJobQueue(
+            mocker.MagicMock(), mocker.MagicMock(), main_thread, file_download_thread
+        )
+        main_queue = mocker.patch.object(job_queue, "main_queue")
+
+        job_queue.prioritize_sources("source-1", ["source-1", "source-2"])
+
+        main_queue.prioritize_sources.assert_called_once_with("source-1", ["source-1", "source-2"])
+
+
 def test_ApiJobQueue_enqueue_when_queues_are_running(mocker):
     mock_client = mocker.MagicMock()
     mock_session_maker = mocker.MagicMock()
@@ -1,8 +1,10 @@
 """
 Tests for the resources sub-module.
 """
+from PyQt5.QtCore import QCoreApplication, QEvent, QObject, QSize
 from PyQt5.QtGui import QIcon, QMovie, QPixmap
 from PyQt5.QtSvg import QSvgWidget
+from PyQt5.QtWidgets import QWidget
 
 import securedrop_client.resources
 from tests.helper import app  # noqa: F401
@@ -67,3 +69,101 @@ def test_load_movie():
     """
     result = securedrop_client.resources.load_movie("download_animation.gif")
     assert isinstance(result, QMovie)
+
+
+def test_load_icon_is_shared():
+    """
+    Check the SVG files of an icon are only read once, and that callers get their own copy.
+    """
+    icon = securedrop_client.resources.load_icon("star_on.svg", "star_hover.svg")
+    other_icon = securedrop_client.resources.load_icon("star_on.svg", "star_hover.svg")
+
+    assert icon is not other_icon
+    assert icon.cacheKey() == other_icon.cacheKey()
+
+
+def test_load_svg_shares_renderer():
+    """
+    Check that SVG widgets of the same file draw with the same renderer.
+    """
+    svg = securedrop_client.resources.load_svg("paperclip.svg")
+    other_svg = securedrop_client.resources.load_svg("paperclip.svg")
+
+    assert svg.renderer() is other_svg.renderer()
+    assert svg.renderer().isValid()
+    assert svg.sizeHint() == svg.renderer().defaultSize()
+
+
+def test_load_css_is_cached(mocker):
+    """
+    Ensure a CSS file is only read the first time it is loaded.
+    """
+    rs = mocker.patch("securedrop_client.resources.resource_string", return_value=b"bar")
+
+    assert securedrop_client.resources.load_css("cached.css") == "bar"
+    assert securedrop_client.resources.load_css("cached.css") == "bar"
+
+    rs.assert_called_once_with(securedrop_client.resources.__name__, "css/cached.css")
+
+
+def test_load_shared_movie():
+    """
+    Check that references to the same animation at the same size share a movie, which runs
+    while any of them is started.
+    """
+    owner = QObject()
+    movie = securedrop_client.resources.load_shared_movie("loading-bar.gif", owner, QSize(4, 2))
+    other_movie = securedrop_client.resources.load_shared_movie(
+        "loading-bar.gif", owner, QSize(4, 2)
+    )
+    assert movie.movie is other_movie.movie
+    assert movie.movie.scaledSize() == QSize(4, 2)
+    assert (
+        securedrop_client.resources.load_shared_movie("loading-bar.gif", owner).movie
+        is not movie.movie
+    )
+
+    movie.start()
+    other_movie.start()
+    other_movie.start()
+    assert movie.movie.state() == QMovie.Running
+
+    other_movie.stop()
+    assert movie.movie.state() == QMovie.Running
+
+    movie.stop()
+    movie.stop()
+    assert movie.movie.state() == QMovie.NotRunning
+
+
+def test_load_shared_movie_stops_when_owner_is_deleted():
+    """
+    Check that a reference is stopped when its owner is deleted.
+    """
+    owner = QObject()
+    movie = securedrop_client.resources.load_shared_movie("loading-cubes.gif", owner)
+    movie.start()
+    assert movie.movie.state() == QMovie.Running
+
+    del owner
+
+    assert not movie.is_started
+    assert movie.movie.state() == QMovie.NotRunning
+
+
+def test_load_shared_movie_stops_when_parent_of_owner_is_deleted():
+    """
+    Check that a reference is stopped when its owner is deleted along with its parent, as
+    happens to widgets that are removed from the GUI.
+    """
+    parent = QWidget()
+    owner = QWidget(parent)
+    movie = securedrop_client.resources.load_shared_movie("loading-cubes.gif", owner)
+    movie.start()
+    assert movie.movie.state() == QMovie.Running
+
+    parent.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    assert not movie.is_started
+    assert movie.movie.state() == QMovie.NotRunning
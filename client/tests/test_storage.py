@@ -21,6 +21,7 @@ from securedrop_client.storage import (
     _cleanup_directory_if_empty,
     _cleanup_flagged_locally_deleted,
     _delete_source_collection_from_db,
+    count_conversation_items,
     create_or_update_user,
     delete_local_conversation_by_source_uuid,
     delete_local_source_by_uuid,
@@ -28,7 +29,11 @@ from securedrop_client.storage import (
     find_new_files,
     find_new_messages,
     find_new_replies,
+    get_conversation_page,
     get_file,
+    get_first_file_counter,
+    get_latest_server_items,
+    get_local_file_states,
     get_local_files,
     get_local_messages,
     get_local_replies,
@@ -36,10 +41,13 @@ from securedrop_client.storage import (
     get_message,
     get_remote_data,
     get_reply,
+    get_seen_by_lists,
+    get_unseen_items,
     mark_all_pending_drafts_as_failed,
     mark_as_decrypted,
     mark_as_downloaded,
     mark_as_not_downloaded,
+    refresh_replies,
     set_message_or_reply_content,
     source_exists,
     update_draft_replies,
@@ -209,6 +217,66 @@ def test_get_local_files(mocker):
     mock_session.query.assert_called_once_with(securedrop_client.db.File)
 
 
+def test_get_local_file_states(session):
+    source = factory.Source()
+    other_source = factory.Source()
+    file = factory.File(source=source, is_downloaded=True)
+    other_file = factory.File(source=other_source, is_downloaded=False, is_decrypted=None)
+    session.add_all([source, other_source, file, other_file])
+    session.commit()
+
+    assert sorted(get_local_file_states(session)) == sorted(
+        [(file.uuid, source.uuid, True), (other_file.uuid, other_source.uuid, False)]
+    )
+
+
+def test_get_unseen_items(session):
+    """
+    Check that only the items of the source that the journalist has not seen are returned, in
+    conversation order.
+    """
+    journalist = factory.User()
+    other_journalist = factory.User()
+    source = factory.Source()
+    other_source = factory.Source()
+    seen_file = factory.File(source=source, filename="1-doc.gz.gpg")
+    unseen_file = factory.File(source=source, filename="2-doc.gz.gpg")
+    unseen_message = factory.Message(source=source, filename="3-msg.gpg")
+    seen_message = factory.Message(source=source, filename="4-msg.gpg")
+    unseen_reply = factory.Reply(source=source, filename="6-reply.gpg")
+    other_unseen_reply = factory.Reply(source=source, filename="5-reply.gpg")
+    other_source_file = factory.File(source=other_source)
+    session.add_all(
+        [
+            journalist,
+            other_journalist,
+            seen_file,
+            unseen_file,
+            unseen_message,
+            seen_message,
+            unseen_reply,
+            other_unseen_reply,
+            other_source_file,
+        ]
+    )
+    session.commit()
+    session.add_all(
+        [
+            db.SeenFile(file_id=seen_file.id, journalist_id=journalist.id),
+            db.SeenFile(file_id=unseen_file.id, journalist_id=other_journalist.id),
+            db.SeenMessage(message_id=seen_message.id, journalist_id=journalist.id),
+            db.SeenReply(reply_id=unseen_reply.id, journalist_id=other_journalist.id),
+        ]
+    )
+    session.commit()
+
+    assert get_unseen_items(session, source.id, journalist.id) == (
+        [unseen_file.uuid],
+        [unseen_message.uuid],
+        [other_unseen_reply.uuid, unseen_reply.uuid],
+    )
+
+
 def test_get_local_replies(mocker):
     """
     At this moment, just return all replies.
@@ -218,6 +286,153 @@ def test_get_local_replies(mocker):
     mock_session.query.assert_called_once_with(securedrop_client.db.Reply)
 
 
+def test_get_conversation_page(session):
+    """
+    Check that the newest conversation items of a source are returned in conversation order,
+    whatever their type, along with the number of older items, and that pending draft replies
+    are always included last.
+    """
+    source = factory.Source()
+    other_source = factory.Source()
+    pending_status = factory.ReplySendStatus(name=db.ReplySendStatusCodes.PENDING.value)
+    session.add_all([source, other_source, pending_status])
+    session.commit()
+    message = factory.Message(source=source, filename="1-msg.gpg")
+    file = factory.File(source=source, filename="2-doc.gz.gpg")
+    reply = factory.Reply(source=source, filename="3-reply.gpg")
+    newest_message = factory.Message(source=source, filename="4-msg.gpg")
+    draft = factory.DraftReply(source=source, file_counter=1, send_status_id=pending_status.id)
+    other_message = factory.Message(source=other_source, filename="5-msg.gpg")
+    session.add_all([message, file, reply, newest_message, draft, other_message])
+    session.commit()
+
+    assert get_conversation_page(session, source.id, 3) == ([reply, newest_message, draft], 2)
+    assert get_conversation_page(session, source.id, 10) == (source.collection, 0)
+    assert get_conversation_page(session, other_source.id, 0) == ([], 1)
+
+
+def test_count_conversation_items(session):
+    source = factory.Source()
+    other_source = factory.Source()
+    session.add_all([source, other_source])
+    session.commit()
+    session.add_all(
+        [
+            factory.Message(source=source, filename="1-msg.gpg"),
+            factory.File(source=source, filename="2-doc.gz.gpg"),
+            factory.Reply(source=source, filename="3-reply.gpg"),
+            factory.DraftReply(source=source, file_counter=3),
+            factory.Message(source=other_source, filename="1-msg.gpg"),
+        ]
+    )
+    session.commit()
+
+    assert count_conversation_items(session, source.id) == 4
+
+
+def test_get_first_file_counter(session):
+    """
+    Check that the first file_counter of a conversation leaves out pending draft replies.
+    """
+    source = factory.Source()
+    pending_status = factory.ReplySendStatus(name=db.ReplySendStatusCodes.PENDING.value)
+    failed_status = factory.ReplySendStatus(name=db.ReplySendStatusCodes.FAILED.value)
+    session.add_all([source, pending_status, failed_status])
+    session.commit()
+    assert get_first_file_counter(session, source.id) is None
+
+    session.add(factory.DraftReply(source=source, file_counter=0, send_status=pending_status))
+    session.add(factory.Message(source=source, filename="3-msg.gpg"))
+    session.add(factory.Reply(source=source, filename="4-reply.gpg"))
+    session.commit()
+    assert get_first_file_counter(session, source.id) == 3
+
+    session.add(factory.DraftReply(source=source, file_counter=2, send_status=failed_status))
+    session.commit()
+    assert get_first_file_counter(session, source.id) == 2
+
+
+def test_get_latest_server_items(session):
+    """
+    Check that the item with the highest file_counter of each source is returned, whatever its
+    type, and that draft replies and sources without items are left out.
+    """
+    source = factory.Source()
+    other_source = factory.Source()
+    empty_source = factory.Source()
+    session.add_all([source, other_source, empty_source])
+    message = factory.Message(source=source, filename="1-msg.gpg")
+    reply = factory.Reply(source=source, filename="3-reply.gpg")
+    file = factory.File(source=source, filename="2-doc.gz.gpg")
+    other_file = factory.File(source=other_source, filename="4-doc.gz.gpg")
+    draft = factory.DraftReply(source=other_source, file_counter=5)
+    session.add_all([message, reply, file, other_file, draft])
+    session.commit()
+
+    assert get_latest_server_items(session) == {source.id: reply, other_source.id: other_file}
+    assert get_latest_server_items(session, [other_source.id, empty_source.id]) == {
+        other_source.id: other_file
+    }
+
+
+def test_get_seen_by_lists(session):
+    """
+    Check that the users who have seen the messages and replies of a source are returned by
+    item UUID, leaving out older items and other sources.
+    """
+    journalist = factory.User(username="dellsberg")
+    other_journalist = factory.User(username="journalist")
+    source = factory.Source()
+    other_source = factory.Source()
+    session.add_all([journalist, other_journalist, source, other_source])
+    old_message = factory.Message(source=source, filename="1-msg.gpg")
+    message = factory.Message(source=source, filename="2-msg.gpg")
+    reply = factory.Reply(source=source, filename="3-reply.gpg")
+    unseen_reply = factory.Reply(source=source, filename="4-reply.gpg")
+    other_message = factory.Message(source=other_source, filename="2-msg.gpg")
+    session.add_all([old_message, message, reply, unseen_reply, other_message])
+    session.commit()
+    session.add_all(
+        [
+            db.SeenMessage(message_id=old_message.id, journalist_id=journalist.id),
+            db.SeenMessage(message_id=message.id, journalist_id=journalist.id),
+            db.SeenMessage(message_id=message.id, journalist_id=other_journalist.id),
+            db.SeenReply(reply_id=reply.id, journalist_id=other_journalist.id),
+            db.SeenMessage(message_id=other_message.id, journalist_id=journalist.id),
+        ]
+    )
+    session.commit()
+
+    assert get_seen_by_lists(session, source.id, 2) == {
+        message.uuid: {"dellsberg": journalist, "journalist": other_journalist},
+        reply.uuid: {"journalist": other_journalist},
+    }
+    assert get_seen_by_lists(session, source.id)[old_message.uuid] == {"dellsberg": journalist}
+
+
+def test_refresh_replies(session):
+    """
+    Check that replies and their senders are reloaded with changes made outside the session.
+    """
+    journalist = factory.User(username="dellsberg")
+    source = factory.Source()
+    session.add_all([journalist, source])
+    reply = factory.Reply(source=source, journalist=journalist, filename="1-reply.gpg")
+    session.add(reply)
+    session.commit()
+    assert reply.journalist.username == "dellsberg"
+
+    # Change the sender's username behind the session's back
+    session.connection().execute(
+        db.User.__table__.update().where(db.User.id == journalist.id).values(username="ellsberg")
+    )
+    assert reply.journalist.username == "dellsberg"
+
+    refresh_replies(session, source.id)
+
+    assert reply.journalist.username == "ellsberg"
+
+
 def test_get_remote_data_handles_api_error(mocker):
     """
     Ensure any error encountered when accessing the API is logged but the
@@ -292,6 +507,29 @@ def test_update_local_storage(homedir, mocker, session_maker):
     )
 
 
+def test_update_local_storage_returns_changed_source_uuids(homedir, session):
+    """
+    Check that only the sources that were added or changed, or whose submissions were, are
+    returned, and that syncing again without any change returns none.
+    """
+    source = factory.RemoteSource()
+    other_source = factory.RemoteSource()
+    message = make_remote_message(source.uuid)
+
+    changed = update_local_storage(session, [source, other_source], [message], [], homedir)
+    assert changed == {source.uuid, other_source.uuid}
+
+    changed = update_local_storage(session, [source, other_source], [message], [], homedir)
+    assert changed == set()
+
+    other_source.is_starred = not other_source.is_starred
+    changed = update_local_storage(session, [source, other_source], [message], [], homedir)
+    assert changed == {other_source.uuid}
+
+    changed = update_local_storage(session, [source, other_source], [], [], homedir)
+    assert changed == {source.uuid}
+
+
 def test_update_local_storage_sanitizes_remote_data(mocker, homedir):
     """
     Check that sanitize functions are called with expected remote sources and submissions.
@@ -374,7 +612,7 @@ def test_sync_delete_race(homedir, mocker, session_maker, session):
         assert source_exists(session, source.uuid) is False
 
         # Don't pass in any UUIDs to skip, test this separately
-        update_messages(remote_submissions, local_submissions, [], [], session, data_dir)
+        return update_messages(remote_submissions, local_submissions, [], [], session, data_dir)
 
     mocker.patch("securedrop_client.storage.update_messages", delayed_update_messages)
 
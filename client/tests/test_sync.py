@@ -3,7 +3,7 @@ from sdclientapi import RequestTimeoutError, ServerConnectionError
 
 from securedrop_client.api_jobs.base import ApiInaccessibleError
 from securedrop_client.app import threads
-from securedrop_client.sync import ApiSync
+from securedrop_client.sync import ApiSync, SyncReason, SyncScheduler
 
 
 def test_ApiSync_init(mocker, session_maker, homedir):
@@ -191,9 +191,9 @@ def test_ApiSync_on_sync_success(mocker, session_maker, homedir):
         )
         sync_success = mocker.patch.object(api_sync, "sync_success")
 
-        api_sync.on_sync_success()
+        api_sync.on_sync_success({"abc123"})
 
-        sync_success.emit.assert_called_once_with()
+        sync_success.emit.assert_called_once_with({"abc123"})
 
 
 def test_ApiSync_on_sync_failure(mocker, session_maker, homedir):
@@ -231,3 +231,167 @@ def test_ApiSync_on_sync_failure_because_of_timeout(mocker, session_maker, homed
         api_sync.on_sync_failure(error)
 
         sync_failure.emit.assert_called_once_with(error)
+
+
+def test_ApiSync_schedules_next_sync_when_sync_finishes(mocker, session_maker, homedir):
+    """
+    Ensure the next sync is scheduled when a sync finishes, and not while it is in progress.
+    """
+    now = 100.0
+    with threads(1) as [sync_thread]:
+        api_sync = ApiSync(
+            mocker.MagicMock(),
+            session_maker,
+            mocker.MagicMock(),
+            homedir,
+            sync_thread,
+            clock=lambda: now,
+        )
+        timer = mocker.patch.object(api_sync, "timer")
+
+        api_sync._on_sync_started()
+        api_sync.request_sync()
+        timer.start.assert_not_called()
+
+        api_sync._on_sync_success(set())
+        timer.start.assert_called_once_with(0)
+
+        api_sync._on_sync_started()
+        api_sync._on_sync_failure(Exception())
+        timer.start.assert_called_with(SyncScheduler.TIME_BETWEEN_SYNCS * 1000)
+
+
+def test_ApiSync_start_schedules_next_sync_if_sync_thread_is_running(
+    mocker, session_maker, homedir
+):
+    with threads(1) as [sync_thread]:
+        api_sync = ApiSync(
+            mocker.MagicMock(), session_maker, mocker.MagicMock(), homedir, sync_thread
+        )
+        api_sync.sync_thread = mocker.MagicMock()
+        api_sync.sync_thread.isRunning = mocker.MagicMock(return_value=True)
+        timer = mocker.patch.object(api_sync, "timer")
+
+        api_sync.start(mocker.MagicMock())
+
+        timer.start.assert_called_once_with(0)
+
+
+def test_ApiSync_stop_stops_timer_and_resets_scheduler(mocker, session_maker, homedir):
+    with threads(1) as [sync_thread]:
+        api_sync = ApiSync(
+            mocker.MagicMock(), session_maker, mocker.MagicMock(), homedir, sync_thread
+        )
+        api_sync.download_started("file-uuid", SyncScheduler.LARGE_DOWNLOAD_SIZE)
+        timer = mocker.patch.object(api_sync, "timer")
+
+        api_sync.stop()
+
+        timer.stop.assert_called_once_with()
+        assert api_sync.scheduler.reason == SyncReason.DEFAULT
+
+        # No more syncs are scheduled once they are stopped
+        api_sync.request_sync()
+        timer.start.assert_not_called()
+
+
+def test_SyncScheduler_syncs_right_away_at_first():
+    scheduler = SyncScheduler(clock=lambda: 100.0)
+
+    assert scheduler.interval == SyncScheduler.TIME_BETWEEN_SYNCS
+    assert scheduler.reason == SyncReason.DEFAULT
+    assert scheduler.time_until_next_sync() == 0
+
+
+def test_SyncScheduler_time_until_next_sync():
+    now = 100.0
+    scheduler = SyncScheduler(clock=lambda: now)
+    scheduler.on_sync_started()
+    scheduler.on_sync_success({"source-uuid"})
+
+    now += 5
+    assert scheduler.time_until_next_sync() == SyncScheduler.TIME_BETWEEN_SYNCS - 5
+
+    now += SyncScheduler.TIME_BETWEEN_SYNCS
+    assert scheduler.time_until_next_sync() == 0
+
+
+def test_SyncScheduler_backs_off_while_nothing_changes():
+    scheduler = SyncScheduler(clock=lambda: 100.0)
+
+    intervals = []
+    for i in range(5):
+        scheduler.on_sync_started()
+        scheduler.on_sync_success(set())
+        intervals.append(scheduler.interval)
+
+    assert intervals == [30, 60, 120, 120, 120]
+    assert scheduler.reason == SyncReason.NO_CHANGES
+
+    scheduler.on_sync_success({"source-uuid"})
+    assert scheduler.interval == SyncScheduler.TIME_BETWEEN_SYNCS
+    assert scheduler.reason == SyncReason.DEFAULT
+
+    # If the changes are not known, assume there were some
+    scheduler.on_sync_success(set())
+    scheduler.on_sync_success(None)
+    assert scheduler.interval == SyncScheduler.TIME_BETWEEN_SYNCS
+
+
+def test_SyncScheduler_does_not_back_off_after_failure():
+    scheduler = SyncScheduler(clock=lambda: 100.0)
+    scheduler.on_sync_success(set())
+
+    scheduler.on_sync_failure()
+
+    assert scheduler.interval == SyncScheduler.TIME_BETWEEN_SYNCS
+    assert scheduler.time_until_next_sync() == SyncScheduler.TIME_BETWEEN_SYNCS
+
+
+def test_SyncScheduler_syncs_right_away_after_local_action():
+    now = 100.0
+    scheduler = SyncScheduler(clock=lambda: now)
+    scheduler.on_sync_success(set())
+    now += 1
+
+    scheduler.request_sync()
+
+    assert scheduler.interval == 0
+    assert scheduler.reason == SyncReason.LOCAL_ACTION
+    assert scheduler.time_until_next_sync() == 0
+
+    scheduler.on_sync_started()
+    assert scheduler.reason == SyncReason.NO_CHANGES
+
+
+def test_SyncScheduler_holds_syncs_back_during_large_downloads():
+    scheduler = SyncScheduler(clock=lambda: 100.0)
+
+    scheduler.download_started("small-file-uuid", SyncScheduler.LARGE_DOWNLOAD_SIZE - 1)
+    assert scheduler.reason == SyncReason.DEFAULT
+
+    scheduler.download_started("large-file-uuid", SyncScheduler.LARGE_DOWNLOAD_SIZE)
+    scheduler.download_started("other-large-file-uuid", SyncScheduler.LARGE_DOWNLOAD_SIZE * 2)
+    assert scheduler.interval == SyncScheduler.MAX_TIME_BETWEEN_SYNCS
+    assert scheduler.reason == SyncReason.LARGE_DOWNLOAD
+
+    scheduler.download_finished("large-file-uuid")
+    assert scheduler.reason == SyncReason.LARGE_DOWNLOAD
+
+    # Local actions still show up right away
+    scheduler.request_sync()
+    assert scheduler.interval == 0
+
+    scheduler.on_sync_started()
+    scheduler.download_finished("other-large-file-uuid")
+    assert scheduler.interval == SyncScheduler.TIME_BETWEEN_SYNCS
+
+
+def test_SyncScheduler_reset():
+    scheduler = SyncScheduler(clock=lambda: 100.0)
+    scheduler.request_sync()
+    scheduler.download_started("large-file-uuid", SyncScheduler.LARGE_DOWNLOAD_SIZE)
+
+    scheduler.reset()
+
+    assert scheduler.reason == SyncReason.DEFAULT
@@ -0,0 +1,207 @@
+import io
+import logging
+import os
+import shutil
+import sys
+import tarfile
+from typing import BinaryIO, Optional
+
+from securedrop_export import __version__
+from securedrop_export.archive import Archive
+from securedrop_export.archive import Status as ArchiveStatus
+from securedrop_export.disk.cli import CLI
+from securedrop_export.exceptions import ExportException
+from securedrop_export.main import Status, _configure_logging, _process_submission
+from securedrop_export.status import BaseStatus
+
+logger = logging.getLogger(__name__)
+
+# Chunk headers are a decimal byte count; anything longer than this is malformed
+_MAX_HEADER_LENGTH = 32
+_CHUNK_SIZE = 1024 * 1024
+
+# Written when the session starts, so that the client only sends requests to a running agent
+READY = b"READY\n"
+
+
+class Agent:
+    """
+    Long-running export service, started once per client session by the `securedrop.Export`
+    qrexec service instead of starting a new process for every archive.
+
+    Each request is an export archive, in the same format as for `send-to-usb`, sent in chunks
+    so that the client can stream it without knowing its size in advance. Every chunk is
+    preceded by its size in bytes, as ASCII decimal followed by a newline, and the request
+    ends with a chunk of size 0. The archive is read as a stream as well, with each member
+    extracted as it arrives, so it is never stored in the Export VM. Each response is the
+    resulting status value, or nothing if there is none, followed by a newline. Before the
+    first request, the agent writes READY to tell the client it is running. The session ends
+    when the client closes stdin.
+
+    All requests in a session share one CLI. Every disk request takes a new block device
+    inventory, but LUKS headers that were looked at during the preflight checks are not probed
+    again for the export itself unless the devices changed in the meantime.
+    """
+
+    def __init__(self, cli: Optional[CLI] = None):
+        self.cli = cli or CLI()
+
+    def serve(self, stdin: BinaryIO, stdout: BinaryIO) -> None:
+        """
+        Handle requests from stdin until it is closed or a request can't be read.
+        """
+        stdout.write(READY)
+        stdout.flush()
+
+        while True:
+            request = _Request(stdin)
+            try:
+                if not request.start():
+                    logger.info("Client closed the session")
+                    return
+
+                status = self.handle(request)
+                # Skip whatever the services did not need to read, up to the next request
+                request.drain()
+            except ValueError as ex:
+                # There is no way to find the start of the next request, so give up
+                logger.error("Malformed request, closing session")
+                logger.error(ex)
+                self._write_response(stdout, Status.ERROR_GENERIC)
+                return
+
+            if request.truncated:
+                logger.info("Client closed the session")
+                return
+
+            self._write_response(stdout, status)
+
+    def handle(self, request: BinaryIO) -> Optional[BaseStatus]:
+        """
+        Run the desired print or export service for a single archive, read from the request as it
+        arrives, and return its status.
+        """
+        submission = None
+        try:
+            try:
+                archive = tarfile.open(fileobj=request, mode="r|*")
+            except tarfile.TarError as ex:
+                raise ExportException(sdstatus=ArchiveStatus.ERROR_EXTRACTION) from ex
+
+            with archive:
+                logger.debug("Extract metadata")
+                submission = Archive(archive).extract_metadata()
+                return _process_submission(submission, self.cli)
+
+        except ExportException as ex:
+            status = ex.sdstatus or Status.ERROR_GENERIC
+            logger.error(f"Encountered exception {status.value}")
+            logger.error(ex)
+            return status
+
+        except Exception as ex:
+            logger.error("Encountered exception during export")
+            logger.error(ex)
+            return Status.ERROR_GENERIC
+
+        finally:
+            if submission:
+                shutil.rmtree(submission.tmpdir, ignore_errors=True)
+
+    def _write_response(self, stdout: BinaryIO, status: Optional[BaseStatus]) -> None:
+        value = status.value if status else ""
+        stdout.write(f"{value}\n".encode("ascii"))
+        stdout.flush()
+
+
+class _Request(io.RawIOBase):
+    """
+    The body of a single chunked request on stdin, read as a stream so that the archive does not
+    have to be stored before it is extracted.
+
+    Reading raises ValueError if a chunk header is malformed, and ends early if stdin does, in
+    which case truncated is set.
+    """
+
+    def __init__(self, stdin: BinaryIO):
+        self._stdin = stdin
+        self._remaining = 0
+        self._error: Optional[ValueError] = None
+        self.complete = False
+        self.truncated = False
+
+    def readable(self) -> bool:
+        return True
+
+    def start(self) -> bool:
+        """
+        Read the first chunk header, and return False if stdin ended before the request started.
+        """
+        self._read_header()
+        return not self.truncated
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        while not self._remaining:
+            if self.complete or self.truncated:
+                return 0
+            self._read_header()
+
+        data = self._stdin.read(min(len(buffer), self._remaining))
+        if not data:
+            self.truncated = True
+            return 0
+        size = len(data)
+        buffer[:size] = data
+        self._remaining -= size
+        return size
+
+    def drain(self) -> None:
+        """
+        Read and discard the rest of the request.
+        """
+        buffer = bytearray(_CHUNK_SIZE)
+        while self.readinto(buffer):
+            pass
+
+    def _read_header(self) -> None:
+        if self._error:
+            # Once a header is malformed, the rest of stdin can't be read as chunks either
+            raise self._error
+
+        header = self._stdin.readline(_MAX_HEADER_LENGTH)
+        if not header:
+            self.truncated = True
+            return
+
+        try:
+            size = int(header.decode("ascii"))
+            if size < 0:
+                raise ValueError(f"Negative chunk size {size}")
+        except ValueError as ex:
+            self._error = ex
+            raise
+
+        self.complete = size == 0
+        self._remaining = size
+
+
+def start():
+    """
+    Entrypoint method for the `sd-export-agent` console script.
+    """
+    try:
+        _configure_logging()
+    except ExportException:
+        # Still serve requests, so that the client isn't left waiting on the session
+        pass
+
+    logger.info("Starting SecureDrop Export agent {}".format(__version__))
+
+    # Commands run by the services inherit stdout, so keep a private copy for responses
+    # and send anything they print to stderr instead of into the session.
+    sys.stdout.flush()
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    with responses:
+        Agent().serve(sys.stdin.buffer, responses)
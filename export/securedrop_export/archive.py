@@ -9,7 +9,11 @@ import tempfile
 from securedrop_export.exceptions import ExportException
 from securedrop_export.status import BaseStatus
 from securedrop_export.command import Command
-from securedrop_export.directory import safe_extractall
+from securedrop_export.directory import (
+    ArchiveSource,
+    safe_extract_member,
+    safe_extractall,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -67,9 +71,13 @@ class Metadata(object):
 
 
 class Archive(object):
-    def __init__(self, archive_path: str):
+    def __init__(self, archive: ArchiveSource):
+        """
+        The archive is either the path of an archive file, or an archive stream that is read
+        in a single pass, in which case the metadata must be its first member.
+        """
         os.umask(0o077)
-        self.archive = archive_path
+        self.archive = archive
         self.target_dirname = "sd-export-{}".format(
             datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
         )
@@ -89,6 +97,22 @@ class Archive(object):
             logger.error("Unable to extract tarball: {}".format(ex))
             raise ExportException(sdstatus=Status.ERROR_EXTRACTION) from ex
 
+    def extract_metadata(self) -> "Archive":
+        """
+        Extract only the metadata file from the tarball, checking for path traversal, and return
+        Archive object. The rest of the archive is left untouched so that it can be extracted
+        later, or streamed directly to its destination.
+        """
+        try:
+            logger.info(
+                "Extracting metadata from {} into {}".format(self.archive, self.tmpdir)
+            )
+            safe_extract_member(self.archive, self.tmpdir, Metadata.METADATA_FILE)
+            return self
+        except Exception as ex:
+            logger.error("Unable to extract metadata: {}".format(ex))
+            raise ExportException(sdstatus=Status.ERROR_EXTRACTION) from ex
+
     def set_metadata(self, metadata: Metadata) -> "Archive":
         """
         Set relevant metadata attributes for a given archive.
@@ -1,7 +1,13 @@
+import contextlib
 import os
+import shutil
 import tarfile
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Iterator, Optional, Set, Union
+
+# An archive is either the path of an archive file, or an archive that is already being read as a
+# stream, in which case reading continues from the current member.
+ArchiveSource = Union[str, tarfile.TarFile]
 
 
 def safe_mkdir(
@@ -48,36 +54,109 @@ def safe_mkdir(
     _check_all_permissions(relative_path, base_path)
 
 
-def safe_extractall(archive_file_path: str, dest_path: str) -> None:
+def safe_extractall(
+    archive: ArchiveSource,
+    dest_path: str,
+    subdirectory: Optional[str] = None,
+    progress_callback: Optional[Callable[[str], None]] = None,
+) -> None:
+    """
+    Safely extract the archive (see ArchiveSource) to dest_path. If subdirectory is supplied,
+    only members inside that top-level directory of the archive are extracted (keeping their
+    archive path) and all other members are skipped. If progress_callback is supplied, it is
+    called with the name of each member after it has been extracted.
+
+    The archive is read as a stream in a single pass: each member is validated as soon as its
+    header is read and is then extracted immediately, so a compressed archive is only ever
+    decompressed once. If a member fails validation, anything already extracted into dest_path
+    by this call is removed before the ValueError is re-raised.
+    """
+    preexisting = set(os.listdir(dest_path))
+    try:
+        with _open_archive(archive) as tar:
+            for file_info in iter(tar.next, None):
+                if subdirectory and Path(file_info.name).parts[:1] != (subdirectory,):
+                    continue
+                _check_tarinfo(file_info, dest_path)
+                tar.extract(file_info, dest_path)
+                if progress_callback:
+                    progress_callback(file_info.name)
+    except Exception:
+        _remove_new_entries(dest_path, preexisting)
+        raise
+
+
+def safe_extract_member(
+    archive: ArchiveSource, dest_path: str, member_name: str
+) -> None:
     """
-    Safely extract a file specified by archive_file_path to dest_path.
+    Safely extract the first member of the archive (see ArchiveSource) that is named member_name
+    to dest_path. The archive is only read up to that member, so this is cheap for members (such
+    as the archive metadata) stored at the start of the archive.
     """
-    with tarfile.open(archive_file_path) as tar:
-        # Tarfile types include:
-        #
-        # FIFO special file (a named pipe)
-        # Regular file
-        # Directory
-        # Symbolic link
-        # Hard link
-        # Block device
-        # Character device
-        for file_info in tar.getmembers():
-            file_info.mode = 0o700 if file_info.isdir() else 0o600
+    with _open_archive(archive) as tar:
+        for file_info in iter(tar.next, None):
+            if file_info.name == member_name:
+                _check_tarinfo(file_info, dest_path)
+                tar.extract(file_info, dest_path)
+                return
 
-            _check_path_traversal(file_info.name)
 
-            # If the path is relative then we don't need to check that it resolves to dest_path
-            if Path(file_info.name).is_absolute():
-                relative_filepath(file_info.name, dest_path)
+@contextlib.contextmanager
+def _open_archive(archive: ArchiveSource) -> Iterator[tarfile.TarFile]:
+    """
+    Helper. Open the archive file at the supplied path as a stream, or hand back the supplied
+    archive stream as it is, leaving it open for the next reader.
+    """
+    if isinstance(archive, tarfile.TarFile):
+        yield archive
+    else:
+        with tarfile.open(archive, "r|*") as tar:
+            yield tar
 
-            if file_info.islnk() or file_info.issym():
-                _check_path_traversal(file_info.linkname)
-                # If the path is relative then we don't need to check that it resolves to dest_path
-                if Path(file_info.linkname).is_absolute():
-                    relative_filepath(file_info.linkname, dest_path)
 
-        tar.extractall(dest_path)
+def _check_tarinfo(file_info: tarfile.TarInfo, dest_path: Union[str, Path]) -> None:
+    """
+    Restrict the permissions of a tarfile member and raise ValueError if its name or link target
+    does any path traversal or resolves outside of dest_path.
+    """
+    # Tarfile types include:
+    #
+    # FIFO special file (a named pipe)
+    # Regular file
+    # Directory
+    # Symbolic link
+    # Hard link
+    # Block device
+    # Character device
+    file_info.mode = 0o700 if file_info.isdir() else 0o600
+
+    _check_path_traversal(file_info.name)
+
+    # If the path is relative then we don't need to check that it resolves to dest_path
+    if Path(file_info.name).is_absolute():
+        relative_filepath(file_info.name, dest_path)
+
+    if file_info.islnk() or file_info.issym():
+        _check_path_traversal(file_info.linkname)
+        # If the path is relative then we don't need to check that it resolves to dest_path
+        if Path(file_info.linkname).is_absolute():
+            relative_filepath(file_info.linkname, dest_path)
+
+
+def _remove_new_entries(dest_path: Union[str, Path], preexisting: Set[str]) -> None:
+    """
+    Remove every entry of dest_path whose name is not in preexisting. Symlinks are removed
+    without being followed.
+    """
+    for name in os.listdir(dest_path):
+        if name in preexisting:
+            continue
+        path = os.path.join(dest_path, name)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
 
 
 def relative_filepath(filepath: Union[str, Path], base_dir: Union[str, Path]) -> Path:
@@ -1,11 +1,15 @@
 import logging
 import os
+import shutil
 import subprocess
+import tarfile
 
-from typing import List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
+from securedrop_export.directory import ArchiveSource, safe_extractall
 from securedrop_export.exceptions import ExportException
 
+from .inventory import DeviceInventory
 from .volume import EncryptionScheme, Volume, MountedVolume
 from .status import Status
 
@@ -19,65 +23,63 @@ class CLI:
 
     CLI callers must handle ExportException and all exceptions and exit with
     sys.exit(0) so that another program does not attempt to open the submission.
+
+    Only commands that need elevated privileges (cryptsetup, mount and friends) are run as
+    subprocesses; file operations on the export data are done in-process.
+
+    Block devices are looked up in a DeviceInventory snapshot, which is only retaken after the
+    CLI changes the state of a device or when refresh() is called, and cryptsetup results are
+    cached until the snapshot shows that the devices changed. A CLI instance may be shared by
+    several requests, as long as each of them starts by calling refresh().
     """
 
     # Default mountpoint (unless drive is already mounted manually by the user)
     _DEFAULT_MOUNTPOINT = "/media/usb"
 
-    def get_connected_devices(self) -> List[str]:
-        """
-        List all block devices attached to VM that are disks and not partitions.
-        Return list of all removable connected block devices.
+    def __init__(self):
+        self._inventory: Optional[DeviceInventory] = None
+        self._luks_volumes: Dict[str, bool] = {}
+        self._luks_names: Dict[str, str] = {}
 
-        Raise ExportException if any commands fail.
+    def get_inventory(self) -> DeviceInventory:
         """
-        logger.info("Checking connected volumes")
-        try:
-            lsblk = subprocess.Popen(
-                ["lsblk", "-o", "NAME,TYPE"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            grep = subprocess.Popen(
-                ["grep", "disk"],
-                stdin=lsblk.stdout,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            command_output = grep.stdout.readlines()  # type: ignore[union-attr]
+        Return the current block device inventory, taking a snapshot if there is none.
 
-            # The first word in each element of the command_output list is the device name
-            attached_devices = [x.decode("utf8").split()[0] for x in command_output]
+        Raise ExportException if the snapshot can't be taken.
+        """
+        if self._inventory is None:
+            self._inventory = DeviceInventory.from_lsblk()
+        return self._inventory
 
-        except subprocess.CalledProcessError as ex:
-            raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
+    def refresh(self) -> None:
+        """
+        Take a new block device inventory, so that devices connected, removed or changed since
+        the previous one are picked up. Cached cryptsetup results are discarded as well, unless
+        the devices are exactly as they were in the previous inventory.
 
-        return self._get_removable_devices(attached_devices)
+        Raise ExportException if the snapshot can't be taken.
+        """
+        previous = self._inventory
+        self._inventory = DeviceInventory.from_lsblk()
+        if previous is None or previous.blockdevices != self._inventory.blockdevices:
+            self._luks_volumes.clear()
+            self._luks_names.clear()
 
-    def _get_removable_devices(self, attached_devices: List[str]) -> List[str]:
+    def _invalidate_inventory(self) -> None:
         """
-        Determine which block devices are USBs by selecting those that are removable.
+        Helper. Discard the block device inventory after a device changed state.
         """
-        logger.info("Checking removable devices")
-        usb_devices = []
-        for device in attached_devices:
-            is_removable = False
-            try:
-                removable = subprocess.check_output(
-                    ["cat", f"/sys/class/block/{device}/removable"],
-                    stderr=subprocess.PIPE,
-                )
+        self._inventory = None
 
-                # removable is "0" for non-removable device, "1" for removable,
-                # convert that into a Python boolean
-                is_removable = bool(int(removable.decode("utf8").strip()))
-
-            except subprocess.CalledProcessError:
-                # Not a removable device
-                continue
+    def get_connected_devices(self) -> List[str]:
+        """
+        List all block devices attached to VM that are disks and not partitions.
+        Return list of all removable connected block devices.
 
-            if is_removable:
-                usb_devices.append(f"/dev/{device}")
+        Raise ExportException if any commands fail.
+        """
+        logger.info("Checking connected volumes")
+        usb_devices = self.get_inventory().get_removable_disks()
 
         logger.info(f"{len(usb_devices)} connected")
         return usb_devices
@@ -90,50 +92,34 @@ class CLI:
         Raise ExportException if partition check fails or device has unsupported partition scheme
         (currently, multiple partitions are unsupported).
         """
-        device_and_partitions = self._check_partitions(blkid)
+        logger.debug(f"Checking device partitions on {blkid}")
+        partitions = self.get_inventory().get_partitions(blkid)
 
-        if device_and_partitions:
-            partition_count = (
-                device_and_partitions.decode("utf-8").split("\n").count("part")
+        partition_count = len(partitions)
+        logger.debug(f"Counted {partition_count} partitions")
+        if partition_count > 1:
+            # We don't currently support devices with multiple partitions
+            logger.error(
+                f"Multiple partitions not supported ({partition_count} partitions"
+                f" on {blkid})"
             )
-            logger.debug(f"Counted {partition_count} partitions")
-            if partition_count > 1:
-                # We don't currently support devices with multiple partitions
-                logger.error(
-                    f"Multiple partitions not supported ({partition_count} partitions"
-                    f" on {blkid})"
-                )
-                raise ExportException(sdstatus=Status.INVALID_DEVICE_DETECTED)
-
-            # redefine device to /dev/sda if disk is encrypted, /dev/sda1 if partition encrypted
-            if partition_count == 1:
-                logger.debug("One partition found")
-                blkid += "1"
-
-            return blkid
-
-        else:
-            # lsblk did not return output we could process
-            logger.error("Error checking device partitions")
-            raise ExportException(sdstatus=Status.DEVICE_ERROR)
+            raise ExportException(sdstatus=Status.INVALID_DEVICE_DETECTED)
 
-    def _check_partitions(self, blkid: str) -> bytes:
-        try:
-            logger.debug(f"Checking device partitions on {blkid}")
-            device_and_partitions = subprocess.check_output(
-                ["lsblk", "-o", "TYPE", "--noheadings", blkid], stderr=subprocess.PIPE
-            )
-            return device_and_partitions
+        # redefine device to /dev/sda if disk is encrypted, /dev/sda1 if partition encrypted
+        if partition_count == 1:
+            logger.debug("One partition found")
+            return partitions[0]
 
-        except subprocess.CalledProcessError as ex:
-            logger.error(f"Error checking block device {blkid}")
-            raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
+        return blkid
 
     def is_luks_volume(self, device: str) -> bool:
         """
         Given a string representing a volume (/dev/sdX or /dev/sdX1), return True if volume is
         LUKS-encrypted, otherwise False.
         """
+        if device in self._luks_volumes:
+            return self._luks_volumes[device]
+
         isLuks = False
 
         try:
@@ -149,6 +135,7 @@ class CLI:
             # Not necessarily an error state, just means the volume is not LUKS encrypted
             logger.info("Target device is not LUKS-encrypted")
 
+        self._luks_volumes[device] = isLuks
         return isLuks
 
     def _get_luks_name_from_headers(self, device: str) -> str:
@@ -157,6 +144,9 @@ class CLI:
 
         Raise ExportException if errors encounterd during attempt to parse LUKS headers.
         """
+        if device in self._luks_names:
+            return self._luks_names[device]
+
         logger.debug("Get LUKS name from headers")
         try:
             luks_header = subprocess.check_output(
@@ -167,7 +157,8 @@ class CLI:
                 for line in luks_header_list:
                     items = line.split("\t")
                     if "UUID" in items[0]:
-                        return "luks-" + items[1]
+                        self._luks_names[device] = "luks-" + items[1]
+                        return self._luks_names[device]
 
             # If no header or no UUID field, we can't use this drive
             logger.error(
@@ -248,6 +239,7 @@ class CLI:
             rc = p.returncode
 
             if rc == 0:
+                self._invalidate_inventory()
                 return Volume(
                     device_name=volume.device_name,
                     mapped_name=volume.mapped_name,
@@ -267,12 +259,9 @@ class CLI:
         """
         logger.debug("Checking mountpoint")
         try:
-            output = subprocess.check_output(
-                ["lsblk", "-o", "MOUNTPOINT", "--noheadings", volume.device_name]
-            )
-            return output.decode("utf-8").strip()
+            return self.get_inventory().get_mountpoint(volume.device_name)
 
-        except subprocess.CalledProcessError as ex:
+        except ExportException as ex:
             logger.error(ex)
             raise ExportException(sdstatus=Status.ERROR_MOUNT) from ex
 
@@ -322,6 +311,7 @@ class CLI:
         try:
             logger.info(f"Mounting volume at {mountpoint}")
             subprocess.check_call(["sudo", "mount", mapped_device_path, mountpoint])
+            self._invalidate_inventory()
             subprocess.check_call(["sudo", "chown", "-R", "user:user", mountpoint])
 
         except subprocess.CalledProcessError as ex:
@@ -330,57 +320,81 @@ class CLI:
 
         return MountedVolume.from_volume(volume, mountpoint)
 
-    def write_data_to_device(
+    def write_archive_to_device(
         self,
-        submission_tmpdir: str,
+        archive: ArchiveSource,
         submission_target_dirname: str,
         device: MountedVolume,
+        progress_callback: Optional[Callable[[str], None]] = None,
     ):
         """
-        Move files to drive (overwrites files with same filename) and unmount drive.
-        Drive is unmounted and files are cleaned up as part of the `finally` block to ensure
-        that cleanup happens even if export fails or only partially succeeds.
-        """
+        Extract the export data in the archive directly onto the drive, without staging it in a
+        temporary directory first, then fsync the written files and unmount drive.
+        Drive is unmounted as part of the `finally` block to ensure that cleanup happens even if
+        export fails or only partially succeeds.
 
-        try:
-            target_path = os.path.join(device.mountpoint, submission_target_dirname)
-            subprocess.check_call(["mkdir", target_path])
+        If supplied, progress_callback is called with the archive path of each member once it
+        has been written to the drive.
 
-            export_data = os.path.join(submission_tmpdir, "export_data/")
-            logger.debug("Copying file to {}".format(submission_target_dirname))
+        If the export fails, the target directory is removed from the drive again.
+        """
+        target_path = os.path.join(device.mountpoint, submission_target_dirname)
+        created_target_path = False
 
-            subprocess.check_call(["cp", "-r", export_data, target_path])
+        try:
+            os.mkdir(target_path)
+            created_target_path = True
+
+            logger.debug("Extracting files to {}".format(submission_target_dirname))
+            safe_extractall(
+                archive,
+                target_path,
+                subdirectory="export_data",
+                progress_callback=progress_callback,
+            )
+            self._fsync_directory_tree(target_path)
             logger.info(
-                "File copied successfully to {}".format(submission_target_dirname)
+                "Files extracted successfully to {}".format(submission_target_dirname)
             )
 
-        except (subprocess.CalledProcessError, OSError) as ex:
+        except (OSError, ValueError, tarfile.TarError) as ex:
             logger.error(ex)
+            if created_target_path:
+                shutil.rmtree(target_path, ignore_errors=True)
             raise ExportException(sdstatus=Status.ERROR_EXPORT) from ex
 
         finally:
-            self.cleanup_drive_and_tmpdir(device, submission_tmpdir)
+            self.cleanup_drive(device)
 
-    def cleanup_drive_and_tmpdir(self, volume: MountedVolume, submission_tmpdir: str):
+    def _fsync_directory_tree(self, path: str):
         """
-        Post-export cleanup method. Unmount and lock drive and remove temporary
-        directory. Currently called at end of `write_data_to_device()` to ensure
-        device is always locked after export.
+        Helper. Flush every file and directory below (and including) path to disk.
+        """
+        for dirpath, _, filenames in os.walk(path):
+            for name in [*filenames, "."]:
+                fd = os.open(os.path.join(dirpath, name), os.O_RDONLY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+
+    def cleanup_drive(self, volume: MountedVolume):
+        """
+        Post-export cleanup method. Sync filesystems, then unmount and lock drive.
 
         Raise ExportException if errors during cleanup are encountered.
         """
         logger.debug("Syncing filesystems")
         try:
-            subprocess.check_call(["sync"])
-            umounted = self._unmount_volume(volume)
-            if umounted:
-                self._close_luks_volume(umounted)
-            self._remove_temp_directory(submission_tmpdir)
-
-        except subprocess.CalledProcessError as ex:
+            os.sync()
+        except OSError as ex:
             logger.error("Error syncing filesystem")
             raise ExportException(sdstatus=Status.ERROR_EXPORT_CLEANUP) from ex
 
+        umounted = self._unmount_volume(volume)
+        if umounted:
+            self._close_luks_volume(umounted)
+
     def _unmount_volume(self, volume: MountedVolume) -> Volume:
         """
         Helper. Unmount volume
@@ -389,6 +403,7 @@ class CLI:
             logger.debug(f"Unmounting drive from {volume.mountpoint}")
             try:
                 subprocess.check_call(["sudo", "umount", volume.mountpoint])
+                self._invalidate_inventory()
 
             except subprocess.CalledProcessError as ex:
                 logger.error("Error unmounting device")
@@ -412,18 +427,8 @@ class CLI:
                 subprocess.check_call(
                     ["sudo", "cryptsetup", "luksClose", unlocked_device.mapped_name]
                 )
+                self._invalidate_inventory()
 
             except subprocess.CalledProcessError as ex:
                 logger.error("Error closing device")
                 raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
-
-    def _remove_temp_directory(self, tmpdir: str):
-        """
-        Helper. Remove temporary directory used during archive export.
-        """
-        logger.debug(f"Deleting temporary directory {tmpdir}")
-        try:
-            subprocess.check_call(["rm", "-rf", tmpdir])
-        except subprocess.CalledProcessError as ex:
-            logger.error("Error removing temporary directory")
-            raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
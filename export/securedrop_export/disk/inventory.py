@@ -0,0 +1,130 @@
+import json
+import logging
+import subprocess
+
+from typing import Iterator, List, Optional, Union
+
+from securedrop_export.exceptions import ExportException
+
+from .status import Status
+
+logger = logging.getLogger(__name__)
+
+
+class DeviceInventory:
+    """
+    A snapshot of the block devices attached to the VM, built from a single
+    `lsblk --json -O` call.
+
+    The snapshot is not refreshed on its own. Callers that change the state of a
+    device (unlocking, mounting, unmounting, locking) must discard it and take a
+    new one.
+    """
+
+    def __init__(self, blockdevices: List[dict]):
+        self.blockdevices = blockdevices
+
+    @classmethod
+    def from_lsblk(cls) -> "DeviceInventory":
+        """
+        Take a snapshot of all block devices.
+
+        Raise ExportException if lsblk fails or its output can't be parsed.
+        """
+        logger.debug("Taking block device inventory")
+        try:
+            output = subprocess.check_output(
+                ["lsblk", "--json", "-O"], stderr=subprocess.PIPE
+            )
+            return cls.from_json(output)
+
+        except subprocess.CalledProcessError as ex:
+            logger.error("Error listing block devices")
+            raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
+
+    @classmethod
+    def from_json(cls, lsblk_output: Union[str, bytes]) -> "DeviceInventory":
+        """
+        Parse the output of `lsblk --json`.
+
+        Raise ExportException if the output can't be parsed.
+        """
+        try:
+            blockdevices = json.loads(lsblk_output)["blockdevices"]
+            if not isinstance(blockdevices, list):
+                raise ValueError("blockdevices is not a list")
+            return cls(blockdevices)
+
+        except (ValueError, KeyError, TypeError) as ex:
+            logger.error("Unable to parse lsblk output")
+            raise ExportException(sdstatus=Status.DEVICE_ERROR) from ex
+
+    def get_removable_disks(self) -> List[str]:
+        """
+        Return the paths (such as "/dev/sda") of all removable block devices that are
+        disks and not partitions.
+        """
+        return [
+            self._path(device)
+            for device in self.blockdevices
+            if device.get("type") == "disk" and self._is_removable(device)
+        ]
+
+    def get_partitions(self, device_path: str) -> List[str]:
+        """
+        Return the paths of all partitions on the supplied device.
+
+        Raise ExportException if the device is not in the inventory.
+        """
+        return [
+            self._path(child)
+            for child in self._walk(self._find(device_path))
+            if child.get("type") == "part"
+        ]
+
+    def get_mountpoint(self, device_path: str) -> Optional[str]:
+        """
+        Return the mountpoint of the supplied device, or of the first device stacked on
+        top of it (such as an unlocked LUKS mapping), or None if nothing is mounted.
+
+        Raise ExportException if the device is not in the inventory.
+        """
+        for device in self._walk(self._find(device_path)):
+            # lsblk >= 2.37 reports every mountpoint in "mountpoints"
+            mountpoints = device.get("mountpoints") or [device.get("mountpoint")]
+            for mountpoint in mountpoints:
+                if mountpoint:
+                    return mountpoint
+
+        return None
+
+    def _find(self, device_path: str) -> dict:
+        for device in self._walk_all():
+            if self._path(device) == device_path:
+                return device
+
+        logger.error(f"Block device {device_path} not found")
+        raise ExportException(sdstatus=Status.DEVICE_ERROR)
+
+    def _walk_all(self) -> Iterator[dict]:
+        for device in self.blockdevices:
+            yield from self._walk(device)
+
+    def _walk(self, device: dict) -> Iterator[dict]:
+        """
+        Yield device and then all devices stacked on top of it, depth first.
+        """
+        yield device
+        for child in device.get("children", []):
+            yield from self._walk(child)
+
+    def _path(self, device: dict) -> str:
+        # The "path" column is only available from lsblk 2.33 onwards
+        return device.get("path") or f"/dev/{device['name']}"
+
+    def _is_removable(self, device: dict) -> bool:
+        # Older versions of lsblk report boolean columns as "0"/"1" strings
+        removable = device.get("rm")
+        if isinstance(removable, str):
+            return removable.strip() == "1"
+        return bool(removable)
@@ -10,6 +10,10 @@ from .volume import MountedVolume
 logger = logging.getLogger(__name__)
 
 
+def _log_progress(name: str):
+    logger.debug(f"Exported {name}")
+
+
 class Service:
     def __init__(self, submission, cli=None):
         self.submission = submission
@@ -22,6 +26,7 @@ class Service:
         logger.info("Export archive is usb-test")
 
         try:
+            self.cli.refresh()
             all_devices = self.cli.get_connected_devices()
             num_devices = len(all_devices)
 
@@ -48,6 +53,7 @@ class Service:
         Check if volume is correctly formatted for export.
         """
         try:
+            self.cli.refresh()
             all_devices = self.cli.get_connected_devices()
 
             if len(all_devices) == 1:
@@ -85,6 +91,8 @@ class Service:
         logger.info("Export archive is disk")
 
         try:
+            # The drive may have been swapped or unlocked since the preflight checks
+            self.cli.refresh()
             all_devices = self.cli.get_connected_devices()
 
             if len(all_devices) == 1:
@@ -103,10 +111,11 @@ class Service:
                         mounted_volume = self.cli.mount_volume(volume)
 
                     logger.info(f"Export submission to {mounted_volume.mountpoint}")
-                    self.cli.write_data_to_device(
-                        self.submission.tmpdir,
+                    self.cli.write_archive_to_device(
+                        self.submission.archive,
                         self.submission.target_dirname,
                         mounted_volume,
+                        progress_callback=_log_progress,
                     )
                     # This is SUCCESS_EXPORT, but the 0.7.0 client is not expecting
                     # a return status from a successful export operation.
@@ -11,6 +11,10 @@ from securedrop_export.exceptions import ExportException
 logger = logging.getLogger(__name__)
 
 
+def _log_progress(name: str):
+    logger.debug(f"Exported {name}")
+
+
 class Service:
     """
     Checks that can be performed against the device(s).
@@ -26,6 +30,7 @@ class Service:
         status.
         """
         try:
+            self.cli.refresh()
             all_devices = self.cli.get_connected_devices()
             number_devices = len(all_devices)
 
@@ -103,7 +108,12 @@ class Service:
         if export was unsuccessful.
         """
         try:
-            self.cli.write_data_to_device(data.tmpdir, data.target_dirname, volume)
+            self.cli.write_archive_to_device(
+                data.archive,
+                data.target_dirname,
+                volume,
+                progress_callback=_log_progress,
+            )
             return Status.SUCCESS_EXPORT
 
         except ExportException as ex:
@@ -13,6 +13,7 @@ from securedrop_export.exceptions import ExportException
 
 from securedrop_export.disk import LegacyService as ExportService
 from securedrop_export.disk import LegacyStatus
+from securedrop_export.disk.cli import CLI
 from securedrop_export.print import Service as PrintService
 
 from logging.handlers import TimedRotatingFileHandler, SysLogHandler
@@ -58,18 +59,9 @@ def entrypoint():
             status = Status.ERROR_FILE_NOT_FOUND
 
         else:
-            logger.debug("Extract tarball")
-            submission = Archive(data_path).extract_tarball()
-            logger.debug("Validate metadata")
-            metadata = Metadata(submission.tmpdir).validate()
-            logger.info("Archive extraction and metadata validation successful")
-
-            # If all we're doing is starting the vm, we're done; otherwise,
-            # run the appropriate print or export routine
-            if metadata.command is not Command.START_VM:
-                submission.set_metadata(metadata)
-                logger.info(f"Start {metadata.command.value} service")
-                status = _start_service(submission)
+            logger.debug("Extract metadata")
+            submission = Archive(data_path).extract_metadata()
+            status = _process_submission(submission)
 
     except ExportException as ex:
         logger.error(f"Encountered exception {ex.sdstatus.value}, exiting")
@@ -125,7 +117,39 @@ def _configure_logging():
         raise ExportException(sdstatus=Status.ERROR_LOGGING) from ex
 
 
-def _start_service(submission: Archive) -> LegacyStatus:
+def _process_submission(
+    submission: Archive, cli: Optional[CLI] = None
+) -> Optional[BaseStatus]:
+    """
+    Validate the metadata of a submission whose metadata has already been extracted, and run the
+    desired print or export service. Callers that handle several submissions in a row can pass
+    the same cli each time so that device state is kept between them.
+
+    Raise ExportException if the submission can't be processed.
+    """
+    logger.debug("Validate metadata")
+    metadata = Metadata(submission.tmpdir).validate()
+    logger.info("Metadata extraction and validation successful")
+
+    # If all we're doing is starting the vm, we're done; otherwise,
+    # run the appropriate print or export routine
+    if metadata.command is Command.START_VM:
+        return None
+
+    submission.set_metadata(metadata)
+
+    # Exported files are streamed from the archive straight onto the device, and
+    # the other commands do not use the archive contents, so only printing needs
+    # the full archive extracted first.
+    if metadata.command is Command.PRINT:
+        logger.debug("Extract tarball")
+        submission.extract_tarball()
+
+    logger.info(f"Start {metadata.command.value} service")
+    return _start_service(submission, cli)
+
+
+def _start_service(submission: Archive, cli: Optional[CLI] = None) -> LegacyStatus:
     """
     Start print or export service.
     """
@@ -139,11 +163,11 @@ def _start_service(submission: Archive) -> LegacyStatus:
 
     # Export routines
     elif submission.command is Command.EXPORT:
-        return ExportService(submission).export()
+        return ExportService(submission, cli).export()
     elif submission.command is Command.CHECK_USBS:
-        return ExportService(submission).check_connected_devices()
+        return ExportService(submission, cli).check_connected_devices()
     elif submission.command is Command.CHECK_VOLUME:
-        return ExportService(submission).check_disk_format()
+        return ExportService(submission, cli).check_disk_format()
 
     # Unreachable
     raise ExportException(
@@ -1,8 +1,12 @@
+import json
 import logging
 import os
 import signal
+import socket
 import subprocess
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Set, Tuple
 
 from securedrop_export.exceptions import handler, TimeoutException, ExportException
 from .status import Status
@@ -17,6 +21,13 @@ class Service:
 
     PRINTER_NAME = "sdw-printer"
     PRINTER_WAIT_TIMEOUT = 60
+    PRINT_JOB_POLL_SECONDS = 1
+    CONVERTER_PORT = 2002  # unoconv's default
+    CONVERTER_START_TIMEOUT = 30
+    # The URI and PPD the printer was last set up with
+    PRINTER_STATE_PATH = os.path.join(
+        os.path.expanduser("~"), ".securedrop_export", "printer.json"
+    )
     BRLASER_DRIVER = "/usr/share/cups/drv/brlaser.drv"
     BRLASER_PPD = "/usr/share/cups/model/br7030.ppd"
     LASERJET_DRIVER = "/usr/share/cups/drv/hpcups.drv"
@@ -27,10 +38,16 @@ class Service:
 
     SUPPORTED_PRINTERS = [BROTHER, LASERJET]
 
-    def __init__(self, submission, printer_timeout_seconds=PRINTER_WAIT_TIMEOUT):
+    def __init__(
+        self,
+        submission,
+        printer_timeout_seconds=PRINTER_WAIT_TIMEOUT,
+        printer_state_path=PRINTER_STATE_PATH,
+    ):
         self.submission = submission
         self.printer_name = self.PRINTER_NAME
         self.printer_wait_timeout = printer_timeout_seconds  # Override during testing
+        self.printer_state_path = printer_state_path  # Override during testing
 
     def print(self):
         """
@@ -71,30 +88,48 @@ class Service:
 
     def _wait_for_print(self):
         """
-        Use lpstat to ensure the job was fully transfered to the printer
+        Use lpstat to wait until CUPS has finished every print job for the printer, that is,
+        until the jobs have been fully transfered to the printer.
         Return True if print was successful, otherwise throw ExportException.
+        The timeout applies to each job in turn, so it restarts whenever a job completes.
         Currently, the handler `handler` is defined in `exceptions.py`.
         """
         signal.signal(signal.SIGALRM, handler)
         signal.alarm(self.printer_wait_timeout)
-        printer_idle_string = "printer {} is idle".format(self.printer_name)
-        while True:
-            try:
+        try:
+            pending_jobs = self._get_pending_print_jobs()
+            while pending_jobs:
                 logger.info(
-                    "Running lpstat waiting for printer {}".format(self.printer_name)
+                    "Waiting for print jobs {}".format(", ".join(sorted(pending_jobs)))
                 )
-                output = subprocess.check_output(["lpstat", "-p", self.printer_name])
-                if printer_idle_string in output.decode("utf-8"):
-                    logger.info("Print completed")
-                    return True
-                else:
-                    time.sleep(5)
-            except subprocess.CalledProcessError:
-                raise ExportException(sdstatus=Status.ERROR_PRINT)
-            except TimeoutException:
-                logger.error("Timeout waiting for printer {}".format(self.printer_name))
-                raise ExportException(sdstatus=Status.ERROR_PRINT)
-        return True
+                time.sleep(self.PRINT_JOB_POLL_SECONDS)
+                still_pending_jobs = self._get_pending_print_jobs()
+                if pending_jobs - still_pending_jobs:
+                    signal.alarm(self.printer_wait_timeout)
+                pending_jobs = still_pending_jobs
+
+            logger.info("Print completed")
+            return True
+        except subprocess.CalledProcessError:
+            raise ExportException(sdstatus=Status.ERROR_PRINT)
+        except TimeoutException:
+            logger.error("Timeout waiting for printer {}".format(self.printer_name))
+            raise ExportException(sdstatus=Status.ERROR_PRINT)
+        finally:
+            signal.alarm(0)
+
+    def _get_pending_print_jobs(self) -> Set[str]:
+        """
+        Return the IDs of the print jobs for the printer that CUPS has not completed yet.
+        """
+        output = subprocess.check_output(
+            ["lpstat", "-W", "not-completed", "-o", self.printer_name]
+        )
+        return {
+            line.split()[0]
+            for line in output.decode("utf-8").splitlines()
+            if line.strip()
+        }
 
     def _check_printer_setup(self) -> None:
         """
@@ -103,7 +138,7 @@ class Service:
         """
         try:
             logger.info("Searching for printer")
-            output = subprocess.check_output(["sudo", "lpinfo", "-v"])
+            output = subprocess.check_output(self._get_lpinfo_command())
             printers = [x for x in output.decode("utf-8").split() if "usb://" in x]
             if not printers:
                 logger.info("No usb printers connected")
@@ -122,7 +157,11 @@ class Service:
 
             printer_uri = printers[0]
             printer_ppd = self._install_printer_ppd(printer_uri)
-            self._setup_printer(printer_uri, printer_ppd)
+            if self._is_printer_set_up(printer_uri, printer_ppd):
+                logger.info("Printer {} is already set up".format(self.printer_name))
+            else:
+                self._setup_printer(printer_uri, printer_ppd)
+                self._save_printer_state(printer_uri, printer_ppd)
         except subprocess.CalledProcessError as e:
             logger.error(e)
             raise ExportException(sdstatus=Status.ERROR_UNKNOWN)
@@ -135,7 +174,7 @@ class Service:
         """
         printer_uri = ""
         try:
-            output = subprocess.check_output(["sudo", "lpinfo", "-v"])
+            output = subprocess.check_output(self._get_lpinfo_command())
         except subprocess.CalledProcessError:
             logger.error("Error attempting to retrieve printer uri with lpinfo")
             raise ExportException(sdstatus=Status.ERROR_PRINTER_URI)
@@ -159,6 +198,55 @@ class Service:
         logger.info("Printer {} is supported".format(printer_uri))
         return printer_uri
 
+    def _get_lpinfo_command(self):
+        # Only USB printers are supported, and probing the network backends is slow
+        return ["sudo", "lpinfo", "--include-schemes", "usb", "-v"]
+
+    def _is_printer_set_up(self, printer_uri: str, printer_ppd: str) -> bool:
+        """
+        Check whether the printer was last set up with the supplied URI and PPD, and CUPS still
+        has it with that URI, so that setting it up again can be skipped.
+        """
+        if self._load_printer_state() != (printer_uri, printer_ppd):
+            return False
+
+        try:
+            output = subprocess.check_output(
+                ["lpstat", "-v", self.printer_name], stderr=subprocess.DEVNULL
+            )
+        except subprocess.CalledProcessError:
+            logger.info("Printer {} is not set up in CUPS".format(self.printer_name))
+            return False
+
+        return output.decode("utf-8").split()[-1:] == [printer_uri]
+
+    def _load_printer_state(self) -> Optional[Tuple[str, str]]:
+        try:
+            with open(self.printer_state_path) as f:
+                state = json.load(f)
+            return (state["uri"], state["ppd"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable printer state: {}".format(e))
+            return None
+
+    def _save_printer_state(self, printer_uri: str, printer_ppd: str) -> None:
+        """
+        Record the URI and PPD the printer was set up with. Failing to do so only means that the
+        printer will be set up again next time.
+        """
+        try:
+            os.makedirs(
+                os.path.dirname(self.printer_state_path), mode=0o700, exist_ok=True
+            )
+            tmp_path = self.printer_state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"uri": printer_uri, "ppd": printer_ppd}, f)
+            os.replace(tmp_path, self.printer_state_path)
+        except OSError as e:
+            logger.warning("Could not save printer state: {}".format(e))
+
     def _install_printer_ppd(self, uri):
         if not any(x in uri for x in self.SUPPORTED_PRINTERS):
             logger.error(
@@ -216,14 +304,36 @@ class Service:
         self._print_file("/usr/share/cups/data/testprint")
 
     def _print_all_files(self):
+        """
+        Print all files, converting office documents to pdf in the background and sending each
+        file to the printer as soon as it is ready, in order, then wait for all print jobs at once.
+
+        Documents are converted one at a time, by a single worker: a unoconv listener serves
+        only one client at a time, and so does LibreOffice without one. The next document is
+        converted while the previous one is sent to the printer.
+        """
         files_path = os.path.join(self.submission.tmpdir, "export_data/")
-        files = os.listdir(files_path)
-        print_count = 0
-        for f in files:
-            file_path = os.path.join(files_path, f)
-            self._print_file(file_path)
-            print_count += 1
-            logger.info("Printing document {} of {}".format(print_count, len(files)))
+        files = [os.path.join(files_path, f) for f in os.listdir(files_path)]
+        office_files = [f for f in files if self._is_open_office_file(f)]
+
+        converter = self._start_converter() if office_files else None
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            conversions: Dict[str, Future] = {
+                f: executor.submit(self._convert_to_pdf, f) for f in office_files
+            }
+            for print_count, f in enumerate(files, start=1):
+                file_to_print = conversions[f].result() if f in conversions else f
+                self._submit_print_job(file_to_print)
+                logger.info(
+                    "Printing document {} of {}".format(print_count, len(files))
+                )
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if converter:
+                self._stop_converter(converter)
+
+        self._wait_for_print()
 
     def _is_open_office_file(self, filename):
         OPEN_OFFICE_FORMATS = [
@@ -247,26 +357,74 @@ class Service:
         # If the file to print is an (open)office document, we need to call unoconf to
         # convert the file to pdf as printer drivers do not support this format
         if self._is_open_office_file(file_to_print):
-            logger.info("Converting Office document to pdf")
-            folder = os.path.dirname(file_to_print)
-            converted_filename = file_to_print + ".pdf"
-            converted_path = os.path.join(folder, converted_filename)
-            self.safe_check_call(
-                command=["unoconv", "-o", converted_path, file_to_print],
-                error_status=Status.ERROR_PRINT,
-            )
-            file_to_print = converted_path
+            file_to_print = self._convert_to_pdf(file_to_print)
 
+        self._submit_print_job(file_to_print)
+        # This is an addition to ensure that the entire print job is transferred over.
+        # If the job is not fully transferred within the timeout window, the user
+        # will see an error message.
+        self._wait_for_print()
+
+    def _convert_to_pdf(self, file_to_convert: str) -> str:
+        """
+        Convert an office document to pdf with unoconv, and return the path of the pdf.
+        """
+        logger.info("Converting Office document to pdf")
+        converted_path = file_to_convert + ".pdf"
+        self.safe_check_call(
+            command=["unoconv", "-o", converted_path, file_to_convert],
+            error_status=Status.ERROR_PRINT,
+        )
+        return converted_path
+
+    def _submit_print_job(self, file_to_print: str) -> None:
         logger.info("Sending file to printer {}".format(self.printer_name))
 
         self.safe_check_call(
             command=["xpp", "-P", self.printer_name, file_to_print],
             error_status=Status.ERROR_PRINT,
         )
-        # This is an addition to ensure that the entire print job is transferred over.
-        # If the job is not fully transferred within the timeout window, the user
-        # will see an error message.
-        self._wait_for_print()
+
+    def _start_converter(self) -> Optional[subprocess.Popen]:
+        """
+        Start a LibreOffice instance for unoconv to convert all office documents with, instead
+        of starting one for each document.
+
+        Return None if it isn't listening in time, in which case every conversion starts its
+        own instance as before.
+        """
+        logger.info("Starting document converter")
+        try:
+            converter = subprocess.Popen(
+                ["unoconv", "--listener"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError as e:
+            logger.error("Could not start document converter: {}".format(e))
+            return None
+
+        deadline = time.monotonic() + self.CONVERTER_START_TIMEOUT
+        while converter.poll() is None and time.monotonic() < deadline:
+            try:
+                socket.create_connection(
+                    ("localhost", self.CONVERTER_PORT), timeout=1
+                ).close()
+                return converter
+            except OSError:
+                time.sleep(0.5)
+
+        logger.error("Document converter is not listening")
+        self._stop_converter(converter)
+        return None
+
+    def _stop_converter(self, converter: subprocess.Popen) -> None:
+        converter.terminate()
+        try:
+            converter.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            converter.kill()
+            converter.wait()
 
     def safe_check_call(
         self, command: str, error_status: Status, ignore_stderr_startswith=None
@@ -31,6 +31,9 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     entry_points={
-        "console_scripts": ["send-to-usb = securedrop_export.main:entrypoint"]
+        "console_scripts": [
+            "send-to-usb = securedrop_export.main:entrypoint",
+            "sd-export-agent = securedrop_export.agent:start",
+        ]
     },
 )
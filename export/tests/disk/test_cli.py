@@ -1,14 +1,17 @@
 import pytest
 from unittest import mock
 
+import os
 import subprocess
+import tarfile
+import tempfile
+from io import BytesIO
 
 from securedrop_export.disk.cli import CLI
 from securedrop_export.disk.volume import EncryptionScheme, Volume, MountedVolume
 from securedrop_export.exceptions import ExportException
 from securedrop_export.disk.status import Status
 
-from securedrop_export.archive import Archive
 
 _DEFAULT_USB_DEVICE = "/dev/sda"
 _DEFAULT_USB_DEVICE_ONE_PART = "/dev/sda1"
@@ -16,13 +19,18 @@ _DEFAULT_USB_DEVICE_ONE_PART = "/dev/sda1"
 _PRETEND_LUKS_ID = "luks-id-123456"
 
 # Sample stdout from shell commands
-_SAMPLE_OUTPUT_NO_PART = b"disk\ncrypt"  # noqa
-_SAMPLE_OUTPUT_ONE_PART = b"disk\npart\ncrypt"  # noqa
-_SAMPLE_OUTPUT_MULTI_PART = b"disk\npart\npart\npart\ncrypt"  # noqa
-_SAMPLE_OUTPUT_USB = b"/dev/sda"  # noqa
-
 _SAMPLE_LUKS_HEADER = b"\n\nUUID:\t123456-DEADBEEF"  # noqa
 
+_LSBLK_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "files", "lsblk")
+
+
+def _lsblk_output(fixture: str) -> bytes:
+    """
+    Helper. Return recorded `lsblk --json -O` output.
+    """
+    with open(os.path.join(_LSBLK_FIXTURES_DIR, f"{fixture}.json"), "rb") as f:
+        return f.read()
+
 
 class TestCli:
     """
@@ -30,95 +38,119 @@ class TestCli:
     USB volumes.
     """
 
-    @classmethod
-    def setup_class(cls):
-        cls.cli = CLI()
+    def setup_method(self, method):
+        # CLI caches device state for its lifetime, so each test needs a fresh instance
+        self.cli = CLI()
 
-    @classmethod
-    def teardown_class(cls):
-        cls.cli = None
+    def teardown_method(self, method):
+        self.cli = None
 
-    def _setup_usb_devices(self, mocker, disks, is_removable):
-        """
-        Helper function to set up mocked shell calls representing
-        the search for attached USB devices.
-        The original calls are `lsblk | grep disk` and
-        `cat /sys/class/block/{disk}/removable`
-
-        Parameters:
-            disks (byte array): Array of disk names separated by newline.
-            is_removable (byte array): Array of removable status results (1 for removable),
-            separated by newline
-        """
-
-        # Patch commandline calls to `lsblk | grep disk`
-        command_output = mock.MagicMock()
-        command_output.stdout = mock.MagicMock()
-        command_output.stdout.readlines = mock.MagicMock(return_value=disks)
-        mocker.patch("subprocess.Popen", return_value=command_output)
-
-        # Patch commandline call to 'cat /sys/class/block/{device}/removable'
-
-        # Using side_effect with an iterable allows for different return value each time,
-        # which matches what would happen if iterating through list of devices
-        mocker.patch("subprocess.check_output", side_effect=is_removable)
+    @mock.patch("subprocess.check_output", return_value=_lsblk_output("two_usb"))
+    def test_get_connected_devices(self, mocked_subprocess):
+        result = self.cli.get_connected_devices()
 
-    def test_get_connected_devices(self, mocker):
-        disks = [b"sda disk\n", b"sdb disk\n"]
-        removable = [b"1\n", b"1\n"]
+        assert result == ["/dev/sda", "/dev/sdb"]
 
-        self._setup_usb_devices(mocker, disks, removable)
+    @mock.patch("subprocess.check_output", return_value=_lsblk_output("no_usb"))
+    def test_get_connected_devices_none_removable(self, mocked_subprocess):
         result = self.cli.get_connected_devices()
 
-        assert result[0] == "/dev/sda" and result[1] == "/dev/sdb"
+        assert len(result) == 0
 
     @mock.patch(
         "subprocess.check_output",
         side_effect=subprocess.CalledProcessError(1, "check_output"),
     )
-    def test_get_removable_devices_none_removable(self, mocker):
-        disks = [b"sda disk\n", b"sdb disk\n"]
-        removable = [b"0\n", b"0\n"]
+    def test_get_connected_devices_error(self, mocked_subprocess):
+        with pytest.raises(ExportException):
+            self.cli.get_connected_devices()
 
-        self._setup_usb_devices(mocker, disks, removable)
+    @mock.patch("subprocess.check_output", return_value=b"lsblk: unknown column")
+    def test_get_connected_devices_unparseable_output(self, mocked_subprocess):
+        with pytest.raises(ExportException) as ex:
+            self.cli.get_connected_devices()
 
-        result = self.cli._get_removable_devices(disks)
-        assert len(result) == 0
+        assert ex.value.sdstatus is Status.DEVICE_ERROR
 
     @mock.patch(
-        "subprocess.Popen", side_effect=subprocess.CalledProcessError(1, "Popen")
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_no_partition")
     )
-    def test_get_connected_devices_error(self, mocked_subprocess):
-        with pytest.raises(ExportException):
-            self.cli.get_connected_devices()
-
-    @mock.patch("subprocess.check_output", return_value=_SAMPLE_OUTPUT_NO_PART)
     def test_get_partitioned_device_no_partition(self, mocked_call):
         assert (
             self.cli.get_partitioned_device(_DEFAULT_USB_DEVICE) == _DEFAULT_USB_DEVICE
         )
 
-    @mock.patch("subprocess.check_output", return_value=_SAMPLE_OUTPUT_ONE_PART)
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_one_partition")
+    )
     def test_get_partitioned_device_one_partition(self, mocked_call):
         assert (
             self.cli.get_partitioned_device(_DEFAULT_USB_DEVICE)
-            == _DEFAULT_USB_DEVICE + "1"
+            == _DEFAULT_USB_DEVICE_ONE_PART
         )
 
-    @mock.patch("subprocess.check_output", return_value=_SAMPLE_OUTPUT_MULTI_PART)
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_multi_partition")
+    )
     def test_get_partitioned_device_multi_partition(self, mocked_call):
         with pytest.raises(ExportException) as ex:
-            self.cli.get_partitioned_device(_SAMPLE_OUTPUT_MULTI_PART)
+            self.cli.get_partitioned_device(_DEFAULT_USB_DEVICE)
 
         assert ex.value.sdstatus is Status.INVALID_DEVICE_DETECTED
 
-    @mock.patch("subprocess.check_output", return_value=None)
-    def test_get_partitioned_device_lsblk_error(self, mocked_subprocess):
+    @mock.patch("subprocess.check_output", return_value=_lsblk_output("no_usb"))
+    def test_get_partitioned_device_device_missing(self, mocked_subprocess):
         with pytest.raises(ExportException) as ex:
-            self.cli.get_partitioned_device(_SAMPLE_OUTPUT_ONE_PART)
+            self.cli.get_partitioned_device(_DEFAULT_USB_DEVICE)
 
         assert ex.value.sdstatus is Status.DEVICE_ERROR
 
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_one_partition")
+    )
+    def test_device_checks_share_one_lsblk_call(self, mocked_subprocess):
+        devices = self.cli.get_connected_devices()
+        device = self.cli.get_partitioned_device(devices[0])
+        self.cli._get_mountpoint(
+            Volume(
+                device_name=device,
+                mapped_name=_PRETEND_LUKS_ID,
+                encryption=EncryptionScheme.LUKS,
+            )
+        )
+
+        mocked_subprocess.assert_called_once()
+
+    @mock.patch("subprocess.check_call", return_value=0)
+    def test_refresh_keeps_cryptsetup_results_for_unchanged_devices(self, mocked_call):
+        with mock.patch(
+            "subprocess.check_output",
+            return_value=_lsblk_output("usb_luks_one_partition"),
+        ) as mocked_output:
+            self.cli.refresh()
+            assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+            self.cli.refresh()
+            assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+
+        assert mocked_output.call_count == 2
+        mocked_call.assert_called_once()
+
+    @mock.patch("subprocess.check_call", return_value=0)
+    def test_refresh_drops_cryptsetup_results_for_changed_devices(self, mocked_call):
+        with mock.patch(
+            "subprocess.check_output",
+            return_value=_lsblk_output("usb_luks_one_partition"),
+        ):
+            self.cli.refresh()
+            assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+        with mock.patch(
+            "subprocess.check_output", return_value=_lsblk_output("usb_multi_partition")
+        ):
+            self.cli.refresh()
+            assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+
+        assert mocked_call.call_count == 2
+
     @mock.patch(
         "subprocess.check_output",
         side_effect=subprocess.CalledProcessError(1, "check_output"),
@@ -133,7 +165,7 @@ class TestCli:
     @mock.patch("subprocess.check_call", return_value=0)
     def test_is_luks_volume_true(self, mocked_call):
         # `sudo cryptsetup isLuks` returns 0 if true
-        assert self.cli.is_luks_volume(_SAMPLE_OUTPUT_ONE_PART)
+        assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
 
     @mock.patch(
         "subprocess.check_call",
@@ -141,7 +173,21 @@ class TestCli:
     )
     def test_is_luks_volume_false(self, mocked_subprocess):
         # `sudo cryptsetup isLuks` returns 1 if false; CalledProcessError is thrown
-        assert not self.cli.is_luks_volume(_SAMPLE_OUTPUT_ONE_PART)
+        assert not self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+
+    @mock.patch("subprocess.check_call", return_value=0)
+    def test_is_luks_volume_cached(self, mocked_call):
+        assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+        assert self.cli.is_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
+
+        mocked_call.assert_called_once()
+
+    @mock.patch("subprocess.check_output", return_value=_SAMPLE_LUKS_HEADER)
+    def test__get_luks_name_from_headers_cached(self, mocked_subprocess):
+        first = self.cli._get_luks_name_from_headers(_DEFAULT_USB_DEVICE)
+
+        assert self.cli._get_luks_name_from_headers(_DEFAULT_USB_DEVICE) == first
+        mocked_subprocess.assert_called_once()
 
     @mock.patch("subprocess.check_output", return_value=_SAMPLE_LUKS_HEADER)
     def test__get_luks_name_from_headers(self, mocked_subprocess):
@@ -185,12 +231,19 @@ class TestCli:
             self.cli._get_luks_name_from_headers(_DEFAULT_USB_DEVICE)
 
     @mock.patch("os.path.exists", return_value=True)
-    @mock.patch("subprocess.check_output", return_value=_SAMPLE_LUKS_HEADER)
+    @mock.patch(
+        "subprocess.check_output",
+        side_effect=[
+            _SAMPLE_LUKS_HEADER,
+            _lsblk_output("usb_luks_one_partition_mounted"),
+        ],
+    )
     def test_get_luks_volume_already_unlocked(self, mocked_subprocess, mocked_os_call):
         result = self.cli.get_luks_volume(_DEFAULT_USB_DEVICE_ONE_PART)
 
         assert result.encryption is EncryptionScheme.LUKS
         assert result.unlocked
+        assert result.mountpoint == "/media/usb"
 
     @mock.patch("os.path.exists", return_value=False)
     @mock.patch("subprocess.check_output", return_value=_SAMPLE_LUKS_HEADER)
@@ -285,7 +338,9 @@ class TestCli:
         assert ex.value.sdstatus is Status.DEVICE_ERROR
 
     @mock.patch("os.path.exists", return_value=True)
-    @mock.patch("subprocess.check_output", return_value=b"\n")
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_one_partition")
+    )
     @mock.patch("subprocess.check_call", return_value=0)
     def test_mount_volume(self, mocked_call, mocked_output, mocked_path):
         vol = Volume(
@@ -297,25 +352,28 @@ class TestCli:
         assert isinstance(mv, MountedVolume)
         assert mv.mountpoint is self.cli._DEFAULT_MOUNTPOINT
 
-    @mock.patch("os.path.exists", return_value=True)
-    @mock.patch(
-        "subprocess.check_output", return_value=b"/dev/pretend/luks-id-123456\n"
+    @pytest.mark.parametrize(
+        "fixture",
+        ["usb_luks_one_partition_mounted", "usb_luks_one_partition_mounted_bullseye"],
     )
+    @mock.patch("os.path.exists", return_value=True)
     @mock.patch("subprocess.check_call", return_value=0)
-    def test_mount_volume_already_mounted(
-        self, mocked_output, mocked_call, mocked_path
-    ):
+    def test_mount_volume_already_mounted(self, mocked_call, mocked_path, fixture):
         md = Volume(
             device_name=_DEFAULT_USB_DEVICE_ONE_PART,
             mapped_name=_PRETEND_LUKS_ID,
             encryption=EncryptionScheme.LUKS,
         )
-        result = self.cli.mount_volume(md)
-        assert result.mountpoint == "/dev/pretend/luks-id-123456"
+        with mock.patch("subprocess.check_output", return_value=_lsblk_output(fixture)):
+            result = self.cli.mount_volume(md)
+        assert result.mountpoint == "/media/usb"
         assert isinstance(result, MountedVolume)
+        mocked_call.assert_not_called()
 
     @mock.patch("os.path.exists", return_value=True)
-    @mock.patch("subprocess.check_output", return_value=b"\n")
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_one_partition")
+    )
     @mock.patch("subprocess.check_call", return_value=0)
     def test_mount_volume_mkdir(self, mocked_output, mocked_subprocess, mocked_path):
         md = Volume(
@@ -327,7 +385,9 @@ class TestCli:
         assert mv.mapped_name == _PRETEND_LUKS_ID
         assert isinstance(mv, MountedVolume)
 
-    @mock.patch("subprocess.check_output", return_value=b"\n")
+    @mock.patch(
+        "subprocess.check_output", return_value=_lsblk_output("usb_luks_one_partition")
+    )
     @mock.patch(
         "subprocess.check_call",
         side_effect=subprocess.CalledProcessError(1, "check_call"),
@@ -438,78 +498,84 @@ class TestCli:
 
         assert ex.value.sdstatus is Status.DEVICE_ERROR
 
-    @mock.patch(
-        "subprocess.check_call",
-        side_effect=subprocess.CalledProcessError(1, "check_call"),
-    )
-    def test__remove_temp_directory_error(self, mocked_subprocess):
-        with pytest.raises(ExportException):
-            self.cli._remove_temp_directory("tmp")
-
-    @mock.patch("subprocess.check_call", return_value=0)
-    def test_write_to_disk(self, mock_check_call):
-        # Temporarily patch a method, to later assert it is called
-        patch = mock.patch.object(self.cli, "cleanup_drive_and_tmpdir")
-        patch.return_value = mock.MagicMock()
+    def test_write_archive_to_disk(self):
+        patch = mock.patch.object(self.cli, "cleanup_drive")
         patch.start()
 
-        vol = MountedVolume(
-            device_name=_DEFAULT_USB_DEVICE_ONE_PART,
-            mapped_name=_PRETEND_LUKS_ID,
-            mountpoint=self.cli._DEFAULT_MOUNTPOINT,
-            encryption=EncryptionScheme.LUKS,
-        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            archive_path = os.path.join(temp_dir, "archive.sd-export")
+            with tarfile.open(archive_path, "w:gz") as archive:
+                for name, content in [
+                    ("metadata.json", b'{"device": "disk"}'),
+                    ("export_data/file.txt", b"test"),
+                ]:
+                    file_info = tarfile.TarInfo(name)
+                    file_info.size = len(content)
+                    archive.addfile(file_info, BytesIO(content))
+
+            mountpoint = os.path.join(temp_dir, "usb")
+            os.mkdir(mountpoint)
+            vol = MountedVolume(
+                device_name=_DEFAULT_USB_DEVICE_ONE_PART,
+                mapped_name=_PRETEND_LUKS_ID,
+                mountpoint=mountpoint,
+                encryption=EncryptionScheme.LUKS,
+            )
 
-        submission = Archive("testfile")
+            progress_callback = mock.MagicMock()
 
-        self.cli.write_data_to_device(submission.tmpdir, submission.target_dirname, vol)
-        self.cli.cleanup_drive_and_tmpdir.assert_called_once()
+            self.cli.write_archive_to_device(
+                archive_path, "sd-export-test", vol, progress_callback
+            )
+
+            progress_callback.assert_called_once_with("export_data/file.txt")
+            target_path = os.path.join(mountpoint, "sd-export-test")
+            assert os.listdir(target_path) == ["export_data"]
+            with open(os.path.join(target_path, "export_data", "file.txt"), "rb") as f:
+                assert f.read() == b"test"
+            self.cli.cleanup_drive.assert_called_once_with(vol)
 
-        # Don't want to patch it indefinitely though, that will mess with the other tests
         patch.stop()
 
     @mock.patch(
-        "subprocess.check_call",
-        side_effect=subprocess.CalledProcessError(1, "check_call"),
+        "securedrop_export.disk.cli.safe_extractall",
+        side_effect=ValueError("Unsafe file or directory name"),
     )
-    def test_write_to_disk_error_still_does_cleanup(self, mock_call):
-        # see above - patch internal method only for this test
-        patch = mock.patch.object(self.cli, "cleanup_drive_and_tmpdir")
-        patch.return_value = mock.MagicMock()
+    @mock.patch("subprocess.check_call", return_value=0)
+    def test_write_archive_to_disk_error_still_does_cleanup(
+        self, mock_call, mock_extract, tmp_path
+    ):
+        patch = mock.patch.object(self.cli, "cleanup_drive")
         patch.start()
 
         vol = MountedVolume(
             device_name=_DEFAULT_USB_DEVICE_ONE_PART,
             mapped_name=_PRETEND_LUKS_ID,
-            mountpoint=self.cli._DEFAULT_MOUNTPOINT,
+            mountpoint=str(tmp_path),
             encryption=EncryptionScheme.LUKS,
         )
-        submission = Archive("testfile")
 
-        with pytest.raises(ExportException):
-            self.cli.write_data_to_device(
-                submission.tmpdir, submission.target_dirname, vol
-            )
-            self.cli.cleanup_drive_and_tmpdir.assert_called_once()
+        with pytest.raises(ExportException) as ex:
+            self.cli.write_archive_to_device("testfile", "sd-export-test", vol)
+
+        assert ex.value.sdstatus is Status.ERROR_EXPORT
+        self.cli.cleanup_drive.assert_called_once_with(vol)
+        # The target directory is not left behind on the drive
+        assert list(tmp_path.iterdir()) == []
 
         patch.stop()
 
-    @mock.patch(
-        "subprocess.check_call",
-        side_effect=subprocess.CalledProcessError(1, "check_call"),
-    )
-    def test_cleanup_drive_and_tmpdir_error(self, mocked_subprocess):
-        submission = Archive("testfile")
+    @mock.patch("os.sync", side_effect=OSError(5, "Input/output error"))
+    def test_cleanup_drive_error(self, mocked_sync):
         mock_volume = mock.MagicMock(Volume)
 
         with pytest.raises(ExportException) as ex:
-            self.cli.cleanup_drive_and_tmpdir(mock_volume, submission.tmpdir)
+            self.cli.cleanup_drive(mock_volume)
         assert ex.value.sdstatus is Status.ERROR_EXPORT_CLEANUP
 
     @mock.patch("os.path.exists", return_value=False)
-    @mock.patch("subprocess.check_call", return_value=0)
-    def test_cleanup_drive_and_tmpdir(self, mock_subprocess, mocked_path):
-        submission = Archive("testfile")
+    @mock.patch("os.sync")
+    def test_cleanup_drive(self, mock_sync, mocked_path):
         vol = Volume(
             device_name=_DEFAULT_USB_DEVICE_ONE_PART,
             mapped_name=_PRETEND_LUKS_ID,
@@ -518,20 +584,16 @@ class TestCli:
         mv = MountedVolume.from_volume(vol, mountpoint=self.cli._DEFAULT_MOUNTPOINT)
 
         close_patch = mock.patch.object(self.cli, "_close_luks_volume")
-        remove_tmpdir_patch = mock.patch.object(self.cli, "_remove_temp_directory")
-
         close_mock = close_patch.start()
-        rm_tpdir_mock = remove_tmpdir_patch.start()
 
         # That was all setup. Here's our test
-        self.cli.cleanup_drive_and_tmpdir(mv, submission.tmpdir)
+        self.cli.cleanup_drive(mv)
 
+        mock_sync.assert_called_once()
         close_mock.assert_called_once()
-        rm_tpdir_mock.assert_called_once_with(submission.tmpdir)
 
         # Undo patch changes
         close_patch.stop()
-        remove_tmpdir_patch.stop()
 
     @mock.patch(
         "subprocess.check_output",
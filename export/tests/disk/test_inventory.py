@@ -0,0 +1,115 @@
+import os
+import subprocess
+
+import pytest
+from unittest import mock
+
+from securedrop_export.disk.inventory import DeviceInventory
+from securedrop_export.disk.status import Status
+from securedrop_export.exceptions import ExportException
+
+_LSBLK_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "files", "lsblk")
+
+_LUKS_MAPPED_PATH = "/dev/mapper/luks-b1a5e7c2-4d3f-4e6a-9b8c-7d6e5f4a3b2c"
+
+
+def _inventory(fixture: str) -> DeviceInventory:
+    """
+    Helper. Return an inventory built from recorded `lsblk --json -O` output.
+    """
+    with open(os.path.join(_LSBLK_FIXTURES_DIR, f"{fixture}.json"), "rb") as f:
+        return DeviceInventory.from_json(f.read())
+
+
+class TestDeviceInventory:
+    @pytest.mark.parametrize(
+        "fixture,expected",
+        [
+            ("no_usb", []),
+            ("usb_luks_no_partition", ["/dev/sda"]),
+            ("usb_luks_one_partition", ["/dev/sda"]),
+            ("usb_luks_one_partition_mounted", ["/dev/sda"]),
+            ("two_usb", ["/dev/sda", "/dev/sdb"]),
+        ],
+    )
+    def test_get_removable_disks(self, fixture, expected):
+        assert _inventory(fixture).get_removable_disks() == expected
+
+    def test_get_removable_disks_legacy_string_booleans(self):
+        inventory = DeviceInventory(
+            [
+                {"name": "xvda", "type": "disk", "rm": "0"},
+                {"name": "sda", "type": "disk", "rm": "1"},
+                {"name": "sr0", "type": "rom", "rm": "1"},
+            ]
+        )
+
+        assert inventory.get_removable_disks() == ["/dev/sda"]
+
+    @pytest.mark.parametrize(
+        "fixture,expected",
+        [
+            ("usb_luks_no_partition", []),
+            ("usb_luks_one_partition", ["/dev/sda1"]),
+            ("usb_luks_one_partition_unlocked", ["/dev/sda1"]),
+            ("usb_multi_partition", ["/dev/sda1", "/dev/sda2"]),
+        ],
+    )
+    def test_get_partitions(self, fixture, expected):
+        assert _inventory(fixture).get_partitions("/dev/sda") == expected
+
+    def test_get_partitions_device_missing(self):
+        with pytest.raises(ExportException) as ex:
+            _inventory("no_usb").get_partitions("/dev/sda")
+
+        assert ex.value.sdstatus is Status.DEVICE_ERROR
+
+    @pytest.mark.parametrize(
+        "fixture,expected",
+        [
+            ("usb_luks_one_partition", None),
+            ("usb_luks_one_partition_unlocked", None),
+            ("usb_luks_one_partition_mounted", "/media/usb"),
+            ("usb_luks_one_partition_mounted_bullseye", "/media/usb"),
+        ],
+    )
+    def test_get_mountpoint(self, fixture, expected):
+        inventory = _inventory(fixture)
+
+        assert inventory.get_mountpoint("/dev/sda1") == expected
+
+    def test_get_mountpoint_of_mapped_device(self):
+        inventory = _inventory("usb_luks_one_partition_mounted")
+
+        assert inventory.get_mountpoint(_LUKS_MAPPED_PATH) == "/media/usb"
+
+    def test_get_mountpoint_not_removable(self):
+        assert _inventory("no_usb").get_mountpoint("/dev/xvdb") == "/rw"
+
+    @pytest.mark.parametrize(
+        "output", [b"", b"lsblk: unknown column", b"{}", b'{"blockdevices": null}']
+    )
+    def test_from_json_invalid(self, output):
+        with pytest.raises(ExportException) as ex:
+            DeviceInventory.from_json(output)
+
+        assert ex.value.sdstatus is Status.DEVICE_ERROR
+
+    @mock.patch("subprocess.check_output", return_value=b'{"blockdevices": []}')
+    def test_from_lsblk(self, mocked_subprocess):
+        inventory = DeviceInventory.from_lsblk()
+
+        assert inventory.blockdevices == []
+        mocked_subprocess.assert_called_once_with(
+            ["lsblk", "--json", "-O"], stderr=subprocess.PIPE
+        )
+
+    @mock.patch(
+        "subprocess.check_output",
+        side_effect=subprocess.CalledProcessError(1, "check_output"),
+    )
+    def test_from_lsblk_error(self, mocked_subprocess):
+        with pytest.raises(ExportException) as ex:
+            DeviceInventory.from_lsblk()
+
+        assert ex.value.sdstatus is Status.DEVICE_ERROR
@@ -149,7 +149,7 @@ class TestExportService:
 
     def test_export_write_error(self):
         self.mock_cli.is_luks_volume.return_value = True
-        self.mock_cli.write_data_to_device.side_effect = ExportException(
+        self.mock_cli.write_archive_to_device.side_effect = ExportException(
             sdstatus=LegacyStatus.LEGACY_ERROR_USB_WRITE
         )
 
@@ -171,7 +171,7 @@ class TestExportService:
     @mock.patch("os.path.exists", return_value=True)
     def test_write_error_returns_legacy_status(self, mock_path):
         self.mock_cli.is_luks_volume.return_value = True
-        self.mock_cli.write_data_to_device.side_effect = ExportException(
+        self.mock_cli.write_archive_to_device.side_effect = ExportException(
             sdstatus=Status.ERROR_EXPORT
         )
 
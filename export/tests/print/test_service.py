@@ -1,8 +1,12 @@
 import pytest
 
 from unittest import mock
+import json
 import os
 import subprocess
+import tempfile
+import threading
+import time
 from subprocess import CalledProcessError
 
 from securedrop_export.directory import safe_mkdir
@@ -15,6 +19,12 @@ from securedrop_export.print.status import Status
 SAMPLE_OUTPUT_NO_PRINTER = b"network beh\nnetwork https\nnetwork ipp\nnetwork ipps\nnetwork http\nnetwork\nnetwork ipp14\nnetwork lpd"  # noqa
 SAMPLE_OUTPUT_BROTHER_PRINTER = b"network beh\nnetwork https\nnetwork ipp\nnetwork ipps\nnetwork http\nnetwork\nnetwork ipp14\ndirect usb://Brother/HL-L2320D%20series?serial=A00000A000000\nnetwork lpd"  # noqa
 SAMPLE_OUTPUT_LASERJET_PRINTER = b"network beh\nnetwork https\nnetwork ipp\nnetwork ipps\nnetwork http\nnetwork\nnetwork ipp14\ndirect usb://HP/LaserJet%20Pro%20M404-M405?serial=A00000A000000\nnetwork lpd"  # noqa
+BROTHER_URI = "usb://Brother/HL-L2320D%20series?serial=A00000A000000"
+BROTHER_PPD = "/usr/share/cups/model/br7030.ppd"
+LASERJET_URI = "usb://HP/LaserJet%20Pro%20M404-M405?serial=A00000A000000"
+LASERJET_PPD = "/usr/share/cups/model/hp-laserjet_6l.ppd"
+SAMPLE_OUTPUT_TWO_JOBS = b"sdw-printer-12          user           1024   Mon 16 Jan 2023 12:00:00 AM UTC\nsdw-printer-13          user           2048   Mon 16 Jan 2023 12:00:01 AM UTC\n"  # noqa
+SAMPLE_OUTPUT_ONE_JOB = b"sdw-printer-13          user           2048   Mon 16 Jan 2023 12:00:01 AM UTC\n"  # noqa
 SAMPLE_OUTPUT_UNSUPPORTED_PRINTER = b"network beh\nnetwork https\nnetwork ipp\nnetwork ipps\nnetwork http\nnetwork\nnetwork ipp14\ndirect usb://Canon/QL-700%?serial=A00000A000000\nnetwork lpd"  # noqa
 
 
@@ -41,6 +51,9 @@ class TestPrint:
 
     def setup_method(self):
         self.service.printer_wait_timeout = self.service.PRINTER_WAIT_TIMEOUT
+        self.service.printer_state_path = os.path.join(
+            tempfile.mkdtemp(), ".securedrop_export", "printer.json"
+        )
 
     @mock.patch("subprocess.check_output", return_value=SAMPLE_OUTPUT_BROTHER_PRINTER)
     def test_get_good_printer_uri_laserjet(self, mocked_call):
@@ -217,13 +230,51 @@ class TestPrint:
     @mock.patch(
         "subprocess.check_output",
         side_effect=[
-            b"printer sdw-printer is busy\n",
-            b"printer sdw-printer is idle\n",
+            SAMPLE_OUTPUT_TWO_JOBS,
+            SAMPLE_OUTPUT_ONE_JOB,
+            b"",
         ],
     )
     def test__wait_for_print(self, mock_subprocess, mock_time):
         assert self.service._wait_for_print()
 
+        mock_subprocess.assert_called_with(
+            ["lpstat", "-W", "not-completed", "-o", "sdw-printer"]
+        )
+        assert mock_subprocess.call_count == 3
+        mock_time.assert_called_with(self.service.PRINT_JOB_POLL_SECONDS)
+
+    @mock.patch("subprocess.check_output", return_value=b"")
+    def test__wait_for_print_no_pending_jobs(self, mock_subprocess):
+        with mock.patch("securedrop_export.print.service.time.sleep") as mock_time:
+            assert self.service._wait_for_print()
+
+        mock_time.assert_not_called()
+
+    @mock.patch("securedrop_export.print.service.time.sleep", return_value=None)
+    @mock.patch("securedrop_export.print.service.signal.alarm")
+    @mock.patch(
+        "subprocess.check_output",
+        side_effect=[
+            SAMPLE_OUTPUT_TWO_JOBS,
+            SAMPLE_OUTPUT_TWO_JOBS,
+            SAMPLE_OUTPUT_ONE_JOB,
+            b"",
+        ],
+    )
+    def test__wait_for_print_timeout_restarts_per_job(
+        self, mock_subprocess, mock_alarm, mock_time
+    ):
+        assert self.service._wait_for_print()
+
+        timeout = self.service.printer_wait_timeout
+        assert mock_alarm.call_args_list == [
+            mock.call(timeout),
+            mock.call(timeout),
+            mock.call(timeout),
+            mock.call(0),
+        ]
+
     @mock.patch(
         "subprocess.check_output",
         side_effect=subprocess.CalledProcessError(1, "check_output"),
@@ -235,9 +286,7 @@ class TestPrint:
 
         assert ex.value.sdstatus is Status.ERROR_PRINT
 
-    @mock.patch(
-        "subprocess.check_output", return_value=b"printer sdw-printer is busy\n"
-    )
+    @mock.patch("subprocess.check_output", return_value=SAMPLE_OUTPUT_ONE_JOB)
     def test__wait_for_print_timeout_exception(self, mock_output):
         self.service.printer_wait_timeout = 1
 
@@ -252,7 +301,9 @@ class TestPrint:
     def test__check_printer_setup(self, printers, mocker):
         mocker.patch("subprocess.check_output", return_value=printers)
         p = mocker.patch.object(self.service, "_setup_printer")
-        p2 = mocker.patch.object(self.service, "_install_printer_ppd")
+        p2 = mocker.patch.object(
+            self.service, "_install_printer_ppd", return_value=BROTHER_PPD
+        )
         p.start()
         p2.start()
 
@@ -263,6 +314,101 @@ class TestPrint:
         p.stop()
         p2.stop()
 
+    def test__check_printer_setup_saves_printer_state(self, mocker):
+        check_output = mocker.patch(
+            "subprocess.check_output", return_value=SAMPLE_OUTPUT_BROTHER_PRINTER
+        )
+        mocker.patch.object(
+            self.service, "_install_printer_ppd", return_value=BROTHER_PPD
+        )
+        setup = mocker.patch.object(self.service, "_setup_printer")
+
+        self.service._check_printer_setup()
+
+        # Only USB printers are looked for
+        check_output.assert_called_once_with(
+            ["sudo", "lpinfo", "--include-schemes", "usb", "-v"]
+        )
+        setup.assert_called_once_with(BROTHER_URI, BROTHER_PPD)
+        with open(self.service.printer_state_path) as f:
+            assert json.load(f) == {"uri": BROTHER_URI, "ppd": BROTHER_PPD}
+
+    def test__check_printer_setup_skips_setup_if_unchanged(self, mocker):
+        self.service._save_printer_state(BROTHER_URI, BROTHER_PPD)
+        check_output = mocker.patch(
+            "subprocess.check_output",
+            side_effect=[
+                SAMPLE_OUTPUT_BROTHER_PRINTER,
+                f"device for sdw-printer: {BROTHER_URI}\n".encode(),
+            ],
+        )
+        mocker.patch.object(
+            self.service, "_install_printer_ppd", return_value=BROTHER_PPD
+        )
+        setup = mocker.patch.object(self.service, "_setup_printer")
+
+        self.service._check_printer_setup()
+
+        setup.assert_not_called()
+        assert check_output.call_args[0][0] == ["lpstat", "-v", "sdw-printer"]
+
+    @pytest.mark.parametrize(
+        "lpstat",
+        [
+            subprocess.CalledProcessError(1, "lpstat"),
+            b"device for sdw-printer: usb://Brother/HL-L2320D%20series?serial=B\n",
+        ],
+    )
+    def test__check_printer_setup_sets_up_printer_missing_from_cups(
+        self, lpstat, mocker
+    ):
+        self.service._save_printer_state(BROTHER_URI, BROTHER_PPD)
+        mocker.patch(
+            "subprocess.check_output",
+            side_effect=[SAMPLE_OUTPUT_BROTHER_PRINTER, lpstat],
+        )
+        mocker.patch.object(
+            self.service, "_install_printer_ppd", return_value=BROTHER_PPD
+        )
+        setup = mocker.patch.object(self.service, "_setup_printer")
+
+        self.service._check_printer_setup()
+
+        setup.assert_called_once_with(BROTHER_URI, BROTHER_PPD)
+
+    def test__check_printer_setup_sets_up_changed_printer(self, mocker):
+        self.service._save_printer_state(LASERJET_URI, LASERJET_PPD)
+        check_output = mocker.patch(
+            "subprocess.check_output", return_value=SAMPLE_OUTPUT_BROTHER_PRINTER
+        )
+        mocker.patch.object(
+            self.service, "_install_printer_ppd", return_value=BROTHER_PPD
+        )
+        setup = mocker.patch.object(self.service, "_setup_printer")
+
+        self.service._check_printer_setup()
+
+        # No need to ask CUPS about the printer
+        check_output.assert_called_once()
+        setup.assert_called_once_with(BROTHER_URI, BROTHER_PPD)
+        assert self.service._load_printer_state() == (BROTHER_URI, BROTHER_PPD)
+
+    @pytest.mark.parametrize("state", ["", "[]", '{"uri": "usb://Brother"}'])
+    def test__load_printer_state_invalid(self, state):
+        os.makedirs(os.path.dirname(self.service.printer_state_path))
+        with open(self.service.printer_state_path, "w") as f:
+            f.write(state)
+
+        assert self.service._load_printer_state() is None
+
+    def test__save_printer_state_error(self):
+        self.service.printer_state_path = "/proc/nonexistent/printer.json"
+
+        # Not being able to save the state is not an error
+        self.service._save_printer_state(BROTHER_URI, BROTHER_PPD)
+
+        assert self.service._load_printer_state() is None
+
     @mock.patch("subprocess.check_output", return_value=SAMPLE_OUTPUT_NO_PRINTER)
     def test__check_printer_setup_error_no_printer(self, mock_output):
         with pytest.raises(ExportException) as ex:
@@ -332,11 +478,14 @@ class TestPrint:
 
     @mock.patch("securedrop_export.print.service.Service._wait_for_print")
     def test__print_all_files(self, mock_wait):
-        p = mock.patch.object(self.service, "_print_file")
-        mock_print = p.start()
-
-        self.service._print_all_files()
-        mock_print.assert_has_calls(
+        with mock.patch.object(
+            self.service, "_submit_print_job"
+        ) as mock_submit, mock.patch.object(
+            self.service, "_start_converter"
+        ) as mock_start:
+            self.service._print_all_files()
+
+        mock_submit.assert_has_calls(
             [
                 mock.call(f"{self.submission.tmpdir}/export_data/file1.txt"),
                 mock.call(f"{self.submission.tmpdir}/export_data/file2.txt"),
@@ -344,7 +493,106 @@ class TestPrint:
             ],
             any_order=True,
         )
-        p.stop()
+        # No office documents, so there is nothing to convert
+        mock_start.assert_not_called()
+        mock_wait.assert_called_once_with()
+
+    @mock.patch("securedrop_export.print.service.Service._wait_for_print")
+    def test__print_all_files_converts_office_documents(self, mock_wait):
+        submission = Archive("testfile")
+        files_path = os.path.join(submission.tmpdir, "export_data")
+        safe_mkdir(files_path)
+        for f in ["a.odt", "b.txt", "c.docx"]:
+            open(os.path.join(files_path, f), "w").close()
+        service = Service(submission)
+        converter = mock.MagicMock()
+        converting = threading.Lock()
+
+        def convert_to_pdf(f):
+            # The converter can only handle one document at a time
+            assert converting.acquire(blocking=False)
+            time.sleep(0.01)
+            converting.release()
+            return f + ".pdf"
+
+        with mock.patch.object(
+            service, "_start_converter", return_value=converter
+        ), mock.patch.object(
+            service, "_convert_to_pdf", side_effect=convert_to_pdf
+        ) as mock_convert, mock.patch.object(
+            service, "_submit_print_job"
+        ) as mock_submit, mock.patch.object(
+            service, "_stop_converter"
+        ) as mock_stop:
+            service._print_all_files()
+
+        files = [os.path.join(files_path, f) for f in os.listdir(files_path)]
+        assert mock_convert.call_args_list == [
+            mock.call(f) for f in files if service._is_open_office_file(f)
+        ]
+        # Files are still sent to the printer in order
+        assert mock_submit.call_args_list == [
+            mock.call(f + ".pdf" if service._is_open_office_file(f) else f)
+            for f in files
+        ]
+        mock_stop.assert_called_once_with(converter)
+        mock_wait.assert_called_once_with()
+
+    @mock.patch("securedrop_export.print.service.Service._wait_for_print")
+    def test__print_all_files_conversion_error(self, mock_wait):
+        submission = Archive("testfile")
+        files_path = os.path.join(submission.tmpdir, "export_data")
+        safe_mkdir(files_path)
+        open(os.path.join(files_path, "a.odt"), "w").close()
+        service = Service(submission)
+        converter = mock.MagicMock()
+
+        with mock.patch.object(
+            service, "_start_converter", return_value=converter
+        ), mock.patch.object(
+            service,
+            "_convert_to_pdf",
+            side_effect=ExportException(sdstatus=Status.ERROR_PRINT),
+        ), mock.patch.object(
+            service, "_submit_print_job"
+        ) as mock_submit, mock.patch.object(
+            service, "_stop_converter"
+        ) as mock_stop, pytest.raises(
+            ExportException
+        ) as ex:
+            service._print_all_files()
+
+        assert ex.value.sdstatus is Status.ERROR_PRINT
+        mock_submit.assert_not_called()
+        mock_stop.assert_called_once_with(converter)
+        mock_wait.assert_not_called()
+
+    @mock.patch("socket.create_connection")
+    @mock.patch("subprocess.Popen")
+    def test__start_converter(self, mock_popen, mock_connect):
+        mock_popen.return_value.poll.return_value = None
+        mock_connect.side_effect = [ConnectionRefusedError(), mock.MagicMock()]
+
+        with mock.patch("securedrop_export.print.service.time.sleep"):
+            converter = self.service._start_converter()
+
+        assert converter is mock_popen.return_value
+        assert mock_popen.call_args[0][0] == ["unoconv", "--listener"]
+        mock_connect.assert_called_with(("localhost", 2002), timeout=1)
+
+    @mock.patch("socket.create_connection", side_effect=ConnectionRefusedError())
+    @mock.patch("subprocess.Popen")
+    def test__start_converter_exits(self, mock_popen, mock_connect):
+        mock_popen.return_value.poll.side_effect = [None, 1]
+
+        with mock.patch("securedrop_export.print.service.time.sleep"):
+            assert self.service._start_converter() is None
+
+        mock_popen.return_value.terminate.assert_called_once_with()
+
+    @mock.patch("subprocess.Popen", side_effect=FileNotFoundError("unoconv"))
+    def test__start_converter_missing(self, mock_popen):
+        assert self.service._start_converter() is None
 
     @mock.patch("securedrop_export.print.service.Service._wait_for_print")
     def test_open_office_file_convert_to_pdf(self, mock_wait):
@@ -398,8 +646,8 @@ class TestPrint:
     @mock.patch(
         "subprocess.check_output",
         side_effect=[
-            b"printer sdw-printer is busy\n",
-            b"printer sdw-printer is idle\n",
+            SAMPLE_OUTPUT_ONE_JOB,
+            b"",
         ],
     )
     def test__wait_for_print_waits_correctly(self, mock_subprocess, mock_time):
@@ -424,12 +672,11 @@ class TestPrint:
                 ),
             ]
         )
-        assert log.call_count == 4
+        assert log.call_count == 3
         log.assert_has_calls(
             [
                 mock.call("Sending file to printer sdw-printer"),
-                mock.call("Running lpstat waiting for printer sdw-printer"),
-                mock.call("Running lpstat waiting for printer sdw-printer"),
+                mock.call("Waiting for print jobs sdw-printer-13"),
                 mock.call("Print completed"),
             ]
         )
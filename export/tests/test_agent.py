@@ -0,0 +1,201 @@
+import json
+import os
+import tarfile
+from io import BytesIO
+from typing import Dict
+from unittest import mock
+
+from securedrop_export.agent import READY, Agent
+from securedrop_export.directory import safe_extractall
+from securedrop_export.disk.cli import CLI
+from securedrop_export.disk.legacy_status import Status as LegacyStatus
+from securedrop_export.exceptions import ExportException
+from securedrop_export.main import Status
+
+_LSBLK_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "files", "lsblk")
+
+
+def _lsblk_output(fixture: str) -> bytes:
+    """
+    Helper. Return recorded `lsblk --json -O` output.
+    """
+    with open(os.path.join(_LSBLK_FIXTURES_DIR, f"{fixture}.json"), "rb") as f:
+        return f.read()
+
+
+def _request(metadata: dict, files: Dict[str, bytes] = {}) -> bytes:
+    """
+    Helper. Return an agent request for an archive with the supplied metadata and files, sent in
+    two chunks.
+    """
+    buf = BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as archive:
+        members = {"metadata.json": json.dumps(metadata).encode("utf-8"), **files}
+        for name, content in members.items():
+            file_info = tarfile.TarInfo(name)
+            file_info.size = len(content)
+            archive.addfile(file_info, BytesIO(content))
+
+    data = buf.getvalue()
+    half = len(data) // 2
+    return b"".join(
+        [
+            f"{half}\n".encode("ascii"),
+            data[:half],
+            f"{len(data) - half}\n".encode("ascii"),
+            data[half:],
+            b"0\n",
+        ]
+    )
+
+
+class TestAgent:
+    def setup_method(self, method):
+        self.mock_cli = mock.MagicMock(spec=CLI)
+        self.agent = Agent(self.mock_cli)
+
+    def _serve(self, requests: bytes) -> bytes:
+        """
+        Helper. Return the responses to the supplied requests, after checking that the agent
+        said it was ready first.
+        """
+        stdout = BytesIO()
+        self.agent.serve(BytesIO(requests), stdout)
+        output = stdout.getvalue()
+        assert output.startswith(READY)
+        return output.removeprefix(READY)
+
+    def test_serve_says_ready_before_requests(self):
+        assert self._serve(b"") == b""
+
+    def test_serve_shares_cli_between_requests(self):
+        self.mock_cli.get_connected_devices.return_value = ["/dev/sda"]
+        self.mock_cli.get_partitioned_device.return_value = "/dev/sda1"
+        self.mock_cli.is_luks_volume.return_value = True
+
+        output = self._serve(
+            _request({"device": "usb-test"}) + _request({"device": "disk-test"})
+        )
+
+        assert output == b"USB_CONNECTED\nUSB_ENCRYPTED\n"
+        # Every disk request looks at the devices afresh
+        assert self.mock_cli.refresh.call_count == 2
+        assert self.mock_cli.get_connected_devices.call_count == 2
+
+    def test_serve_disk_picks_up_device_changed_after_preflight(self):
+        lsblk = {"fixture": "usb_luks_one_partition"}
+
+        def check_output(cmd, *args, **kwargs):
+            assert cmd[0] == "lsblk"
+            return _lsblk_output(lsblk["fixture"])
+
+        self.agent = Agent(CLI())
+        with mock.patch(
+            "subprocess.check_output", side_effect=check_output
+        ), mock.patch("subprocess.check_call", return_value=0), mock.patch(
+            "subprocess.Popen"
+        ) as mock_popen:
+            assert self._serve(_request({"device": "disk-test"})) == b"USB_ENCRYPTED\n"
+
+            # The drive is swapped for one with several partitions before the export
+            lsblk["fixture"] = "usb_multi_partition"
+            output = self._serve(
+                _request(
+                    {
+                        "device": "disk",
+                        "encryption_method": "luks",
+                        "encryption_key": "a passphrase",
+                    }
+                )
+            )
+
+        assert output == b"USB_ENCRYPTION_NOT_SUPPORTED\n"
+        mock_popen.assert_not_called()
+
+    def test_serve_streams_export_data_onto_device(self, tmp_path):
+        self.mock_cli.get_connected_devices.return_value = ["/dev/sda"]
+        self.mock_cli.get_partitioned_device.return_value = "/dev/sda1"
+        self.mock_cli.is_luks_volume.return_value = True
+
+        def write_archive_to_device(archive, target_dirname, volume, progress_callback):
+            # The archive is read from the request as it arrives, rather than from a file
+            assert isinstance(archive, tarfile.TarFile)
+            safe_extractall(archive, str(tmp_path), subdirectory="export_data")
+
+        self.mock_cli.write_archive_to_device.side_effect = write_archive_to_device
+
+        export_request = _request(
+            {
+                "device": "disk",
+                "encryption_method": "luks",
+                "encryption_key": "a passphrase",
+            },
+            {
+                "export_data/file.txt": b"exported",
+                "export_data/other.txt": b"also exported",
+            },
+        )
+        # The files in a preflight request are never read, but are skipped over
+        preflight_request = _request(
+            {"device": "usb-test"}, {"export_data/file.txt": b"unread"}
+        )
+
+        output = self._serve(export_request + preflight_request)
+
+        assert output == b"\nUSB_CONNECTED\n"
+        assert (tmp_path / "export_data" / "file.txt").read_bytes() == b"exported"
+        assert (tmp_path / "export_data" / "other.txt").read_bytes() == b"also exported"
+
+    def test_serve_error_status_does_not_end_session(self):
+        self.mock_cli.get_connected_devices.side_effect = [
+            [],
+            ["/dev/sda"],
+        ]
+
+        output = self._serve(
+            _request({"device": "usb-test"}) + _request({"device": "usb-test"})
+        )
+
+        assert output == b"USB_NOT_CONNECTED\nUSB_CONNECTED\n"
+
+    def test_serve_empty_response_without_status(self):
+        assert self._serve(_request({"device": ""})) == b"\n"
+
+    def test_serve_invalid_archive(self):
+        output = self._serve(b"5\nhello0\n" + _request({"device": ""}))
+
+        assert output == b"ERROR_EXTRACTION\n\n"
+
+    def test_serve_invalid_metadata(self):
+        output = self._serve(_request({"device": "floppy"}))
+
+        assert output == b"ERROR_ARCHIVE_METADATA\n"
+
+    def test_serve_malformed_header_ends_session(self):
+        output = self._serve(b"lots\n" + _request({"device": ""}))
+
+        assert output == Status.ERROR_GENERIC.value.encode("ascii") + b"\n"
+
+    def test_serve_truncated_archive_ends_session(self):
+        request = _request({"device": ""})
+
+        assert self._serve(request[:-2]) == b""
+        assert self._serve(request[:-10]) == b""
+
+    def test_serve_unexpected_error(self):
+        with mock.patch(
+            "securedrop_export.agent._process_submission",
+            side_effect=RuntimeError("Zounds, an uncaught error!"),
+        ):
+            output = self._serve(_request({"device": ""}))
+
+        assert output == b"ERROR_GENERIC\n"
+
+    def test_serve_export_exception(self):
+        with mock.patch(
+            "securedrop_export.agent._process_submission",
+            side_effect=ExportException(sdstatus=LegacyStatus.LEGACY_ERROR_USB_WRITE),
+        ):
+            output = self._serve(_request({"device": ""}))
+
+        assert output == b"ERROR_USB_WRITE\n"
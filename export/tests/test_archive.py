@@ -9,6 +9,7 @@ import pytest
 import tarfile
 from io import BytesIO
 
+from securedrop_export.command import Command
 from securedrop_export.exceptions import ExportException
 from securedrop_export.archive import Archive, Metadata, Status
 
@@ -404,6 +405,80 @@ def test_extract_tarball_raises_if_linkname_has_unsafe_absolute_path():
         assert not os.path.exists("/tmp/unsafe")
 
 
+def test_extract_tarball_removes_extracted_members_on_violation():
+    """
+    Check that members extracted before an unsafe member is encountered are cleaned up, since
+    the archive is validated and extracted in a single streaming pass.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "archive.sd-export")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            content = b"test"
+            file_info = tarfile.TarInfo("export_data/file.txt")
+            file_info.size = len(content)
+            archive.addfile(file_info, BytesIO(content))
+            traversed_file_info = tarfile.TarInfo("export_data/../../traversed")
+            traversed_file_info.size = len(content)
+            archive.addfile(traversed_file_info, BytesIO(content))
+            archive.close()
+
+        submission = Archive(archive_path)
+        preexisting_path = os.path.join(submission.tmpdir, "preexisting")
+        with open(preexisting_path, "w") as f:
+            f.write("keep me")
+
+        with pytest.raises(ExportException):
+            submission.extract_tarball()
+
+        assert os.listdir(submission.tmpdir) == ["preexisting"]
+
+
+def test_extract_tarball_with_hardlink():
+    """
+    Check that hardlinks to earlier members are extracted when streaming the archive.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "archive.sd-export")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            content = b"test"
+            file_info = tarfile.TarInfo("file")
+            file_info.size = len(content)
+            archive.addfile(file_info, BytesIO(content))
+            hardlink_info = tarfile.TarInfo("hardlink")
+            hardlink_info.type = tarfile.LNKTYPE
+            hardlink_info.linkname = "file"
+            archive.addfile(hardlink_info)
+            archive.close()
+
+        submission = Archive(archive_path).extract_tarball()
+
+        with open(os.path.join(submission.tmpdir, "hardlink"), "rb") as f:
+            assert f.read() == b"test"
+
+
+def test_extract_metadata():
+    """
+    Check that only the metadata file is extracted from the archive.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "archive.sd-export")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            metadata_str = json.dumps({"device": "disk", "encryption_method": "luks"})
+            metadata_file_info = tarfile.TarInfo("metadata.json")
+            metadata_file_info.size = len(metadata_str)
+            archive.addfile(metadata_file_info, BytesIO(metadata_str.encode("utf-8")))
+            content = b"test"
+            file_info = tarfile.TarInfo("export_data/file.txt")
+            file_info.size = len(content)
+            archive.addfile(file_info, BytesIO(content))
+            archive.close()
+
+        submission = Archive(archive_path).extract_metadata()
+
+        assert os.listdir(submission.tmpdir) == ["metadata.json"]
+        assert Metadata(submission.tmpdir).validate().command is Command.EXPORT
+
+
 def test_empty_config(capsys):
     Archive("testfile")
     temp_folder = tempfile.mkdtemp()
@@ -510,3 +585,30 @@ def test_metadata_parsing_error(mock_json):
         Metadata(tempfile.mkdtemp()).validate()
 
     assert ex.value.sdstatus is Status.ERROR_METADATA_PARSING
+
+
+@pytest.mark.parametrize("mode", ["w", "w:gz"])
+def test_extract_tarball_compressed_or_not(mode):
+    """
+    Check that archives are extracted whether they are compressed or not.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        archive_path = os.path.join(temp_dir, "archive.sd-export")
+        with tarfile.open(archive_path, mode) as archive:
+            metadata_str = json.dumps({"device": "printer"})
+            metadata_file_info = tarfile.TarInfo("metadata.json")
+            metadata_file_info.size = len(metadata_str)
+            archive.addfile(metadata_file_info, BytesIO(metadata_str.encode("utf-8")))
+            content = b"test"
+            file_info = tarfile.TarInfo("export_data/file.txt")
+            file_info.size = len(content)
+            archive.addfile(file_info, BytesIO(content))
+
+        submission = Archive(archive_path).extract_metadata()
+        assert Metadata(submission.tmpdir).validate().command is Command.PRINT
+
+        submission = Archive(archive_path).extract_tarball()
+        with open(
+            os.path.join(submission.tmpdir, "export_data", "file.txt"), "rb"
+        ) as f:
+            assert f.read() == content
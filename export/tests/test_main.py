@@ -83,9 +83,12 @@ class TestMain:
         ), mock.patch(
             "securedrop_export.main._start_service"
         ) as mock_service, mock.patch(
+            "securedrop_export.main.Archive.extract_metadata",
+            return_value=self.submission,
+        ), mock.patch(
             "securedrop_export.main.Archive.extract_tarball",
             return_value=self.submission,
-        ), pytest.raises(
+        ) as mock_extract_tarball, pytest.raises(
             SystemExit
         ):
             entrypoint()
@@ -93,7 +96,13 @@ class TestMain:
         if command is not Command.START_VM:
             assert self.submission.command == command
             assert mock_service.call_args[0][0].archive == SUBMISSION_SAMPLE_ARCHIVE
-            mock_service.assert_called_once_with(self.submission)
+            mock_service.assert_called_once_with(self.submission, None)
+
+        # Only printing needs the full archive extracted before the service starts
+        if command is Command.PRINT:
+            mock_extract_tarball.assert_called_once()
+        else:
+            mock_extract_tarball.assert_not_called()
 
     def test_valid_printer_test_config(self, capsys):
         Archive("testfile")
@@ -108,7 +117,7 @@ class TestMain:
         assert config.encryption_method is None
 
     @mock.patch(
-        "securedrop_export.archive.safe_extractall",
+        "securedrop_export.archive.safe_extract_member",
         side_effect=ValueError("A tarball problem!"),
     )
     @mock.patch("securedrop_export.main.os.path.exists", return_value=True)